@@ -0,0 +1,184 @@
+"""
+Résolutions asynchrones (asyncio) avec limite de concurrence et annulation
+
+Les résolutions Gurobi sont bloquantes: elles tournent dans un pool de
+threads borné et sont attendues depuis la boucle asyncio.
+  - solve_async(optimizer): await d'une résolution, dans un environnement
+    du pool si l'optimiseur utilise l'environnement partagé; l'annulation
+    de la tâche interrompt la résolution en cours (Model.terminate) et
+    attend qu'elle rende la main avant de propager CancelledError
+  - solve_many_async(problèmes): résolutions en lot, au plus
+    max_concurrency à la fois, chacune dans un environnement du pool;
+    les résultats sont produits dans l'ordre où ils se terminent
+  - background_loop(): boucle asyncio dans un thread dédié, pour appeler
+    cette API depuis du code synchrone (interface Qt, scripts)
+
+Exemple:
+    async for index, results in solve_many_async(problemes, max_concurrency=4):
+        print(index, results['total_cost'])
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from solver_env import env_pool, shared_env
+
+_lock = threading.Lock()
+_executor = None
+_loop = None
+
+
+def solver_executor():
+    """Pool de threads partagé par les résolutions asynchrones"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                           thread_name_prefix='solve')
+        return _executor
+
+
+def background_loop():
+    """Boucle asyncio partagée tournant dans un thread démon"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='asyncio-solve',
+                             daemon=True).start()
+        return _loop
+
+
+def submit(coroutine):
+    """
+    Lancer une coroutine sur background_loop() depuis du code synchrone
+
+    Returns:
+        concurrent.futures.Future (cancel() annule la tâche et la résolution)
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, background_loop())
+
+
+async def _run_cancellable(function, cancel, executor=None):
+    """Exécuter function dans le pool; cancel() est appelé si la tâche est annulée"""
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor or solver_executor(), function)
+    try:
+        # shield: l'annulation de la tâche ne doit pas abandonner le thread
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancel()
+        # Attendre la fin effective: le modèle n'est plus utilisé ensuite
+        try:
+            await future
+        except Exception:
+            pass
+        raise
+
+
+async def solve_async(optimizer, executor=None):
+    """
+    Résoudre sans bloquer la boucle asyncio
+
+    Args:
+        optimizer: NetworkOptimizer (utilisé par un seul thread à la fois)
+        executor: Pool de threads (défaut: solver_executor())
+
+    Returns:
+        Résultat de optimizer.solve()
+    """
+    optimizer.clear_cancel()
+    try:
+        return await _run_cancellable(lambda: _solve_in_pool(optimizer),
+                                      optimizer.cancel, executor)
+    finally:
+        optimizer.clear_cancel()
+
+
+def _solve_in_pool(optimizer):
+    """
+    optimizer.solve() depuis un thread du pool
+
+    L'environnement partagé ne doit pas servir à plusieurs threads à la
+    fois: le modèle est déplacé dans un environnement du pool le temps de
+    la résolution, puis ramené.
+    """
+    if optimizer.env is not shared_env():
+        return optimizer.solve()
+    with env_pool().acquire() as env:
+        optimizer.move_to_env(env)
+        try:
+            return optimizer.solve()
+        finally:
+            optimizer.move_to_env(shared_env())
+
+
+class _PooledSolve:
+    """Une résolution d'un lot: optimiseur construit dans un environnement du pool"""
+
+    def __init__(self, options, parallel_jobs):
+        self.options = dict(options)
+        self.options.setdefault('parallel_jobs', parallel_jobs)
+        self.optimizer = None
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def run(self):
+        from network_model import load_backend
+
+        NetworkOptimizer = load_backend(self.options.pop('backend', 'gurobi'))
+        with env_pool().acquire() as env:
+            with self._lock:
+                if self.cancelled:
+                    return None
+                self.optimizer = NetworkOptimizer(env=env, **self.options)
+            try:
+                return self.optimizer.solve()
+            finally:
+                self.optimizer.model.dispose()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self.optimizer is not None:
+                self.optimizer.cancel()
+
+
+async def solve_many_async(problems, max_concurrency=None, executor=None):
+    """
+    Résoudre un lot de problèmes, résultats produits au fil de l'eau
+
+    Args:
+        problems: Itérable de dicts d'arguments de NetworkOptimizer
+                  (num_nodes, edges, demand, objective_type...)
+        max_concurrency: Résolutions simultanées (défaut: nombre de cœurs);
+                         le nombre de threads par résolution est borné en
+                         conséquence
+        executor: Pool de threads (défaut: solver_executor())
+
+    Yields:
+        tuple: (indice du problème, résultat de solve())
+
+    Quitter la boucle (break, exception) ou annuler la tâche qui la
+    parcourt interrompt les résolutions en cours et abandonne les autres.
+    """
+    problems = list(problems)
+    limit = max_concurrency or os.cpu_count() or 1
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(index, options):
+        async with semaphore:
+            job = _PooledSolve(options, limit)
+            return index, await _run_cancellable(job.run, job.cancel, executor)
+
+    tasks = [asyncio.ensure_future(run(index, options))
+             for index, options in enumerate(problems)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,108 @@
+"""
+Banc de mesure des performances
+
+Chaque mesure d'import est faite dans un interpréteur neuf pour ne pas
+profiter des modules déjà chargés. Le temps d'import du cœur léger
+(network_model) est soumis à un budget: le script échoue s'il est dépassé.
+"""
+
+import os
+import subprocess
+import sys
+
+# Budget du cœur léger (secondes, médiane sur plusieurs lancements)
+CORE_IMPORT_BUDGET = 0.5
+
+# Modules lourds qui ne doivent pas être chargés par le cœur
+HEAVY_MODULES = ('gurobipy', 'PyQt5', 'matplotlib', 'networkx', 'pandas')
+
+IMPORT_TARGETS = [
+    'network_model',
+    'example_data',
+    'network_optimizer',
+    'main_window',
+]
+
+_IMPORT_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ','.join(heavy) or '-')
+"""
+
+
+def measure_import(module, repeat=3):
+    """
+    Mesurer le temps d'import d'un module dans des interpréteurs neufs
+
+    Returns:
+        dict: {'module', 'time' (médiane), 'heavy' (modules lourds chargés)}
+              ou {'module', 'error'} si l'import échoue
+    """
+    times = []
+    heavy = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-c', _IMPORT_SNIPPET.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        if proc.returncode != 0:
+            last = proc.stderr.strip().splitlines()
+            return {'module': module, 'error': last[-1] if last else 'erreur'}
+        elapsed, loaded = proc.stdout.strip().splitlines()[-1].split()
+        times.append(float(elapsed))
+        heavy = [m for m in loaded.split(',') if m != '-']
+
+    times.sort()
+    return {'module': module, 'time': times[len(times) // 2], 'heavy': heavy}
+
+
+def check_core_import(repeat=3):
+    """
+    Vérifier le budget d'import du cœur léger
+
+    Returns:
+        tuple: (respecté, mesure)
+    """
+    result = measure_import('network_model', repeat)
+    ok = ('error' not in result
+          and result['time'] <= CORE_IMPORT_BUDGET
+          and not result['heavy'])
+    return ok, result
+
+
+def bench_imports(repeat=3):
+    """Afficher le temps d'import de chaque module"""
+    print("="*70)
+    print("TEMPS D'IMPORT (interpréteur neuf, médiane)")
+    print("="*70)
+    print(f"{'Module':<22} {'Temps (s)':<12} {'Modules lourds chargés'}")
+    print("-"*70)
+
+    for module in IMPORT_TARGETS:
+        result = measure_import(module, repeat)
+        if 'error' in result:
+            print(f"{module:<22} {'-':<12} indisponible ({result['error']})")
+        else:
+            print(f"{module:<22} {result['time']:<12.3f} {', '.join(result['heavy']) or '-'}")
+    print()
+
+
+def run_benchmarks():
+    """Lancer tous les bancs; code de sortie non nul si un budget est dépassé"""
+    bench_imports()
+
+    ok, result = check_core_import()
+    if ok:
+        print(f"✓ Import du cœur: {result['time']:.3f} s "
+              f"(budget {CORE_IMPORT_BUDGET:.2f} s)")
+    else:
+        print(f"❌ Budget d'import du cœur dépassé: {result}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmarks() else 1)
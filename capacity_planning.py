@@ -0,0 +1,184 @@
+"""
+Planification de capacité: débit maximal et flot concurrent maximal
+
+Réponse directe à « combien de trafic en plus ce réseau peut-il porter? »,
+sans dichotomie sur la demande ni résolutions répétées:
+  - max_throughput(): flot maximal source -> destination (Dinic,
+    flow_algorithms.FlowNetwork). Les nœuds encore atteignables dans le
+    graphe résiduel donnent la coupe minimale: ses arcs sont saturés et
+    leur capacité est exactement le débit maximal
+  - max_concurrent_flow(): pour une matrice de trafic, plus grand facteur
+    λ tel que λ x chaque demande soit acheminée simultanément. Un seul
+    PL, agrégé par source (un flot par source vers toutes ses
+    destinations: S x m variables au lieu de K x m); les liens dont la
+    contrainte de capacité a une variable duale non nulle sont ceux qui
+    limitent λ
+
+Les deux modes travaillent sur les arcs de NetworkOptimizer (edge_arrays):
+les deux arcs d'un lien bidirectionnel partagent sa capacité. Le plafond
+d'équilibrage (70 % de la capacité) s'applique s'il est actif; le plafond
+de fiabilité, relatif à la demande, ne s'applique pas. La marge
+(headroom) d'un lien est sa capacité effective moins sa charge.
+"""
+
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from flow_algorithms import FlowNetwork, cancel_opposing
+from network_model import RoutingResult
+
+
+def _capacity_data(optimizer):
+    """
+    Arcs, capacité effective par arc (celle de son lien), coefficients
+    objectif et positions des arcs de chaque lien
+    """
+    arrays = optimizer.edge_arrays()
+    bounds = arrays['capacity'] * (0.7 if optimizer.use_balance else 1.0)
+    unit = optimizer.objective_coefficient(arrays['cost'], arrays['latency'])
+    position = {arc: k for k, arc in enumerate(optimizer.edge_dict)}
+    columns = [[position[arc] for arc in arcs] for arcs in optimizer.link_arcs]
+    return arrays, bounds, unit, columns
+
+
+def _headroom(optimizer, arrays, bounds, columns, flow):
+    """Marge par lien {(i, j) du lien: capacité effective - charge}"""
+    load = np.bincount(arrays['link'], flow, minlength=len(columns))
+    return {arcs[0]: float(bounds[cols[0]] - load[k])
+            for k, (arcs, cols) in enumerate(zip(optimizer.link_arcs, columns))}
+
+
+def max_throughput(optimizer, source=None, destination=None):
+    """
+    Débit maximal source -> destination et coupe saturée
+
+    Args:
+        optimizer: NetworkOptimizer (seules ses données sont utilisées)
+        source, destination: Nœuds extrêmes (défaut: ceux de l'optimiseur)
+
+    Returns:
+        RoutingResult du flot maximal (demand = débit), complété par
+        throughput, additional_demand (débit - demande actuelle), cut
+        (arcs saturés de la coupe minimale), cut_capacity, source_side
+        (nœuds du côté source), headroom (par lien) et method
+    """
+    start_time = time.time()
+    source = optimizer.source if source is None else source
+    destination = optimizer.destination if destination is None else destination
+    arrays, bounds, unit, columns = _capacity_data(optimizer)
+    tails, heads = arrays['tails'], arrays['heads']
+
+    graph = FlowNetwork(optimizer.num_nodes, tails, heads)
+    value, flow, source_side = graph.max_flow(bounds, source, destination)
+    # Un lien bidirectionnel vaut deux arcs de sa capacité pour le flot
+    # maximal, une fois les flux opposés annulés
+    flow = cancel_opposing(flow, arrays['link'])
+    cut = source_side[tails] & ~source_side[heads]
+
+    results = RoutingResult(
+        'optimal', time.time() - start_time, tails, heads, arrays['capacity'],
+        arrays['cost'], arrays['latency'], flow, links=arrays['link'], source=source,
+        destination=destination, demand=value, objective=float(unit @ flow)
+    )
+    results['method'] = 'max_flow'
+    results['throughput'] = value
+    results['additional_demand'] = value - optimizer.demand
+    results['cut'] = [(int(i), int(j)) for i, j in zip(tails[cut], heads[cut])]
+    results['cut_capacity'] = float(bounds[cut].sum())
+    results['source_side'] = np.flatnonzero(source_side).tolist()
+    results['headroom'] = _headroom(optimizer, arrays, bounds, columns, flow)
+    return results
+
+
+def max_concurrent_flow(optimizer, commodities=None, tol=1e-9):
+    """
+    Plus grand facteur λ tel que toute la matrice de trafic x λ passe
+
+    Args:
+        optimizer: NetworkOptimizer (données et environnement Gurobi)
+        commodities: Liste de (source, destination, volume) (défaut: la
+                     demande de l'optimiseur)
+        tol: Seuil des variables duales et des marges
+
+    Returns:
+        RoutingResult de la charge totale par arc (objective = λ),
+        complété par lambda, routed (volume acheminé par demande),
+        flows_by_source, cut (liens qui limitent λ), saturated (liens
+        sans marge), headroom (par lien) et method
+    """
+    start_time = time.time()
+    if commodities is None:
+        commodities = [(optimizer.source, optimizer.destination, optimizer.demand)]
+    commodities = [(int(s), int(t), float(d)) for s, t, d in commodities]
+    if not any(d > 0 and s != t for s, t, d in commodities):
+        raise ValueError("Au moins une demande positive entre deux nœuds distincts est requise")
+    arrays, bounds, _, columns = _capacity_data(optimizer)
+    tails, heads = arrays['tails'], arrays['heads']
+    num_nodes, num_edges = optimizer.num_nodes, len(tails)
+
+    # Offre de chaque source agrégée: +total à la source, -d_k à chaque destination
+    sources = sorted({s for s, t, d in commodities if d > 0 and s != t})
+    supply = np.zeros((len(sources), num_nodes))
+    for s, t, d in commodities:
+        if d > 0 and s != t:
+            row = sources.index(s)
+            supply[row, s] += d
+            supply[row, t] -= d
+
+    model = gp.Model("concurrent_flow", env=optimizer.env)
+    try:
+        model.setParam('OutputFlag', 0)
+        lam = model.addVar(obj=1.0)
+        model.ModelSense = GRB.MAXIMIZE
+        flows = []
+        for row in range(len(sources)):
+            x = list(model.addVars(num_edges, lb=0.0).values())
+            flows.append(x)
+            outgoing = [[] for _ in range(num_nodes)]
+            incoming = [[] for _ in range(num_nodes)]
+            for k, (i, j) in enumerate(zip(tails.tolist(), heads.tolist())):
+                outgoing[i].append(x[k])
+                incoming[j].append(x[k])
+            # Sortant - entrant = λ x offre
+            for node in range(num_nodes):
+                expr = gp.LinExpr([1.0] * len(outgoing[node]) + [-1.0] * len(incoming[node]),
+                                  outgoing[node] + incoming[node])
+                if supply[row, node]:
+                    expr.add(lam, -supply[row, node])
+                model.addLConstr(expr, GRB.EQUAL, 0.0)
+
+        # Capacité par lien: toutes les sources, les deux arcs d'un lien
+        capacity = []
+        for cols in columns:
+            terms = [x[k] for x in flows for k in cols]
+            capacity.append(model.addLConstr(gp.LinExpr([1.0] * len(terms), terms),
+                                             GRB.LESS_EQUAL, float(bounds[cols[0]])))
+        model.optimize()
+        if model.Status != GRB.OPTIMAL:
+            raise RuntimeError(f"Flot concurrent: statut {model.Status}")
+        value = lam.X
+        by_source = np.array([model.getAttr('X', x) for x in flows]).reshape(-1, num_edges)
+        duals = np.array(model.getAttr('Pi', capacity))
+        slack = np.array(model.getAttr('Slack', capacity))
+    finally:
+        model.dispose()
+
+    load = by_source.sum(axis=0)
+    links = [arcs[0] for arcs in optimizer.link_arcs]
+    results = RoutingResult(
+        'optimal', time.time() - start_time, tails, heads, arrays['capacity'],
+        arrays['cost'], arrays['latency'], load, links=arrays['link'],
+        source=optimizer.source, destination=optimizer.destination,
+        demand=optimizer.demand, objective=value
+    )
+    results['method'] = 'concurrent_flow'
+    results['lambda'] = value
+    results['routed'] = [value * d for _, _, d in commodities]
+    results['flows_by_source'] = dict(zip(sources, by_source))
+    results['cut'] = [e for e, pi in zip(links, duals.tolist()) if abs(pi) > tol]
+    results['saturated'] = [e for e, s in zip(links, slack.tolist()) if s <= tol]
+    results['headroom'] = _headroom(optimizer, arrays, bounds, columns, load)
+    return results
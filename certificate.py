@@ -0,0 +1,215 @@
+"""
+Certificat de validité d'une solution de routage
+
+Vérification indépendante du solveur, pour les solutions qui ne sortent
+pas d'une résolution prouvée: bibliothèque de solutions, démarrage à
+chaud, heuristiques, réponses à échéance. Tout tient en quelques
+opérations NumPy sur les tableaux d'arêtes (aucune boucle Python):
+  - conservation du flux à chaque nœud par scatter-add (np.bincount):
+    la source émet demand, la destination l'absorbe, les autres nœuds
+    sont équilibrés
+  - bornes: 0 <= x <= capacité; les deux arcs d'un lien bidirectionnel
+    partagent la capacité (charge du lien par np.bincount)
+  - plafonds de NetworkOptimizer s'ils sont actifs: fiabilité
+    (x <= 0.8 demand) et équilibrage (x <= 0.7 capacité)
+  - objectif recalculé depuis les coefficients unitaires et comparé à
+    l'objectif annoncé
+
+Les tolérances sont relatives: tol x max(1, demande) pour la conservation,
+tol x max(1, borne) pour les bornes, tol x max(1, |objectif|) pour
+l'objectif. Le module n'importe aucun solveur (cœur léger).
+"""
+
+import time
+
+import numpy as np
+
+# Mêmes facteurs que NetworkOptimizer.flow_upper_bound
+RELIABILITY_SHARE = 0.8
+BALANCE_SHARE = 0.7
+
+
+class Certificate:
+    """Verdict d'une vérification: valide ou non, pires violations"""
+
+    def __init__(self, valid, max_violation, violations, objective,
+                 reported_objective, check_time):
+        """
+        Args:
+            valid: Vrai si tous les contrôles passent
+            max_violation: Dict {contrôle: pire écart} (0 si respecté)
+            violations: Pires violations, triées par écart décroissant:
+                        dicts {'check', 'node' ou 'edge', 'amount'}
+            objective: Objectif recalculé (None sans coefficients)
+            reported_objective: Objectif annoncé (None si absent)
+            check_time: Durée de la vérification (s)
+        """
+        self.valid = valid
+        self.max_violation = max_violation
+        self.violations = violations
+        self.objective = objective
+        self.reported_objective = reported_objective
+        self.check_time = check_time
+
+    def __bool__(self):
+        return self.valid
+
+    def __repr__(self):
+        verdict = 'valide' if self.valid else f"invalide ({len(self.violations)} violations)"
+        return f"Certificate({verdict})"
+
+    def summary(self):
+        """Résumé lisible, une ligne par violation"""
+        lines = ["Solution valide" if self.valid else "Solution invalide"]
+        for v in self.violations:
+            where = f"nœud {v['node']}" if 'node' in v else (
+                f"arête {v['edge']}" if 'edge' in v else "objectif")
+            lines.append(f"  {v['check']}: {where}, écart {v['amount']:.6g}")
+        return "\n".join(lines)
+
+
+def check_flow(num_nodes, tails, heads, capacity, flow, demand, source=0,
+               destination=None, unit_cost=None, objective=None,
+               use_reliability=False, use_balance=False, links=None, tol=1e-6,
+               max_violations=5):
+    """
+    Vérifier un vecteur de flux aligné sur les arêtes
+
+    Args:
+        num_nodes: Nombre de nœuds
+        tails, heads, capacity: Tableaux des arêtes
+        flow: Flux par arête
+        demand: Demande source -> destination
+        source, destination: Nœuds extrêmes (défaut: 0 et n-1)
+        unit_cost: Coefficients objectif par arête (recalcul de l'objectif)
+        objective: Objectif annoncé, comparé à l'objectif recalculé
+        use_reliability, use_balance: Plafonds de NetworkOptimizer actifs
+        links: Indice du lien de chaque arc (arrays['link']): capacité et
+               plafonds portent sur la charge du lien; une violation est
+               rapportée sur le premier arc du lien
+        tol: Tolérance relative
+        max_violations: Nombre de pires violations rapportées
+
+    Returns:
+        Certificate
+    """
+    start = time.perf_counter()
+    if flow is None:
+        raise ValueError("Aucun flux à vérifier")
+    destination = num_nodes - 1 if destination is None else destination
+    tails = np.asarray(tails, dtype=np.int64)
+    heads = np.asarray(heads, dtype=np.int64)
+    capacity = np.asarray(capacity, dtype=float)
+    flow = np.asarray(flow, dtype=float)
+    if flow.shape != capacity.shape:
+        raise ValueError(f"Flux de forme {flow.shape}, attendu {capacity.shape}")
+    # Une valeur non finie (NaN, inf) viole tous les contrôles de son arête
+    # et la conservation à ses deux extrémités
+    nonfinite = ~np.isfinite(flow)
+    flow = np.where(nonfinite, np.inf, flow)
+    finite = np.where(nonfinite, 0.0, flow)
+
+    # Conservation: sortant - entrant = +demand (source), -demand (destination)
+    net = (np.bincount(tails, finite, minlength=num_nodes)
+           - np.bincount(heads, finite, minlength=num_nodes))
+    net[source] -= demand
+    net[destination] += demand
+    net = np.abs(net)
+    net[tails[nonfinite]] = np.inf
+    net[heads[nonfinite]] = np.inf
+
+    # Charge et capacité de chaque lien (un arc par lien sans links)
+    if links is None:
+        load, link_capacity, first_arc = flow, capacity, None
+    else:
+        links = np.asarray(links, dtype=np.int64)
+        num_links = int(links.max(initial=-1)) + 1
+        load = np.bincount(links, flow, minlength=num_links)
+        link_capacity = np.zeros(num_links)
+        link_capacity[links] = capacity
+        first_arc = np.empty(num_links, dtype=np.int64)
+        first_arc[links[::-1]] = np.arange(len(links))[::-1]
+
+    # Écarts, positifs quand la borne est dépassée: par arc pour la
+    # positivité, par lien pour la capacité et les plafonds
+    excesses = {'nonnegativity': (np.where(nonfinite, np.inf, -flow),
+                                  np.ones_like(capacity), None),
+                'capacity': (load - link_capacity, np.maximum(1.0, np.abs(link_capacity)),
+                             first_arc)}
+    if use_reliability:
+        cap = RELIABILITY_SHARE * demand
+        excesses['reliability'] = (load - cap, np.full_like(load, max(1.0, abs(cap))),
+                                   first_arc)
+    if use_balance:
+        cap = BALANCE_SHARE * link_capacity
+        excesses['balance'] = (load - cap, np.maximum(1.0, np.abs(cap)), first_arc)
+
+    max_violation = {'conservation': float(net.max(initial=0.0))}
+    candidates = []
+    node_limit = tol * max(1.0, abs(demand))
+    bad = np.flatnonzero(net > node_limit)
+    candidates.extend(('conservation', 'node', k, net[k]) for k in
+                      _worst(bad, net, max_violations))
+    for check, (excess, scale, arcs) in excesses.items():
+        max_violation[check] = float(max(0.0, excess.max(initial=0.0)))
+        bad = np.flatnonzero(excess > tol * scale)
+        candidates.extend((check, 'edge', k if arcs is None else arcs[k], excess[k])
+                          for k in _worst(bad, excess, max_violations))
+
+    recomputed = None
+    if unit_cost is not None:
+        recomputed = float(np.asarray(unit_cost, dtype=float) @ finite)
+        if objective is not None:
+            error = abs(recomputed - objective)
+            max_violation['objective'] = error
+            if not error <= tol * max(1.0, abs(recomputed)):
+                candidates.append(('objective', None, None, error))
+
+    candidates.sort(key=lambda c: -c[3])
+    violations = []
+    for check, kind, k, amount in candidates[:max_violations]:
+        violation = {'check': check, 'amount': float(amount)}
+        if kind == 'node':
+            violation['node'] = int(k)
+        elif kind == 'edge':
+            violation['edge'] = (int(tails[k]), int(heads[k]))
+        violations.append(violation)
+
+    return Certificate(not candidates, max_violation, violations, recomputed,
+                       objective, time.perf_counter() - start)
+
+
+def _worst(indices, amounts, count):
+    """Les count indices de plus grand écart parmi indices"""
+    if len(indices) > count:
+        indices = indices[np.argpartition(-amounts[indices], count - 1)[:count]]
+    return indices.tolist()
+
+
+def check_solution(network, flow, objective=None, unit_cost=None, use_reliability=False,
+                   use_balance=False, tol=1e-6, max_violations=5):
+    """
+    Vérifier une solution d'un network_model.Network
+
+    Args:
+        network: Network (source 0, destination n-1, network.demand)
+        flow: Flux par arc (aligné sur network.arrays), dict {(i, j): flux}
+              ou RoutingResult
+        objective: Objectif annoncé (défaut: celui du RoutingResult)
+        unit_cost: Coefficients objectif (défaut: coûts des arêtes)
+
+    Returns:
+        Certificate
+    """
+    arrays = network.arrays
+    if hasattr(flow, 'flow') and hasattr(flow, 'objective'):
+        objective = flow.objective if objective is None else objective
+        flow = flow.flow
+    if isinstance(flow, dict):
+        flow = [flow.get(e, 0.0) for e in network.edge_keys]
+    return check_flow(network.num_nodes, arrays['tails'], arrays['heads'],
+                      arrays['capacity'], flow, network.demand,
+                      unit_cost=arrays['cost'] if unit_cost is None else unit_cost,
+                      objective=objective, use_reliability=use_reliability,
+                      use_balance=use_balance, links=arrays['link'], tol=tol,
+                      max_violations=max_violations)
@@ -0,0 +1,378 @@
+"""
+Routage sensible à la congestion: délai convexe par lien
+
+Le délai d'un lien croît avec sa charge; on minimise le délai total
+(optimum système) sum_e x_e * t_e(x_e), séparable et convexe:
+  - 'bpr': t_e(x) = t0_e * (1 + a * (x / c_e)^b)         (Bureau of Public Roads)
+  - 'kleinrock': t_e(x) = t0_e + s / (c_e - x)           (file M/M/1)
+    Au-delà de rho_max * c_e, la fonction est prolongée par son développement
+    de Taylor d'ordre 2: elle reste finie et convexe, et une surcharge se
+    lit dans max_utilization au lieu de rendre le problème infaisable.
+
+Deux moteurs:
+  - 'frank_wolfe': Frank-Wolfe (ou sa variante conjuguée) entièrement
+    vectorisé en NumPy, sans solveur. L'oracle linéaire est un plus court
+    chemin (Dijkstra) pondéré par le coût marginal; chaque itération coûte
+    O(E log V). Seule la conservation du flot est imposée: la congestion est
+    pénalisée par la fonction de délai, pas par une capacité dure.
+  - 'pwl': approximation extérieure linéaire par morceaux dans Gurobi
+    (tangentes ajoutées à la volée). Respecte les contraintes du modèle de
+    NetworkOptimizer (capacité, fiabilité, équilibrage).
+
+Les deux moteurs rapportent une borne inférieure et l'écart relatif de
+convergence, ainsi que le temps de chaque itération.
+"""
+
+import time
+
+import numpy as np
+
+from flow_algorithms import ForwardStar
+from network_model import flow_metrics
+
+DELAY_MODELS = ('bpr', 'kleinrock')
+
+# Poids maximal 1 - delta du point conjugué précédent (Frank-Wolfe conjugué)
+CONJUGATE_DELTA = 0.05
+
+
+class DelayFunction:
+    """
+    Délai total par lien f_e(x) = x * t_e(x), vectorisé sur toutes les arêtes
+
+    value(), gradient() et curvature() prennent et renvoient des tableaux
+    alignés sur les arêtes.
+    """
+
+    def __init__(self, model, free_flow, capacity, bpr_alpha=0.15, bpr_beta=4.0,
+                 service_scale=1.0, rho_max=0.99):
+        """
+        Args:
+            model: 'bpr' ou 'kleinrock'
+            free_flow: Délai à vide t0 par arête (latence)
+            capacity: Capacité par arête
+            bpr_alpha, bpr_beta: Paramètres a et b de la fonction BPR
+            service_scale: Facteur s du terme de file d'attente (Kleinrock)
+            rho_max: Taux de charge au-delà duquel Kleinrock est prolongée
+        """
+        if model not in DELAY_MODELS:
+            raise ValueError(f"Modèle de délai inconnu: {model} "
+                             f"(disponibles: {', '.join(DELAY_MODELS)})")
+        self.model = model
+        self.t0 = np.asarray(free_flow, dtype=float)
+        self.capacity = np.asarray(capacity, dtype=float)
+        if np.any(self.capacity <= 0):
+            raise ValueError("Les capacités doivent être strictement positives")
+        self.bpr_alpha = bpr_alpha
+        self.bpr_beta = bpr_beta
+        self.service_scale = service_scale
+        self.knee = rho_max * self.capacity
+
+    # Terme de file d'attente de Kleinrock g(x) = s * x / (c - x) et dérivées
+    def _queue(self, x):
+        c, s = self.capacity, self.service_scale
+        return s * x / (c - x), s * c / (c - x) ** 2, 2 * s * c / (c - x) ** 3
+
+    def _kleinrock(self, x):
+        """(valeur, dérivée, dérivée seconde) du terme de file, prolongé"""
+        xk = np.minimum(x, self.knee)
+        g, dg, d2g = self._queue(xk)
+        over = x - xk
+        return (g + dg * over + 0.5 * d2g * over ** 2,
+                dg + d2g * over,
+                d2g)
+
+    def value(self, x):
+        """Délai total par arête f_e(x_e)"""
+        if self.model == 'bpr':
+            ratio = x / self.capacity
+            return self.t0 * x * (1 + self.bpr_alpha * ratio ** self.bpr_beta)
+        return self.t0 * x + self._kleinrock(x)[0]
+
+    def gradient(self, x):
+        """Coût marginal f'_e(x_e)"""
+        if self.model == 'bpr':
+            ratio = x / self.capacity
+            return self.t0 * (1 + self.bpr_alpha * (self.bpr_beta + 1) * ratio ** self.bpr_beta)
+        return self.t0 + self._kleinrock(x)[1]
+
+    def curvature(self, x):
+        """Dérivée seconde f''_e(x_e) (diagonale du hessien)"""
+        if self.model == 'bpr':
+            b = self.bpr_beta
+            ratio = x / self.capacity
+            return (self.t0 * self.bpr_alpha * (b + 1) * b
+                    * ratio ** max(b - 1, 0) / self.capacity)
+        return self._kleinrock(x)[2]
+
+    def link_delay(self, x):
+        """Délai unitaire t_e(x_e) d'un paquet sur chaque arête"""
+        if self.model == 'bpr':
+            return self.t0 * (1 + self.bpr_alpha * (x / self.capacity) ** self.bpr_beta)
+        safe = np.where(x > 0, x, 1.0)
+        queue = np.where(x > 0, self._kleinrock(x)[0] / safe,
+                         self.service_scale / self.capacity)
+        return self.t0 + queue
+
+
+def _line_search(delay, x, direction, iterations=30, rel_tol=1e-10):
+    """
+    Pas optimal dans [0, 1]: Newton sur la dérivée directionnelle,
+    protégé par un encadrement (dichotomie si Newton sort de l'intervalle)
+    """
+    slope0 = delay.gradient(x) @ direction
+    if slope0 >= 0:
+        return 0.0
+    if delay.gradient(x + direction) @ direction <= 0:
+        return 1.0
+
+    low, high, step = 0.0, 1.0, 0.5
+    for _ in range(iterations):
+        point = x + step * direction
+        slope = delay.gradient(point) @ direction
+        if abs(slope) <= rel_tol * abs(slope0):
+            break
+        if slope > 0:
+            high = step
+        else:
+            low = step
+        if high - low <= rel_tol:
+            break
+        curvature = (delay.curvature(point) * direction) @ direction
+        newton = step - slope / curvature if curvature > 0 else -1.0
+        step = newton if low < newton < high else 0.5 * (low + high)
+    return step
+
+
+def _results(network, delay, x, start_time):
+    """Métriques communes aux deux moteurs"""
+    keys = network.edge_keys
+    flows = dict(zip(keys, x.tolist()))
+    arrays = network.arrays
+    edge_dict = {
+        e: {'capacity': cap, 'cost': cost, 'latency': lat}
+        for e, cap, cost, lat in zip(keys, arrays['capacity'].tolist(),
+                                     arrays['cost'].tolist(), arrays['latency'].tolist())
+    }
+    results = {
+        'flows': flows,
+        'x': x,
+        'total_delay': float(delay.value(x).sum()),
+        'link_delay': dict(zip(keys, delay.link_delay(x).tolist())),
+        'solve_time': time.time() - start_time
+    }
+    results['avg_delay'] = (results['total_delay'] / network.demand
+                            if network.demand else 0.0)
+    results.update(flow_metrics(edge_dict, flows, links=arrays['link']))
+    return results
+
+
+def frank_wolfe(network, delay='bpr', conjugate=True, max_iter=500, tol=1e-4,
+                **delay_options):
+    """
+    Routage à délai convexe minimal par Frank-Wolfe vectorisé
+
+    Args:
+        network: network_model.Network (source 0, destination n-1)
+        delay: 'bpr', 'kleinrock' ou une DelayFunction déjà construite
+        conjugate: Direction conjuguée (Mitradjieva-Lindberg) au lieu de la
+                   direction de Frank-Wolfe classique
+        max_iter: Nombre maximal d'itérations
+        tol: Écart relatif visé (f(x) - borne inférieure) / f(x)
+        **delay_options: Paramètres de DelayFunction (bpr_alpha, rho_max...)
+
+    Returns:
+        dict: flows, total_delay, lower_bound, relative_gap, iterations,
+              gap_history, iteration_times, oracle_times, status...
+    """
+    start_time = time.time()
+    arrays = network.arrays
+    if not isinstance(delay, DelayFunction):
+        delay = DelayFunction(delay, arrays['latency'], arrays['capacity'],
+                              **delay_options)
+
+    source, target = 0, network.num_nodes - 1
+    graph = ForwardStar(network.num_nodes, arrays['tails'], arrays['heads'])
+
+    def all_or_nothing(weights):
+        _, path = graph.shortest_path(weights, source, target)
+        if path is None:
+            raise ValueError(f"Aucun chemin de {source} vers {target}")
+        y = np.zeros(len(weights))
+        y[path] = network.demand
+        return y
+
+    x = all_or_nothing(delay.gradient(np.zeros(len(arrays['tails']))))
+    previous = None
+    lower_bound = -np.inf
+    gap_history, iteration_times, oracle_times = [], [], []
+    status = 'iteration_limit'
+    relative_gap = np.inf
+
+    for iteration in range(1, max_iter + 1):
+        iter_start = time.perf_counter()
+        grad = delay.gradient(x)
+
+        oracle_start = time.perf_counter()
+        y = all_or_nothing(grad)
+        oracle_times.append(time.perf_counter() - oracle_start)
+
+        # Écart de Frank-Wolfe: f(x) - f* <= grad . (x - y)
+        objective = float(delay.value(x).sum())
+        lower_bound = max(lower_bound, objective - float(grad @ (x - y)))
+        relative_gap = (objective - lower_bound) / objective if objective > 0 else 0.0
+        gap_history.append(relative_gap)
+        if relative_gap <= tol:
+            iteration_times.append(time.perf_counter() - iter_start)
+            status = 'optimal'
+            break
+
+        # Point cible: conjugué du précédent par rapport au hessien diagonal
+        point = y
+        if conjugate and previous is not None:
+            hessian = delay.curvature(x)
+            to_previous = previous - x
+            numerator = to_previous @ (hessian * (y - x))
+            denominator = to_previous @ (hessian * (y - previous))
+            if denominator != 0:
+                weight = min(max(numerator / denominator, 0.0), 1 - CONJUGATE_DELTA)
+                candidate = weight * previous + (1 - weight) * y
+                # Garder une direction de descente, sinon repli sur Frank-Wolfe
+                if grad @ (candidate - x) < 0:
+                    point = candidate
+
+        direction = point - x
+        step = _line_search(delay, x, direction)
+        x = x + step * direction
+        previous = point
+        iteration_times.append(time.perf_counter() - iter_start)
+
+    results = _results(network, delay, x, start_time)
+    results.update({
+        'status': status,
+        'method': 'conjugate_frank_wolfe' if conjugate else 'frank_wolfe',
+        'objective': results['total_delay'],
+        'lower_bound': lower_bound,
+        'relative_gap': relative_gap,
+        'iterations': len(gap_history),
+        'gap_history': np.array(gap_history),
+        'iteration_times': np.array(iteration_times),
+        'oracle_times': np.array(oracle_times)
+    })
+    return results
+
+
+def solve_pwl(optimizer, delay='bpr', tol=1e-4, max_rounds=100, **delay_options):
+    """
+    Approximation extérieure linéaire par morceaux dans Gurobi
+
+    Chaque arête reçoit une variable z_e >= f_e(x_e) représentée par des
+    tangentes; on résout le PL, puis on ajoute la tangente au point obtenu
+    pour chaque arête sous-estimée, jusqu'à l'écart relatif visé. La valeur
+    du PL est une borne inférieure, le délai réel du flot une borne supérieure.
+
+    Le modèle de l'optimiseur est copié: il n'est pas modifié.
+
+    Args:
+        optimizer: NetworkOptimizer (ses contraintes sont conservées)
+        delay: 'bpr', 'kleinrock' ou une DelayFunction
+        tol: Écart relatif visé
+        max_rounds: Nombre maximal de tours d'ajout de tangentes
+
+    Returns:
+        dict: mêmes champs que frank_wolfe(), plus 'num_tangents'
+    """
+    from gurobipy import GRB
+    from network_model import Network
+
+    start_time = time.time()
+    network = Network(optimizer.num_nodes, [
+        (i, j, d['capacity'], d['cost'], d['latency'])
+        for (i, j), d in optimizer.edge_dict.items()
+    ], optimizer.demand)
+    arrays = network.arrays
+    if not isinstance(delay, DelayFunction):
+        delay = DelayFunction(delay, arrays['latency'], arrays['capacity'],
+                              **delay_options)
+
+    if not optimizer.flow_vars:
+        optimizer.build_model()
+    model = optimizer.model.copy()
+    num_edges = len(arrays['tails'])
+    variables = model.getVars()
+    x_vars = variables[:num_edges]
+    for var in variables[num_edges:2 * num_edges]:
+        var.VType = GRB.CONTINUOUS
+
+    model.setAttr('Obj', variables, [0.0] * len(variables))
+    z_vars = model.addVars(num_edges, lb=0.0, obj=1.0, name="delay")
+    model.ModelSense = GRB.MINIMIZE
+
+    def add_tangents(indices, points):
+        at = np.zeros(num_edges)
+        at[indices] = points
+        values = delay.value(at)[indices]
+        slopes = delay.gradient(at)[indices]
+        for k, a, f, g in zip(indices, points, values, slopes):
+            model.addConstr(z_vars[k] >= f + g * (x_vars[k] - a))
+
+    # Tangentes initiales: à vide, mi-charge et près de la capacité
+    bounds = np.array([var.UB for var in x_vars])
+    bounds = np.where(np.isfinite(bounds), bounds, arrays['capacity'])
+    for fraction in (0.0, 0.5, 0.9):
+        add_tangents(np.arange(num_edges), fraction * bounds)
+    num_tangents = 3 * num_edges
+
+    gap_history, iteration_times = [], []
+    lower_bound, relative_gap = -np.inf, np.inf
+    status, x = 'iteration_limit', None
+
+    for _ in range(max_rounds):
+        iter_start = time.perf_counter()
+        model.optimize()
+        if model.Status != GRB.OPTIMAL:
+            status = optimizer.get_status_string(model)
+            iteration_times.append(time.perf_counter() - iter_start)
+            break
+
+        x = np.array(model.getAttr('X', x_vars))
+        z = np.array(model.getAttr('X', list(z_vars.values())))
+        values = delay.value(x)
+        lower_bound = max(lower_bound, model.ObjVal)
+        objective = float(values.sum())
+        relative_gap = (objective - lower_bound) / objective if objective > 0 else 0.0
+        gap_history.append(relative_gap)
+        if relative_gap <= tol:
+            status = 'optimal'
+            iteration_times.append(time.perf_counter() - iter_start)
+            break
+
+        under = np.flatnonzero(values - z > tol * max(objective, 1.0) / num_edges)
+        if len(under) == 0:
+            status = 'optimal'
+            iteration_times.append(time.perf_counter() - iter_start)
+            break
+        add_tangents(under, x[under])
+        num_tangents += len(under)
+        iteration_times.append(time.perf_counter() - iter_start)
+
+    if x is None:
+        model.dispose()
+        return {'status': status, 'method': 'pwl',
+                'solve_time': time.time() - start_time,
+                'message': "Le modèle linéarisé n'a pas de solution."}
+
+    results = _results(network, delay, x, start_time)
+    results.update({
+        'status': status,
+        'method': 'pwl',
+        'objective': results['total_delay'],
+        'lower_bound': lower_bound,
+        'relative_gap': relative_gap,
+        'iterations': len(gap_history),
+        'gap_history': np.array(gap_history),
+        'iteration_times': np.array(iteration_times),
+        'num_tangents': num_tangents
+    })
+    model.dispose()
+    return results
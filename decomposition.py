@@ -0,0 +1,327 @@
+"""
+Décomposition par régions pour les très grands réseaux
+
+Le graphe est partitionné en régions (graph_partition) en limitant les
+arêtes coupées. La coordination suit une décomposition de Benders sur les
+flux des arêtes frontières:
+  - le maître (PL) ne contient que les flux z des arêtes coupées, une
+    variable theta_r par région et l'équilibre global de chaque région
+    (flux entrant - flux sortant = demande nette de la région)
+  - à z fixé, chaque région résout son propre PL de flot, dans un
+    processus de calcul qui garde son modèle d'une itération à l'autre
+    (seuls des seconds membres changent: démarrage à chaud). La
+    conservation y est élastique (écarts pénalisés): le sous-problème est
+    toujours réalisable et ses duaux donnent une coupe d'optimalité
+    theta_r >= const_r + coef_r . z
+  - la valeur du maître est une borne inférieure, le coût réel de z une
+    borne supérieure; on s'arrête quand l'écart relatif passe sous tol.
+
+Les deux arcs d'un lien bidirectionnel relient les mêmes nœuds: ils sont
+internes à la même région ou tous deux coupés. Leur capacité partagée est
+une ligne du PL de la région, ou du maître s'ils sont coupés.
+
+Le modèle monolithique n'est jamais construit: seules les régions (et le
+maître, de la taille de la coupe) existent en mémoire.
+"""
+
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from graph_partition import cut_mask, partition_graph
+from network_model import RoutingResult
+from worker_pool import start_workers, stop_workers
+
+
+class _RegionSolver:
+    """PL de flot d'une région, modifié en place à chaque itération"""
+
+    def __init__(self, env, data):
+        self.region = data['region']
+        self.supply = data['supply']
+        self.entry_cut = data['entry_cut']
+        self.entry_node = data['entry_node']
+        self.entry_sign = data['entry_sign']
+        self.upper = data['upper']
+        num_nodes = len(self.supply)
+        num_edges = len(data['cost'])
+
+        model = gp.Model(f"region_{self.region}", env=env)
+        self.x = list(model.addVars(num_edges, lb=0.0, ub=self.upper.tolist(),
+                               obj=data['cost'].tolist()).values())
+        # Écarts de conservation, pénalisés (sous-problème toujours réalisable)
+        self.excess = list(model.addVars(num_nodes, obj=data['penalty'].tolist()).values())
+        self.deficit = list(model.addVars(num_nodes, obj=data['penalty'].tolist()).values())
+
+        # Sortant - entrant (arêtes internes) = offre + frontière
+        ends = np.concatenate((data['tails'], data['heads']))
+        edges = np.concatenate((np.arange(num_edges), np.arange(num_edges)))
+        signs = np.concatenate((np.ones(num_edges), -np.ones(num_edges)))
+        order = np.argsort(ends, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(ends, minlength=num_nodes))))
+        edges, signs = edges[order].tolist(), signs[order].tolist()
+
+        self.conservation = []
+        for i in range(num_nodes):
+            lo, hi = bounds[i], bounds[i + 1]
+            expr = gp.LinExpr(signs[lo:hi], [self.x[k] for k in edges[lo:hi]])
+            expr.add(self.excess[i] - self.deficit[i])
+            self.conservation.append(model.addLConstr(expr, GRB.EQUAL, self.supply[i]))
+
+        # Capacité partagée des liens bidirectionnels internes
+        self.link_bound = data['link_bound']
+        self.shared = [model.addLConstr(gp.LinExpr([1.0] * len(group),
+                                                   [self.x[k] for k in group]),
+                                        GRB.LESS_EQUAL, bound)
+                       for group, bound in zip(data['link_arcs'], self.link_bound.tolist())]
+        self.model = model
+
+    def rhs(self, z):
+        """Second membre des nœuds à z fixé"""
+        rhs = self.supply.copy()
+        np.add.at(rhs, self.entry_node, self.entry_sign * z[self.entry_cut])
+        return rhs
+
+    def _optimize(self, z):
+        self.model.setAttr('RHS', self.conservation, self.rhs(z).tolist())
+        self.model.optimize()
+        if self.model.Status != GRB.OPTIMAL:
+            raise RuntimeError(f"Région {self.region}: statut {self.model.Status}")
+
+    def solve(self, z):
+        """
+        Résoudre à z fixé
+
+        Returns:
+            dict: valeur, coupe (constante et coefficients sur les arêtes
+                  coupées de la région), écarts de conservation, temps
+        """
+        start = time.perf_counter()
+        self._optimize(z)
+
+        pi = np.array(self.model.getAttr('Pi', self.conservation))
+        # Duaux des bornes supérieures: -min(coût réduit, 0) sur les arêtes
+        mu = np.maximum(-np.array(self.model.getAttr('RC', self.x)), 0.0)
+        # Duaux (<= 0) des capacités partagées, à seconds membres fixes
+        nu = np.array(self.model.getAttr('Pi', self.shared)) if self.shared else np.zeros(0)
+        slack = (sum(self.model.getAttr('X', self.excess))
+                 + sum(self.model.getAttr('X', self.deficit)))
+        return {
+            'region': self.region,
+            'value': self.model.ObjVal,
+            'constant': float(pi @ self.supply - mu @ self.upper + nu @ self.link_bound),
+            'cut_index': self.entry_cut,
+            'coefficients': pi[self.entry_node] * self.entry_sign,
+            'violation': float(slack),
+            'time': time.perf_counter() - start
+        }
+
+    def flows(self, z):
+        """Flux internes de la région à z fixé"""
+        self._optimize(z)
+        return self.region, np.array(self.model.getAttr('X', self.x))
+
+
+def _shared_links(edges, links):
+    """Positions dans edges des arcs de chaque lien qui en a plusieurs"""
+    groups = {}
+    for position, link in enumerate(links[edges].tolist()):
+        groups.setdefault(link, []).append(position)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def _region_data(parts, num_regions, tails, heads, cost, upper, supply, cut, penalty,
+                 links):
+    """Données de chaque sous-problème (indices locaux, arêtes frontières)"""
+    cut_edges = np.flatnonzero(cut)
+    regions = []
+    for r in range(num_regions):
+        nodes = np.flatnonzero(parts == r)
+        local = np.full(len(parts), -1, dtype=np.int64)
+        local[nodes] = np.arange(len(nodes))
+
+        internal = np.flatnonzero(~cut & (parts[tails] == r))
+        # Arête coupée entrant dans la région: +z au nœud d'arrivée;
+        # sortant de la région: -z au nœud de départ
+        entering = np.flatnonzero(parts[heads[cut_edges]] == r)
+        leaving = np.flatnonzero(parts[tails[cut_edges]] == r)
+        shared = _shared_links(internal, links)
+        regions.append({
+            'region': r,
+            'nodes': nodes,
+            'edges': internal,
+            'tails': local[tails[internal]],
+            'heads': local[heads[internal]],
+            'cost': cost[internal],
+            'upper': upper[internal],
+            'supply': supply[nodes],
+            'link_arcs': shared,
+            'link_bound': np.array([upper[internal[group[0]]] for group in shared]),
+            'penalty': np.full(len(nodes), penalty),
+            'entry_cut': np.concatenate((entering, leaving)),
+            'entry_node': np.concatenate((local[heads[cut_edges[entering]]],
+                                          local[tails[cut_edges[leaving]]])),
+            'entry_sign': np.concatenate((np.ones(len(entering)), -np.ones(len(leaving))))
+        })
+    return regions
+
+
+def solve_decomposed(optimizer, num_regions=4, workers=None, tol=1e-4, max_iter=500,
+                     time_limit=None, parts=None, progress=None):
+    """
+    Résoudre le routage par décomposition en régions
+
+    Args:
+        optimizer: NetworkOptimizer (seules ses données sont utilisées)
+        num_regions: Nombre de régions
+        workers: Processus de calcul (défaut: min(régions, cœurs);
+                 0 = tout dans le processus courant)
+        tol: Écart relatif visé entre bornes inférieure et supérieure
+        max_iter: Nombre maximal d'itérations maître / régions
+        time_limit: Limite de temps (s)
+        parts: Partition imposée (région de chaque nœud), sinon calculée
+        progress: Fonction appelée à chaque itération avec un dict
+                  (iteration, lower_bound, upper_bound, gap, time)
+
+    Returns:
+        RoutingResult, complété par lower_bound, upper_bound, gap,
+        iterations, history, region_times, num_regions, cut_edges
+    """
+    start_time = time.time()
+    keys = list(optimizer.edge_dict.keys())
+    tails = np.array([i for i, _ in keys], dtype=np.int64)
+    heads = np.array([j for _, j in keys], dtype=np.int64)
+    cost = np.array([optimizer.objective_coefficient(optimizer.edge_dict[e]['cost'],
+                                                     optimizer.edge_dict[e]['latency'])
+                     for e in keys])
+    upper = np.array([optimizer.flow_upper_bound(*e) for e in keys], dtype=float)
+    supply = np.zeros(optimizer.num_nodes)
+    supply[optimizer.source] += optimizer.demand
+    supply[optimizer.destination] -= optimizer.demand
+
+    if parts is None:
+        parts = partition_graph(optimizer.num_nodes, tails, heads, num_regions)
+    parts = np.asarray(parts, dtype=np.int64)
+    num_regions = int(parts.max()) + 1
+    cut = cut_mask(parts, tails, heads)
+    cut_edges = np.flatnonzero(cut)
+
+    # Pénalité supérieure au coût de tout chemin: les écarts ne servent
+    # qu'en cas d'infaisabilité réelle
+    penalty = 1.0 + 2.0 * float(np.abs(cost).sum())
+    links = optimizer.edge_arrays()['link']
+    regions = _region_data(parts, num_regions, tails, heads, cost, upper, supply,
+                           cut, penalty, links)
+    partition_time = time.time() - start_time
+
+    # Répartition des régions entre processus (tourniquet)
+    handles, processes = start_workers(optimizer.env, _RegionSolver, regions, workers)
+
+    # Maître: flux des arêtes coupées, une estimation theta par région
+    master = gp.Model("decomposition_master", env=optimizer.env)
+    z = list(master.addVars(len(cut_edges), lb=0.0, ub=upper[cut_edges].tolist(),
+                            obj=cost[cut_edges].tolist()).values())
+    theta = list(master.addVars(num_regions, obj=1.0).values())
+    for group in _shared_links(cut_edges, links):
+        master.addLConstr(gp.LinExpr([1.0] * len(group), [z[k] for k in group]),
+                          GRB.LESS_EQUAL, float(upper[cut_edges[group[0]]]))
+    region_supply = np.bincount(parts, weights=supply, minlength=num_regions)
+    for data in regions:
+        master.addLConstr(gp.LinExpr(data['entry_sign'].tolist(),
+                                     [z[k] for k in data['entry_cut']]),
+                          GRB.EQUAL, -region_supply[data['region']])
+
+    history = []
+    region_times = np.zeros(num_regions)
+    lower_bound, upper_bound = -np.inf, np.inf
+    best_z, best_violation = None, 0.0
+    gap, status = np.inf, 'iteration_limit'
+    iteration = 0
+
+    try:
+        for iteration in range(1, max_iter + 1):
+            master.optimize()
+            if master.Status != GRB.OPTIMAL:
+                status = 'infeasible'
+                break
+            lower_bound = max(lower_bound, master.ObjVal)
+            z_val = np.array(master.getAttr('X', z))
+            theta_val = master.getAttr('X', theta)
+
+            for handle in handles:
+                handle.send(('solve', z_val))
+            answers = [answer for handle in handles for answer in handle.recv()]
+
+            value = float(cost[cut_edges] @ z_val)
+            violation = 0.0
+            for answer in answers:
+                r = answer['region']
+                region_times[r] += answer['time']
+                value += answer['value']
+                violation += answer['violation']
+                if answer['value'] > theta_val[r] + 1e-9 * max(1.0, abs(answer['value'])):
+                    expr = gp.LinExpr((-answer['coefficients']).tolist(),
+                                      [z[k] for k in answer['cut_index']])
+                    expr.add(theta[r])
+                    master.addLConstr(expr, GRB.GREATER_EQUAL, answer['constant'])
+
+            if value < upper_bound:
+                upper_bound, best_z, best_violation = value, z_val.copy(), violation
+            gap = (upper_bound - lower_bound) / max(abs(upper_bound), 1e-9)
+            entry = {
+                'iteration': iteration,
+                'lower_bound': lower_bound,
+                'upper_bound': upper_bound,
+                'gap': gap,
+                'time': time.time() - start_time
+            }
+            history.append(entry)
+            if progress is not None:
+                progress(entry)
+
+            if gap <= tol:
+                status = 'optimal'
+                break
+            if time_limit is not None and time.time() - start_time > time_limit:
+                status = 'time_limit'
+                break
+
+        flow = None
+        if best_z is not None:
+            flow = np.zeros(len(keys))
+            flow[cut_edges] = best_z
+            for handle in handles:
+                handle.send(('flows', best_z))
+            for handle in handles:
+                for r, x in handle.recv():
+                    flow[regions[r]['edges']] = x
+            if best_violation > 1e-6 * max(1.0, optimizer.demand):
+                status = 'infeasible'
+    finally:
+        stop_workers(handles, processes)
+        master.dispose()
+
+    if status == 'infeasible':
+        flow = None
+    arrays = optimizer.edge_arrays()
+    result = RoutingResult(
+        status, time.time() - start_time,
+        arrays['tails'], arrays['heads'], arrays['capacity'],
+        arrays['cost'], arrays['latency'], flow, links=arrays['link'],
+        source=optimizer.source, destination=optimizer.destination,
+        demand=optimizer.demand,
+        objective=upper_bound if flow is not None else None,
+        message=None if flow is not None else "Aucun routage réalisable trouvé."
+    )
+    result['lower_bound'] = lower_bound
+    result['upper_bound'] = upper_bound
+    result['gap'] = gap
+    result['iterations'] = iteration
+    result['history'] = history
+    result['region_times'] = region_times
+    result['partition_time'] = partition_time
+    result['num_regions'] = num_regions
+    result['cut_edges'] = len(cut_edges)
+    return result
@@ -45,8 +45,7 @@ CDN_NETWORK = {
         (0, 1, 300, 2.0, 20),  # Origine → Paris
         (0, 2, 280, 2.5, 25),  # Origine → Londres
         (0, 3, 250, 3.5, 40),  # Origine → Tokyo
-        (1, 2, 200, 0.5, 5),   # Paris ↔ Londres (courte latence)
-        (2, 1, 200, 0.5, 5),
+        (1, 2, 200, 0.5, 5, True),  # Paris ↔ Londres (courte latence, capacité partagée)
         (1, 4, 220, 2.0, 30),  # Paris → Singapour
         (2, 5, 240, 2.5, 35),  # Londres → New York
         (3, 4, 180, 1.0, 15),  # Tokyo → Singapour
@@ -246,9 +245,12 @@ def save_example_to_file(name, filename):
         f.write(f"# Nœuds: {network['num_nodes']}\n")
         f.write(f"# Demande: {network['demand']}\n\n")
         
-        f.write("# Format: source destination capacité coût latence\n")
-        for source, dest, cap, cost, lat in network['edges']:
-            f.write(f"{source} {dest} {cap} {cost} {lat}\n")
+        f.write("# Format: source destination capacité coût latence [both]\n")
+        for edge in network['edges']:
+            source, dest, cap, cost, lat = edge[:5]
+            # Sixième champ vrai: lien bidirectionnel (capacité partagée)
+            suffix = " both" if len(edge) > 5 and edge[5] else ""
+            f.write(f"{source} {dest} {cap} {cost} {lat}{suffix}\n")
     
     print(f"Exemple sauvegardé dans {filename}")
 
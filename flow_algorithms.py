@@ -0,0 +1,674 @@
+"""
+Algorithmes de flot combinatoires (sans solveur)
+
+Fonctions du cœur léger, utilisables par tous les moteurs: elles travaillent
+sur les tableaux d'arêtes (tails, heads, capacités) de network_model.Network.
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+
+
+def max_flow(num_nodes, tails, heads, capacities, source, sink, tol=1e-9,
+             initial_flow=None):
+    """
+    Flot maximal source -> puits (algorithme de Dinic)
+
+    Args:
+        num_nodes: Nombre de nœuds
+        tails, heads: Extrémités des arêtes (tableaux d'entiers)
+        capacities: Capacités des arêtes
+        source, sink: Nœuds source et puits
+        tol: Seuil en dessous duquel une capacité résiduelle est nulle
+        initial_flow: Flot réalisable de départ (augmenté, pas recalculé)
+
+    Returns:
+        tuple: (valeur du flot, flux par arête (ndarray),
+                masque des nœuds côté source de la coupe minimale)
+    """
+    return FlowNetwork(num_nodes, tails, heads).max_flow(capacities, source, sink, tol,
+                                                         initial_flow)
+
+
+def min_cost_flow(num_nodes, tails, heads, capacities, costs, source, sink, demand,
+                  tol=1e-9):
+    """
+    Flot de coût minimal: acheminer demand de source à sink
+    (plus courts chemins successifs avec potentiels)
+
+    Args:
+        num_nodes: Nombre de nœuds
+        tails, heads: Extrémités des arêtes
+        capacities: Capacités des arêtes
+        costs: Coûts unitaires (positifs ou nuls)
+        source, sink: Nœuds source et puits
+        demand: Flux à acheminer
+        tol: Seuil en dessous duquel une capacité résiduelle est nulle
+
+    Returns:
+        tuple: (flux par arête (ndarray), coût) ou (None, None) si la
+               demande dépasse le flot maximal
+    """
+    return FlowNetwork(num_nodes, tails, heads).min_cost_flow(capacities, costs, source, sink,
+                                                              demand, tol)
+
+
+def cancel_opposing(flow, links):
+    """
+    Annuler les flux opposés des liens bidirectionnels
+
+    Les deux arcs d'un lien (même indice dans links, côte à côte comme
+    dans network_model.expand_links) ne gardent que le flux net: la
+    conservation est préservée, aucune borne par arc n'est dépassée, le
+    coût ne croît pas à coûts positifs, et la charge du lien tient dans
+    sa capacité partagée.
+
+    Returns:
+        ndarray: Flux par arc (copie si des flux ont été annulés)
+    """
+    links = np.asarray(links)
+    forward = np.flatnonzero(links[1:] == links[:-1])
+    if not len(forward):
+        return flow
+    backward = forward + 1
+    flow = np.array(flow, dtype=float)
+    net = flow[forward] - flow[backward]
+    flow[forward] = np.maximum(net, 0.0)
+    flow[backward] = np.maximum(-net, 0.0)
+    return flow
+
+
+class FlowNetwork:
+    """
+    Graphe résiduel en listes d'adjacence, construit une fois
+
+    Chaque arête k donne deux arcs: 2k (sens direct) et 2k+1 (retour).
+    Les flots maximaux successifs (capacités différentes, par exemple
+    après des pannes) réutilisent les listes d'adjacence.
+    """
+
+    def __init__(self, num_nodes, tails, heads):
+        self.num_nodes = num_nodes
+        self.tails = np.asarray(tails, dtype=np.int64)
+        self.heads = np.asarray(heads, dtype=np.int64)
+        num_edges = len(self.tails)
+        to = np.empty(2 * num_edges, dtype=np.int64)
+        to[0::2] = self.heads
+        to[1::2] = self.tails
+        self._to = to.tolist()
+
+        self._adjacency = [[] for _ in range(num_nodes)]
+        for k, (i, j) in enumerate(zip(self.tails.tolist(), self.heads.tolist())):
+            self._adjacency[i].append(2 * k)
+            self._adjacency[j].append(2 * k + 1)
+
+    def max_flow(self, capacities, source, sink, tol=1e-9, initial_flow=None):
+        """Flot maximal source -> puits (voir max_flow())"""
+        num_nodes = self.num_nodes
+        to = self._to
+        adjacency = self._adjacency
+        capacities = np.asarray(capacities, dtype=float)
+        residual = np.zeros(2 * len(capacities))
+        value = 0.0
+        if initial_flow is None:
+            residual[0::2] = capacities
+        else:
+            initial_flow = np.asarray(initial_flow, dtype=float)
+            residual[0::2] = capacities - initial_flow
+            residual[1::2] = initial_flow
+            value = float(initial_flow[self.tails == source].sum()
+                          - initial_flow[self.heads == source].sum())
+        residual = residual.tolist()
+
+        def bfs_levels():
+            level = [-1] * num_nodes
+            level[source] = 0
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                for arc in adjacency[node]:
+                    nxt = to[arc]
+                    if level[nxt] < 0 and residual[arc] > tol:
+                        level[nxt] = level[node] + 1
+                        queue.append(nxt)
+            return level
+
+        if source == sink:
+            return value, np.zeros(len(capacities)), np.zeros(num_nodes, dtype=bool)
+
+        while True:
+            level = bfs_levels()
+            if level[sink] < 0:
+                break
+
+            # Flot bloquant: DFS itératif avec pointeurs d'arcs
+            pointer = [0] * num_nodes
+            while True:
+                path = []
+                node = source
+                while node != sink:
+                    arcs = adjacency[node]
+                    while pointer[node] < len(arcs):
+                        arc = arcs[pointer[node]]
+                        nxt = to[arc]
+                        if residual[arc] > tol and level[nxt] == level[node] + 1:
+                            break
+                        pointer[node] += 1
+                    else:
+                        # Impasse: on recule d'un arc
+                        if not path:
+                            break
+                        level[node] = -1
+                        arc = path.pop()
+                        node = to[arc ^ 1]
+                        pointer[node] += 1
+                        continue
+                    path.append(arc)
+                    node = to[arc]
+                else:
+                    push = min(residual[arc] for arc in path)
+                    for arc in path:
+                        residual[arc] -= push
+                        residual[arc ^ 1] += push
+                    value += push
+                    continue
+                break
+
+        flows = np.asarray(residual[1::2])
+        level = bfs_levels()
+        source_side = np.array([lvl >= 0 for lvl in level], dtype=bool)
+        return value, flows, source_side
+
+
+    def min_cost_flow(self, capacities, costs, source, sink, demand, tol=1e-9):
+        """Flot de coût minimal source -> puits (voir min_cost_flow())"""
+        num_nodes = self.num_nodes
+        to = self._to
+        adjacency = self._adjacency
+        costs = np.asarray(costs, dtype=float)
+        if np.any(costs < 0):
+            raise ValueError("Les coûts des arêtes doivent être positifs ou nuls")
+        residual = np.zeros(2 * len(costs))
+        residual[0::2] = capacities
+        residual = residual.tolist()
+        arc_cost = np.empty(2 * len(costs))
+        arc_cost[0::2] = costs
+        arc_cost[1::2] = -costs
+        arc_cost = arc_cost.tolist()
+
+        potential = [0.0] * num_nodes
+        sent = 0.0
+        inf = float('inf')
+        while sent < demand - tol:
+            # Dijkstra sur les coûts réduits (positifs grâce aux potentiels)
+            dist = [inf] * num_nodes
+            pred = [-1] * num_nodes
+            dist[source] = 0.0
+            heap = [(0.0, source)]
+            while heap:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                for arc in adjacency[node]:
+                    if residual[arc] <= tol:
+                        continue
+                    nxt = to[arc]
+                    nd = d + max(0.0, arc_cost[arc] + potential[node] - potential[nxt])
+                    if nd < dist[nxt]:
+                        dist[nxt] = nd
+                        pred[nxt] = arc
+                        heapq.heappush(heap, (nd, nxt))
+            if dist[sink] == inf:
+                return None, None
+            for node in range(num_nodes):
+                potential[node] += min(dist[node], dist[sink])
+
+            push = demand - sent
+            node = sink
+            while node != source:
+                arc = pred[node]
+                push = min(push, residual[arc])
+                node = to[arc ^ 1]
+            node = sink
+            while node != source:
+                arc = pred[node]
+                residual[arc] -= push
+                residual[arc ^ 1] += push
+                node = to[arc ^ 1]
+            sent += push
+
+        flows = np.asarray(residual[1::2])
+        return flows, float(costs @ flows)
+
+
+def flow_decomposition(num_nodes, tails, heads, flow, source, sink, tol=1e-9):
+    """
+    Décomposer un flot source -> puits en chemins (les cycles sont annulés)
+
+    Returns:
+        list: (indices des arêtes du chemin, flux porté) par chemin
+    """
+    tails = np.asarray(tails, dtype=np.int64)
+    heads_list = np.asarray(heads, dtype=np.int64).tolist()
+    remaining = np.asarray(flow, dtype=float).tolist()
+    out_edges = [[] for _ in range(num_nodes)]
+    for k, i in enumerate(tails.tolist()):
+        out_edges[i].append(k)
+    pointer = [0] * num_nodes
+
+    def next_edge(node):
+        edges = out_edges[node]
+        while pointer[node] < len(edges) and remaining[edges[pointer[node]]] <= tol:
+            pointer[node] += 1
+        return edges[pointer[node]] if pointer[node] < len(edges) else None
+
+    paths = []
+    while source != sink and next_edge(source) is not None:
+        path, nodes, position = [], [source], {source: 0}
+        node = source
+        while node != sink:
+            k = next_edge(node)
+            if k is None:
+                # Flot non conservatif: on s'arrête aux chemins trouvés
+                return paths
+            path.append(k)
+            node = heads_list[k]
+            if node in position:
+                # Cycle: annuler son flux minimal et reprendre avant le cycle
+                start = position[node]
+                cycle = path[start:]
+                amount = min(remaining[e] for e in cycle)
+                for e in cycle:
+                    remaining[e] -= amount
+                for dropped in nodes[start + 1:]:
+                    del position[dropped]
+                del path[start:]
+                del nodes[start + 1:]
+                continue
+            position[node] = len(nodes)
+            nodes.append(node)
+        amount = min(remaining[e] for e in path)
+        for e in path:
+            remaining[e] -= amount
+        paths.append((np.array(path, dtype=np.int64), amount))
+    return paths
+
+
+class ForwardStar:
+    """
+    Représentation « forward star » (CSR) d'un graphe orienté
+
+    Construite une fois, elle permet de relancer un plus court chemin
+    avec de nouveaux poids sans reconstruire les listes d'adjacence.
+    """
+
+    def __init__(self, num_nodes, tails, heads):
+        self.num_nodes = num_nodes
+        self.tails = np.asarray(tails, dtype=np.int64)
+        self.heads = np.asarray(heads, dtype=np.int64)
+        self.order = np.argsort(self.tails, kind='stable')
+        counts = np.bincount(self.tails, minlength=num_nodes)
+        self.indptr = np.concatenate(([0], np.cumsum(counts))).tolist()
+        self._sorted_heads = self.heads[self.order].tolist()
+        self._sorted_edges = self.order.tolist()
+
+    def shortest_path_tree(self, weights, source, target=None):
+        """
+        Dijkstra (poids positifs ou nuls)
+
+        Args:
+            weights: Poids des arêtes (ordre d'origine)
+            source: Nœud de départ
+            target: Arrêt anticipé dès que ce nœud est fixé (optionnel)
+
+        Returns:
+            tuple: (distances, arête prédécesseur de chaque nœud, -1 si aucune)
+        """
+        w = np.asarray(weights, dtype=float)[self.order].tolist()
+        heads = self._sorted_heads
+        edges = self._sorted_edges
+        indptr = self.indptr
+
+        dist = [float('inf')] * self.num_nodes
+        pred = [-1] * self.num_nodes
+        done = [False] * self.num_nodes
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if done[node]:
+                continue
+            done[node] = True
+            if node == target:
+                break
+            for k in range(indptr[node], indptr[node + 1]):
+                nxt = heads[k]
+                nd = d + w[k]
+                if nd < dist[nxt]:
+                    dist[nxt] = nd
+                    pred[nxt] = edges[k]
+                    heapq.heappush(heap, (nd, nxt))
+        return np.array(dist), np.array(pred, dtype=np.int64)
+
+    def path_edges(self, pred, source, target):
+        """Indices des arêtes du chemin source -> target (None si inaccessible)"""
+        path = []
+        node = target
+        while node != source:
+            k = pred[node]
+            if k < 0:
+                return None
+            path.append(k)
+            node = self.tails[k]
+        path.reverse()
+        return np.array(path, dtype=np.int64)
+
+    def simple_paths(self, weights, source, target, max_length, to_target=None, limit=None):
+        """
+        Énumérer les chemins élémentaires source -> target de longueur <= max_length
+
+        Args:
+            weights: Poids des arêtes (positifs ou nuls)
+            source, target: Extrémités
+            max_length: Longueur maximale
+            to_target: Borne inférieure de la distance de chaque nœud à
+                       target (élagage; par exemple Dijkstra sur le graphe
+                       inverse)
+            limit: Nombre maximal de chemins
+
+        Returns:
+            list: Indices des arêtes de chaque chemin, ou None si plus de
+                  limit chemins existent
+        """
+        if source == target:
+            return [np.zeros(0, dtype=np.int64)]
+        w = np.asarray(weights, dtype=float)[self.order].tolist()
+        heads = self._sorted_heads
+        edges = self._sorted_edges
+        indptr = self.indptr
+        bound = [0.0] * self.num_nodes if to_target is None else list(to_target)
+        eps = 1e-9 * max(1.0, abs(max_length))
+
+        paths = []
+        on_path = [False] * self.num_nodes
+        on_path[source] = True
+        nodes, positions, path, lengths = [source], [indptr[source]], [], [0.0]
+        while nodes:
+            node = nodes[-1]
+            pos = positions[-1]
+            if pos == indptr[node + 1]:
+                nodes.pop()
+                positions.pop()
+                on_path[node] = False
+                if path:
+                    path.pop()
+                    lengths.pop()
+                continue
+            positions[-1] = pos + 1
+            nxt = heads[pos]
+            if on_path[nxt]:
+                continue
+            length = lengths[-1] + w[pos]
+            if length + bound[nxt] > max_length + eps:
+                continue
+            if nxt == target:
+                paths.append(np.array(path + [edges[pos]], dtype=np.int64))
+                if limit is not None and len(paths) > limit:
+                    return None
+                continue
+            on_path[nxt] = True
+            nodes.append(nxt)
+            positions.append(indptr[nxt])
+            path.append(edges[pos])
+            lengths.append(length)
+        return paths
+
+    def shortest_path(self, weights, source, target):
+        """
+        Plus court chemin source -> target
+
+        Returns:
+            tuple: (longueur, indices des arêtes) ou (inf, None)
+        """
+        dist, pred = self.shortest_path_tree(weights, source, target)
+        path = self.path_edges(pred, source, target)
+        return (dist[target], path) if path is not None else (float('inf'), None)
+
+    def greedy_flow(self, weights, capacities, source, target, demand, links=None,
+                    tol=1e-9):
+        """
+        Heuristique rapide: plus courts chemins successifs sans arcs retour
+
+        Chaque itération pousse le goulot du plus court chemin parmi les
+        arêtes non saturées et sature au moins un lien: au plus m
+        Dijkstra. Le flux est réalisable mais pas forcément optimal; faute
+        d'arcs retour, la demande peut ne pas passer alors qu'un flot
+        réalisable existe.
+
+        Args:
+            links: Indice du lien de chaque arc (optionnel): les arcs d'un
+                   même lien partagent sa capacité résiduelle (capacities
+                   donne alors la capacité du lien sur chacun de ses arcs)
+
+        Returns:
+            ndarray: Flux par arête, ou None si la demande n'a pas pu passer
+        """
+        weights = np.asarray(weights, dtype=float)
+        capacities = np.asarray(capacities, dtype=float)
+        links = np.arange(len(capacities)) if links is None else np.asarray(links)
+        residual = np.zeros(links.max(initial=-1) + 1)
+        residual[links] = capacities
+        flow = np.zeros(len(capacities))
+        remaining = float(demand)
+        while remaining > tol:
+            _, path = self.shortest_path(np.where(residual[links] > tol, weights, np.inf),
+                                         source, target)
+            if path is None:
+                return None
+            # Un chemin élémentaire n'emprunte pas deux fois le même lien
+            push = min(remaining, float(residual[links[path]].min()))
+            flow[path] += push
+            residual[links[path]] -= push
+            remaining -= push
+        return flow
+
+    def reverse(self):
+        """Graphe inverse (construit une fois)"""
+        if getattr(self, '_reverse', None) is None:
+            self._reverse = ForwardStar(self.num_nodes, self.heads, self.tails)
+        return self._reverse
+
+    def constrained_shortest_path(self, weights, source, target, resources, limits,
+                                  resource_bounds=None, max_cost=float('inf'),
+                                  max_multiplier_steps=20):
+        """
+        Plus court chemin sous contraintes de ressources (étiquetage)
+
+        Chaque étiquette (coût, ressources consommées) est prolongée le long
+        des arêtes sortantes. Les étiquettes sont traitées par coût
+        croissant: la première qui atteint target est optimale. Une
+        étiquette est éliminée si une autre étiquette du même nœud la domine
+        (coût et toutes les ressources inférieurs ou égaux), si elle ne peut
+        plus atteindre target dans les limites, ou si une borne inférieure
+        de son coût final dépasse le meilleur chemin admissible connu.
+
+        Avant l'étiquetage, une recherche de multiplicateurs (LARAC) sur les
+        poids weights + mu_r * ressource_r fournit des chemins admissibles
+        (bornes supérieures) et, pour chaque ressource, les distances
+        lagrangiennes d_r jusqu'à target: une étiquette (c, q) au nœud v
+        coûtera au moins c + d_r(v) - mu_r (limite_r - q_r).
+
+        Args:
+            weights: Poids des arêtes (positifs ou nuls)
+            source, target: Extrémités
+            resources: Consommation par arête, tableau (ressources x arêtes)
+                       de valeurs positives ou nulles
+            limits: Consommation maximale de chaque ressource
+            resource_bounds: Borne inférieure de la consommation restante de
+                             chaque nœud à target (ressources x nœuds);
+                             calculée si absente
+            max_cost: Seuls les chemins de coût strictement inférieur sont cherchés
+            max_multiplier_steps: Itérations de la recherche de multiplicateurs
+
+        Returns:
+            tuple: (coût, indices des arêtes, consommation de chaque
+                    ressource) ou (inf, None, None)
+        """
+        weights = np.asarray(weights, dtype=float)
+        resources = np.atleast_2d(np.asarray(resources, dtype=float))
+        num_resources = len(resources) if resources.size else 0
+        resources = resources.reshape(num_resources, len(weights))
+        limits = np.array([float(v) + 1e-9 * max(1.0, abs(v)) for v in limits])
+        none = (float('inf'), None, None)
+        reverse = self.reverse()
+        if resource_bounds is None:
+            resource_bounds = [reverse.shortest_path_tree(r, target)[0] for r in resources]
+        resource_bounds = np.asarray(resource_bounds, dtype=float).reshape(
+            num_resources, self.num_nodes)
+        if np.any(resource_bounds[:, source] > limits):
+            return none
+
+        def evaluate(path):
+            return float(weights[path].sum()), resources[:, path].sum(axis=1)
+
+        # Plus court chemin sans contrainte: optimal s'il respecte les limites
+        cost_bound, pred = reverse.shortest_path_tree(weights, target)
+        if cost_bound[source] >= max_cost:
+            return none
+        path = self._reverse_tree_path(pred, source, target)
+        cost, consumed = evaluate(path)
+        if np.all(consumed <= limits):
+            return cost, path, consumed
+
+        # Multiplicateurs par ressource (LARAC): bornes et chemins admissibles
+        best = none
+        lower = cost_bound[source]
+        lagrangian = []
+        for r in range(num_resources):
+            if consumed[r] <= limits[r]:
+                continue
+            cheap, cheap_use = cost, consumed[r]
+            dist, pred = reverse.shortest_path_tree(resources[r], target)
+            frugal = self._reverse_tree_path(pred, source, target)
+            frugal_cost, frugal_use = evaluate(frugal)
+            if np.all(frugal_use <= limits) and frugal_cost < best[0]:
+                best = (frugal_cost, frugal, frugal_use)
+            frugal_use = frugal_use[r]
+            mu, dist = 0.0, cost_bound
+            for _ in range(max_multiplier_steps):
+                if cheap_use - frugal_use <= 1e-12:
+                    break
+                step = (frugal_cost - cheap) / (cheap_use - frugal_use)
+                combined = weights + step * resources[r]
+                step_dist, pred = reverse.shortest_path_tree(combined, target)
+                if step_dist[source] - step * limits[r] > dist[source] - mu * limits[r]:
+                    mu, dist = step, step_dist
+                path = self._reverse_tree_path(pred, source, target)
+                path_cost, path_use = evaluate(path)
+                if np.all(path_use <= limits) and path_cost < best[0]:
+                    best = (path_cost, path, path_use)
+                if step_dist[source] >= cheap + step * cheap_use - 1e-12:
+                    break
+                if path_use[r] <= limits[r]:
+                    frugal_cost, frugal_use = path_cost, path_use[r]
+                else:
+                    cheap, cheap_use = path_cost, path_use[r]
+            lower = max(lower, dist[source] - mu * limits[r])
+            if mu > 0:
+                lagrangian.append((r, mu, dist.tolist()))
+
+        upper = min(max_cost, best[0])
+        if lower >= upper - 1e-9 * max(1.0, abs(upper)):
+            return best if best[0] < max_cost else none
+        found = self._label_setting(weights, source, target, resources, limits,
+                                    resource_bounds, cost_bound, lagrangian, upper)
+        if found[1] is not None:
+            return found
+        return best if best[0] < max_cost else none
+
+    def _reverse_tree_path(self, pred, source, target):
+        """Chemin source -> target dans un arbre de plus courts chemins du graphe inverse"""
+        path = []
+        node = source
+        while node != target:
+            k = pred[node]
+            if k < 0:
+                return None
+            path.append(k)
+            node = self.heads[k]
+        return np.array(path, dtype=np.int64)
+
+    def _label_setting(self, weights, source, target, resources, limits,
+                       resource_bounds, cost_bound, lagrangian, max_cost):
+        """Étiquetage avec dominance (voir constrained_shortest_path())"""
+        num_resources = len(resources)
+        w = weights[self.order].tolist()
+        use = resources[:, self.order].T.tolist()
+        heads = self._sorted_heads
+        edges = self._sorted_edges
+        indptr = self.indptr
+        limits = limits.tolist()
+        remaining = resource_bounds.T.tolist()
+        to_target = np.asarray(cost_bound, dtype=float).tolist()
+
+        # Étiquettes: coût, ressources, nœud, étiquette parente, arête
+        zero = [0.0] * num_resources
+        costs, used, nodes, parents, via = [0.0], [zero], [source], [-1], [-1]
+        alive = [True]
+        kept = [[] for _ in range(self.num_nodes)]
+        kept[source].append(0)
+        heap = [(0.0, 0)]
+        while heap:
+            cost, label = heapq.heappop(heap)
+            if not alive[label]:
+                continue
+            node = nodes[label]
+            if node == target:
+                consumption = np.array(used[label])
+                path = []
+                while parents[label] >= 0:
+                    path.append(via[label])
+                    label = parents[label]
+                path.reverse()
+                return cost, np.array(path, dtype=np.int64), consumption
+            current = used[label]
+            for k in range(indptr[node], indptr[node + 1]):
+                nxt = heads[k]
+                new_cost = cost + w[k]
+                if new_cost + to_target[nxt] >= max_cost:
+                    continue
+                consumed = [current[r] + use[k][r] for r in range(num_resources)]
+                bound = remaining[nxt]
+                if any(consumed[r] + bound[r] > limits[r] for r in range(num_resources)):
+                    continue
+                if any(new_cost + dist[nxt] - mu * (limits[r] - consumed[r]) >= max_cost
+                       for r, mu, dist in lagrangian):
+                    continue
+                # Dominance au nœud suivant
+                dominated = False
+                survivors = []
+                for other in kept[nxt]:
+                    other_used = used[other]
+                    if costs[other] <= new_cost and all(
+                            other_used[r] <= consumed[r] for r in range(num_resources)):
+                        dominated = True
+                        break
+                    if new_cost <= costs[other] and all(
+                            consumed[r] <= other_used[r] for r in range(num_resources)):
+                        alive[other] = False
+                    else:
+                        survivors.append(other)
+                if dominated:
+                    continue
+                survivors.append(len(costs))
+                kept[nxt] = survivors
+                costs.append(new_cost)
+                used.append(consumed)
+                nodes.append(nxt)
+                parents.append(label)
+                via.append(edges[k])
+                alive.append(True)
+                heapq.heappush(heap, (new_cost, len(costs) - 1))
+        return float('inf'), None, None
@@ -0,0 +1,148 @@
+"""
+Partitionnement de graphe en régions (sans solveur)
+
+Découpe les nœuds en régions de tailles voisines en limitant le nombre
+d'arêtes coupées: bissections récursives par croissance en largeur
+(parcours depuis un nœud pseudo-périphérique), puis raffinement glouton
+des frontières (un nœud change de région si cela réduit la coupe et
+respecte l'équilibre des tailles).
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+def undirected_csr(num_nodes, tails, heads):
+    """
+    Adjacence non orientée en CSR
+
+    Returns:
+        tuple: (indptr, voisins) avec les voisins de i dans
+               voisins[indptr[i]:indptr[i + 1]]
+    """
+    tails = np.asarray(tails, dtype=np.int64)
+    heads = np.asarray(heads, dtype=np.int64)
+    ends = np.concatenate((tails, heads))
+    others = np.concatenate((heads, tails))
+    order = np.argsort(ends, kind='stable')
+    counts = np.bincount(ends, minlength=num_nodes)
+    indptr = np.concatenate(([0], np.cumsum(counts)))
+    return indptr, others[order]
+
+
+def _bfs_order(indptr, neighbors, inside, start):
+    """Ordre de parcours en largeur restreint aux nœuds marqués inside"""
+    seen = {start}
+    order = [start]
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for nxt in neighbors[indptr[node]:indptr[node + 1]]:
+            if inside[nxt] and nxt not in seen:
+                seen.add(nxt)
+                order.append(nxt)
+                queue.append(nxt)
+    return order
+
+
+def _grow_order(indptr, neighbors, nodes, inside):
+    """
+    Ordre de croissance d'une région: parcours en largeur depuis un nœud
+    pseudo-périphérique, composante après composante
+    """
+    order = []
+    placed = set()
+    for seed in nodes:
+        if seed in placed:
+            continue
+        # Deux parcours: le dernier nœud atteint est loin du centre
+        far = _bfs_order(indptr, neighbors, inside, seed)[-1]
+        component = _bfs_order(indptr, neighbors, inside, far)
+        order.extend(component)
+        placed.update(component)
+    return order
+
+
+def _refine(indptr, neighbors, ends, others, parts, num_parts, max_size, passes):
+    """Raffinement glouton des frontières (déplacements à gain positif)"""
+    num_nodes = len(parts)
+    for _ in range(passes):
+        # Connexions de chaque nœud vers chaque région
+        conn = np.zeros((num_nodes, num_parts))
+        np.add.at(conn, (ends, parts[others]), 1)
+        own = conn[np.arange(num_nodes), parts]
+        best = np.argmax(conn, axis=1)
+        gain = conn[np.arange(num_nodes), best] - own
+
+        candidates = np.flatnonzero(gain > 0)
+        if len(candidates) == 0:
+            break
+        candidates = candidates[np.argsort(-gain[candidates], kind='stable')]
+
+        sizes = np.bincount(parts, minlength=num_parts)
+        locked = np.zeros(num_nodes, dtype=bool)
+        moved = 0
+        for node in candidates.tolist():
+            target = best[node]
+            if locked[node] or sizes[target] + 1 > max_size:
+                continue
+            # Les voisins d'un nœud déplacé attendent la passe suivante
+            locked[neighbors[indptr[node]:indptr[node + 1]]] = True
+            sizes[parts[node]] -= 1
+            sizes[target] += 1
+            parts[node] = target
+            moved += 1
+        if moved == 0:
+            break
+    return parts
+
+
+def partition_graph(num_nodes, tails, heads, num_parts, imbalance=0.05, refine_passes=8):
+    """
+    Partitionner les nœuds en num_parts régions
+
+    Args:
+        num_nodes: Nombre de nœuds
+        tails, heads: Extrémités des arêtes
+        num_parts: Nombre de régions
+        imbalance: Dépassement toléré de la taille moyenne d'une région
+        refine_passes: Passes de raffinement des frontières
+
+    Returns:
+        ndarray: Région de chaque nœud (0 .. num_parts - 1)
+    """
+    num_parts = max(1, min(num_parts, num_nodes))
+    parts = np.zeros(num_nodes, dtype=np.int64)
+    if num_parts == 1:
+        return parts
+
+    indptr, neighbors = undirected_csr(num_nodes, tails, heads)
+    indptr_list = indptr.tolist()
+    neighbor_list = neighbors.tolist()
+
+    # Bissections récursives: (nœuds, nombre de régions, première étiquette)
+    stack = [(np.arange(num_nodes), num_parts, 0)]
+    while stack:
+        nodes, k, label = stack.pop()
+        if k == 1:
+            parts[nodes] = label
+            continue
+        inside = np.zeros(num_nodes, dtype=bool)
+        inside[nodes] = True
+        order = np.array(_grow_order(indptr_list, neighbor_list, nodes.tolist(),
+                                     inside.tolist()), dtype=np.int64)
+        k_first = k // 2
+        split = int(round(len(order) * k_first / k))
+        stack.append((order[:split], k_first, label))
+        stack.append((order[split:], k - k_first, label + k_first))
+
+    max_size = int(np.ceil((1 + imbalance) * num_nodes / num_parts))
+    ends = np.concatenate((np.asarray(tails, dtype=np.int64), np.asarray(heads, dtype=np.int64)))
+    others = np.concatenate((np.asarray(heads, dtype=np.int64), np.asarray(tails, dtype=np.int64)))
+    return _refine(indptr, neighbors, ends, others, parts, num_parts, max_size, refine_passes)
+
+
+def cut_mask(parts, tails, heads):
+    """Masque des arêtes dont les extrémités sont dans deux régions différentes"""
+    return parts[np.asarray(tails, dtype=np.int64)] != parts[np.asarray(heads, dtype=np.int64)]
@@ -4,30 +4,49 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QTableWidgetItem, QSpinBox, QGroupBox, QTextEdit,
                              QTabWidget, QMessageBox, QProgressBar, QDoubleSpinBox,
                              QComboBox, QCheckBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
 from PyQt5.QtGui import QFont
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import networkx as nx
 import numpy as np
-from network_optimizer import NetworkOptimizer
+from network_model import load_backend
+from metrics import ACTIVE_THRESHOLD
+from rendering import draw_network
 
-class OptimizationThread(QThread):
-    """Thread pour exécuter l'optimisation sans bloquer l'interface"""
+class OptimizationTask(QObject):
+    """
+    Optimisation sans bloquer l'interface, sur l'API asyncio (async_solve)
+    
+    La résolution tourne sur la boucle asyncio d'arrière-plan; les signaux
+    sont émis depuis ce thread et délivrés dans le thread de l'interface.
+    """
     finished = pyqtSignal(object)
     error = pyqtSignal(str)
     
-    def __init__(self, optimizer):
-        super().__init__()
+    def __init__(self, optimizer, parent=None):
+        super().__init__(parent)
         self.optimizer = optimizer
+        self.future = None
+        
+    def start(self):
+        from async_solve import submit
+        
+        self.future = submit(self.optimizer.solve_async())
+        self.future.add_done_callback(self._done)
+        
+    def cancel(self):
+        """Annuler la résolution en cours"""
+        if self.future is not None:
+            self.future.cancel()
         
-    def run(self):
-        try:
-            results = self.optimizer.solve()
-            self.finished.emit(results)
-        except Exception as e:
-            self.error.emit(str(e))
+    def _done(self, future):
+        if future.cancelled():
+            return
+        exception = future.exception()
+        if exception is not None:
+            self.error.emit(str(exception))
+        else:
+            self.finished.emit(future.result())
 
 class NetworkCanvas(FigureCanvas):
     """Canvas pour visualiser le réseau"""
@@ -38,73 +57,15 @@ class NetworkCanvas(FigureCanvas):
         self.setParent(parent)
         
     def plot_network(self, num_nodes, edges_data, flow_solution=None):
-        self.ax.clear()
-        
-        # Créer le graphe
-        G = nx.DiGraph()
-        G.add_nodes_from(range(num_nodes))
-        
-        # Ajouter les arêtes avec leurs propriétés
-        edge_labels = {}
-        for edge in edges_data:
-            source, dest, capacity, cost, latency = edge
-            G.add_edge(source, dest, capacity=capacity, cost=cost, latency=latency)
-            
-            if flow_solution and (source, dest) in flow_solution:
-                flow = flow_solution[(source, dest)]
-                if flow > 0.01:
-                    edge_labels[(source, dest)] = f"Flow: {flow:.1f}\nCost: {cost}"
-            else:
-                edge_labels[(source, dest)] = f"Cap: {capacity}\nCost: {cost}"
-        
-        # Position des nœuds
-        pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-        
-        # Dessiner les nœuds
-        node_colors = []
-        for node in G.nodes():
-            if node == 0:
-                node_colors.append('lightgreen')  # Source
-            elif node == num_nodes - 1:
-                node_colors.append('lightcoral')  # Destination
-            else:
-                node_colors.append('lightblue')  # Intermédiaire
-        
-        nx.draw_networkx_nodes(G, pos, node_color=node_colors, 
-                               node_size=800, ax=self.ax)
-        nx.draw_networkx_labels(G, pos, ax=self.ax, font_size=10, font_weight='bold')
-        
-        # Dessiner les arêtes
-        if flow_solution:
-            # Arêtes avec flux
-            edges_with_flow = [(u, v) for (u, v) in G.edges() 
-                              if (u, v) in flow_solution and flow_solution[(u, v)] > 0.01]
-            edges_without_flow = [(u, v) for (u, v) in G.edges() 
-                                 if (u, v) not in flow_solution or flow_solution[(u, v)] <= 0.01]
-            
-            nx.draw_networkx_edges(G, pos, edgelist=edges_with_flow, 
-                                  edge_color='red', width=3, ax=self.ax,
-                                  arrows=True, arrowsize=20, arrowstyle='->')
-            nx.draw_networkx_edges(G, pos, edgelist=edges_without_flow, 
-                                  edge_color='gray', width=1, ax=self.ax,
-                                  arrows=True, arrowsize=15, arrowstyle='->',
-                                  style='dashed')
-        else:
-            nx.draw_networkx_edges(G, pos, edge_color='gray', width=2, 
-                                  ax=self.ax, arrows=True, arrowsize=20)
-        
-        # Ajouter les labels des arêtes
-        nx.draw_networkx_edge_labels(G, pos, edge_labels, ax=self.ax, font_size=7)
-        
-        self.ax.set_title("Réseau de routage de données", fontsize=14, fontweight='bold')
-        self.ax.axis('off')
-        self.fig.tight_layout()
+        # Style partagé avec le rendu sans interface (rendering.py)
+        draw_network(self.ax, num_nodes, edges_data, flow_solution)
         self.draw()
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.optimizer = None
+        self.opt_task = None
         self.edges_data = []
         self.initUI()
         
@@ -170,10 +131,10 @@ class MainWindow(QMainWindow):
         edges_layout = QVBoxLayout()
         
         self.edges_table = QTableWidget()
-        self.edges_table.setColumnCount(5)
+        self.edges_table.setColumnCount(6)
         self.edges_table.setHorizontalHeaderLabels(["Source", "Destination", 
                                                     "Capacité", "Coût/unité", 
-                                                    "Latence (ms)"])
+                                                    "Latence (ms)", "Bidirectionnel"])
         edges_layout.addWidget(self.edges_table)
         
         # Boutons de gestion des arêtes
@@ -268,6 +229,14 @@ class MainWindow(QMainWindow):
         self.edges_table.setItem(row, 2, QTableWidgetItem("100"))
         self.edges_table.setItem(row, 3, QTableWidgetItem("1.0"))
         self.edges_table.setItem(row, 4, QTableWidgetItem("10"))
+        self.edges_table.setItem(row, 5, self.bidirectional_item(False))
+        
+    def bidirectional_item(self, checked):
+        """Case à cocher: lien bidirectionnel (capacité partagée entre les deux sens)"""
+        item = QTableWidgetItem()
+        item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+        item.setCheckState(Qt.Checked if checked else Qt.Unchecked)
+        return item
         
     def remove_edge_row(self):
         """Supprimer la ligne sélectionnée"""
@@ -306,6 +275,7 @@ class MainWindow(QMainWindow):
             self.edges_table.setItem(idx, 2, QTableWidgetItem(str(capacity)))
             self.edges_table.setItem(idx, 3, QTableWidgetItem(str(cost)))
             self.edges_table.setItem(idx, 4, QTableWidgetItem(str(latency)))
+            self.edges_table.setItem(idx, 5, self.bidirectional_item(False))
         
         # Visualiser le réseau
         self.visualize_network()
@@ -320,7 +290,11 @@ class MainWindow(QMainWindow):
                 capacity = float(self.edges_table.item(row, 2).text())
                 cost = float(self.edges_table.item(row, 3).text())
                 latency = float(self.edges_table.item(row, 4).text())
-                edges.append((source, dest, capacity, cost, latency))
+                both = self.edges_table.item(row, 5)
+                if both is not None and both.checkState() == Qt.Checked:
+                    edges.append((source, dest, capacity, cost, latency, True))
+                else:
+                    edges.append((source, dest, capacity, cost, latency))
             except (ValueError, AttributeError) as e:
                 QMessageBox.warning(self, "Erreur", 
                                   f"Données invalides à la ligne {row + 1}")
@@ -347,20 +321,25 @@ class MainWindow(QMainWindow):
         use_reliability = self.reliability_check.isChecked()
         use_balance = self.balance_check.isChecked()
         
-        # Créer l'optimiseur
+        # Moteur chargé au premier clic (Gurobi n'est pas importé au démarrage)
+        NetworkOptimizer = load_backend('gurobi')
+        from solver_env import template_cache
+        
+        # Créer l'optimiseur (modèle réutilisé si la topologie n'a pas changé)
         self.optimizer = NetworkOptimizer(num_nodes, edges, demand, 
-                                         objective, use_reliability, use_balance)
+                                         objective, use_reliability, use_balance,
+                                         template_cache=template_cache())
         
         # Désactiver les boutons
         self.solve_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Mode indéterminé
         
-        # Lancer l'optimisation dans un thread séparé
-        self.opt_thread = OptimizationThread(self.optimizer)
-        self.opt_thread.finished.connect(self.on_optimization_finished)
-        self.opt_thread.error.connect(self.on_optimization_error)
-        self.opt_thread.start()
+        # Lancer l'optimisation sans bloquer l'interface
+        self.opt_task = OptimizationTask(self.optimizer, self)
+        self.opt_task.finished.connect(self.on_optimization_finished)
+        self.opt_task.error.connect(self.on_optimization_error)
+        self.opt_task.start()
         
     def on_optimization_finished(self, results):
         """Callback quand l'optimisation est terminée"""
@@ -381,6 +360,11 @@ class MainWindow(QMainWindow):
         
     def display_results(self, results):
         """Afficher les résultats"""
+        percentiles = ", ".join(f"p{p} {value:.2f} ms"
+                                for p, value in results['latency_percentiles'].items())
+        bottlenecks = ", ".join(f"{i} → {j} ({u:.0%})"
+                                for (i, j), u in results['bottlenecks']) or "aucun"
+        
         # Texte des résultats
         result_text = f"""
 ╔══════════════════════════════════════════════════════════════╗
@@ -397,6 +381,9 @@ Temps de calcul: {results['solve_time']:.3f} secondes
 Coût total: {results['total_cost']:.2f} unités monétaires
 Latence moyenne: {results['avg_latency']:.2f} ms
 Utilisation moyenne des liens: {results['avg_utilization']:.2%}
+Utilisation maximale: {results['max_utilization']:.2%}
+Latence pondérée par le flux: {percentiles}
+Goulots: {bottlenecks}
 
 ╔══════════════════════════════════════════════════════════════╗
 ║            STATISTIQUES DU RÉSEAU                             ║
@@ -418,26 +405,15 @@ Capacité totale disponible: {results['total_capacity']:.2f}
         
         self.results_text.setText(result_text)
         
-        # Table des flux
-        self.flow_table.setRowCount(0)
-        for idx, (edge, flow) in enumerate(results['flows'].items()):
-            if flow > 0.01:
-                self.flow_table.insertRow(idx)
-                source, dest = edge
-                
-                # Trouver le coût de cette arête
-                cost_per_unit = 0
-                for e in self.get_edges_data():
-                    if e[0] == source and e[1] == dest:
-                        cost_per_unit = e[3]
-                        break
-                
-                total_cost = flow * cost_per_unit
-                
-                self.flow_table.setItem(idx, 0, QTableWidgetItem(str(source)))
-                self.flow_table.setItem(idx, 1, QTableWidgetItem(str(dest)))
-                self.flow_table.setItem(idx, 2, QTableWidgetItem(f"{flow:.2f}"))
-                self.flow_table.setItem(idx, 3, QTableWidgetItem(f"{total_cost:.2f}"))
+        # Table des flux (coûts par arête lus dans les tableaux du résultat)
+        active = np.flatnonzero(results.flow > ACTIVE_THRESHOLD)
+        link_cost = results.link_cost
+        self.flow_table.setRowCount(len(active))
+        for row, k in enumerate(active.tolist()):
+            self.flow_table.setItem(row, 0, QTableWidgetItem(str(results.tails[k])))
+            self.flow_table.setItem(row, 1, QTableWidgetItem(str(results.heads[k])))
+            self.flow_table.setItem(row, 2, QTableWidgetItem(f"{results.flow[k]:.2f}"))
+            self.flow_table.setItem(row, 3, QTableWidgetItem(f"{link_cost[k]:.2f}"))
         
         # Visualisation du réseau avec la solution
         num_nodes = self.nodes_spin.value()
@@ -447,6 +423,12 @@ Capacité totale disponible: {results['total_capacity']:.2f}
         # Passer à l'onglet visualisation
         self.tabs.setCurrentIndex(0)
         
+    def closeEvent(self, event):
+        """Interrompre une optimisation en cours à la fermeture"""
+        if self.opt_task is not None:
+            self.opt_task.cancel()
+        super().closeEvent(event)
+        
     def clear_results(self):
         """Réinitialiser les résultats"""
         self.results_text.clear()
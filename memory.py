@@ -0,0 +1,220 @@
+"""
+Mesure de la mémoire et choix d'une stratégie de construction sous budget
+
+Deux usages:
+  - MemoryMonitor: mémoire par phase (construction, résolution,
+    extraction): pic des allocations Python (tracemalloc), mémoire
+    résidente du processus (RSS) et mémoire du solveur (MaxMemUsed)
+  - choose_strategy(): estimation de la mémoire de chaque stratégie avant
+    toute construction, et choix de la première qui tient dans le budget:
+      'full'     modèle complet de build_model (noms, expressions quicksum)
+      'chunked'  même modèle, émis par paquets depuis des listes
+                 d'adjacence, sans noms ni expression objectif complète
+      'lp'       modèle sans variables link_used ni contraintes
+                 d'activation (mêmes flux optimaux: link_used
+                 n'intervient pas dans l'objectif)
+      'native'   flot de coût minimal combinatoire, sans Gurobi
+    Si aucune stratégie ne tient, MemoryError est levée avant de
+    construire quoi que ce soit.
+
+Les coefficients d'estimation (octets par arête, variable, contrainte ou
+coefficient non nul) ont été relevés sur des grilles de quelques centaines
+d'arêtes; ils visent un ordre de grandeur avec une marge, pas l'octet près.
+"""
+
+import contextlib
+import os
+import re
+import time
+import tracemalloc
+
+STRATEGIES = ('full', 'chunked', 'lp', 'native')
+
+# Octets par objet (mesures tracemalloc et MaxMemUsed, arrondies au-dessus)
+PYTHON_PER_EDGE = 320          # edge_dict et tableaux d'arêtes
+PYTHON_PER_NODE = 120
+PYTHON_PER_VAR = 300           # Var et entrée de dict (flow_vars, link_used)
+PYTHON_PER_CONSTR = 300        # Constr et entrée de dict
+PYTHON_PER_NAME = 60           # Nom de variable ou de contrainte (chaîne)
+PYTHON_OBJECTIVE_PER_EDGE = 240  # Expressions quicksum de l'objectif
+SOLVER_PER_VAR = 400
+SOLVER_PER_CONSTR = 350
+SOLVER_PER_NONZERO = 60
+SOLVER_PER_NAME = 24
+SOLVER_WORKSPACE = 1.25        # Surcoût de la résolution (facteur)
+NATIVE_PER_EDGE = 400          # Graphe résiduel en listes Python
+NATIVE_PER_NODE = 250
+SAFETY_FACTOR = 1.2
+
+_UNITS = {'': 1, 'b': 1, 'k': 1024, 'kb': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2,
+          'g': 1024 ** 3, 'gb': 1024 ** 3}
+
+
+def parse_size(value):
+    """Taille en octets depuis un nombre ou une chaîne ('512MB', '2 GB', '800k')"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([a-zA-Z]*)\s*', str(value))
+    if not match or match.group(2).lower() not in _UNITS:
+        raise ValueError(f"Taille mémoire invalide: {value}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).lower()])
+
+
+def format_size(num_bytes):
+    """Taille lisible (Ko, Mo, Go)"""
+    if num_bytes is None:
+        return '-'
+    for unit in ('o', 'Ko', 'Mo', 'Go'):
+        if abs(num_bytes) < 1024 or unit == 'Go':
+            return f"{num_bytes:.0f} {unit}" if unit == 'o' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def process_rss():
+    """Mémoire résidente actuelle du processus (octets), None si inconnue"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Linux: Ko, macOS: octets; c'est le pic, faute de mieux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+def model_size(num_nodes, num_edges, strategy, use_reliability=True, use_balance=False):
+    """
+    Taille du modèle Gurobi de chaque stratégie
+
+    Returns:
+        dict: num_vars, num_constrs, num_nonzeros, names (objets nommés)
+    """
+    extra = int(bool(use_reliability)) + int(bool(use_balance))
+    if strategy in ('full', 'chunked'):
+        num_vars = 2 * num_edges
+        num_constrs = num_nodes + (2 + extra) * num_edges
+        nonzeros = (2 + 1 + 2 + extra) * num_edges
+    elif strategy == 'lp':
+        num_vars = num_edges
+        num_constrs = num_nodes + (1 + extra) * num_edges
+        nonzeros = (2 + 1 + extra) * num_edges
+    else:
+        return {'num_vars': 0, 'num_constrs': 0, 'num_nonzeros': 0, 'names': 0}
+    names = num_vars + num_constrs if strategy == 'full' else 0
+    return {'num_vars': num_vars, 'num_constrs': num_constrs,
+            'num_nonzeros': nonzeros, 'names': names}
+
+
+def estimate_memory(num_nodes, num_edges, strategy, use_reliability=True, use_balance=False):
+    """
+    Estimer la mémoire de pointe (octets) d'une stratégie, données comprises
+
+    Returns:
+        dict: python, solver, total (octets)
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Stratégie inconnue: {strategy} (attendu: {', '.join(STRATEGIES)})")
+    data = PYTHON_PER_EDGE * num_edges + PYTHON_PER_NODE * num_nodes
+    if strategy == 'native':
+        python = data + NATIVE_PER_EDGE * num_edges + NATIVE_PER_NODE * num_nodes
+        solver = 0
+    else:
+        size = model_size(num_nodes, num_edges, strategy, use_reliability, use_balance)
+        python = (data + PYTHON_PER_VAR * size['num_vars']
+                  + PYTHON_PER_CONSTR * size['num_constrs']
+                  + PYTHON_PER_NAME * size['names'])
+        if strategy == 'full':
+            python += PYTHON_OBJECTIVE_PER_EDGE * num_edges
+        solver = SOLVER_WORKSPACE * (SOLVER_PER_VAR * size['num_vars']
+                                     + SOLVER_PER_CONSTR * size['num_constrs']
+                                     + SOLVER_PER_NONZERO * size['num_nonzeros']
+                                     + SOLVER_PER_NAME * size['names'])
+    python *= SAFETY_FACTOR
+    solver *= SAFETY_FACTOR
+    return {'python': int(python), 'solver': int(solver), 'total': int(python + solver)}
+
+
+def choose_strategy(optimizer, budget, strategies=STRATEGIES):
+    """
+    Première stratégie dont l'estimation tient dans le budget
+
+    Args:
+        optimizer: NetworkOptimizer (non construit)
+        budget: Budget en octets (ou chaîne, voir parse_size)
+        strategies: Stratégies essayées, par empreinte décroissante
+
+    Returns:
+        tuple: (stratégie, estimations de toutes les stratégies)
+
+    Raises:
+        MemoryError: si aucune stratégie ne tient dans le budget
+    """
+    budget = parse_size(budget)
+    estimates = {
+        strategy: estimate_memory(optimizer.num_nodes, len(optimizer.edge_dict), strategy,
+                                  optimizer.use_reliability, optimizer.use_balance)
+        for strategy in strategies
+    }
+    for strategy in strategies:
+        if estimates[strategy]['total'] <= budget:
+            return strategy, estimates
+    smallest = min(strategies, key=lambda s: estimates[s]['total'])
+    raise MemoryError(
+        f"Budget mémoire insuffisant: {format_size(budget)} pour "
+        f"{optimizer.num_nodes} nœuds et {len(optimizer.edge_dict)} arêtes; "
+        f"la stratégie la plus économe ({smallest}) demande environ "
+        f"{format_size(estimates[smallest]['total'])}."
+    )
+
+
+class MemoryMonitor:
+    """
+    Mémoire par phase: pic Python (tracemalloc), RSS avant / après, durée
+
+    tracemalloc est démarré à la première phase s'il ne l'était pas, et
+    arrêté par close().
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._started = False
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        rss_before = process_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            rss_after = process_rss()
+            self.phases[name] = {
+                'python_peak': peak - base,
+                'python_retained': current - base,
+                'rss': rss_after,
+                'rss_delta': (rss_after - rss_before
+                              if rss_after is not None and rss_before is not None else None),
+                'time': time.perf_counter() - start
+            }
+
+    def close(self):
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started = False
+
+    def report(self, **extra):
+        """Rapport: phases, pic Python global, RSS finale, et champs extra"""
+        report = {'phases': dict(self.phases)}
+        report['python_peak'] = max((p['python_peak'] for p in self.phases.values()), default=0)
+        report['rss'] = process_rss()
+        report.update(extra)
+        return report
@@ -0,0 +1,216 @@
+"""
+Métriques d'une solution de routage, calculées en une passe NumPy
+
+Moteur commun à l'optimiseur (RoutingResult.metrics, flow_metrics), à
+l'interface graphique et à la ligne de commande. À partir des tableaux
+alignés sur les arêtes (flux, capacité, coût, latence), il produit:
+  - les métriques historiques de solve(): coût total, latence moyenne,
+    liens actifs, flux total, utilisation moyenne, capacités
+  - des métriques par arête: utilisation et coût de transmission
+  - un histogramme des taux d'utilisation des liens
+  - les liens goulots (les plus chargés au-delà d'un seuil)
+  - des percentiles de latence pondérés par le flux
+
+L'utilisation moyenne est la moyenne des taux d'utilisation par lien
+(flux / capacité), et non plus le rapport flux total / capacité totale.
+Avec les indices de lien des arcs, les deux arcs d'un lien bidirectionnel
+sont agrégés (np.bincount): utilisation, goulots, liens actifs et capacité
+totale sont comptés par lien, sur sa capacité partagée.
+
+Rapport en ligne de commande:
+    python metrics.py reseau.txt
+"""
+
+import argparse
+
+import numpy as np
+
+# Seuil de flux au-dessus duquel un lien est considéré actif
+ACTIVE_THRESHOLD = 0.01
+
+# Bornes des classes de l'histogramme d'utilisation (la dernière est fermée)
+UTILIZATION_BINS = (0.0, 0.25, 0.5, 0.75, 0.9, 1.0)
+
+# Utilisation à partir de laquelle un lien est un goulot
+BOTTLENECK_THRESHOLD = 0.9
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+def weighted_percentiles(values, weights, percentiles):
+    """
+    Percentiles de values pondérés par weights (poids nuls ignorés)
+
+    Returns:
+        dict: {percentile: valeur} (0 si le poids total est nul)
+    """
+    keep = weights > 0
+    if not keep.any():
+        return {p: 0.0 for p in percentiles}
+    order = np.argsort(values[keep], kind='stable')
+    sorted_values = values[keep][order]
+    cumulative = np.cumsum(weights[keep][order])
+    targets = np.asarray(percentiles, dtype=float) / 100.0 * cumulative[-1]
+    idx = np.minimum(np.searchsorted(cumulative, targets, side='left'),
+                     len(sorted_values) - 1)
+    return dict(zip(percentiles, sorted_values[idx].tolist()))
+
+
+def compute_metrics(flow, capacity, cost, latency, tails=None, heads=None, links=None,
+                    bins=UTILIZATION_BINS, bottleneck_threshold=BOTTLENECK_THRESHOLD,
+                    max_bottlenecks=5, percentiles=LATENCY_PERCENTILES):
+    """
+    Calculer toutes les métriques d'une solution
+
+    Args:
+        flow, capacity, cost, latency: Tableaux alignés sur les arêtes
+        tails, heads: Extrémités des arêtes (pour nommer les goulots)
+        links: Indice du lien de chaque arc (défaut: un lien par arc); un
+               goulot est nommé par le premier arc de son lien
+        bins: Bornes de l'histogramme d'utilisation
+        bottleneck_threshold: Utilisation minimale d'un goulot
+        max_bottlenecks: Nombre maximal de goulots renvoyés
+        percentiles: Percentiles de latence pondérés par le flux
+
+    Returns:
+        dict: métriques de flow_metrics() plus max_utilization,
+              utilization_histogram, bottlenecks, latency_percentiles
+    """
+    flow = np.asarray(flow, dtype=float)
+    capacity = np.asarray(capacity, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+    latency = np.asarray(latency, dtype=float)
+
+    active_flow = np.where(flow > ACTIVE_THRESHOLD, flow, 0.0)
+
+    # Flux et capacité par lien (capacité partagée par ses arcs)
+    if links is not None:
+        links = np.asarray(links, dtype=np.int64)
+        _, first, inverse = np.unique(links, return_index=True, return_inverse=True)
+        link_flow = np.bincount(inverse, flow, minlength=len(first))
+        link_capacity = capacity[first]
+    else:
+        first = np.arange(len(flow))
+        link_flow, link_capacity = flow, capacity
+    active = link_flow > ACTIVE_THRESHOLD
+    utilization = np.divide(link_flow, link_capacity, out=np.zeros_like(link_flow),
+                            where=link_capacity > 0)
+
+    total_flow = float(flow.sum())
+    total_capacity = float(link_capacity.sum())
+    total_latency = float(active_flow @ latency)
+
+    counts, _ = np.histogram(np.clip(utilization, bins[0], bins[-1]), bins=bins)
+
+    # Goulots: liens les plus chargés au-delà du seuil
+    over = np.flatnonzero(utilization >= bottleneck_threshold)
+    over = over[np.argsort(-utilization[over], kind='stable')][:max_bottlenecks]
+    if tails is not None and heads is not None:
+        tails = np.asarray(tails)
+        heads = np.asarray(heads)
+        bottlenecks = [((int(tails[first[k]]), int(heads[first[k]])), float(utilization[k]))
+                       for k in over.tolist()]
+    else:
+        bottlenecks = [(int(k), float(utilization[k])) for k in over.tolist()]
+
+    return {
+        'total_cost': float(flow @ cost),
+        'avg_latency': total_latency / total_flow if total_flow > 0 else 0,
+        'active_links': int(active.sum()),
+        'total_flow': total_flow,
+        'avg_utilization': float(utilization.mean()) if len(utilization) else 0,
+        'total_capacity': total_capacity,
+        'total_capacity_used': total_flow,
+        'max_utilization': float(utilization.max()) if len(utilization) else 0.0,
+        'utilization_histogram': {
+            'bins': tuple(bins),
+            'counts': counts.tolist()
+        },
+        'bottlenecks': bottlenecks,
+        'latency_percentiles': weighted_percentiles(latency, active_flow, percentiles)
+    }
+
+
+def format_report(results, max_links=5):
+    """
+    Rapport texte d'un résultat de solve() (RoutingResult ou dict équivalent)
+
+    Utilisé par la ligne de commande et par les scripts de test.
+    """
+    if results['status'] != 'optimal':
+        return (f"⚠️  Statut: {results['status']}\n"
+                f"   Message: {results.get('message', 'Aucune solution trouvée')}")
+
+    lines = [
+        f"✓ Statut: {results['status'].upper()}",
+        f"  Temps de calcul: {results['solve_time']:.3f} secondes",
+        "",
+        "Résultats:",
+        f"  Coût total: {results['total_cost']:.2f} €",
+        f"  Latence moyenne: {results['avg_latency']:.2f} ms",
+        f"  Liens actifs: {results['active_links']}",
+        f"  Utilisation moyenne: {results['avg_utilization']:.1%}",
+        f"  Utilisation maximale: {results['max_utilization']:.1%}",
+    ]
+
+    percentiles = results['latency_percentiles']
+    lines.append("  Latence pondérée par le flux: " + ", ".join(
+        f"p{p} {value:.2f} ms" for p, value in percentiles.items()))
+
+    histogram = results['utilization_histogram']
+    bins = histogram['bins']
+    lines.append("  Histogramme d'utilisation:")
+    for low, high, count in zip(bins[:-1], bins[1:], histogram['counts']):
+        lines.append(f"    {low:>4.0%} - {high:>4.0%}: {count}")
+
+    if results['bottlenecks']:
+        lines.append("  Goulots: " + ", ".join(
+            f"{i} → {j} ({u:.0%})" for (i, j), u in results['bottlenecks']))
+
+    if results.get('main_paths'):
+        lines.append("")
+        lines.append("Chemins principaux:")
+        for i, path in enumerate(results['main_paths'][:3], 1):
+            lines.append(f"  {i}. {path}")
+
+    # Liens les plus chargés, triés sur les tableaux
+    tails, heads, flow = _edge_columns(results)
+    order = np.argsort(-flow, kind='stable')
+    order = order[flow[order] > ACTIVE_THRESHOLD]
+    lines.append("")
+    lines.append("Flux sur les liens:")
+    for k in order[:max_links].tolist():
+        lines.append(f"  {tails[k]} → {heads[k]}: {flow[k]:.2f} unités")
+    if len(order) > max_links:
+        lines.append(f"  ... et {len(order) - max_links} autres liens")
+    return "\n".join(lines)
+
+
+def _edge_columns(results):
+    """(tails, heads, flow) d'un RoutingResult ou d'un dict avec 'flows'"""
+    if getattr(results, 'flow', None) is not None:
+        return results.tails, results.heads, results.flow
+    keys = list(results['flows'].keys())
+    return ([i for i, _ in keys], [j for _, j in keys],
+            np.fromiter(results['flows'].values(), dtype=float, count=len(keys)))
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Résoudre un réseau et afficher ses métriques")
+    parser.add_argument('network', help="Fichier réseau (format de Network.save)")
+    parser.add_argument('--links', type=int, default=5, help="Nombre de liens affichés")
+    args = parser.parse_args(argv)
+
+    from network_model import Network
+
+    results = Network.load(args.network).optimizer().solve()
+    print(format_report(results, args.links))
+    return 0 if results['status'] == 'optimal' else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,435 @@
+"""
+Résolution multiniveau (contracter, résoudre, raffiner) pour les très
+grands réseaux
+
+Sur un grand graphe, le modèle complet fait porter l'effort du solveur sur
+des régions qui ne transportent manifestement aucun flux. Ici:
+  - contraction: à chaque niveau, les nœuds sont appariés le long de
+    l'arête la plus lourde (plus grande borne effective), sans jamais
+    réunir la source et la destination; les arcs parallèles entre deux
+    groupes sont fusionnés (capacités additionnées, coût moyen pondéré
+    par la capacité). On s'arrête vers coarse_nodes nœuds
+  - le problème le plus grossier est résolu en entier (petit PL)
+  - projection: au niveau plus fin, les arcs candidats sont ceux qui
+    se contractent sur un arc utilisé, et les arcs internes des groupes
+    traversés par le flux. Le PL restreint à ces arcs est résolu, puis
+    complété par coûts réduits (génération de colonnes): un arc exclu de
+    coût réduit négatif est ajouté, le modèle est réoptimisé à chaud
+    (simplexe depuis la base précédente)
+  - seul le niveau le plus fin est certifié: quand aucun arc exclu n'a
+    de coût réduit négatif, les duaux du PL restreint sont réalisables
+    pour le PL complet, et la solution est optimale pour le modèle de
+    build_model (link_used n'intervient pas dans l'objectif)
+
+Le PL restreint ne crée une ligne de conservation que pour les nœuds
+touchés par ses arcs (duaux nuls ailleurs), et une ligne de capacité
+partagée pour les liens bidirectionnels. Un arc artificiel source ->
+destination, pénalisé au-delà du coût de tout chemin, le rend toujours
+réalisable: s'il porte encore du flux une fois la solution certifiée, le
+problème complet est irréalisable.
+"""
+
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from flow_algorithms import ForwardStar, cancel_opposing
+from network_model import RoutingResult
+
+
+def _match(num_nodes, tails, heads, weight, label):
+    """
+    Appariement glouton par arête lourde
+
+    Args:
+        label: Étiquette par nœud (0 libre): deux nœuds d'étiquettes non
+               nulles différentes ne sont jamais réunis
+
+    Returns:
+        np.ndarray: Groupe de chaque nœud (numérotés à partir de 0)
+    """
+    ends = np.concatenate((tails, heads))
+    others = np.concatenate((heads, tails))
+    weights = np.concatenate((weight, weight))
+    # Voisins de chaque nœud, du plus lourd au plus léger
+    order = np.lexsort((-weights, ends))
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(ends, minlength=num_nodes))))
+    others = others[order].tolist()
+    indptr = indptr.tolist()
+    label = label.tolist()
+
+    mate = [-1] * num_nodes
+    # Nœuds de faible degré d'abord: ils ont peu de partenaires possibles
+    for node in np.argsort(np.diff(indptr), kind='stable').tolist():
+        if mate[node] >= 0:
+            continue
+        mate[node] = node
+        for other in others[indptr[node]:indptr[node + 1]]:
+            if mate[other] < 0 and (not label[node] or not label[other]
+                                    or label[node] == label[other]):
+                mate[node], mate[other] = other, node
+                label[node] = label[other] = label[node] or label[other]
+                break
+
+    mate = np.array(mate)
+    root = np.minimum(np.arange(num_nodes), mate)
+    _, cluster = np.unique(root, return_inverse=True)
+    return cluster
+
+
+def coarsen(num_nodes, tails, heads, bound, unit, supply):
+    """
+    Un niveau de contraction
+
+    Args:
+        bound, unit: Borne effective et coefficient objectif par arc
+        supply: Offre par nœud (+demande à la source, -demande à la destination)
+
+    Returns:
+        dict: num_nodes, tails, heads, bound, unit, supply du niveau
+              grossier, cluster (groupe de chaque nœud fin) et parent
+              (arc grossier de chaque arc fin, -1 pour un arc interne)
+    """
+    label = np.zeros(num_nodes, dtype=np.int64)
+    label[supply > 0] = 1
+    label[supply < 0] = 2
+    cluster = _match(num_nodes, tails, heads, bound, label)
+    coarse_nodes = int(cluster.max()) + 1 if num_nodes else 0
+
+    ct, ch = cluster[tails], cluster[heads]
+    external = ct != ch
+    parent = np.full(len(tails), -1, dtype=np.int64)
+    keys, inverse = np.unique(ct[external] * coarse_nodes + ch[external], return_inverse=True)
+    parent[external] = inverse
+    capacity = np.bincount(inverse, bound[external], minlength=len(keys))
+    weighted = np.bincount(inverse, bound[external] * unit[external], minlength=len(keys))
+    mean = np.bincount(inverse, unit[external], minlength=len(keys)) / \
+        np.maximum(np.bincount(inverse, minlength=len(keys)), 1)
+    cost = np.divide(weighted, capacity, out=mean, where=capacity > 0)
+
+    return {
+        'num_nodes': coarse_nodes,
+        'tails': keys // max(coarse_nodes, 1),
+        'heads': keys % max(coarse_nodes, 1),
+        'bound': capacity,
+        'unit': cost,
+        'supply': np.bincount(cluster, supply, minlength=coarse_nodes),
+        'cluster': cluster,
+        'parent': parent
+    }
+
+
+class _RestrictedLP:
+    """
+    PL de flot restreint à un sous-ensemble d'arcs, étendu par colonnes
+
+    Les arcs d'un même lien (links) entrent ensemble et partagent une
+    ligne de capacité; le modèle est gardé d'un ajout à l'autre pour que
+    le simplexe reparte de la base précédente.
+    """
+
+    def __init__(self, env, num_nodes, tails, heads, bound, unit, supply, links=None):
+        self.num_nodes = num_nodes
+        self.tails, self.heads = tails, heads
+        self.bound, self.unit = bound, unit
+        self.links = np.arange(len(tails)) if links is None else links
+        num_links = int(self.links.max(initial=-1)) + 1
+        self.shared = np.bincount(self.links, minlength=num_links) > 1
+        self.first_arc = np.empty(num_links, dtype=np.int64)
+        self.first_arc[self.links[::-1]] = np.arange(len(self.links))[::-1]
+        self.included = np.zeros(len(tails), dtype=bool)
+        self.reverse = None
+        if len(tails) and unit.min() >= 0:
+            # Graphe inversé et super-nœud num_nodes relié à chaque nœud
+            self.reverse = ForwardStar(num_nodes + 1,
+                                       np.concatenate((heads, np.full(num_nodes, num_nodes))),
+                                       np.concatenate((tails, np.arange(num_nodes))))
+        self.arcs = []
+        self.vars = []
+        self.rows = {}
+        self.link_rows = {}
+        self.supply = supply
+
+        self.model = gp.Model("multilevel", env=env)
+        self.model.setParam('OutputFlag', 0)
+        self.model.ModelSense = GRB.MINIMIZE
+        ends = np.flatnonzero(supply).tolist()
+        self._add_rows(ends, [])
+        self.model.update()
+        # Arc artificiel: pénalité supérieure au coût de tout chemin
+        penalty = 1.0 + 2.0 * float(np.abs(unit).sum())
+        source, destination = int(np.argmax(supply)), int(np.argmin(supply))
+        self.artificial = self.model.addVar(
+            obj=penalty, column=gp.Column([1.0, -1.0], [self.rows[source], self.rows[destination]]))
+
+    def _add_rows(self, nodes, links):
+        for node in nodes:
+            if node not in self.rows:
+                self.rows[node] = self.model.addLConstr(gp.LinExpr(), GRB.EQUAL,
+                                                        float(self.supply[node]))
+        for link in links:
+            if link not in self.link_rows:
+                self.link_rows[link] = self.model.addLConstr(
+                    gp.LinExpr(), GRB.LESS_EQUAL, float(self.bound[self.first_arc[link]]))
+
+    def add(self, arcs):
+        """Ajouter des arcs (et les autres arcs de leurs liens); nombre ajouté"""
+        arcs = np.flatnonzero(np.isin(self.links, self.links[arcs]) & ~self.included)
+        if not len(arcs):
+            return 0
+        self.included[arcs] = True
+        tails, heads, links = self.tails[arcs], self.heads[arcs], self.links[arcs]
+        self._add_rows(np.unique(np.concatenate((tails, heads))).tolist(),
+                       np.unique(links[self.shared[links]]).tolist())
+        self.model.update()
+        for k, i, j, link in zip(arcs.tolist(), tails.tolist(), heads.tolist(), links.tolist()):
+            coeffs, constrs = [1.0, -1.0], [self.rows[i], self.rows[j]]
+            if link in self.link_rows:
+                coeffs.append(1.0)
+                constrs.append(self.link_rows[link])
+            self.vars.append(self.model.addVar(lb=0.0, ub=float(self.bound[k]),
+                                               obj=float(self.unit[k]),
+                                               column=gp.Column(coeffs, constrs)))
+        self.arcs.extend(arcs.tolist())
+        self.model.update()
+        return len(arcs)
+
+    def solve(self, time_limit=None):
+        """
+        Résoudre le PL restreint
+
+        Returns:
+            tuple: (flux par arc, flux artificiel), ou None si la
+                   résolution n'aboutit pas
+        """
+        self.model.Params.TimeLimit = GRB.INFINITY if time_limit is None else max(time_limit, 0.0)
+        self.model.optimize()
+        if self.model.Status != GRB.OPTIMAL:
+            return None
+        flow = np.zeros(len(self.tails))
+        flow[self.arcs] = self.model.getAttr('X', self.vars)
+        self.pi = np.zeros(self.num_nodes)
+        self.pi[list(self.rows)] = self.model.getAttr('Pi', list(self.rows.values()))
+        self.mu = np.zeros(len(self.shared))
+        if self.link_rows:
+            self.mu[list(self.link_rows)] = self.model.getAttr('Pi', list(self.link_rows.values()))
+        return flow, self.artificial.X
+
+    def price(self, threshold, limit):
+        """
+        Arcs exclus à coût réduit négatif, prolongés jusqu'aux nœuds du PL
+
+        Les duaux des nœuds absents sont libres: on prend la distance
+        (coût unitaire) jusqu'aux nœuds présents, augmentée de leur dual
+        (Dijkstra multi-sources sur le graphe inversé), ce qui ne rend
+        négatifs que les arcs qui ouvrent un détour réellement moins
+        cher. Chaque arc entrant est complété par son plus court chemin
+        vers les nœuds présents.
+
+        Args:
+            threshold: Coût réduit en dessous duquel un arc entre (-threshold)
+            limit: Nombre maximal d'arcs entrants (les plus négatifs)
+
+        Returns:
+            np.ndarray: Arcs à ajouter (vide: la solution est optimale)
+        """
+        num_edges = len(self.tails)
+        pi, pred = self.pi, None
+        if self.reverse is not None:
+            present = np.zeros(self.num_nodes, dtype=bool)
+            present[list(self.rows)] = True
+            base = pi[present].min()
+            weights = np.concatenate((self.unit, np.where(present, pi - base, np.inf)))
+            dist, pred = self.reverse.shortest_path_tree(weights, self.num_nodes)
+            dist = dist[:self.num_nodes] + base
+            finite = np.isfinite(dist)
+            # Nœud qui n'atteint aucun nœud présent: dual maximal, ses arcs
+            # entrants ne peuvent pas devenir négatifs
+            pi = np.where(present, pi, np.where(finite, dist, pi[present].max()))
+        # Colonne de (i, j): +1 ligne i, -1 ligne j, +1 ligne du lien partagé
+        reduced = self.unit - pi[self.tails] + pi[self.heads] - self.mu[self.links]
+        entering = np.flatnonzero(~self.included & (reduced < -threshold))
+        if len(entering) > limit:
+            entering = entering[np.argpartition(reduced[entering], limit - 1)[:limit]]
+        if pred is None or not len(entering):
+            return entering
+        arcs = set(entering.tolist())
+        for node in self.heads[entering].tolist():
+            # Remonter l'arbre: pred[v] = arc (v, suivant) du chemin vers
+            # les nœuds présents
+            while not present[node] and 0 <= pred[node] < num_edges \
+                    and pred[node] not in arcs:
+                arcs.add(int(pred[node]))
+                node = self.heads[pred[node]]
+        return np.array(sorted(arcs), dtype=np.int64)
+
+    def dispose(self):
+        self.model.dispose()
+
+
+def _project(fine, coarse, coarse_flow, threshold):
+    """Arcs candidats du niveau fin d'après le flux du niveau grossier"""
+    used = coarse_flow > threshold
+    parent, cluster = coarse['parent'], coarse['cluster']
+    # Groupes traversés par le flux (et ceux de la source / destination)
+    active = np.zeros(coarse['num_nodes'], dtype=bool)
+    active[coarse['tails'][used]] = True
+    active[coarse['heads'][used]] = True
+    active[coarse['supply'] != 0] = True
+    internal = (parent < 0) & active[cluster[fine['tails']]]
+    crossing = parent >= 0
+    crossing[crossing] = used[parent[crossing]]
+    return np.flatnonzero(internal | crossing)
+
+
+def solve_multilevel(optimizer, coarse_nodes=64, max_levels=20, coarse_rounds=2,
+                     tol=1e-6, time_limit=None):
+    """
+    Résoudre le routage par contraction, résolution grossière et raffinement
+
+    Args:
+        optimizer: NetworkOptimizer (seules ses données sont utilisées)
+        coarse_nodes: Taille visée du niveau le plus grossier
+        max_levels: Nombre maximal de niveaux de contraction
+        coarse_rounds: Tours de coûts réduits aux niveaux intermédiaires
+                       (le niveau le plus fin itère jusqu'au certificat)
+        tol: Seuil de flux utilisé et de coût réduit négatif (relatif)
+        time_limit: Limite de temps (s)
+
+    Returns:
+        RoutingResult, complété par method, levels (nœuds, arcs,
+        candidats, objectif, tours et durée de chaque niveau, du plus
+        grossier au plus fin), time_to_first et first_objective (première
+        solution réalisable du niveau fin), time_to_optimal, certified,
+        candidate_arcs et pricing_rounds
+    """
+    start_time = time.time()
+    arrays = optimizer.edge_arrays()
+    bound = arrays['capacity'] * (0.7 if optimizer.use_balance else 1.0)
+    if optimizer.use_reliability:
+        bound = np.minimum(bound, 0.8 * optimizer.demand)
+    supply = np.zeros(optimizer.num_nodes)
+    supply[optimizer.source] += optimizer.demand
+    supply[optimizer.destination] -= optimizer.demand
+    finest = {
+        'num_nodes': optimizer.num_nodes,
+        'tails': arrays['tails'],
+        'heads': arrays['heads'],
+        'bound': bound,
+        'unit': optimizer.objective_coefficient(arrays['cost'], arrays['latency']),
+        'supply': supply,
+        'links': arrays['link']
+    }
+
+    # Contraction jusqu'à coarse_nodes nœuds, ou tant qu'elle réduit le graphe
+    levels = [finest]
+    while levels[-1]['num_nodes'] > coarse_nodes and len(levels) <= max_levels:
+        coarse = coarsen(levels[-1]['num_nodes'], levels[-1]['tails'], levels[-1]['heads'],
+                         levels[-1]['bound'], levels[-1]['unit'], levels[-1]['supply'])
+        if coarse['num_nodes'] > 0.9 * levels[-1]['num_nodes']:
+            break
+        levels.append(coarse)
+    coarsen_time = time.time() - start_time
+
+    def time_left():
+        return None if time_limit is None else time_limit - (time.time() - start_time)
+
+    history = []
+    status, flow, artificial = 'optimal', None, 0.0
+    time_to_first = first_objective = time_to_optimal = None
+    certified = False
+    rounds = 0
+    candidates = np.arange(len(levels[-1]['tails']))
+    scale = max(1.0, abs(optimizer.demand))
+    depths = range(len(levels) - 1, -1, -1)
+    if not supply.any():
+        # Rien à acheminer: le flux nul est optimal, sans PL à résoudre
+        depths = ()
+        flow, certified = np.zeros(len(finest['tails'])), True
+        time_to_first, first_objective = 0.0, 0.0
+        history.append({'level': 0, 'nodes': finest['num_nodes'], 'arcs': len(flow),
+                        'candidates': 0, 'objective': 0.0, 'rounds': 0, 'time': 0.0})
+
+    for depth in depths:
+        level = levels[depth]
+        level_start = time.time()
+        flow, artificial = None, 0.0
+        lp = _RestrictedLP(optimizer.env, level['num_nodes'], level['tails'], level['heads'],
+                           level['bound'], level['unit'], level['supply'], level.get('links'))
+        threshold = tol * max(1.0, float(np.abs(level['unit']).max(initial=0.0)))
+        try:
+            lp.add(candidates)
+            rounds = 0
+            while True:
+                rounds += 1
+                solution = lp.solve(time_left())
+                if solution is None:
+                    status = 'time_limit'
+                    break
+                flow, artificial = solution
+                feasible = artificial <= tol * scale
+                if depth == 0 and time_to_first is None and feasible:
+                    time_to_first = time.time() - start_time
+                    first_objective = float(level['unit'] @ flow)
+                # Aux niveaux intermédiaires, une solution réalisable suffit
+                # après coarse_rounds tours
+                if depth > 0 and feasible and rounds >= coarse_rounds:
+                    break
+                entering = lp.price(threshold, max(64, len(lp.arcs)))
+                if not len(entering):
+                    certified = depth == 0
+                    break
+                remaining = time_left()
+                if remaining is not None and remaining <= 0:
+                    status = 'time_limit'
+                    break
+                lp.add(entering)
+            num_candidates = len(lp.arcs)
+        finally:
+            lp.dispose()
+
+        history.append({
+            'level': depth,
+            'nodes': level['num_nodes'],
+            'arcs': len(level['tails']),
+            'candidates': num_candidates,
+            'objective': None if flow is None else float(level['unit'] @ flow),
+            'rounds': rounds,
+            'time': time.time() - level_start
+        })
+        if status == 'time_limit':
+            break
+        if depth > 0:
+            candidates = _project(levels[depth - 1], level, flow, tol * scale)
+
+    if certified:
+        time_to_optimal = time.time() - start_time
+        if artificial > tol * scale:
+            status = 'infeasible'
+    # Flux du niveau fin seulement (une interruption plus haut n'en donne pas)
+    if history[-1]['level'] != 0 or flow is None or artificial > tol * scale:
+        flow = None
+    if flow is not None:
+        flow = cancel_opposing(flow, arrays['link'])
+
+    results = RoutingResult(
+        status, time.time() - start_time,
+        arrays['tails'], arrays['heads'], arrays['capacity'],
+        arrays['cost'], arrays['latency'], flow, links=arrays['link'],
+        source=optimizer.source, destination=optimizer.destination,
+        demand=optimizer.demand,
+        objective=None if flow is None else float(finest['unit'] @ flow),
+        message=None if flow is not None else "Aucun routage réalisable trouvé."
+    )
+    results['method'] = 'multilevel'
+    results['levels'] = history
+    results['coarsen_time'] = coarsen_time
+    results['time_to_first'] = time_to_first
+    results['first_objective'] = first_objective
+    results['time_to_optimal'] = time_to_optimal
+    results['certified'] = certified
+    results['candidate_arcs'] = history[-1]['candidates'] if history[-1]['level'] == 0 else None
+    results['pricing_rounds'] = rounds if history[-1]['level'] == 0 else None
+    return results
@@ -0,0 +1,359 @@
+"""
+Conception de réseau à coûts fixes (fixed-charge network design)
+
+Chaque lien ouvert coûte un montant fixe, en plus du coût de routage des
+flux. Deux méthodes:
+  - 'monolithic': le modèle de NetworkOptimizer, où les binaires link_used
+    portent désormais les coûts fixes (grand M resserré à la borne effective
+    du flux)
+  - 'benders': décomposition de Benders en un seul arbre de branchement.
+    Le maître ne contient que la conception binaire y et une variable theta
+    qui estime le coût de routage; chaque conception entière candidate (et
+    la relaxation fractionnaire à la racine) est évaluée par un sous-problème
+    de flot (PL) qui renvoie des coupes:
+      * coupes de faisabilité combinatoires (coupes s-t issues d'un flot max)
+      * coupes d'optimalité Pareto-optimales (Magnanti-Wong, variante de
+        Papadakos) issues du dual du sous-problème
+"""
+
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from flow_algorithms import max_flow
+from network_model import flow_metrics, find_main_paths
+from solver_env import env_pool
+
+
+def _design_data(optimizer, fixed_costs):
+    """Tableaux alignés sur les arêtes: coûts fixes, coûts unitaires, bornes"""
+    keys = list(optimizer.edge_dict.keys())
+    if optimizer.strategy in ('lp', 'native'):
+        raise ValueError(f"La conception requiert les binaires link_used, absents de la "
+                         f"stratégie '{optimizer.strategy}' (budget mémoire trop serré)")
+    if len(optimizer.link_arcs) != len(keys):
+        raise ValueError("La conception ouvre chaque arc séparément: "
+                         "liens bidirectionnels non pris en charge")
+    if isinstance(fixed_costs, dict):
+        fixed = np.array([fixed_costs.get(e, 0.0) for e in keys], dtype=float)
+    else:
+        fixed = np.asarray(fixed_costs, dtype=float)
+        if fixed.shape != (len(keys),):
+            raise ValueError(f"{len(fixed)} coûts fixes pour {len(keys)} arêtes")
+
+    unit = np.array([
+        optimizer.objective_coefficient(optimizer.edge_dict[e]['cost'],
+                                        optimizer.edge_dict[e]['latency'])
+        for e in keys
+    ])
+    bounds = np.array([optimizer.flow_upper_bound(*e) for e in keys], dtype=float)
+    tails = np.array([e[0] for e in keys], dtype=np.int64)
+    heads = np.array([e[1] for e in keys], dtype=np.int64)
+    return keys, fixed, unit, bounds, tails, heads
+
+
+def _design_results(optimizer, keys, x, y, fixed, unit, method, start_time, model):
+    """Résultats au format de NetworkOptimizer.solve(), plus la conception"""
+    results = {
+        'status': optimizer.get_status_string(model),
+        'solve_time': time.time() - start_time,
+        'method': method
+    }
+    if x is None:
+        results['message'] = "Aucune conception réalisable trouvée."
+        return results
+
+    flows = dict(zip(keys, x.tolist()))
+    results['flows'] = flows
+    results.update(flow_metrics(optimizer.edge_dict, flows,
+                                links=optimizer.edge_arrays()['link']))
+    results['main_paths'] = find_main_paths(flows, optimizer.source,
+                                            optimizer.destination, optimizer.demand)
+
+    results['open_links'] = [e for e, used in zip(keys, y) if used > 0.5]
+    results['routing_objective'] = float(unit @ x)
+    results['fixed_cost'] = float(fixed @ (y > 0.5))
+    results['objective'] = results['routing_objective'] + results['fixed_cost']
+    if model.IsMIP and model.SolCount > 0:
+        results['best_bound'] = model.ObjBound
+        results['gap'] = model.MIPGap
+    return results
+
+
+def _working_model(optimizer, keys):
+    """
+    Copie du modèle de l'optimiseur: la conception modifie objectif, grand M
+    et bornes de link_used sans toucher au modèle que solve() réutilise
+
+    Returns:
+        tuple: (copie, flux, link_used, contraintes d'activation), alignés
+               sur keys (objets retrouvés par position dans la copie)
+    """
+    if not optimizer.flow_vars:
+        optimizer.build_model()
+    optimizer.model.update()
+    model = optimizer.model.copy()
+    variables, constrs = model.getVars(), model.getConstrs()
+    x_vars = [variables[optimizer.flow_vars[e].index] for e in keys]
+    y_vars = [variables[optimizer.link_used[e].index] for e in keys]
+    activation = [constrs[optimizer.activation_constrs[e].index] for e in keys]
+    return model, x_vars, y_vars, activation
+
+
+# ============================================
+# MODÈLE MONOLITHIQUE
+# ============================================
+
+def solve_monolithic(optimizer, fixed_costs, max_active_links=None,
+                     time_limit=None, mip_gap=None):
+    """
+    Résoudre la conception sur le modèle complet de NetworkOptimizer
+
+    Args:
+        optimizer: NetworkOptimizer
+        fixed_costs: Coût fixe par arête (dict {(i, j): coût} ou liste alignée)
+        max_active_links: Nombre maximal de liens ouverts (optionnel)
+        time_limit: Limite de temps (s)
+        mip_gap: Écart relatif d'optimalité visé
+
+    Returns:
+        dict: Résultats (flux, métriques, liens ouverts, coûts)
+    """
+    start_time = time.time()
+    keys, fixed, unit, bounds, _, _ = _design_data(optimizer, fixed_costs)
+    model, x_vars, y_vars, activation = _working_model(optimizer, keys)
+    try:
+        model.setAttr('Obj', y_vars, fixed.tolist())
+
+        # Grand M resserré: borne effective du flux plutôt que la capacité
+        for constr, y_var, bound in zip(activation, y_vars, bounds):
+            model.chgCoeff(constr, y_var, -bound)
+
+        if max_active_links is not None:
+            model.addConstr(gp.quicksum(y_vars) <= max_active_links, name="max_active_links")
+
+        if time_limit is not None:
+            model.setParam('TimeLimit', time_limit)
+        if mip_gap is not None:
+            model.setParam('MIPGap', mip_gap)
+
+        model.optimize()
+
+        x = y = None
+        if model.SolCount > 0:
+            x = np.array(model.getAttr('X', x_vars))
+            y = np.array(model.getAttr('X', y_vars))
+        return _design_results(optimizer, keys, x, y, fixed, unit, 'monolithic',
+                               start_time, model)
+    finally:
+        model.dispose()
+
+
+# ============================================
+# DÉCOMPOSITION DE BENDERS
+# ============================================
+
+class _FlowDual:
+    """
+    Dual du sous-problème de flot pour une conception y fixée
+
+        max  d * pi_s + sum_e U_e y_e mu_e
+        s.c. pi_i - pi_j + mu_e <= c_e   pour e = (i, j)
+             mu_e <= 0, pi_t = 0
+
+    Une solution (pi, mu) donne la coupe theta >= d * pi_s + sum_e U_e mu_e y_e.
+    """
+
+    def __init__(self, env, num_nodes, tails, heads, unit, bounds, source,
+                 destination, demand):
+        self.bounds = bounds
+        self.demand = demand
+        self.model = gp.Model("benders_dual", env=env)
+        self.model.setParam('OutputFlag', 0)
+        self.model.ModelSense = GRB.MAXIMIZE
+
+        self.pi = [self.model.addVar(lb=-GRB.INFINITY, name=f"pi_{v}")
+                   for v in range(num_nodes)]
+        self.pi[destination].LB = 0.0
+        self.pi[destination].UB = 0.0
+        self.pi[source].Obj = demand
+        self.pi_source = self.pi[source]
+
+        self.mu = [self.model.addVar(lb=-GRB.INFINITY, ub=0.0, name=f"mu_{k}")
+                   for k in range(len(tails))]
+        for k, (i, j) in enumerate(zip(tails.tolist(), heads.tolist())):
+            self.model.addConstr(self.pi[i] - self.pi[j] + self.mu[k] <= unit[k])
+        self.model.update()
+
+    def _cut(self):
+        mu = np.array(self.model.getAttr('X', self.mu))
+        return self.demand * self.pi_source.X, self.bounds * mu
+
+    def solve(self, y_bar, core=None):
+        """
+        Évaluer la conception y_bar
+
+        Returns:
+            tuple: (coût de routage Q(y_bar), constante, coefficients de la coupe)
+        """
+        self.model.setAttr('Obj', self.mu, (self.bounds * y_bar).tolist())
+        self.model.optimize()
+        value = self.model.ObjVal
+        constant, coefficients = self._cut()
+
+        if core is not None:
+            # Magnanti-Wong: parmi les duals optimaux en y_bar, le plus fort au point intérieur
+            face = self.model.addConstr(
+                self.demand * self.pi_source
+                + gp.LinExpr((self.bounds * y_bar).tolist(), self.mu)
+                >= value - 1e-7 * max(1.0, abs(value))
+            )
+            self.model.setAttr('Obj', self.mu, (self.bounds * core).tolist())
+            self.model.optimize()
+            if self.model.Status == GRB.OPTIMAL:
+                constant, coefficients = self._cut()
+            self.model.remove(face)
+            self.model.update()
+
+        return value, constant, coefficients
+
+
+def solve_benders(optimizer, fixed_costs, max_active_links=None,
+                  time_limit=None, mip_gap=None, pareto_cuts=True,
+                  max_root_rounds=200, tol=1e-6):
+    """
+    Résoudre la conception par décomposition de Benders (coupes paresseuses)
+
+    Args:
+        optimizer: NetworkOptimizer (fournit données, options et environnement)
+        fixed_costs: Coût fixe par arête (dict {(i, j): coût} ou liste alignée)
+        max_active_links: Nombre maximal de liens ouverts (optionnel)
+        time_limit: Limite de temps (s)
+        mip_gap: Écart relatif d'optimalité visé
+        pareto_cuts: Renforcer les coupes d'optimalité (Magnanti-Wong)
+        max_root_rounds: Tours de séparation sur la relaxation à la racine
+        tol: Tolérance de violation des coupes
+
+    Returns:
+        dict: Résultats (flux, métriques, liens ouverts, coûts, statistiques)
+    """
+    start_time = time.time()
+    keys, fixed, unit, bounds, tails, heads = _design_data(optimizer, fixed_costs)
+    num_nodes = optimizer.num_nodes
+    source, destination = optimizer.source, optimizer.destination
+    demand = optimizer.demand
+    stats = {'feasibility_cuts': 0, 'optimality_cuts': 0, 'subproblems': 0}
+
+    master = gp.Model("benders_master", env=optimizer.env)
+    master.setParam('OutputFlag', 0)
+    master.setParam('LazyConstraints', 1)
+    if time_limit is not None:
+        master.setParam('TimeLimit', time_limit)
+    if mip_gap is not None:
+        master.setParam('MIPGap', mip_gap)
+
+    y_vars = [master.addVar(vtype=GRB.BINARY, obj=fixed[k], name=f"used_{i}_{j}")
+              for k, (i, j) in enumerate(keys)]
+    theta = master.addVar(lb=0.0, obj=1.0, name="theta")
+
+    if max_active_links is not None:
+        master.addConstr(gp.quicksum(y_vars) <= max_active_links, name="max_active_links")
+
+    def cutset_expr(source_side):
+        crossing = np.flatnonzero(source_side[tails] & ~source_side[heads])
+        return gp.LinExpr(bounds[crossing].tolist(), [y_vars[k] for k in crossing])
+
+    def cut_expr(constant, coefficients):
+        return constant + gp.LinExpr(coefficients.tolist(), y_vars)
+
+    with env_pool().acquire() as env:
+        dual = _FlowDual(env, num_nodes, tails, heads, unit, bounds, source,
+                         destination, demand)
+
+        # Réseau complet: infaisabilité globale et première coupe d'optimalité
+        value, _, side = max_flow(num_nodes, tails, heads, bounds, source, destination)
+        if value < demand - tol:
+            dual.model.dispose()
+            master.dispose()
+            return {'status': 'infeasible', 'solve_time': time.time() - start_time,
+                    'method': 'benders',
+                    'message': "Demande supérieure au flot maximal du réseau complet."}
+
+        ones = np.ones(len(keys))
+        q_all, constant, coefficients = dual.solve(ones)
+        theta.LB = q_all  # Ouvrir plus de liens ne peut que réduire le routage
+        master.addConstr(theta >= cut_expr(constant, coefficients))
+        stats['optimality_cuts'] += 1
+
+        # Coupes s-t triviales autour de la source et de la destination
+        around_source = np.zeros(num_nodes, dtype=bool)
+        around_source[source] = True
+        master.addConstr(cutset_expr(around_source) >= demand)
+        master.addConstr(cutset_expr(np.arange(num_nodes) != destination) >= demand)
+
+        core = np.full(len(keys), 0.5 if max_active_links is None
+                       else min(0.5, max_active_links / max(1, 2 * len(keys))))
+        root_rounds = 0
+
+        def separate(y_bar, theta_bar, add):
+            """Chercher une coupe s-t puis une coupe d'optimalité violées en y_bar"""
+            stats['subproblems'] += 1
+            flow_value, _, source_side = max_flow(num_nodes, tails, heads,
+                                                  bounds * y_bar, source, destination)
+            if flow_value < demand - tol:
+                add(cutset_expr(source_side) >= demand)
+                stats['feasibility_cuts'] += 1
+                return
+
+            q_value, cst, coef = dual.solve(y_bar, core if pareto_cuts else None)
+            if theta_bar < q_value - tol * max(1.0, abs(q_value)):
+                add(theta >= cut_expr(cst, coef))
+                stats['optimality_cuts'] += 1
+
+        def callback(model, where):
+            nonlocal core, root_rounds
+            if where == GRB.Callback.MIPSOL:
+                # Conception entière candidate: coupes paresseuses obligatoires
+                y_bar = (np.array(model.cbGetSolution(y_vars)) > 0.5).astype(float)
+                separate(y_bar, model.cbGetSolution(theta), model.cbLazy)
+                # Point intérieur déplacé vers les conceptions rencontrées
+                core = 0.5 * core + 0.5 * y_bar
+
+            elif (where == GRB.Callback.MIPNODE
+                  and model.cbGet(GRB.Callback.MIPNODE_STATUS) == GRB.OPTIMAL
+                  and model.cbGet(GRB.Callback.MIPNODE_NODCNT) == 0
+                  and root_rounds < max_root_rounds):
+                # Relaxation à la racine: mêmes coupes sur la solution fractionnaire
+                root_rounds += 1
+                y_bar = np.clip(np.array(model.cbGetNodeRel(y_vars)), 0.0, 1.0)
+                separate(y_bar, model.cbGetNodeRel(theta), model.cbCut)
+
+        master.optimize(callback)
+        dual.model.dispose()
+
+    x = y = None
+    if master.SolCount > 0:
+        y = (np.array(master.getAttr('X', y_vars)) > 0.5).astype(float)
+        x = _route_design(optimizer, keys, y)
+
+    results = _design_results(optimizer, keys, x, y, fixed, unit, 'benders',
+                              start_time, master)
+    results.update(stats)
+    master.dispose()
+    return results
+
+
+def _route_design(optimizer, keys, y):
+    """Flux optimaux pour une conception fixée (copie du modèle de l'optimiseur)"""
+    model, x_vars, y_vars, _ = _working_model(optimizer, keys)
+    try:
+        model.setAttr('LB', y_vars, y.tolist())
+        model.setAttr('UB', y_vars, y.tolist())
+        model.optimize()
+        if model.Status != GRB.OPTIMAL:
+            return None
+        return np.array(model.getAttr('X', x_vars))
+    finally:
+        model.dispose()
@@ -0,0 +1,432 @@
+"""
+Cœur léger: modèle de réseau, lecture / écriture et métriques
+
+Ce module n'importe aucun solveur ni aucune bibliothèque graphique:
+un traitement par lots qui ne manipule que les données (ou un moteur
+sans Gurobi) démarre en quelques dizaines de millisecondes. Les moteurs
+de résolution sont chargés à la demande via load_backend().
+"""
+
+import importlib
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from metrics import compute_metrics
+
+# Moteurs de résolution: nom -> (module, classe), importés à la demande
+SOLVER_BACKENDS = {
+    'gurobi': ('network_optimizer', 'NetworkOptimizer'),
+}
+
+
+def load_backend(name='gurobi'):
+    """
+    Importer un moteur de résolution seulement lorsqu'il est demandé
+
+    Args:
+        name: Nom du moteur (clé de SOLVER_BACKENDS)
+
+    Returns:
+        La classe d'optimiseur du moteur
+    """
+    if name not in SOLVER_BACKENDS:
+        raise ValueError(f"Moteur inconnu: {name} (disponibles: {', '.join(SOLVER_BACKENDS)})")
+
+    module_name, class_name = SOLVER_BACKENDS[name]
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            f"Le moteur '{name}' nécessite une dépendance absente ({e.name}). "
+            f"Installez-la (ex: pip install gurobipy) ou choisissez un autre moteur."
+        ) from e
+    return getattr(module, class_name)
+
+
+def is_bidirectional(edge):
+    """Vrai si le lien est bidirectionnel (sixième champ vrai)"""
+    return len(edge) > 5 and bool(edge[5])
+
+
+def expand_links(edges):
+    """
+    Arcs orientés d'une liste de liens
+
+    Un lien (source, dest, capacité, coût, latence) est orienté. Avec un
+    sixième champ vrai, (source, dest, capacité, coût, latence, True), il
+    est bidirectionnel: deux arcs (source, dest) puis (dest, source), de
+    mêmes attributs, qui partagent la capacité du lien. Les réseaux sans
+    lien bidirectionnel gardent exactement leurs arcs et leur ordre.
+
+    Returns:
+        tuple: (arcs (liste de 5-uplets), indice du lien de chaque arc (liste))
+
+    Raises:
+        ValueError: si un arc apparaît deux fois
+    """
+    arcs, links, seen = [], [], set()
+    for k, edge in enumerate(edges):
+        i, j = edge[0], edge[1]
+        directions = ((i, j), (j, i)) if is_bidirectional(edge) else ((i, j),)
+        for a, b in directions:
+            if (a, b) in seen:
+                raise ValueError(f"Arc ({a}, {b}) défini deux fois")
+            seen.add((a, b))
+            arcs.append((a, b) + tuple(edge[2:5]))
+            links.append(k)
+    return arcs, links
+
+
+class Network:
+    """
+    Réseau de routage: nœuds, liens et demande source (0) -> destination (n-1)
+
+    self.edges garde un enregistrement par lien (voir expand_links pour les
+    liens bidirectionnels); arrays et edge_keys sont alignés sur les arcs.
+    """
+
+    def __init__(self, num_nodes, edges, demand, name=None, node_names=None):
+        """
+        Args:
+            num_nodes: Nombre de nœuds
+            edges: Liste de tuples (source, dest, capacity, cost, latency),
+                   avec un sixième champ True pour un lien bidirectionnel
+            demand: Demande totale à acheminer
+            name: Nom du réseau (optionnel)
+            node_names: Noms des nœuds (optionnel)
+        """
+        self.num_nodes = num_nodes
+        self.edges = [tuple(edge) for edge in edges]
+        self.demand = demand
+        self.name = name
+        self.node_names = node_names
+        self._arrays = None
+
+    @classmethod
+    def from_example(cls, name):
+        """Construire un réseau à partir d'un exemple de example_data"""
+        from example_data import get_example
+
+        example = get_example(name)
+        if example is None:
+            raise ValueError(f"Exemple '{name}' introuvable")
+        return cls(example['num_nodes'], example['edges'], example['demand'],
+                   name=example['name'], node_names=example.get('node_names'))
+
+    @property
+    def edge_keys(self):
+        """Liste ordonnée des arcs (i, j), alignée sur arrays"""
+        return [(i, j) for i, j in zip(self.arrays['tails'].tolist(),
+                                       self.arrays['heads'].tolist())]
+
+    @property
+    def arrays(self):
+        """
+        Attributs des arcs en tableaux NumPy (un lien bidirectionnel donne
+        deux arcs); 'link' est l'indice du lien de chaque arc dans self.edges
+        """
+        if self._arrays is None:
+            arcs, links = expand_links(self.edges)
+            data = np.array(arcs, dtype=float).reshape(-1, 5)
+            self._arrays = {
+                'tails': data[:, 0].astype(np.int64),
+                'heads': data[:, 1].astype(np.int64),
+                'capacity': data[:, 2],
+                'cost': data[:, 3],
+                'latency': data[:, 4],
+                'link': np.array(links, dtype=np.int64)
+            }
+        return self._arrays
+
+    def optimizer(self, backend='gurobi', **options):
+        """Créer un optimiseur du moteur choisi pour ce réseau"""
+        optimizer_class = load_backend(backend)
+        return optimizer_class(self.num_nodes, self.edges, self.demand, **options)
+
+    # ============================================
+    # LECTURE / ÉCRITURE
+    # ============================================
+
+    def save(self, filename):
+        """Écrire le réseau au format texte de save_example_to_file"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f"# {self.name or 'Réseau'}\n")
+            f.write(f"# Nœuds: {self.num_nodes}\n")
+            f.write(f"# Demande: {self.demand}\n\n")
+
+            f.write("# Format: source destination capacité coût latence [both]\n")
+            for edge in self.edges:
+                source, dest, cap, cost, lat = edge[:5]
+                suffix = " both" if is_bidirectional(edge) else ""
+                f.write(f"{source} {dest} {cap} {cost} {lat}{suffix}\n")
+
+    @classmethod
+    def load(cls, filename, demand=None):
+        """
+        Lire un réseau au format texte (une arête par ligne)
+
+        Les en-têtes « # Nœuds: » et « # Demande: » sont lus s'ils existent;
+        sinon le nombre de nœuds est déduit des arêtes. Un sixième champ
+        « both » marque un lien bidirectionnel.
+        """
+        num_nodes = None
+        name = None
+        edges = []
+
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith('#'):
+                    header = line.lstrip('#').strip()
+                    if header.startswith('Nœuds:'):
+                        num_nodes = int(header.split(':', 1)[1])
+                    elif header.startswith('Demande:') and demand is None:
+                        demand = float(header.split(':', 1)[1])
+                    elif name is None and ':' not in header:
+                        name = header
+                    continue
+
+                fields = line.split()
+                source, dest, cap, cost, lat = fields[:5]
+                edge = (int(source), int(dest), float(cap), float(cost), float(lat))
+                if len(fields) > 5 and fields[5].lower() == 'both':
+                    edge += (True,)
+                edges.append(edge)
+
+        if num_nodes is None:
+            num_nodes = 1 + max(max(e[0], e[1]) for e in edges) if edges else 0
+        return cls(num_nodes, edges, demand, name=name)
+
+
+# ============================================
+# MÉTRIQUES
+# ============================================
+
+def flow_metrics(edge_dict, flows, links=None):
+    """
+    Calculer les métriques d'une solution
+
+    Args:
+        edge_dict: Dict {(i, j): {'capacity', 'cost', 'latency'}}
+        flows: Dict {(i, j): flux}
+        links: Indice du lien de chaque arête de edge_dict (voir
+               metrics.compute_metrics)
+
+    Returns:
+        dict: total_cost, avg_latency, active_links, total_flow,
+              avg_utilization, total_capacity, total_capacity_used, ainsi
+              que les métriques détaillées de metrics.compute_metrics()
+    """
+    keys = list(edge_dict.keys())
+    columns = np.array([(edge_dict[e]['capacity'], edge_dict[e]['cost'],
+                         edge_dict[e]['latency'], flows.get(e, 0.0)) for e in keys],
+                       dtype=float).reshape(-1, 4)
+    return compute_metrics(columns[:, 3], columns[:, 0], columns[:, 1], columns[:, 2],
+                           tails=[i for i, _ in keys], heads=[j for _, j in keys],
+                           links=links)
+
+
+def find_main_paths(flows, source, destination, demand):
+    """Trouver les chemins principaux utilisés (au plus 5)"""
+    paths = []
+
+    # Utiliser un algorithme de recherche en profondeur pour trouver les chemins
+    def dfs_path(node, visited, path, remaining_flow):
+        if node == destination and remaining_flow > 0.01:
+            # Chemin trouvé
+            path_str = " → ".join(str(n) for n in path)
+            paths.append(f"Chemin: {path_str} | Flux: {remaining_flow:.2f}")
+            return
+
+        for (i, j) in flows.keys():
+            if i == node and j not in visited and flows[(i, j)] > 0.01:
+                flow_to_use = min(remaining_flow, flows[(i, j)])
+                visited.add(j)
+                path.append(j)
+                dfs_path(j, visited.copy(), path.copy(), flow_to_use)
+
+    # Limiter à 5 chemins principaux
+    visited_start = {source}
+    dfs_path(source, visited_start, [source], demand)
+
+    return paths[:5]  # Retourner au plus 5 chemins
+
+
+# ============================================
+# RÉSULTAT DE ROUTAGE
+# ============================================
+
+class RoutingResult(MutableMapping):
+    """
+    Résultat de routage adossé à des tableaux NumPy alignés sur les arêtes
+
+    Les flux, coûts et utilisations sont des tableaux (tails, heads, flow,
+    capacity, cost, latency...) exportables sans copie vers pandas ou Arrow.
+    Pour la compatibilité, l'objet se lit aussi comme l'ancien dict de
+    solve(): results['flows'], results['total_cost'], results.get(...);
+    ces entrées sont calculées à la première lecture et peuvent être
+    complétées (results['objective'] = ...) comme un dict.
+    """
+
+    # Colonnes exportées, dans l'ordre
+    COLUMNS = ('tail', 'head', 'flow', 'capacity', 'cost', 'latency',
+               'utilization', 'link_cost')
+
+    def __init__(self, status, solve_time, tails, heads, capacity, cost, latency,
+                 flow=None, links=None, source=0, destination=None, demand=None,
+                 objective=None, message=None):
+        """
+        Args:
+            status: Statut lisible ('optimal', 'infeasible'...)
+            solve_time: Temps de résolution (s)
+            tails, heads, capacity, cost, latency: Tableaux des arêtes
+            flow: Flux par arête (None si aucune solution)
+            links: Indice du lien de chaque arête (métriques par lien)
+            source, destination, demand: Demande routée
+            objective: Valeur de l'objectif du solveur (optionnel)
+            message: Message d'erreur éventuel
+        """
+        self.status = status
+        self.solve_time = solve_time
+        self.tails = np.asarray(tails, dtype=np.int64)
+        self.heads = np.asarray(heads, dtype=np.int64)
+        self.capacity = np.asarray(capacity, dtype=float)
+        self.cost = np.asarray(cost, dtype=float)
+        self.latency = np.asarray(latency, dtype=float)
+        self.flow = None if flow is None else np.asarray(flow, dtype=float)
+        self.links = None if links is None else np.asarray(links, dtype=np.int64)
+        self.source = source
+        self.destination = destination
+        self.demand = demand
+        self.objective = objective
+        self.message = message
+        self._legacy = None
+
+    @classmethod
+    def from_network(cls, network, flow, status='optimal', solve_time=0.0, **kwargs):
+        """Construire un résultat à partir d'un Network et d'un tableau de flux"""
+        arrays = network.arrays
+        return cls(status, solve_time, arrays['tails'], arrays['heads'],
+                   arrays['capacity'], arrays['cost'], arrays['latency'], flow,
+                   links=arrays['link'], source=0, destination=network.num_nodes - 1,
+                   demand=network.demand, **kwargs)
+
+    @property
+    def has_solution(self):
+        """Vrai si un flux a été obtenu"""
+        return self.flow is not None
+
+    @property
+    def edge_keys(self):
+        """Liste ordonnée des arêtes (i, j)"""
+        return list(zip(self.tails.tolist(), self.heads.tolist()))
+
+    @property
+    def utilization(self):
+        """Taux d'utilisation par arête (flux / capacité)"""
+        return np.divide(self.flow, self.capacity, out=np.zeros_like(self.flow),
+                         where=self.capacity > 0)
+
+    @property
+    def link_cost(self):
+        """Coût de transmission par arête (flux x coût unitaire)"""
+        return self.flow * self.cost
+
+    def metrics(self):
+        """Métriques de metrics.compute_metrics(), calculées sur les tableaux"""
+        return compute_metrics(self.flow, self.capacity, self.cost, self.latency,
+                               tails=self.tails, heads=self.heads, links=self.links)
+
+    # ---- Lecture façon dict (compatibilité avec l'ancien format) ----
+
+    def as_dict(self):
+        """Dict au format historique de NetworkOptimizer.solve()"""
+        if self._legacy is None:
+            legacy = {'status': self.status, 'solve_time': self.solve_time}
+            if self.has_solution:
+                flows = dict(zip(self.edge_keys, self.flow.tolist()))
+                legacy['flows'] = flows
+                legacy.update(self.metrics())
+                legacy['main_paths'] = find_main_paths(flows, self.source,
+                                                       self.destination, self.demand)
+            if self.message is not None:
+                legacy['message'] = self.message
+            self._legacy = legacy
+        return self._legacy
+
+    def __getitem__(self, key):
+        return self.as_dict()[key]
+
+    def __setitem__(self, key, value):
+        self.as_dict()[key] = value
+
+    def __delitem__(self, key):
+        del self.as_dict()[key]
+
+    def __iter__(self):
+        return iter(self.as_dict())
+
+    def __len__(self):
+        return len(self.as_dict())
+
+    def __repr__(self):
+        return (f"RoutingResult(status={self.status!r}, edges={len(self.tails)}, "
+                f"solve_time={self.solve_time:.3f})")
+
+    # ---- Export ----
+
+    def columns(self):
+        """Colonnes exportées: dict nom -> tableau (sans copie pour les données)"""
+        if not self.has_solution:
+            raise ValueError(f"Aucune solution à exporter (statut: {self.status})")
+        return {
+            'tail': self.tails,
+            'head': self.heads,
+            'flow': self.flow,
+            'capacity': self.capacity,
+            'cost': self.cost,
+            'latency': self.latency,
+            'utilization': self.utilization,
+            'link_cost': self.link_cost
+        }
+
+    def to_pandas(self):
+        """DataFrame d'une ligne par arête; les colonnes partagent les tableaux"""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns(), copy=False)
+
+    def to_arrow(self):
+        """Table Arrow (pyarrow) construite sans copie des tableaux NumPy"""
+        pa = _import_pyarrow()
+        columns = self.columns()
+        return pa.Table.from_arrays([pa.array(columns[name]) for name in self.COLUMNS],
+                                    names=list(self.COLUMNS))
+
+    def to_parquet(self, filename):
+        """Écrire les arêtes au format Parquet"""
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), filename)
+
+    def to_feather(self, filename):
+        """Écrire les arêtes au format Arrow IPC (Feather v2)"""
+        _import_pyarrow()
+        import pyarrow.feather as feather
+
+        feather.write_feather(self.to_arrow(), filename)
+
+
+def _import_pyarrow():
+    """Importer pyarrow (dépendance optionnelle des exports Arrow / Parquet)"""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "L'export Arrow / Parquet nécessite pyarrow (pip install pyarrow)."
+        ) from e
+    return pyarrow
@@ -1,8 +1,13 @@
 import gurobipy as gp
 from gurobipy import GRB
+import contextlib
+import threading
 import time
 import numpy as np
 
+from network_model import RoutingResult, expand_links, find_main_paths
+from solver_env import shared_env
+
 class NetworkOptimizer:
     """
     Classe pour optimiser le routage de données dans un réseau
@@ -10,17 +15,42 @@ class NetworkOptimizer:
     """
     
     def __init__(self, num_nodes, edges, demand, objective_type=0, 
-                 use_reliability=True, use_balance=False):
+                 use_reliability=True, use_balance=False, alpha=0.1,
+                 latency_scale=100.0, env=None, template_cache=None,
+                 profile='auto', parallel_jobs=1, solution_library=None,
+                 memory_budget=None, track_memory=False, fast_path=True):
         """
         Initialisation de l'optimiseur
         
         Args:
             num_nodes: Nombre de nœuds dans le réseau
-            edges: Liste de tuples (source, dest, capacity, cost, latency)
+            edges: Liste de tuples (source, dest, capacity, cost, latency);
+                   un sixième champ True rend le lien bidirectionnel: deux
+                   arcs de flux, une seule capacité (voir expand_links)
             demand: Demande totale à acheminer de la source (0) à la destination (n-1)
             objective_type: 0=coût, 1=latence, 2=multi-critère
             use_reliability: Utiliser contraintes de fiabilité
             use_balance: Utiliser équilibrage de charge
+            alpha: Poids de la latence en mode multi-critère
+            latency_scale: Facteur de normalisation de la latence (multi-critère)
+            env: Environnement Gurobi (défaut: environnement partagé)
+            template_cache: ModelTemplateCache pour réutiliser un modèle
+                            déjà construit sur la même topologie
+            profile: Paramètres du solveur: 'auto' (profil de la classe
+                     d'instance, voir solver_profiles), un ProfileStore,
+                     un dict de paramètres, ou None (défauts Gurobi)
+            parallel_jobs: Nombre de résolutions lancées en même temps
+                           (borne le nombre de threads par résolution)
+            solution_library: SolutionLibrary où chercher un démarrage à
+                              chaud et enregistrer les solutions
+            memory_budget: Budget mémoire (octets ou chaîne '2GB'): la
+                           stratégie de construction est choisie avant de
+                           construire (voir memory.py); MemoryError si
+                           rien ne tient
+            track_memory: Mesurer la mémoire par phase (results['memory'])
+            fast_path: Essayer d'abord un plus court chemin: si la demande
+                       tient sur le chemin, la solution est optimale sans
+                       construire le modèle (voir _solve_shortest_path)
         """
         self.num_nodes = num_nodes
         self.edges = edges
@@ -28,31 +58,89 @@ class NetworkOptimizer:
         self.objective_type = objective_type
         self.use_reliability = use_reliability
         self.use_balance = use_balance
+        self.alpha = alpha
+        self.latency_scale = latency_scale
         
         # Nœud source et destination
         self.source = 0
         self.destination = num_nodes - 1
         
-        # Dictionnaires pour accès rapide
+        # Dictionnaires pour accès rapide (un arc par direction)
         self.edge_dict = {}
-        for source, dest, capacity, cost, latency in edges:
+        arcs, links = expand_links(edges)
+        for source, dest, capacity, cost, latency in arcs:
             self.edge_dict[(source, dest)] = {
                 'capacity': capacity,
                 'cost': cost,
                 'latency': latency
             }
         
-        # Créer le modèle Gurobi
-        self.model = gp.Model("Network_Routing")
+        # Liens physiques: arcs qui partagent link_used et les contraintes
+        # de capacité, fiabilité et équilibrage (deux arcs par lien
+        # bidirectionnel), dans l'ordre des liens
+        self.link_arcs = [[] for _ in edges]
+        self._arc_link = {}
+        for (i, j), k in zip(self.edge_dict.keys(), links):
+            self.link_arcs[k].append((i, j))
+            self._arc_link[(i, j)] = k
+        
+        # Créer le modèle Gurobi (l'environnement partagé est déjà silencieux)
+        self.env = env if env is not None else shared_env()
+        self.template_cache = template_cache
+        self.model = gp.Model("Network_Routing", env=self.env)
         self.model.setParam('OutputFlag', 0)  # Désactiver sortie console
         
         # Variables et contraintes
         self.flow_vars = {}
+        self.balance_constrs = {}
+        self.capacity_constrs = {}
+        self.activation_constrs = {}
+        self.reliability_constrs = {}
+        self.balance_cap_constrs = {}
         self.results = {}
+        self._edge_arrays = None
+        
+        # Profil de paramètres du solveur (appliqué avant chaque résolution)
+        self.profile = profile
+        self.parallel_jobs = parallel_jobs
+        self.instance_class = None
+        self.solver_params = {}
+        self.solution_library = solution_library
+        
+        # Demande d'annulation (cancel(), depuis un autre thread)
+        self._cancel = threading.Event()
+        
+        # Budget mémoire: stratégie de construction ('full', 'chunked',
+        # 'lp' ou 'native'), choisie à la première résolution
+        self.memory_budget = memory_budget
+        self.track_memory = track_memory
+        self.strategy = 'full'
+        self.memory_estimates = None
+        
+        # Chemin rapide (plus court chemin) quand les capacités ne lient pas
+        self.fast_path = fast_path
+        self._forward_star = None
         
     def build_model(self):
         """Construire le modèle d'optimisation"""
         
+        if self.strategy in ('chunked', 'lp'):
+            self._build_model_compact(lp_only=self.strategy == 'lp')
+            return
+        
+        # Réutiliser un gabarit de la même topologie si disponible
+        if self.template_cache is not None:
+            key = self.template_cache.key(self)
+            cached = self.template_cache.get(key, self.env)
+            if cached is not None:
+                template, template_demand = cached
+                self.model.dispose()
+                self.model = template
+                self._bind_model()
+                if template_demand != self.demand:
+                    self.update_demand(self.demand)
+                return
+        
         # ============================================
         # VARIABLES DE DÉCISION
         # ============================================
@@ -66,13 +154,17 @@ class NetworkOptimizer:
                 name=f"flow_{i}_{j}"
             )
         
-        # Variables binaires pour savoir si un lien est utilisé
+        # Variables binaires pour savoir si un lien est utilisé (une par
+        # lien physique, partagée par ses deux arcs s'il est bidirectionnel)
         self.link_used = {}
-        for (i, j) in self.edge_dict.keys():
-            self.link_used[(i, j)] = self.model.addVar(
+        for arcs in self.link_arcs:
+            i, j = arcs[0]
+            used = self.model.addVar(
                 vtype=GRB.BINARY,
                 name=f"used_{i}_{j}"
             )
+            for arc in arcs:
+                self.link_used[arc] = used
         
         self.model.update()
         
@@ -97,19 +189,19 @@ class NetworkOptimizer:
             
             if node == self.source:
                 # Nœud source: sortie = demande
-                self.model.addConstr(
+                self.balance_constrs[node] = self.model.addConstr(
                     outflow - inflow == self.demand,
                     name=f"flow_balance_source_{node}"
                 )
             elif node == self.destination:
                 # Nœud destination: entrée = demande
-                self.model.addConstr(
+                self.balance_constrs[node] = self.model.addConstr(
                     inflow - outflow == self.demand,
                     name=f"flow_balance_dest_{node}"
                 )
             else:
                 # Nœuds intermédiaires: conservation du flux
-                self.model.addConstr(
+                self.balance_constrs[node] = self.model.addConstr(
                     inflow == outflow,
                     name=f"flow_balance_{node}"
                 )
@@ -118,20 +210,27 @@ class NetworkOptimizer:
         # CONTRAINTES DE CAPACITÉ
         # ============================================
         
-        for (i, j), edge_data in self.edge_dict.items():
-            capacity = edge_data['capacity']
+        # Une contrainte par lien: un lien bidirectionnel partage sa
+        # capacité entre ses deux arcs
+        for arcs in self.link_arcs:
+            i, j = arcs[0]
+            capacity = self.edge_dict[(i, j)]['capacity']
+            load = gp.quicksum(self.flow_vars[arc] for arc in arcs)
             
             # Le flux ne peut pas dépasser la capacité
-            self.model.addConstr(
-                self.flow_vars[(i, j)] <= capacity,
+            capacity_constr = self.model.addConstr(
+                load <= capacity,
                 name=f"capacity_{i}_{j}"
             )
             
             # Lier la variable binaire au flux
-            self.model.addConstr(
-                self.flow_vars[(i, j)] <= capacity * self.link_used[(i, j)],
+            activation_constr = self.model.addConstr(
+                load <= capacity * self.link_used[(i, j)],
                 name=f"link_activation_{i}_{j}"
             )
+            for arc in arcs:
+                self.capacity_constrs[arc] = capacity_constr
+                self.activation_constrs[arc] = activation_constr
         
         # ============================================
         # CONTRAINTES DE FIABILITÉ (optionnel)
@@ -140,11 +239,14 @@ class NetworkOptimizer:
         if self.use_reliability:
             # Assurer qu'au moins 2 chemins différents existent si possible
             # En limitant le flux sur chaque arête à 80% de la demande
-            for (i, j) in self.edge_dict.keys():
-                self.model.addConstr(
-                    self.flow_vars[(i, j)] <= 0.8 * self.demand,
+            for arcs in self.link_arcs:
+                i, j = arcs[0]
+                constr = self.model.addConstr(
+                    gp.quicksum(self.flow_vars[arc] for arc in arcs) <= 0.8 * self.demand,
                     name=f"reliability_{i}_{j}"
                 )
+                for arc in arcs:
+                    self.reliability_constrs[arc] = constr
         
         # ============================================
         # CONTRAINTES D'ÉQUILIBRAGE (optionnel)
@@ -152,126 +254,985 @@ class NetworkOptimizer:
         
         if self.use_balance:
             # Équilibrage: éviter qu'un lien soit trop chargé
-            for (i, j), edge_data in self.edge_dict.items():
-                capacity = edge_data['capacity']
+            for arcs in self.link_arcs:
+                i, j = arcs[0]
+                capacity = self.edge_dict[(i, j)]['capacity']
                 # Limiter l'utilisation à 70% de la capacité
-                self.model.addConstr(
-                    self.flow_vars[(i, j)] <= 0.7 * capacity,
+                constr = self.model.addConstr(
+                    gp.quicksum(self.flow_vars[arc] for arc in arcs) <= 0.7 * capacity,
                     name=f"balance_{i}_{j}"
                 )
+                for arc in arcs:
+                    self.balance_cap_constrs[arc] = constr
         
         # ============================================
         # FONCTION OBJECTIF
         # ============================================
         
+        total_cost = gp.quicksum(
+            self.flow_vars[(i, j)] * self.edge_dict[(i, j)]['cost']
+            for (i, j) in self.edge_dict.keys()
+        )
+        
+        total_latency = gp.quicksum(
+            self.flow_vars[(i, j)] * self.edge_dict[(i, j)]['latency']
+            for (i, j) in self.edge_dict.keys()
+        )
+        
         if self.objective_type == 0:
             # Minimiser le coût total
-            total_cost = gp.quicksum(
-                self.flow_vars[(i, j)] * self.edge_dict[(i, j)]['cost']
-                for (i, j) in self.edge_dict.keys()
-            )
             self.model.setObjective(total_cost, GRB.MINIMIZE)
             
         elif self.objective_type == 1:
             # Minimiser la latence moyenne pondérée
-            total_latency = gp.quicksum(
-                self.flow_vars[(i, j)] * self.edge_dict[(i, j)]['latency']
-                for (i, j) in self.edge_dict.keys()
-            )
             self.model.setObjective(total_latency, GRB.MINIMIZE)
             
         else:
             # Multi-critère: minimiser coût + alpha * latence
-            alpha = 0.1  # Poids de la latence
-            
-            total_cost = gp.quicksum(
-                self.flow_vars[(i, j)] * self.edge_dict[(i, j)]['cost']
-                for (i, j) in self.edge_dict.keys()
-            )
-            
-            total_latency = gp.quicksum(
-                self.flow_vars[(i, j)] * self.edge_dict[(i, j)]['latency']
-                for (i, j) in self.edge_dict.keys()
-            )
-            
             # Normaliser la latence pour qu'elle soit comparable au coût
-            normalized_latency = total_latency / 100.0
+            normalized_latency = total_latency / self.latency_scale
             
             self.model.setObjective(
-                total_cost + alpha * normalized_latency, 
+                total_cost + self.alpha * normalized_latency, 
                 GRB.MINIMIZE
             )
         
         self.model.update()
+        
+        if self.template_cache is not None:
+            self.template_cache.put(key, self.model, self.demand)
     
-    def solve(self):
-        """Résoudre le problème d'optimisation"""
+    def _build_model_compact(self, lp_only=False, chunk_size=5000):
+        """
+        Construire le modèle à empreinte réduite (stratégies 'chunked' et 'lp')
         
-        # Construire le modèle
-        self.build_model()
+        Mêmes contraintes, dans le même ordre que build_model, mais sans
+        noms ni expressions quicksum: la conservation du flux est lue sur
+        des listes d'adjacence et les contraintes sont transmises au solveur
+        par paquets de chunk_size; l'objectif est posé par l'attribut Obj.
+        Avec lp_only, link_used et les contraintes d'activation sont omis.
+        """
+        keys = list(self.edge_dict.keys())
+        arrays = self.edge_arrays()
+        capacity = arrays['capacity'].tolist()
+        flow = list(self.model.addVars(len(keys), lb=0.0, ub=capacity).values())
+        self.flow_vars = dict(zip(keys, flow))
+        groups = [[self.flow_vars[arc] for arc in arcs] for arcs in self.link_arcs]
+        link_capacity = [self.edge_dict[arcs[0]]['capacity'] for arcs in self.link_arcs]
+        self.link_used = {}
+        if not lp_only:
+            used = list(self.model.addVars(len(groups), vtype=GRB.BINARY).values())
+            self.link_used = {arc: used[k] for k, arcs in enumerate(self.link_arcs)
+                              for arc in arcs}
+        self.model.update()
         
-        # Mesurer le temps de résolution
-        start_time = time.time()
+        outgoing = [[] for _ in range(self.num_nodes)]
+        incoming = [[] for _ in range(self.num_nodes)]
+        for k, (i, j) in enumerate(keys):
+            outgoing[i].append(flow[k])
+            incoming[j].append(flow[k])
         
-        # Résoudre
-        self.model.optimize()
+        emitted = 0
         
-        solve_time = time.time() - start_time
+        def flush():
+            nonlocal emitted
+            emitted += 1
+            if emitted % chunk_size == 0:
+                self.model.update()
         
-        # Extraire les résultats
-        results = {
-            'status': self.get_status_string(),
-            'solve_time': solve_time
-        }
+        def link_rows(target, rhs):
+            for k, group in enumerate(groups):
+                constr = self.model.addLConstr(
+                    gp.LinExpr([1.0] * len(group), group), GRB.LESS_EQUAL, rhs[k])
+                for arc in self.link_arcs[k]:
+                    target[arc] = constr
+                flush()
         
-        if self.model.Status == GRB.OPTIMAL:
-            # Récupérer les flux optimaux
-            flows = {}
-            for (i, j), var in self.flow_vars.items():
-                flows[(i, j)] = var.X
-            
-            results['flows'] = flows
-            
-            # Calculer les métriques
-            total_cost = sum(
-                flows[(i, j)] * self.edge_dict[(i, j)]['cost']
-                for (i, j) in flows.keys()
+        for node in range(self.num_nodes):
+            out, inc = outgoing[node], incoming[node]
+            if node == self.source:
+                expr = gp.LinExpr([1.0] * len(out) + [-1.0] * len(inc), out + inc)
+                rhs = self.demand
+            else:
+                expr = gp.LinExpr([1.0] * len(inc) + [-1.0] * len(out), inc + out)
+                rhs = self.demand if node == self.destination else 0.0
+            self.balance_constrs[node] = self.model.addLConstr(expr, GRB.EQUAL, rhs)
+            flush()
+        
+        for k, group in enumerate(groups):
+            constr = self.model.addLConstr(
+                gp.LinExpr([1.0] * len(group), group), GRB.LESS_EQUAL, link_capacity[k])
+            for arc in self.link_arcs[k]:
+                self.capacity_constrs[arc] = constr
+            if not lp_only:
+                constr = self.model.addLConstr(
+                    gp.LinExpr([1.0] * len(group) + [-link_capacity[k]], group + [used[k]]),
+                    GRB.LESS_EQUAL, 0.0)
+                for arc in self.link_arcs[k]:
+                    self.activation_constrs[arc] = constr
+            flush()
+        
+        if self.use_reliability:
+            link_rows(self.reliability_constrs, [0.8 * self.demand] * len(groups))
+        
+        if self.use_balance:
+            link_rows(self.balance_cap_constrs, [0.7 * c for c in link_capacity])
+        
+        self.model.update()
+        self.model.setAttr('Obj', flow, [self.objective_coefficient(c, l)
+                                         for c, l in zip(arrays['cost'], arrays['latency'])])
+        self.model.ModelSense = GRB.MINIMIZE
+        self.model.update()
+    
+    def _bind_model(self):
+        """
+        Relier variables et contraintes d'un modèle copié
+        
+        L'ordre de création de build_model est déterministe: les
+        objets sont retrouvés par position, sans recherche par nom.
+        """
+        keys = list(self.edge_dict.keys())
+        num_edges = len(keys)
+        num_links = len(self.link_arcs)
+        variables = self.model.getVars()
+        constrs = self.model.getConstrs()
+        
+        self.flow_vars = dict(zip(keys, variables[:num_edges]))
+        
+        def by_link(objects):
+            return {arc: objects[k] for k, arcs in enumerate(self.link_arcs) for arc in arcs}
+        
+        self.link_used = by_link(variables[num_edges:num_edges + num_links])
+        
+        n = self.num_nodes
+        self.balance_constrs = dict(zip(range(n), constrs[:n]))
+        self.capacity_constrs = by_link(constrs[n:n + 2 * num_links:2])
+        self.activation_constrs = by_link(constrs[n + 1:n + 2 * num_links:2])
+        
+        offset = n + 2 * num_links
+        if self.use_reliability:
+            self.reliability_constrs = by_link(constrs[offset:offset + num_links])
+            offset += num_links
+        if self.use_balance:
+            self.balance_cap_constrs = by_link(constrs[offset:offset + num_links])
+    
+    def move_to_env(self, env):
+        """
+        Déplacer le modèle dans l'environnement env (copie)
+        
+        Les variables et contraintes sont retrouvées par position
+        (Var.index, Constr.index), quelle que soit la stratégie.
+        """
+        if env is self.env:
+            return
+        self.model.update()
+        model = self.model.copy(env=env)
+        variables = model.getVars()
+        constrs = model.getConstrs()
+        
+        def remap(objects, copies):
+            return {key: copies[obj.index] for key, obj in objects.items()}
+        
+        self.flow_vars = remap(self.flow_vars, variables)
+        self.link_used = remap(getattr(self, 'link_used', {}), variables)
+        for name in ('balance_constrs', 'capacity_constrs', 'activation_constrs',
+                     'reliability_constrs', 'balance_cap_constrs'):
+            setattr(self, name, remap(getattr(self, name), constrs))
+        
+        old, self.model, self.env = self.model, model, env
+        old.dispose()
+        # La copie reprend les paramètres de env: profil réappliqué à la
+        # prochaine résolution
+        self.model.setParam('OutputFlag', 0)
+        self.instance_class = None
+        self.solver_params = {}
+    
+    def apply_solver_profile(self):
+        """
+        Appliquer les paramètres du solveur selon self.profile
+        
+        En mode automatique, l'instance est classée (PL / PLNE, taille,
+        densité) et reçoit le profil de sa classe; rien n'est refait tant
+        que la classe ne change pas (ex: après relax_link_usage()).
+        
+        Returns:
+            dict: Paramètres appliqués
+        """
+        from solver_profiles import ProfileStore, apply_params, classify, resolve_params
+        
+        if self.profile is None:
+            return self.solver_params
+        if isinstance(self.profile, dict):
+            params = dict(self.profile)
+        else:
+            instance_class = classify(self)
+            if instance_class == self.instance_class:
+                return self.solver_params
+            self.instance_class = instance_class
+            store = self.profile if isinstance(self.profile, ProfileStore) else None
+            params = resolve_params(instance_class, self.parallel_jobs, store)
+        
+        if params != self.solver_params:
+            apply_params(self.model, params)
+            self.solver_params = params
+        return params
+    
+    def relax_link_usage(self):
+        """
+        Relâcher les binaires link_used en variables continues
+        
+        link_used n'intervient pas dans l'objectif: les flux optimaux sont
+        inchangés, mais le modèle devient un PL que le simplexe peut
+        résoudre à chaud après chaque modification.
+        """
+        if not self.link_used:
+            return
+        binaries = [self.link_used[arcs[0]] for arcs in self.link_arcs]
+        self.model.setAttr('VType', binaries, [GRB.CONTINUOUS] * len(binaries))
+    
+    def flow_upper_bound(self, i, j, capacity=None):
+        """Borne effective du flux sur (i, j): capacité, fiabilité et équilibrage"""
+        bound = self.edge_dict[(i, j)]['capacity'] if capacity is None else capacity
+        if self.use_balance:
+            bound = 0.7 * bound
+        if self.use_reliability:
+            bound = min(bound, 0.8 * self.demand)
+        return bound
+    
+    def objective_coefficient(self, cost, latency):
+        """Coefficient objectif d'une arête selon le mode d'optimisation"""
+        if self.objective_type == 0:
+            return cost
+        elif self.objective_type == 1:
+            return latency
+        return cost + self.alpha * latency / self.latency_scale
+    
+    def update_demand(self, demand):
+        """
+        Modifier la demande sur le modèle déjà construit
+        
+        Seuls les seconds membres changent: la résolution suivante
+        repart de la base (ou solution) précédente.
+        """
+        self.demand = demand
+        if not self.balance_constrs:
+            return  # Modèle pas encore construit
+        self.balance_constrs[self.source].RHS = demand
+        self.balance_constrs[self.destination].RHS = demand
+        
+        if self.use_reliability and self.reliability_constrs:
+            constrs = list(self.reliability_constrs.values())
+            self.model.setAttr('RHS', constrs, [0.8 * demand] * len(constrs))
+    
+    def update_edges(self, capacities=None, costs=None, latencies=None):
+        """
+        Modifier les attributs des arêtes sur le modèle déjà construit
+        
+        Args:
+            capacities: Dict {(i, j): capacité} (capacité du lien: les deux
+                        arcs d'un lien bidirectionnel la partagent)
+            costs: Dict {(i, j): coût unitaire}
+            latencies: Dict {(i, j): latence}
+        """
+        self._edge_arrays = None
+        if not self.flow_vars:
+            # Modèle pas encore construit: seules les données changent
+            for (i, j), capacity in (capacities or {}).items():
+                for arc in self.link_arcs[self._arc_link[(i, j)]]:
+                    self.edge_dict[arc]['capacity'] = capacity
+            for key, values in (('cost', costs), ('latency', latencies)):
+                for edge, value in (values or {}).items():
+                    self.edge_dict[edge][key] = value
+            return
+        if capacities:
+            for (i, j), capacity in capacities.items():
+                # Capacité du lien: les deux arcs d'un lien bidirectionnel
+                for arc in self.link_arcs[self._arc_link[(i, j)]]:
+                    self.edge_dict[arc]['capacity'] = capacity
+                    self.flow_vars[arc].UB = capacity
+                self.capacity_constrs[(i, j)].RHS = capacity
+                if self.activation_constrs:
+                    self.model.chgCoeff(self.activation_constrs[(i, j)],
+                                        self.link_used[(i, j)], -capacity)
+                if self.use_balance:
+                    self.balance_cap_constrs[(i, j)].RHS = 0.7 * capacity
+        
+        changed = set()
+        for key, values in (('cost', costs), ('latency', latencies)):
+            if values:
+                for edge, value in values.items():
+                    self.edge_dict[edge][key] = value
+                    changed.add(edge)
+        
+        if changed:
+            changed = list(changed)
+            self.model.setAttr(
+                'Obj',
+                [self.flow_vars[e] for e in changed],
+                [self.objective_coefficient(self.edge_dict[e]['cost'],
+                                            self.edge_dict[e]['latency'])
+                 for e in changed]
             )
+    
+    def solve(self, deadline=None, mip_gap=None):
+        """
+        Résoudre le problème d'optimisation
+        
+        Args:
+            deadline: Échéance (s, temps réel depuis l'appel): la réponse
+                      contient la meilleure solution trouvée à l'échéance,
+                      sa borne et son écart (voir _solve_model)
+            mip_gap: Écart relatif d'optimalité visé (arrêt anticipé)
+        
+        Returns:
+            RoutingResult
+        """
+        start_time = time.perf_counter()
+        
+        # Budget mémoire: choisir la stratégie avant de construire
+        monitor = None
+        if self.memory_budget is not None or self.track_memory:
+            from memory import MemoryMonitor, choose_strategy
             
-            total_latency = sum(
-                flows[(i, j)] * self.edge_dict[(i, j)]['latency']
-                for (i, j) in flows.keys() if flows[(i, j)] > 0.01
-            )
+            monitor = MemoryMonitor()
+            if self.memory_budget is not None and self.memory_estimates is None \
+                    and not self.flow_vars:
+                self.strategy, self.memory_estimates = choose_strategy(self, self.memory_budget)
+        
+        try:
+            results = None
+            if self._fast_path_allowed():
+                results = self._solve_shortest_path(deadline, mip_gap, start_time)
+            if results is None and self.strategy == 'native':
+                results = self._solve_native(monitor)
+            elif results is None:
+                results = self._solve_model(monitor, deadline, mip_gap, start_time)
+            if monitor is not None:
+                results['memory'] = monitor.report(
+                    strategy=self.strategy, budget=self.memory_budget,
+                    estimate=(self.memory_estimates[self.strategy]
+                              if self.memory_estimates else None),
+                    solver_peak=self._solver_peak_memory()
+                )
+            return results
+        finally:
+            if monitor is not None:
+                monitor.close()
+    
+    def _fast_path_allowed(self):
+        """
+        Le chemin rapide ne s'applique qu'avant toute construction du modèle
+        et sans option propre au solveur (gabarit, bibliothèque de
+        solutions, profil explicite)
+        """
+        return (self.fast_path and not self.flow_vars and not self._cancel.is_set()
+                and self.template_cache is None and self.solution_library is None
+                and isinstance(self.profile, str) and self.profile == 'auto')
+    
+    def _solve_shortest_path(self, deadline=None, mip_gap=None, start=None):
+        """
+        Chemin rapide: un seul plus court chemin sur le coefficient objectif
+        
+        Sans capacités, le PL est un plus court chemin: demande x distance
+        est une borne inférieure de l'optimum. Si le chemin accepte toute
+        la demande (capacité, fiabilité et équilibrage appliqués), cette
+        borne est atteinte et la solution est optimale. Sans chemin, le
+        problème est irréalisable.
+        
+        Avec une échéance ou un écart visé, la réponse porte les mêmes clés
+        que _solve_model: la solution est prouvée optimale (écart nul).
+        
+        Returns:
+            RoutingResult, ou None si le modèle complet est nécessaire
+        """
+        start_time = time.perf_counter()
+        if start is None:
+            start = start_time
+        arrays = self.edge_arrays()
+        unit = self.objective_coefficient(arrays['cost'], arrays['latency'])
+        if self.demand <= 0 or np.any(unit < 0):
+            return None
+        length, path = self._graph().shortest_path(unit, self.source, self.destination)
+        
+        flow = objective = None
+        if path is not None:
+            bounds = arrays['capacity'][path]
+            if self.use_balance:
+                bounds = 0.7 * bounds
+            if self.use_reliability:
+                bounds = np.minimum(bounds, 0.8 * self.demand)
+            if len(path) and bounds.min() < self.demand * (1 - 1e-9):
+                return None
+            flow = np.zeros(len(unit))
+            flow[path] = self.demand
+            objective = float(self.demand * length)
+        
+        results = RoutingResult(
+            'optimal' if flow is not None else 'infeasible',
+            time.perf_counter() - start_time,
+            arrays['tails'], arrays['heads'], arrays['capacity'],
+            arrays['cost'], arrays['latency'], flow, links=arrays['link'],
+            source=self.source, destination=self.destination, demand=self.demand,
+            objective=objective,
+            message=None if flow is not None else
+            "Aucune solution optimale trouvée. Vérifiez les contraintes."
+        )
+        results['method'] = 'shortest_path'
+        if deadline is not None or mip_gap is not None:
+            results['incumbent'] = 'shortest_path' if flow is not None else None
+            results['best_bound'] = objective
+            results['gap'] = 0.0 if flow is not None else None
+            results['elapsed'] = time.perf_counter() - start
+        return results
+    
+    def _graph(self):
+        """Graphe ForwardStar des arêtes (construit une fois)"""
+        if self._forward_star is None:
+            from flow_algorithms import ForwardStar
             
-            active_flows = sum(1 for flow in flows.values() if flow > 0.01)
-            total_flow = sum(flows.values())
+            arrays = self.edge_arrays()
+            self._forward_star = ForwardStar(self.num_nodes, arrays['tails'], arrays['heads'])
+        return self._forward_star
+    
+    def _heuristic_flow(self):
+        """
+        Solution réalisable rapide (ForwardStar.greedy_flow) sur les bornes
+        effectives flow_upper_bound
+        
+        Returns:
+            tuple: (flux, objectif) ou (None, None)
+        """
+        from flow_algorithms import cancel_opposing
+        
+        arrays = self.edge_arrays()
+        unit = self.objective_coefficient(arrays['cost'], arrays['latency'])
+        if np.any(unit < 0):
+            return None, None
+        bounds = [self.flow_upper_bound(i, j) for i, j in self.edge_dict]
+        flow = self._graph().greedy_flow(unit, bounds, self.source, self.destination,
+                                         self.demand, links=arrays['link'])
+        if flow is None:
+            return None, None
+        flow = cancel_opposing(flow, arrays['link'])
+        return flow, float(unit @ flow)
+    
+    def _phase(self, monitor, name):
+        """Phase mesurée par monitor (aucune mesure si monitor est None)"""
+        return monitor.phase(name) if monitor is not None else contextlib.nullcontext()
+    
+    def _solver_peak_memory(self):
+        """Pic mémoire de l'environnement Gurobi (octets), None si indisponible"""
+        if self.strategy == 'native':
+            return 0
+        try:
+            return int(self.model.MaxMemUsed * 1e9)
+        except (AttributeError, gp.GurobiError):
+            return None
+    
+    def _solve_model(self, monitor=None, deadline=None, mip_gap=None, start=None):
+        """
+        Résolution par Gurobi (stratégies 'full', 'chunked' et 'lp')
+        
+        Avec une échéance, une solution heuristique est calculée avant la
+        construction (départ du MIP, et réponse de repli si le solveur n'a
+        pas d'incumbent à l'échéance); le solveur reçoit le temps restant.
+        Toute solution réalisable est extraite (SolCount > 0), quel que
+        soit le statut, avec sa borne (best_bound) et son écart (gap).
+        """
+        start = start if start is not None else time.perf_counter()
+        
+        def time_left():
+            return None if deadline is None else deadline - (time.perf_counter() - start)
+        
+        heuristic = heuristic_objective = None
+        if deadline is not None:
+            with self._phase(monitor, 'heuristic'):
+                heuristic, heuristic_objective = self._heuristic_flow()
+        
+        # Construire le modèle (une seule fois), sauf échéance déjà passée
+        with self._phase(monitor, 'build'):
+            if not self.flow_vars and not (deadline is not None and time_left() <= 0):
+                self.build_model()
+        
+        warm_start = None
+        remaining = time_left()
+        expired = remaining is not None and (remaining <= 0 or not self.flow_vars)
+        if not expired:
+            self.apply_solver_profile()
             
-            avg_latency = total_latency / total_flow if total_flow > 0 else 0
+            # Démarrage à chaud depuis la solution stockée la plus proche,
+            # sinon depuis l'heuristique
+            if self.solution_library is not None:
+                warm_start = self.solution_library.warm_start(self)
+            if warm_start is None and heuristic is not None and self.model.IsMIP:
+                self.model.setAttr('Start', list(self.flow_vars.values()), heuristic.tolist())
+                if self.link_used:
+                    # Un binaire par lien: actif si l'un de ses arcs porte du flux
+                    used = np.bincount(self.edge_arrays()['link'], heuristic > 0,
+                                       minlength=len(self.link_arcs)) > 0
+                    self.model.setAttr('Start',
+                                       [self.link_used[arcs[0]] for arcs in self.link_arcs],
+                                       used.astype(float).tolist())
             
-            # Calculer l'utilisation moyenne
-            total_capacity = sum(e['capacity'] for e in self.edge_dict.values())
-            total_capacity_used = sum(flows.values())
-            avg_utilization = total_capacity_used / total_capacity if total_capacity > 0 else 0
+            # Échéance et écart: réappliqués à chaque résolution
+            remaining = time_left()
+            self.model.setParam('TimeLimit', max(remaining, 0.0) if remaining is not None
+                                else GRB.INFINITY)
+            self.model.setParam('MIPGap', mip_gap if mip_gap is not None
+                                else self.solver_params.get('MIPGap', 1e-4))
+        
+        # Mesurer le temps de résolution
+        start_time = time.time()
+        
+        # Résoudre, sauf si la résolution a été annulée avant de démarrer
+        # ou si l'échéance est déjà passée; une annulation arrivée entre ce
+        # test et le démarrage est vue par le rappel _cancel_callback
+        cancelled = self._cancel.is_set()
+        with self._phase(monitor, 'solve'):
+            if not cancelled and not expired:
+                self.model.optimize(self._cancel_callback)
+        
+        solve_time = time.time() - start_time
+        
+        # Extraire les résultats (flux lus en un seul appel)
+        with self._phase(monitor, 'extract'):
+            arrays = self.edge_arrays()
+            solved = not cancelled and not expired
+            status = ('interrupted' if cancelled else
+                      'time_limit' if expired else self.get_status_string())
+            flow = None
+            objective = None
+            best_bound = None
+            message = None
+            incumbent = None
+            if solved and self.model.SolCount > 0:
+                flow = np.array(self.model.getAttr('X', list(self.flow_vars.values())))
+                objective = self.model.ObjVal
+                incumbent = 'solver'
+                if self.model.Status == GRB.OPTIMAL and self.solution_library is not None:
+                    self.solution_library.store(self, flow, solve_time, objective, warm_start)
+            elif not cancelled and heuristic is not None and status in (
+                    'time_limit', 'node_limit', 'iteration_limit', 'solution_limit',
+                    'interrupted'):
+                flow, objective = heuristic, heuristic_objective
+                incumbent = 'heuristic'
             
-            results['total_cost'] = total_cost
-            results['avg_latency'] = avg_latency
-            results['active_links'] = active_flows
-            results['total_flow'] = total_flow
-            results['avg_utilization'] = avg_utilization
-            results['total_capacity'] = total_capacity
-            results['total_capacity_used'] = total_capacity_used
+            if solved and self.model.Status == GRB.OPTIMAL:
+                best_bound = objective
+            elif solved and self.model.IsMIP:
+                best_bound = self.model.ObjBound
             
-            # Trouver les chemins principaux
-            main_paths = self.find_main_paths(flows)
-            results['main_paths'] = main_paths
+            if cancelled or status == 'interrupted':
+                message = "Résolution annulée."
+            elif flow is None:
+                message = "Aucune solution optimale trouvée. Vérifiez les contraintes."
+            elif status != 'optimal':
+                message = "Meilleure solution trouvée à l'échéance (non prouvée optimale)."
             
+            results = RoutingResult(
+                status, solve_time,
+                arrays['tails'], arrays['heads'], arrays['capacity'],
+                arrays['cost'], arrays['latency'], flow, links=arrays['link'],
+                source=self.source, destination=self.destination, demand=self.demand,
+                objective=objective, message=message
+            )
+        if warm_start is not None:
+            results['warm_start'] = warm_start
+        if deadline is not None or mip_gap is not None:
+            results['incumbent'] = incumbent
+            results['best_bound'] = best_bound
+            results['gap'] = (max(0.0, (objective - best_bound) / max(abs(objective), 1e-9))
+                              if objective is not None and best_bound is not None else None)
+            results['elapsed'] = time.perf_counter() - start
+        return results
+    
+    def _solve_native(self, monitor=None):
+        """
+        Résolution sans Gurobi (stratégie 'native')
+        
+        Sans link_used, le problème est un flot de coût minimal: bornes
+        flow_upper_bound (capacité, fiabilité, équilibrage) et coûts
+        objective_coefficient. Les plus courts chemins successifs donnent
+        la même valeur optimale que le modèle (les flux opposés d'un lien
+        bidirectionnel sont annulés: la capacité partagée est respectée).
+        """
+        from flow_algorithms import cancel_opposing, min_cost_flow
+        
+        with self._phase(monitor, 'build'):
+            arrays = self.edge_arrays()
+            bounds = [self.flow_upper_bound(i, j) for i, j in self.edge_dict]
+            unit = [self.objective_coefficient(c, l)
+                    for c, l in zip(arrays['cost'], arrays['latency'])]
+        
+        start_time = time.time()
+        cancelled = self._cancel.is_set()
+        flow = objective = None
+        with self._phase(monitor, 'solve'):
+            if not cancelled:
+                flow, objective = min_cost_flow(self.num_nodes, arrays['tails'], arrays['heads'],
+                                                bounds, unit, self.source, self.destination,
+                                                self.demand)
+                if flow is not None:
+                    flow = cancel_opposing(flow, arrays['link'])
+                    objective = float(np.dot(unit, flow))
+        solve_time = time.time() - start_time
+        
+        if cancelled:
+            status, message = 'interrupted', "Résolution annulée."
+        elif flow is None:
+            status = 'infeasible'
+            message = "Aucune solution optimale trouvée. Vérifiez les contraintes."
         else:
-            results['message'] = "Aucune solution optimale trouvée. Vérifiez les contraintes."
+            status, message = 'optimal', None
+        return RoutingResult(
+            status, solve_time, arrays['tails'], arrays['heads'], arrays['capacity'],
+            arrays['cost'], arrays['latency'], flow, links=arrays['link'],
+            source=self.source, destination=self.destination, demand=self.demand,
+            objective=objective, message=message
+        )
+    
+    def cancel(self):
+        """
+        Interrompre la résolution en cours (appelable depuis un autre thread)
         
-        return results
+        Une résolution qui n'a pas encore démarré est abandonnée; la demande
+        reste active jusqu'à clear_cancel().
+        """
+        self._cancel.set()
+        try:
+            self.model.terminate()
+        except gp.GurobiError:
+            pass  # Modèle en cours de déplacement (move_to_env): le rappel s'en charge
+    
+    def _cancel_callback(self, model, where):
+        """Rappel Gurobi: interrompre dès qu'une annulation est demandée"""
+        if self._cancel.is_set():
+            model.terminate()
+    
+    def clear_cancel(self):
+        """Retirer une demande d'annulation"""
+        self._cancel.clear()
+    
+    async def solve_async(self, executor=None):
+        """
+        Résoudre depuis une boucle asyncio (voir async_solve.py)
+        
+        La résolution tourne dans un pool de threads; annuler la tâche
+        interrompt la résolution.
+        """
+        from async_solve import solve_async
+        
+        return await solve_async(self, executor)
+    
+    def max_throughput(self, source=None, destination=None):
+        """
+        Débit maximal source -> destination en un seul flot maximal
+        (voir capacity_planning.py)
+        
+        Returns:
+            RoutingResult: flot maximal, coupe saturée (cut) et marge de
+            chaque lien (headroom)
+        """
+        from capacity_planning import max_throughput
+        
+        return max_throughput(self, source, destination)
+    
+    def max_concurrent_flow(self, commodities=None):
+        """
+        Facteur λ maximal d'une matrice de trafic, en un seul PL
+        (voir capacity_planning.py)
+        
+        Args:
+            commodities: Liste de (source, destination, volume) (défaut:
+                         la demande de l'optimiseur)
+        
+        Returns:
+            RoutingResult: charge par arc, lambda, liens limitants (cut)
+            et marge de chaque lien (headroom)
+        """
+        from capacity_planning import max_concurrent_flow
+        
+        return max_concurrent_flow(self, commodities)
+    
+    def check_solution(self, flow, objective=None, tol=1e-6, max_violations=5):
+        """
+        Vérifier une solution sans le solveur (voir certificate.py)
+        
+        Conservation, capacités, plafonds de fiabilité et d'équilibrage
+        actifs sur cet optimiseur, et objectif recalculé selon le mode.
+        
+        Args:
+            flow: RoutingResult, dict {(i, j): flux} ou flux par arête
+                  (ordre de flow_vars)
+            objective: Objectif annoncé (défaut: celui du RoutingResult)
+        
+        Returns:
+            Certificate
+        """
+        from certificate import check_flow
+        
+        if isinstance(flow, RoutingResult):
+            objective = flow.objective if objective is None else objective
+            flow = flow.flow
+        if isinstance(flow, dict):
+            flow = [flow.get(e, 0.0) for e in self.edge_dict]
+        arrays = self.edge_arrays()
+        return check_flow(self.num_nodes, arrays['tails'], arrays['heads'], arrays['capacity'],
+                          flow, self.demand, self.source, self.destination,
+                          unit_cost=self.objective_coefficient(arrays['cost'],
+                                                               arrays['latency']),
+                          objective=objective, use_reliability=self.use_reliability,
+                          use_balance=self.use_balance, links=arrays['link'], tol=tol,
+                          max_violations=max_violations)
+    
+    def edge_arrays(self):
+        """Attributs des arêtes en tableaux NumPy, dans l'ordre de flow_vars"""
+        if self._edge_arrays is None:
+            keys = list(self.edge_dict.keys())
+            self._edge_arrays = {
+                'tails': np.array([i for i, _ in keys], dtype=np.int64),
+                'heads': np.array([j for _, j in keys], dtype=np.int64),
+                'capacity': np.array([self.edge_dict[e]['capacity'] for e in keys], dtype=float),
+                'cost': np.array([self.edge_dict[e]['cost'] for e in keys], dtype=float),
+                'latency': np.array([self.edge_dict[e]['latency'] for e in keys], dtype=float),
+                'link': np.array([self._arc_link[e] for e in keys], dtype=np.int64)
+            }
+        return self._edge_arrays
+    
+    def solve_pareto(self, method='parametric', num_points=11, workers=1):
+        """
+        Calculer la frontière de Pareto coût / latence
+        
+        Args:
+            method: 'parametric' (points extrêmes exacts) ou 'epsilon'
+                    (balayage epsilon-contrainte)
+            num_points: Nombre de points du balayage epsilon
+            workers: Nombre de segments du balayage résolus en parallèle
+        
+        Returns:
+            ParetoFrontier: Points non dominés avec leurs flux
+        """
+        from pareto import parametric_frontier, epsilon_frontier
+        
+        if not self.flow_vars:
+            self.build_model()
+        
+        if method == 'parametric':
+            return parametric_frontier(self)
+        elif method == 'epsilon':
+            return epsilon_frontier(self, num_points=num_points, workers=workers)
+        raise ValueError(f"Méthode Pareto inconnue: {method}")
     
-    def get_status_string(self):
-        """Convertir le statut Gurobi en string lisible"""
+    def solve_design(self, fixed_costs, max_active_links=None, method='benders',
+                     time_limit=None, mip_gap=None):
+        """
+        Conception de réseau: coût fixe d'activation par lien
+        
+        Args:
+            fixed_costs: Coût fixe par arête (dict {(i, j): coût} ou liste alignée)
+            max_active_links: Nombre maximal de liens ouverts (optionnel)
+            method: 'benders' (décomposition) ou 'monolithic' (modèle complet)
+            time_limit: Limite de temps (s)
+            mip_gap: Écart relatif d'optimalité visé
+        
+        Returns:
+            dict: Résultats de solve() plus open_links, fixed_cost, objective
+        """
+        from network_design import solve_benders, solve_monolithic
+        
+        if method == 'benders':
+            return solve_benders(self, fixed_costs, max_active_links,
+                                 time_limit=time_limit, mip_gap=mip_gap)
+        elif method == 'monolithic':
+            return solve_monolithic(self, fixed_costs, max_active_links,
+                                    time_limit=time_limit, mip_gap=mip_gap)
+        raise ValueError(f"Méthode de conception inconnue: {method}")
+    
+    def solve_decomposed(self, num_regions=4, workers=None, tol=1e-4, max_iter=500,
+                         time_limit=None, progress=None):
+        """
+        Résolution par régions pour les très grands réseaux
+        
+        Le modèle monolithique n'est pas construit: voir decomposition.py.
+        
+        Args:
+            num_regions: Nombre de régions du partitionnement
+            workers: Processus de calcul (0 = dans le processus courant)
+            tol: Écart relatif visé entre bornes
+            max_iter: Nombre maximal d'itérations de coordination
+            time_limit: Limite de temps (s)
+            progress: Fonction appelée à chaque itération (bornes, écart)
+        
+        Returns:
+            RoutingResult avec lower_bound, upper_bound, gap, history,
+            region_times
+        """
+        from decomposition import solve_decomposed
+        
+        return solve_decomposed(self, num_regions, workers=workers, tol=tol,
+                                max_iter=max_iter, time_limit=time_limit,
+                                progress=progress)
+    
+    def solve_multilevel(self, coarse_nodes=64, coarse_rounds=2, time_limit=None):
+        """
+        Résolution multiniveau: contraction du graphe, résolution grossière,
+        puis raffinement niveau par niveau sur des arcs candidats
+        
+        Le modèle complet n'est pas construit: voir multilevel.py.
+        
+        Args:
+            coarse_nodes: Taille visée du niveau le plus grossier
+            coarse_rounds: Tours de coûts réduits aux niveaux intermédiaires
+            time_limit: Limite de temps (s)
+        
+        Returns:
+            RoutingResult avec levels, time_to_first, first_objective,
+            time_to_optimal et certified
+        """
+        from multilevel import solve_multilevel
+        
+        return solve_multilevel(self, coarse_nodes=coarse_nodes,
+                                coarse_rounds=coarse_rounds, time_limit=time_limit)
+    
+    def solve_unsplittable(self, commodities=None, exact=True, time_limit=10.0,
+                           mip_gap=1e-4, max_columns=1500):
+        """
+        Routage insécable: chaque demande sur un seul chemin
+        
+        Heuristique gloutonne avec recherche locale, puis PLNE sur les
+        chemins amorcée par l'heuristique (voir unsplittable.py).
+        
+        Args:
+            commodities: Liste de (source, destination, volume)
+                         (défaut: la demande de l'optimiseur)
+            exact: Lancer la PLNE après l'heuristique
+            time_limit: Limite de temps (s)
+            mip_gap: Écart relatif visé
+            max_columns: Nombre maximal de chemins dans la PLNE
+        
+        Returns:
+            RoutingResult avec paths, heuristic_cost, lower_bound, gap
+        """
+        from unsplittable import solve_unsplittable
+        
+        return solve_unsplittable(self, commodities, exact=exact, time_limit=time_limit,
+                                  mip_gap=mip_gap, max_columns=max_columns)
+    
+    def solve_sla(self, max_latency=None, max_hops=None, commodities=None,
+                  max_rounds=500, time_limit=None):
+        """
+        Routage dont chaque chemin respecte une latence et/ou un nombre de sauts maximal
+        
+        Formulation par chemins, pricing par plus court chemin sous
+        contraintes de ressources (voir sla_routing.py).
+        
+        Args:
+            max_latency: Latence maximale de bout en bout d'un chemin
+            max_hops: Nombre maximal de sauts d'un chemin
+            commodities: Liste de (source, destination, volume)
+                         (défaut: la demande de l'optimiseur)
+            max_rounds: Tours de génération de colonnes
+            time_limit: Limite de temps (s)
+        
+        Returns:
+            RoutingResult avec paths, max_path_latency, max_path_hops,
+            lower_bound, gap
+        """
+        from sla_routing import solve_sla
+        
+        return solve_sla(self, max_latency=max_latency, max_hops=max_hops,
+                         commodities=commodities, max_rounds=max_rounds,
+                         time_limit=time_limit)
+    
+    def solve_stochastic(self, scenarios, reservation_cost=0.5, risk='expected',
+                         method='l_shaped', workers=None, tol=1e-4, max_iter=200,
+                         time_limit=None, progress=None):
+        """
+        Réservation de capacité sur plusieurs scénarios de demande / coûts
+        
+        Args:
+            scenarios: Liste de dicts {'demand', 'probability', 'cost'}
+                       ou de demandes (voir stochastic.py)
+            reservation_cost: Coût de réservation (fraction du coût
+                              unitaire, dict ou tableau)
+            risk: 'expected' (espérance) ou 'worst_case' (robuste)
+            method: 'l_shaped' (décomposition, scénarios en parallèle) ou
+                    'extensive' (forme étendue, petits N)
+            workers: Processus de calcul (0 = dans le processus courant)
+            tol: Écart relatif visé entre bornes
+            max_iter: Itérations de la décomposition
+            time_limit: Limite de temps (s)
+            progress: Fonction appelée à chaque itération
+        
+        Returns:
+            RoutingResult du flux moyen avec reservation, scenario_costs,
+            expected_cost, worst_case_cost
+        """
+        from stochastic import solve_extensive, solve_stochastic
+        
+        if method == 'l_shaped':
+            return solve_stochastic(self, scenarios, reservation_cost, risk,
+                                    workers=workers, tol=tol, max_iter=max_iter,
+                                    time_limit=time_limit, progress=progress)
+        elif method == 'extensive':
+            return solve_extensive(self, scenarios, reservation_cost, risk,
+                                   time_limit=time_limit)
+        raise ValueError(f"Méthode stochastique inconnue: {method}")
+    
+    def simulate_reliability(self, failure_prob=0.01, mode='max_flow', results=None,
+                             **options):
+        """
+        Fiabilité sous pannes aléatoires de liens (Monte-Carlo)
+        
+        Args:
+            failure_prob: Probabilité de panne (scalaire, dict ou tableau)
+            mode: 'max_flow' (meilleur reroutage) ou 'fixed' (solution fixée)
+            results: Solution évaluée en mode 'fixed' (défaut: self.solve())
+            **options: Paramètres de reliability.simulate_reliability
+                       (max_samples, tol, workers, seed...)
+        
+        Returns:
+            dict: availability, expected_unserved, intervalles de confiance,
+                  critical_links
+        """
+        from reliability import simulate_reliability
+        
+        return simulate_reliability(self, failure_prob, mode=mode, flow=results, **options)
+    
+    def solve_congestion(self, delay='bpr', engine='frank_wolfe', conjugate=True,
+                         max_iter=500, tol=1e-4, **delay_options):
+        """
+        Routage à délai convexe (congestion) au lieu du coût linéaire
+        
+        Args:
+            delay: 'bpr' ou 'kleinrock'
+            engine: 'frank_wolfe' (NumPy, sans solveur, conservation du flot
+                    seulement) ou 'pwl' (Gurobi, contraintes du modèle conservées)
+            conjugate: Direction conjuguée pour Frank-Wolfe
+            max_iter: Itérations (Frank-Wolfe) ou tours de tangentes (pwl)
+            tol: Écart relatif de convergence visé
+            **delay_options: Paramètres de congestion.DelayFunction
+        
+        Returns:
+            dict: flows, total_delay, lower_bound, relative_gap, gap_history,
+                  iteration_times et les métriques de solve()
+        """
+        from congestion import frank_wolfe, solve_pwl
+        from network_model import Network
+        
+        if engine == 'frank_wolfe':
+            network = Network(self.num_nodes, [
+                (i, j, d['capacity'], d['cost'], d['latency'])
+                for (i, j), d in self.edge_dict.items()
+            ], self.demand)
+            return frank_wolfe(network, delay, conjugate=conjugate,
+                               max_iter=max_iter, tol=tol, **delay_options)
+        elif engine == 'pwl':
+            return solve_pwl(self, delay, tol=tol, max_rounds=max_iter, **delay_options)
+        raise ValueError(f"Moteur de congestion inconnu: {engine}")
+    
+    def get_status_string(self, model=None):
+        """Convertir le statut Gurobi en string lisible (modèle principal par défaut)"""
         status_dict = {
             GRB.OPTIMAL: 'optimal',
             GRB.INFEASIBLE: 'infeasible',
@@ -286,35 +1247,17 @@ class NetworkOptimizer:
             GRB.NUMERIC: 'numeric',
             GRB.SUBOPTIMAL: 'suboptimal'
         }
-        return status_dict.get(self.model.Status, 'unknown')
+        model = model if model is not None else self.model
+        return status_dict.get(model.Status, 'unknown')
     
     def find_main_paths(self, flows):
         """Trouver les chemins principaux utilisés"""
-        paths = []
-        
-        # Utiliser un algorithme de recherche en profondeur pour trouver les chemins
-        def dfs_path(node, visited, path, remaining_flow):
-            if node == self.destination and remaining_flow > 0.01:
-                # Chemin trouvé
-                path_str = " → ".join(str(n) for n in path)
-                paths.append(f"Chemin: {path_str} | Flux: {remaining_flow:.2f}")
-                return
-            
-            for (i, j) in flows.keys():
-                if i == node and j not in visited and flows[(i, j)] > 0.01:
-                    flow_to_use = min(remaining_flow, flows[(i, j)])
-                    visited.add(j)
-                    path.append(j)
-                    dfs_path(j, visited.copy(), path.copy(), flow_to_use)
-                    
-        # Limiter à 5 chemins principaux
-        visited_start = {self.source}
-        dfs_path(self.source, visited_start, [self.source], self.demand)
-        
-        return paths[:5]  # Retourner au plus 5 chemins
+        return find_main_paths(flows, self.source, self.destination, self.demand)
     
     def get_model_statistics(self):
-        """Obtenir des statistiques sur le modèle"""
+        """Obtenir des statistiques sur le modèle (construit si besoin)"""
+        if not self.flow_vars and self.strategy != 'native':
+            self.build_model()
         return {
             'num_variables': self.model.NumVars,
             'num_constraints': self.model.NumConstrs,
@@ -0,0 +1,321 @@
+"""
+Frontière de Pareto coût / latence pour le routage de données
+
+Les variables binaires link_used n'interviennent pas dans l'objectif:
+projeté sur les flux, le problème est un PL bi-objectif. La frontière
+non dominée est donc linéaire par morceaux et convexe, ce qui permet:
+  - une méthode paramétrique exacte (recherche dichotomique sur les poids)
+    qui trouve tous les points extrêmes de la frontière
+  - un balayage epsilon-contrainte où chaque point repart de la base
+    de son voisin, les segments indépendants étant résolus en parallèle
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from solver_env import env_pool, thread_budget
+
+
+class ParetoFrontier:
+    """Points non dominés coût / latence, triés par coût croissant"""
+
+    def __init__(self, edges, points, method, solve_time):
+        """
+        Args:
+            edges: Liste ordonnée des arêtes (i, j)
+            points: Liste de dicts {'cost', 'latency', 'flows'}
+            method: Méthode utilisée ('parametric' ou 'epsilon')
+            solve_time: Temps total de calcul (s)
+        """
+        self.edges = edges
+        self.points = sorted(points, key=lambda p: (p['cost'], p['latency']))
+        self.method = method
+        self.solve_time = solve_time
+
+    def __len__(self):
+        return len(self.points)
+
+    def __iter__(self):
+        return iter(self.points)
+
+    def __getitem__(self, index):
+        return self.points[index]
+
+    def select(self, max_latency=None, max_cost=None):
+        """
+        Choisir un point de la frontière sans nouvelle résolution
+
+        Entre deux points consécutifs, les flux sont interpolés
+        linéairement (toute combinaison convexe reste réalisable).
+
+        Args:
+            max_latency: Latence totale maximale -> point le moins coûteux
+            max_cost: Coût total maximal -> point de latence minimale
+
+        Returns:
+            dict: Point {'cost', 'latency', 'flows'} ou None si aucun
+        """
+        if not self.points:
+            return None
+
+        if max_latency is not None:
+            for k, point in enumerate(self.points):
+                if point['latency'] <= max_latency + 1e-9:
+                    if k == 0:
+                        return point
+                    prev = self.points[k - 1]
+                    t = (prev['latency'] - max_latency) / (prev['latency'] - point['latency'])
+                    return self._interpolate(prev, point, t)
+            return None
+
+        if max_cost is not None:
+            for k in range(len(self.points) - 1, -1, -1):
+                point = self.points[k]
+                if point['cost'] <= max_cost + 1e-9:
+                    if k == len(self.points) - 1:
+                        return point
+                    nxt = self.points[k + 1]
+                    t = (max_cost - point['cost']) / (nxt['cost'] - point['cost'])
+                    return self._interpolate(point, nxt, t)
+            return None
+
+        return self.points[0]
+
+    def _interpolate(self, a, b, t):
+        """Combinaison convexe (1-t)*a + t*b de deux points"""
+        flows = {
+            edge: (1 - t) * a['flows'][edge] + t * b['flows'][edge]
+            for edge in self.edges
+        }
+        return {
+            'cost': (1 - t) * a['cost'] + t * b['cost'],
+            'latency': (1 - t) * a['latency'] + t * b['latency'],
+            'flows': flows,
+            'interpolated': True
+        }
+
+
+def _working_model(optimizer):
+    """
+    Copie relaxée (PL) du modèle et expressions coût / latence
+
+    Les variables de flux sont retrouvées par position: les stratégies
+    'chunked' et 'lp' ne nomment pas leurs variables.
+    """
+    optimizer.model.update()
+    model = optimizer.model.relax()
+    model.setParam('OutputFlag', 0)
+
+    edges = list(optimizer.edge_dict.keys())
+    variables = model.getVars()
+    flow_vars = [variables[optimizer.flow_vars[e].index] for e in edges]
+    costs = np.array([optimizer.edge_dict[e]['cost'] for e in edges], dtype=float)
+    latencies = np.array([optimizer.edge_dict[e]['latency'] for e in edges], dtype=float)
+
+    return model, edges, flow_vars, costs, latencies
+
+
+def _expressions(flow_vars, costs, latencies):
+    cost_expr = gp.LinExpr(costs.tolist(), flow_vars)
+    latency_expr = gp.LinExpr(latencies.tolist(), flow_vars)
+    return cost_expr, latency_expr
+
+
+def _extract_point(model, edges, flow_vars, costs, latencies):
+    """Lire la solution courante sous forme de point de la frontière"""
+    x = np.array(model.getAttr('X', flow_vars))
+    return {
+        'cost': float(x @ costs),
+        'latency': float(x @ latencies),
+        'flows': dict(zip(edges, x.tolist()))
+    }
+
+
+def _solve_lexicographic(model, primary, secondary, context):
+    """Minimiser primary, puis secondary à primary optimal"""
+    model.setObjective(primary, GRB.MINIMIZE)
+    model.optimize()
+    if model.Status != GRB.OPTIMAL:
+        return None
+
+    best = model.ObjVal
+    fix = model.addConstr(primary <= best + 1e-7 * max(1.0, abs(best)),
+                          name="pareto_lexico")
+    model.setObjective(secondary, GRB.MINIMIZE)
+    model.optimize()
+    point = _extract_point(model, *context)
+    model.remove(fix)
+    model.update()
+    return point
+
+
+def _non_dominated(points, tol=1e-6):
+    """Filtrer les points dominés (et les doublons)"""
+    points = sorted(points, key=lambda p: (p['cost'], p['latency']))
+    front = []
+    for point in points:
+        if not front or point['latency'] < front[-1]['latency'] - tol * max(1.0, abs(point['latency'])):
+            front.append(point)
+    return front
+
+
+def _endpoints(model, context):
+    """Points extrêmes: coût minimal et latence minimale"""
+    _, flow_vars, costs, latencies = context
+    cost_expr, latency_expr = _expressions(flow_vars, costs, latencies)
+
+    min_cost = _solve_lexicographic(model, cost_expr, latency_expr, context)
+    if min_cost is None:
+        return None, None
+    min_latency = _solve_lexicographic(model, latency_expr, cost_expr, context)
+    return min_cost, min_latency
+
+
+def parametric_frontier(optimizer, tol=1e-6):
+    """
+    Frontière exacte par recherche dichotomique sur les poids (NISE)
+
+    Pour deux points voisins A et B, on minimise w_c*coût + w_l*latence
+    avec des poids normaux au segment [A, B]. Un point strictement
+    meilleur est un nouveau point extrême; sinon [A, B] est une arête de
+    la frontière. Le modèle est réutilisé: seul l'objectif change, le
+    simplexe repart de la base précédente.
+
+    Args:
+        optimizer: NetworkOptimizer dont le modèle est construit
+        tol: Tolérance relative d'amélioration
+
+    Returns:
+        ParetoFrontier
+    """
+    start_time = time.time()
+    model, edges, flow_vars, costs, latencies = _working_model(optimizer)
+    context = (edges, flow_vars, costs, latencies)
+    try:
+        cost_expr, latency_expr = _expressions(flow_vars, costs, latencies)
+        a, b = _endpoints(model, context)
+        if a is None:
+            return ParetoFrontier(edges, [], 'parametric', time.time() - start_time)
+
+        points = [a, b]
+        stack = [(a, b)]
+        while stack:
+            p, q = stack.pop()
+            w_cost = p['latency'] - q['latency']
+            w_latency = q['cost'] - p['cost']
+            if w_cost <= tol or w_latency <= tol:
+                continue
+
+            norm = w_cost + w_latency
+            model.setObjective((w_cost / norm) * cost_expr + (w_latency / norm) * latency_expr,
+                               GRB.MINIMIZE)
+            model.optimize()
+            if model.Status != GRB.OPTIMAL:
+                continue
+
+            r = _extract_point(model, *context)
+            reference = (w_cost * p['cost'] + w_latency * p['latency']) / norm
+            value = (w_cost * r['cost'] + w_latency * r['latency']) / norm
+            if value < reference - tol * max(1.0, abs(reference)):
+                points.append(r)
+                stack.append((p, r))
+                stack.append((r, q))
+
+        return ParetoFrontier(edges, _non_dominated(points, tol), 'parametric',
+                              time.time() - start_time)
+    finally:
+        model.dispose()
+
+
+def _epsilon_segment(model, context, epsilons):
+    """Résoudre une suite de points epsilon sur un même modèle"""
+    _, flow_vars, costs, latencies = context
+    cost_expr, latency_expr = _expressions(flow_vars, costs, latencies)
+
+    bound = model.addConstr(latency_expr <= float(epsilons[0]), name="pareto_epsilon")
+    model.setObjective(cost_expr, GRB.MINIMIZE)
+
+    points = []
+    for eps in epsilons:
+        # Seul le second membre change: le dual simplexe repart de la base voisine
+        bound.RHS = float(eps)
+        model.optimize()
+        if model.Status == GRB.OPTIMAL:
+            points.append(_extract_point(model, *context))
+    return points
+
+
+def _epsilon_worker(model, lock, indices, context, epsilons, workers):
+    """Résoudre un segment sur une copie du modèle dans un environnement du pool"""
+    edges, _, costs, latencies = context
+    # Les environnements Gurobi ne sont pas partagés entre threads
+    with env_pool().acquire() as env:
+        with lock:
+            copy = model.copy(env=env)
+        # La copie prend les paramètres de l'environnement: threads à repartager
+        copy.Params.Threads = thread_budget(workers)
+        variables = copy.getVars()
+        copy_vars = [variables[k] for k in indices]
+        try:
+            return _epsilon_segment(copy, (edges, copy_vars, costs, latencies), epsilons)
+        finally:
+            copy.dispose()
+
+
+def epsilon_frontier(optimizer, num_points=11, workers=1):
+    """
+    Frontière échantillonnée par epsilon-contrainte
+
+    On minimise le coût sous latence <= epsilon, epsilon parcourant
+    l'intervalle entre les deux points extrêmes. L'intervalle est découpé
+    en segments contigus; chaque segment est résolu séquentiellement
+    (démarrage à chaud depuis le point voisin) et les segments en
+    parallèle, chacun sur sa propre copie du modèle dans un environnement
+    emprunté au pool partagé.
+
+    Args:
+        optimizer: NetworkOptimizer dont le modèle est construit
+        num_points: Nombre total de points (extrémités comprises)
+        workers: Nombre de segments parallèles
+
+    Returns:
+        ParetoFrontier
+    """
+    start_time = time.time()
+    model, edges, flow_vars, costs, latencies = _working_model(optimizer)
+    context = (edges, flow_vars, costs, latencies)
+
+    try:
+        a, b = _endpoints(model, context)
+        if a is None:
+            return ParetoFrontier(edges, [], 'epsilon', time.time() - start_time)
+
+        # Du coût minimal (latence haute) vers la latence minimale
+        epsilons = np.linspace(a['latency'], b['latency'], max(num_points, 2))[1:-1]
+        points = [a, b]
+
+        if len(epsilons) > 0:
+            workers = max(1, min(workers, len(epsilons)))
+            segments = [seg for seg in np.array_split(epsilons, workers) if len(seg)]
+
+            if workers == 1:
+                points.extend(_epsilon_segment(model, context, segments[0]))
+            else:
+                lock = threading.Lock()
+                indices = [v.index for v in flow_vars]
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(_epsilon_worker, model, lock, indices,
+                                           context, segment, workers)
+                               for segment in segments]
+                    for future in futures:
+                        points.extend(future.result())
+
+        return ParetoFrontier(edges, _non_dominated(points), 'epsilon',
+                              time.time() - start_time)
+    finally:
+        model.dispose()
@@ -0,0 +1,316 @@
+"""
+Fiabilité du routage sous pannes aléatoires de liens (Monte-Carlo)
+
+Chaque lien tombe en panne indépendamment avec sa probabilité (les deux
+arcs d'un lien bidirectionnel tombent ensemble). Pour
+chaque scénario tiré, on calcule le flux effectivement acheminé:
+  - mode 'max_flow': flot maximal sur les liens survivants (borné par la
+    demande), c'est-à-dire le meilleur reroutage possible
+  - mode 'fixed': la solution fixée est décomposée en chemins; un chemin
+    ne livre son flux que si tous ses liens survivent. Avec reroute=True,
+    le flux perdu est rerouté sur la capacité restante (flot maximal
+    sur le graphe résiduel)
+
+Les scénarios sont tirés par lots vectorisés (matrice de pannes
+lots x liens); seuls les motifs de panne distincts qui touchent le flux
+de référence demandent un calcul de flot. Les lots peuvent être répartis
+sur plusieurs processus. Le tirage s'arrête dès que les intervalles de
+confiance de la disponibilité et de la demande non servie sont assez
+étroits.
+
+Résultats: disponibilité (probabilité de servir toute la demande),
+demande non servie espérée, intervalles de confiance et liens critiques
+(hausse de la demande non servie espérée quand le lien est en panne).
+"""
+
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from flow_algorithms import FlowNetwork, cancel_opposing, flow_decomposition
+
+RELIABILITY_MODES = ('max_flow', 'fixed')
+
+
+def _failure_probabilities(failure_prob, link_arcs):
+    """
+    Probabilité de panne par lien (scalaire, dict {(i, j): p} ou tableau
+    aligné sur les liens); un lien bidirectionnel est trouvé dans le dict
+    par l'un ou l'autre de ses arcs
+    """
+    if isinstance(failure_prob, dict):
+        probs = np.array([next((failure_prob[arc] for arc in arcs if arc in failure_prob), 0.0)
+                          for arcs in link_arcs], dtype=float)
+    else:
+        probs = np.broadcast_to(np.asarray(failure_prob, dtype=float),
+                                (len(link_arcs),)).copy()
+    if np.any((probs < 0) | (probs > 1)):
+        raise ValueError("Les probabilités de panne doivent être dans [0, 1]")
+    return probs
+
+
+def _simulation_data(optimizer, failure_prob, mode, flow, reroute, tol):
+    """
+    Données (sérialisables) transmises aux processus de simulation
+
+    Les pannes sont tirées par lien: keys contient le premier arc de chaque
+    lien, et links l'indice du lien de chaque arc.
+    """
+    arrays = optimizer.edge_arrays()
+    tails, heads, capacity, links = (arrays['tails'], arrays['heads'],
+                                     arrays['capacity'], arrays['link'])
+    keys = [arcs[0] for arcs in optimizer.link_arcs]
+    link_capacity = np.zeros(len(keys))
+    link_capacity[links] = capacity
+    data = {
+        'mode': mode,
+        'graph': FlowNetwork(optimizer.num_nodes, tails, heads),
+        'capacity': capacity,
+        'links': links,
+        'link_capacity': link_capacity,
+        'source': optimizer.source,
+        'destination': optimizer.destination,
+        'demand': float(optimizer.demand),
+        'probs': _failure_probabilities(failure_prob, optimizer.link_arcs),
+        'reroute': reroute,
+        'tol': tol
+    }
+
+    if mode == 'max_flow':
+        value, reference, _ = data['graph'].max_flow(capacity, optimizer.source,
+                                                     optimizer.destination)
+        data['nominal'] = min(value, data['demand'])
+        # Flux net par lien: la charge tient dans la capacité partagée
+        flow = cancel_opposing(reference, links)
+    paths = flow_decomposition(optimizer.num_nodes, tails, heads, flow,
+                               optimizer.source, optimizer.destination, tol)
+    incidence = np.zeros((len(paths), len(tails)))
+    for p, (edges, _) in enumerate(paths):
+        incidence[p, edges] = 1.0
+    data['incidence'] = incidence
+    data['path_flow'] = np.array([amount for _, amount in paths])
+    return keys, data
+
+
+def _max_flow_values(data, capacities, initial_flows):
+    """Flot maximal source -> destination pour chaque ligne de capacités"""
+    graph = data['graph']
+    return np.array([
+        graph.max_flow(cap, data['source'], data['destination'], initial_flow=initial)[0]
+        for cap, initial in zip(capacities, initial_flows)
+    ])
+
+
+def _delivered(data, failed):
+    """Flux acheminé pour chaque scénario (lignes de la matrice de pannes par lien)"""
+    demand = data['demand']
+    tol = data['tol']
+    incidence = data['incidence']
+    path_flow = data['path_flow']
+    links = data['links']
+
+    # Chemins de référence: un chemin livre son flux si aucun de ses liens
+    # n'est en panne (produit matriciel sur tout le lot)
+    path_down = failed[:, links].astype(float) @ incidence.T > 0
+    delivered = (~path_down).astype(float) @ path_flow
+
+    if data['mode'] == 'max_flow':
+        # Flot maximal seulement si les chemins survivants ne suffisent
+        # pas, en repartant de leur flux
+        delivered = np.minimum(delivered, data['nominal'])
+        short = delivered < data['nominal'] - tol
+        if short.any():
+            patterns, first, inverse = np.unique(failed[short], axis=0, return_index=True,
+                                                 return_inverse=True)
+            survivors = (~path_down[short][first]).astype(float)
+            values = _max_flow_values(data, data['capacity'] * ~patterns[:, links],
+                                      (survivors * path_flow) @ incidence)
+            delivered[short] = np.minimum(values, demand)[inverse.ravel()]
+    elif data['reroute']:
+        # Flux perdu rerouté sur la capacité laissée par les chemins survivants
+        lost = delivered < demand - tol
+        if lost.any():
+            patterns, first, inverse = np.unique(failed[lost], axis=0, return_index=True,
+                                                 return_inverse=True)
+            survivors = (~path_down[lost][first]).astype(float)
+            # Capacité restante par lien (partagée par ses deux arcs)
+            load = (survivors * path_flow) @ incidence
+            residual = data['link_capacity'] * ~patterns
+            for row, arc_load in zip(residual, load):
+                np.subtract.at(row, links, arc_load)
+            residual = np.maximum(residual, 0.0)[:, links]
+            values = _max_flow_values(data, residual, np.zeros_like(residual))
+            extra = np.minimum(values, demand - delivered[lost][first])
+            delivered[lost] += extra[inverse.ravel()]
+    return delivered
+
+
+def _simulate_batch(data, seed, size):
+    """
+    Simuler un lot de scénarios
+
+    Returns:
+        dict: sommes du lot (scénarios, scénarios servis, demande non servie
+              et son carré, pannes et demande non servie par lien)
+    """
+    rng = np.random.default_rng(seed)
+    failed = rng.random((size, len(data['probs']))) < data['probs']
+    unserved = np.maximum(data['demand'] - _delivered(data, failed), 0.0)
+    return {
+        'samples': size,
+        'available': int(np.sum(unserved <= data['tol'] * max(1.0, data['demand']))),
+        'unserved': float(unserved.sum()),
+        'unserved_sq': float(unserved @ unserved),
+        'edge_failures': failed.sum(axis=0),
+        'edge_unserved': unserved @ failed
+    }
+
+
+def _wilson_interval(successes, n, z):
+    """Intervalle de confiance de Wilson d'une proportion"""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def simulate_reliability(optimizer, failure_prob=0.01, mode='max_flow', flow=None,
+                         reroute=True, max_samples=100000, batch_size=2048,
+                         min_samples=4096, tol=0.002, confidence=0.95, workers=0,
+                         seed=None, top_links=5, progress=None):
+    """
+    Estimer la fiabilité du routage sous pannes aléatoires de liens
+
+    Args:
+        optimizer: NetworkOptimizer (seules ses données sont utilisées)
+        failure_prob: Probabilité de panne: scalaire, dict {(i, j): p}
+                      ou tableau aligné sur les liens (optimizer.edges);
+                      les deux arcs d'un lien bidirectionnel tombent ensemble
+        mode: 'max_flow' (meilleur reroutage) ou 'fixed' (solution fixée)
+        flow: Flux par arête de la solution fixée (RoutingResult ou
+              tableau); mode 'fixed' seulement, défaut: optimizer.solve()
+        reroute: Mode 'fixed': rerouter le flux perdu sur la capacité restante
+        max_samples: Nombre maximal de scénarios
+        batch_size: Scénarios par lot vectorisé
+        min_samples: Scénarios tirés avant de tester la convergence
+        tol: Demi-largeur visée des intervalles de confiance (disponibilité,
+             et demande non servie rapportée à la demande)
+        confidence: Niveau des intervalles de confiance
+        workers: Processus de calcul (0 = dans le processus courant)
+        seed: Graine du générateur aléatoire
+        top_links: Nombre de liens critiques rapportés
+        progress: Fonction appelée après chaque tour de lots (dict d'état)
+
+    Returns:
+        dict: availability, availability_ci, expected_unserved,
+              expected_unserved_ci, samples, converged, critical_links,
+              history, time, mode
+    """
+    if mode not in RELIABILITY_MODES:
+        raise ValueError(f"Mode inconnu: {mode} (attendu: {', '.join(RELIABILITY_MODES)})")
+    if max_samples < 1:
+        raise ValueError("max_samples doit être au moins 1")
+    start_time = time.time()
+    if mode == 'fixed':
+        if flow is None:
+            flow = optimizer.solve()
+        if hasattr(flow, 'flow'):
+            flow = flow.flow
+        if flow is None:
+            raise ValueError("Aucune solution à évaluer")
+    keys, data = _simulation_data(optimizer, failure_prob, mode, flow, reroute, 1e-9)
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    demand = data['demand']
+    seeds = np.random.SeedSequence(seed)
+    totals = {
+        'samples': 0, 'available': 0, 'unserved': 0.0, 'unserved_sq': 0.0,
+        'edge_failures': np.zeros(len(keys)), 'edge_unserved': np.zeros(len(keys))
+    }
+    history = []
+    converged = False
+
+    executor = None
+    if workers:
+        executor = ProcessPoolExecutor(max_workers=workers,
+                                       mp_context=multiprocessing.get_context('spawn'))
+    try:
+        while totals['samples'] < max_samples:
+            # Un tour: un lot par processus
+            sizes = []
+            for _ in range(max(1, workers)):
+                size = min(batch_size, max_samples - totals['samples'] - sum(sizes))
+                if size > 0:
+                    sizes.append(size)
+            children = seeds.spawn(len(sizes))
+            if executor is None:
+                batches = [_simulate_batch(data, child, size)
+                           for child, size in zip(children, sizes)]
+            else:
+                batches = list(executor.map(_simulate_batch, [data] * len(sizes),
+                                            children, sizes))
+            for batch in batches:
+                for key in totals:
+                    totals[key] = totals[key] + batch[key]
+
+            n = totals['samples']
+            availability = totals['available'] / n
+            low, high = _wilson_interval(totals['available'], n, z)
+            mean = totals['unserved'] / n
+            variance = max(0.0, totals['unserved_sq'] / n - mean * mean) * n / max(1, n - 1)
+            half = z * math.sqrt(variance / n)
+            entry = {
+                'samples': n,
+                'availability': availability,
+                'availability_ci': (low, high),
+                'expected_unserved': mean,
+                'expected_unserved_ci': (max(0.0, mean - half), mean + half),
+                'time': time.time() - start_time
+            }
+            history.append(entry)
+            if progress is not None:
+                progress(entry)
+
+            if n >= min_samples and (high - low) / 2 <= tol and half <= tol * max(demand, 1e-9):
+                converged = True
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Liens critiques: E[non servi | lien en panne] - E[non servi | lien actif]
+    failures = totals['edge_failures']
+    up = n - failures
+    down_mean = np.divide(totals['edge_unserved'], failures,
+                          out=np.zeros(len(keys)), where=failures > 0)
+    up_mean = np.divide(totals['unserved'] - totals['edge_unserved'], up,
+                        out=np.zeros(len(keys)), where=up > 0)
+    importance = np.where(failures > 0, down_mean - up_mean, 0.0)
+    order = np.argsort(-importance, kind='stable')[:top_links]
+    critical = [{
+        'edge': keys[k],
+        'importance': float(importance[k]),
+        'failure_prob': float(data['probs'][k]),
+        'failures': int(failures[k])
+    } for k in order.tolist() if importance[k] > 0]
+
+    return {
+        'mode': mode,
+        'availability': entry['availability'],
+        'availability_ci': entry['availability_ci'],
+        'expected_unserved': entry['expected_unserved'],
+        'expected_unserved_ci': entry['expected_unserved_ci'],
+        'expected_delivered': demand - entry['expected_unserved'],
+        'samples': n,
+        'converged': converged,
+        'critical_links': critical,
+        'history': history,
+        'time': time.time() - start_time
+    }
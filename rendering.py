@@ -0,0 +1,340 @@
+"""
+Rendu des schémas de réseau, avec ou sans interface
+
+draw_network() porte le style de la visualisation (source en vert,
+destination en rouge clair, arêtes avec flux en rouge, arêtes inactives
+en pointillés gris): NetworkCanvas l'utilise dans la fenêtre Qt, et les
+fonctions de rendu l'utilisent sans QApplication, sur le moteur Agg
+(Figure + FigureCanvasAgg, sans pyplot).
+
+Pour les rapports en lot:
+  - positions des nœuds mises en cache par topologie (spring_layout n'est
+    calculé qu'une fois par topologie et par processus; les travaux de
+    même topologie sont regroupés dans les mêmes paquets)
+  - arêtes et pointes de flèches dessinées en collections (une
+    LineCollection et une PolyCollection par style) au lieu d'un patch
+    par arête
+  - rendu réparti sur plusieurs processus
+
+Exemple:
+    render_batch([{'name': 'reseau_1', 'num_nodes': 6, 'edges': edges,
+                   'flows': results}], 'rapports', fmt='svg', workers=4)
+"""
+
+import argparse
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+
+from metrics import ACTIVE_THRESHOLD
+from network_model import expand_links, is_bidirectional
+
+NODE_SIZE = 800
+SOURCE_COLOR = 'lightgreen'
+DESTINATION_COLOR = 'lightcoral'
+NODE_COLOR = 'lightblue'
+DEFAULT_TITLE = "Réseau de routage de données"
+
+# Style des arêtes: couleur, épaisseur (pt), longueur de la pointe (pt), tirets
+FLOW_STYLE = ('red', 3.0, 12.0, 'solid')
+IDLE_STYLE = ('gray', 1.0, 9.0, 'dashed')
+PLAIN_STYLE = ('gray', 2.0, 12.0, 'solid')
+
+# Au-delà, les étiquettes ('auto') sont omises: illisibles et coûteuses
+MAX_EDGE_LABELS = 60
+MAX_NODE_LABELS = 200
+
+LAYOUT_CACHE_SIZE = 256
+_layouts = OrderedDict()
+
+
+def topology_key(num_nodes, edges):
+    """Clé de la topologie (nœuds et arêtes orientées)"""
+    return num_nodes, tuple(sorted({(int(e[0]), int(e[1])) for e in edges}))
+
+
+def network_layout(num_nodes, edges):
+    """
+    Positions des nœuds (spring_layout de la visualisation), en cache par topologie
+
+    Returns:
+        ndarray: Coordonnées (num_nodes x 2)
+    """
+    import networkx as nx
+
+    key = topology_key(num_nodes, edges)
+    pos = _layouts.get(key)
+    if pos is None:
+        G = nx.DiGraph()
+        G.add_nodes_from(range(num_nodes))
+        G.add_edges_from(key[1])
+        layout = nx.spring_layout(G, k=2, iterations=50, seed=42)
+        pos = np.array([layout[node] for node in range(num_nodes)], dtype=float)
+        _layouts[key] = pos
+        if len(_layouts) > LAYOUT_CACHE_SIZE:
+            _layouts.popitem(last=False)
+    else:
+        _layouts.move_to_end(key)
+    return pos
+
+
+def _flow_dict(flows, edges):
+    """Flux par arête {(i, j): flux} depuis un dict, un RoutingResult ou un tableau"""
+    if flows is None or isinstance(flows, dict):
+        return flows
+    if getattr(flows, 'flow', None) is not None:
+        return dict(zip(flows.edge_keys, np.asarray(flows.flow).tolist()))
+    if hasattr(flows, 'flow'):
+        return None
+    values = np.asarray(flows, dtype=float).tolist()
+    return {(a[0], a[1]): f for a, f in zip(expand_links(edges)[0], values)}
+
+
+def _draw_edges(ax, pixels, tails, heads, style, radius, both=None):
+    """
+    Segments et pointes de flèches d'un style, en deux collections
+    (both: liens bidirectionnels, une pointe à chaque extrémité)
+    """
+    if len(tails) == 0:
+        return
+    color, width, head, dashes = style
+    scale = ax.figure.dpi / 72.0
+    start, end = pixels[tails], pixels[heads]
+    vector = end - start
+    length = np.maximum(np.hypot(vector[:, 0], vector[:, 1]), 1e-9)[:, None]
+    unit = vector / length
+    normal = np.column_stack([-unit[:, 1], unit[:, 0]])
+    # Raccourcir aux bords des disques des nœuds
+    gap = np.minimum(radius, 0.45 * length)
+    tip = end - unit * gap
+    arrow = np.minimum(head * scale, 0.5 * length)
+    base = tip - unit * arrow
+    start = start + unit * gap
+
+    to_data = ax.transData.inverted()
+    half = 0.4 * head * scale
+    triangles = np.stack([tip, base + normal * half, base - normal * half], axis=1)
+    if both is not None and np.any(both):
+        # Pointe arrière: le segment part de sa base
+        back = start[both] + unit[both] * arrow[both]
+        triangles = np.concatenate([triangles, np.stack(
+            [start[both], back + normal[both] * half, back - normal[both] * half], axis=1)])
+        start = start.copy()
+        start[both] = back
+    segments = to_data.transform(np.concatenate([start, base])).reshape(2, -1, 2)
+    triangles = to_data.transform(triangles.reshape(-1, 2)).reshape(-1, 3, 2)
+
+    ax.add_collection(LineCollection(np.stack(segments, axis=1), colors=color,
+                                     linewidths=width, linestyles=dashes, zorder=1))
+    ax.add_collection(PolyCollection(triangles, facecolors=color, edgecolors=color,
+                                     linewidths=0.5, zorder=1))
+
+
+def draw_network(ax, num_nodes, edges_data, flow_solution=None, pos=None,
+                 title=DEFAULT_TITLE, edge_labels='auto', node_labels='auto', tight=True):
+    """
+    Dessiner le réseau (et la solution) sur des axes matplotlib
+
+    Args:
+        ax: Axes matplotlib (Qt ou Agg)
+        num_nodes: Nombre de nœuds
+        edges_data: Liste de tuples (source, dest, capacity, cost, latency);
+                    un lien bidirectionnel (sixième champ True) est dessiné
+                    une fois, orienté selon son flux net s'il en porte
+        flow_solution: Flux par arc (dict {(i, j): flux}, RoutingResult
+                       ou tableau aligné sur les arcs), optionnel
+        pos: Positions des nœuds (défaut: network_layout())
+        title: Titre du schéma
+        edge_labels: Étiquettes des arêtes (True, False ou 'auto')
+        node_labels: Numéros des nœuds (True, False ou 'auto')
+        tight: Ajuster la mise en page (tight_layout) avant de placer les flèches
+    """
+    flow_solution = _flow_dict(flow_solution, edges_data)
+    pos = network_layout(num_nodes, edges_data) if pos is None else np.asarray(pos, float)
+    fig = ax.figure
+
+    ax.clear()
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.axis('off')
+    if len(pos):
+        low, high = pos.min(axis=0), pos.max(axis=0)
+        margin = 0.1 * np.maximum(high - low, 1e-3)
+        ax.set_xlim(low[0] - margin[0], high[0] + margin[0])
+        ax.set_ylim(low[1] - margin[1], high[1] + margin[1])
+    if tight:
+        fig.tight_layout()
+
+    # Nœuds: une seule collection
+    colors = [NODE_COLOR] * num_nodes
+    if num_nodes:
+        colors[0] = SOURCE_COLOR
+        colors[-1] = DESTINATION_COLOR
+    ax.scatter(pos[:, 0], pos[:, 1], s=NODE_SIZE, c=colors, zorder=2)
+    if node_labels is True or (node_labels == 'auto' and num_nodes <= MAX_NODE_LABELS):
+        for node, (x, y) in enumerate(pos.tolist()):
+            ax.text(x, y, str(node), fontsize=10, fontweight='bold',
+                    ha='center', va='center', zorder=3)
+
+    # Arêtes: regroupées par style, une par lien
+    tails = np.array([e[0] for e in edges_data], dtype=np.int64)
+    heads = np.array([e[1] for e in edges_data], dtype=np.int64)
+    both = np.array([is_bidirectional(e) for e in edges_data], dtype=bool)
+    labels = {}
+    if flow_solution:
+        forward = np.array([flow_solution.get((e[0], e[1]), 0.0) for e in edges_data])
+        backward = np.array([flow_solution.get((e[1], e[0]), 0.0) if b else 0.0
+                             for e, b in zip(edges_data, both)])
+        known = np.array([(e[0], e[1]) in flow_solution
+                          or (b and (e[1], e[0]) in flow_solution)
+                          for e, b in zip(edges_data, both)], dtype=bool)
+        # Lien bidirectionnel: orienté selon le sens de son flux net
+        reverse = backward > forward
+        tails, heads = np.where(reverse, heads, tails), np.where(reverse, tails, heads)
+        flows = np.abs(forward - backward)
+        active = known & (flows > ACTIVE_THRESHOLD)
+        styles = ((active, FLOW_STYLE), (~active, IDLE_STYLE))
+        both = both & ~active
+        for k, edge in enumerate(edges_data):
+            if active[k]:
+                labels[k] = f"Flow: {flows[k]:.1f}\nCost: {edge[3]}"
+            elif not known[k]:
+                labels[k] = f"Cap: {edge[2]}\nCost: {edge[3]}"
+    else:
+        styles = ((np.ones(len(edges_data), dtype=bool), PLAIN_STYLE),)
+        labels = {k: f"Cap: {e[2]}\nCost: {e[3]}" for k, e in enumerate(edges_data)}
+
+    pixels = ax.transData.transform(pos) if len(pos) else np.zeros((0, 2))
+    radius = 0.5 * np.sqrt(NODE_SIZE) * fig.dpi / 72.0
+    for mask, style in styles:
+        _draw_edges(ax, pixels, tails[mask], heads[mask], style, radius, both[mask])
+
+    if edge_labels is True or (edge_labels == 'auto' and len(edges_data) <= MAX_EDGE_LABELS):
+        for k, text in labels.items():
+            x, y = 0.5 * (pos[tails[k]] + pos[heads[k]])
+            ax.text(x, y, text, fontsize=7, ha='center', va='center', zorder=3,
+                    bbox=dict(boxstyle='round', ec=(1.0, 1.0, 1.0), fc=(1.0, 1.0, 1.0)))
+
+
+def render_network(filename, num_nodes, edges, flows=None, title=DEFAULT_TITLE,
+                   pos=None, figsize=(10, 8), dpi=100, **options):
+    """
+    Écrire le schéma d'un réseau dans un fichier (PNG, SVG, PDF...), sans Qt
+
+    Le format est déduit de l'extension de filename.
+
+    Args:
+        filename: Fichier de sortie
+        num_nodes, edges: Réseau
+        flows: Solution (voir draw_network)
+        title: Titre du schéma
+        pos: Positions des nœuds (défaut: cache de topologie)
+        figsize, dpi: Taille de l'image
+        **options: Paramètres de draw_network (edge_labels, node_labels)
+
+    Returns:
+        str: filename
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    fig.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=0.93)
+    ax = fig.add_subplot(111)
+    draw_network(ax, num_nodes, edges, flows, pos=pos, title=title, tight=False, **options)
+    fig.savefig(filename, dpi=dpi)
+    return filename
+
+
+def _render_job(job):
+    """Rendre un travail de render_batch (exécuté dans un processus de calcul)"""
+    job = dict(job)
+    filename = job.pop('filename')
+    return render_network(filename, job.pop('num_nodes'), job.pop('edges'),
+                          job.pop('flows', None), **job)
+
+
+def render_batch(jobs, output_dir, fmt='png', workers=None, chunksize=8, **options):
+    """
+    Rendre un lot de schémas en parallèle
+
+    Args:
+        jobs: Itérable de dicts avec num_nodes, edges, et optionnellement
+              name (nom du fichier), flows (dict, RoutingResult ou
+              tableau), title, pos
+        output_dir: Répertoire de sortie (créé si besoin)
+        fmt: Format des fichiers ('png', 'svg', 'pdf'...)
+        workers: Processus de rendu (défaut: nombre de cœurs; 0 = dans le
+                 processus courant)
+        chunksize: Travaux envoyés ensemble à un processus
+        **options: Paramètres communs de render_network (dpi, figsize,
+                   edge_labels...)
+
+    Returns:
+        list: Fichiers écrits, dans l'ordre des travaux
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    prepared = []
+    for index, job in enumerate(jobs):
+        task = dict(options)
+        task.update(job)
+        name = task.pop('name', None) or f"reseau_{index:05d}"
+        task['filename'] = os.path.join(output_dir, f"{name}.{fmt}")
+        # Flux en dict simple: seul ce qui sert au dessin est transmis
+        task['flows'] = _flow_dict(task.get('flows'), task['edges'])
+        prepared.append(task)
+
+    # Travaux de même topologie côte à côte: un seul calcul de positions
+    # par paquet
+    order = sorted(range(len(prepared)),
+                   key=lambda k: hash(topology_key(prepared[k]['num_nodes'],
+                                                   prepared[k]['edges'])))
+    ordered = [prepared[k] for k in order]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers and len(ordered) > 1:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            files = list(executor.map(_render_job, ordered, chunksize=chunksize))
+    else:
+        files = [_render_job(job) for job in ordered]
+
+    result = [None] * len(prepared)
+    for k, filename in zip(order, files):
+        result[k] = filename
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendre les schémas de réseaux (sans interface)")
+    parser.add_argument('networks', nargs='+', help="Fichiers réseau (format de Network.save)")
+    parser.add_argument('-o', '--output', default='schemas', help="Répertoire de sortie")
+    parser.add_argument('--format', default='png', help="Format des images (png, svg, pdf)")
+    parser.add_argument('--workers', type=int, default=None, help="Processus de rendu")
+    parser.add_argument('--solve', action='store_true', help="Résoudre et dessiner les flux")
+    args = parser.parse_args(argv)
+
+    from network_model import Network
+
+    jobs = []
+    for filename in args.networks:
+        network = Network.load(filename)
+        flows = network.optimizer().solve() if args.solve else None
+        jobs.append({
+            'name': os.path.splitext(os.path.basename(filename))[0],
+            'num_nodes': network.num_nodes,
+            'edges': network.edges,
+            'flows': flows,
+            'title': network.name or DEFAULT_TITLE
+        })
+    for filename in render_batch(jobs, args.output, fmt=args.format, workers=args.workers):
+        print(filename)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,225 @@
+"""
+Routage sous contrainte de qualité de service (SLA) par chemin
+
+Tout chemin qui porte du flux doit respecter une latence de bout en bout
+maximale et/ou un nombre maximal de sauts. La contrainte porte sur chaque
+chemin, pas sur la latence moyenne: elle s'exprime dans une formulation
+par chemins, résolue par génération de colonnes:
+  - maître restreint (PL): fraction de chaque demande sur chaque chemin
+    généré, capacités effectives de NetworkOptimizer (fiabilité et
+    équilibrage compris), variable de demande non servie pénalisée qui
+    garde le maître réalisable
+  - pricing: plus court chemin sous contraintes de ressources
+    (ForwardStar.constrained_shortest_path, étiquetage avec dominance)
+    sur les poids c_e - pi_e; les bornes inférieures de latence et de
+    sauts jusqu'à la destination (Dijkstra inverse, calculées une fois)
+    et les bornes lagrangiennes du coût élaguent les étiquettes qui ne
+    peuvent plus respecter le SLA ou donner une colonne améliorante
+
+Aucun chemin n'est énuméré et le graphe n'est pas dupliqué par nombre de
+sauts: le maître a une ligne par lien et par demande (les deux arcs d'un
+lien bidirectionnel partagent sa capacité). À convergence, la
+valeur du maître est l'optimum du problème contraint.
+"""
+
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from flow_algorithms import ForwardStar
+from network_model import RoutingResult
+
+
+class _SLAMaster:
+    """
+    PL sur les chemins admissibles
+
+        min  sum_k d_k (sum_p c_p lambda_kp + M u_k)
+        s.c. sum_p lambda_kp + u_k = 1                   (sigma_k)
+             sum_k d_k sum_{p ∋ l} lambda_kp <= u_l       (pi_l <= 0, par lien)
+             lambda, u >= 0
+    """
+
+    def __init__(self, env, unit, bounds, commodities, penalty, links):
+        self.unit = unit
+        self.links = links
+        self.commodities = commodities
+        self.model = gp.Model("sla_paths", env=env)
+        self.model.setParam('OutputFlag', 0)
+        self.capacity = [self.model.addLConstr(gp.LinExpr(), GRB.LESS_EQUAL, float(b))
+                         for b in bounds]
+        self.unserved = [self.model.addVar(obj=penalty * d) for _, _, d in commodities]
+        self.convexity = [self.model.addLConstr(gp.LinExpr(1.0, u), GRB.EQUAL, 1.0)
+                          for u in self.unserved]
+        self.columns = []  # (demande k, indices des arêtes, variable)
+
+    def add_path(self, k, path):
+        demand = self.commodities[k][2]
+        column = gp.Column([demand] * len(path) + [1.0],
+                           [self.capacity[l] for l in self.links[path].tolist()]
+                           + [self.convexity[k]])
+        var = self.model.addVar(obj=demand * float(self.unit[path].sum()), column=column)
+        self.columns.append((k, path, var))
+
+    def duals(self):
+        """Duaux par arête (celui de son lien) et par demande"""
+        pi = np.array(self.model.getAttr('Pi', self.capacity))[self.links]
+        sigma = np.array(self.model.getAttr('Pi', self.convexity))
+        return pi, sigma
+
+
+def solve_sla(optimizer, max_latency=None, max_hops=None, commodities=None,
+              max_rounds=500, time_limit=None, tol=1e-6):
+    """
+    Routage à coût minimal dont chaque chemin respecte le SLA
+
+    Args:
+        optimizer: NetworkOptimizer (seules ses données sont utilisées)
+        max_latency: Latence maximale de bout en bout d'un chemin
+        max_hops: Nombre maximal d'arêtes d'un chemin
+        commodities: Liste de (source, destination, volume) (défaut: la
+                     demande de l'optimiseur)
+        max_rounds: Tours de génération de colonnes
+        time_limit: Limite de temps (s)
+        tol: Coût réduit en dessous duquel un chemin entre dans le maître
+
+    Returns:
+        RoutingResult, complété par paths, max_path_latency, max_path_hops,
+        lower_bound, gap, num_columns, iterations, method
+    """
+    start_time = time.time()
+    keys = list(optimizer.edge_dict.keys())
+    arrays = optimizer.edge_arrays()
+    tails, heads = arrays['tails'], arrays['heads']
+    latency = arrays['latency']
+    unit = np.array([optimizer.objective_coefficient(c, l)
+                     for c, l in zip(arrays['cost'], latency)])
+    if np.any(unit < 0):
+        raise ValueError("Le pricing suppose des coûts d'arêtes positifs ou nuls")
+    bounds = np.array([optimizer.flow_upper_bound(*arcs[0]) for arcs in optimizer.link_arcs],
+                      dtype=float)
+    if commodities is None:
+        commodities = [(optimizer.source, optimizer.destination, optimizer.demand)]
+    commodities = [(int(s), int(t), float(d)) for s, t, d in commodities]
+    # Demandes de volume nul (ou source = destination): routage vide, hors du maître
+    routed = [k for k, (s, t, d) in enumerate(commodities) if d > 0 and s != t]
+    all_commodities, commodities = commodities, [commodities[k] for k in routed]
+
+    # Ressources contraintes par le SLA
+    resources, limits = [], []
+    if max_latency is not None:
+        if np.any(latency < 0):
+            raise ValueError("Les latences doivent être positives ou nulles")
+        resources.append(latency)
+        limits.append(float(max_latency))
+    if max_hops is not None:
+        resources.append(np.ones(len(keys)))
+        limits.append(float(max_hops))
+    resources = np.array(resources).reshape(len(resources), len(keys))
+
+    graph = ForwardStar(optimizer.num_nodes, tails, heads)
+    reverse = graph.reverse()
+    resource_bounds = {}
+    for destination in {t for _, t, _ in commodities}:
+        resource_bounds[destination] = np.array(
+            [reverse.shortest_path_tree(r, destination)[0] for r in resources]
+        ).reshape(len(resources), optimizer.num_nodes)
+
+    penalty = 1.0 + 2.0 * float(np.abs(unit).sum())
+    master = _SLAMaster(optimizer.env, unit, bounds, commodities, penalty, arrays['link'])
+    try:
+        def price(weights, k, max_cost=float('inf')):
+            source, destination, _ = commodities[k]
+            return graph.constrained_shortest_path(
+                weights, source, destination, resources, limits,
+                resource_bounds=resource_bounds[destination], max_cost=max_cost)
+
+        # Colonnes initiales: meilleur chemin admissible de chaque demande
+        for k in range(len(commodities)):
+            _, path, _ = price(unit, k)
+            if path is not None:
+                master.add_path(k, path)
+
+        lower_bound = -np.inf
+        converged = False
+        iterations = 0
+        for iterations in range(1, max_rounds + 1):
+            master.model.optimize()
+            pi, sigma = master.duals()
+            value = master.model.ObjVal
+            # pi <= 0: les poids unit - pi restent positifs ou nuls
+            weights = np.maximum(unit - pi, 0.0)
+            reduced = np.zeros(len(commodities))
+            candidates = []
+            for k, (_, _, demand) in enumerate(commodities):
+                # Seuls les chemins de coût réduit négatif sont cherchés
+                length, path, _ = price(weights, k, (sigma[k] - tol) / demand)
+                if path is not None:
+                    reduced[k] = demand * length - sigma[k]
+                    candidates.append((k, path))
+            lower_bound = max(lower_bound, value + float(reduced.sum()))
+            if not candidates:
+                converged = True
+                break
+            if time_limit is not None and time.time() - start_time > time_limit:
+                break
+            for k, path in candidates:
+                master.add_path(k, path)
+
+        variables = [var for _, _, var in master.columns]
+        fractions = np.array(master.model.getAttr('X', variables)) if variables else np.zeros(0)
+        unserved = np.array(master.model.getAttr('X', master.unserved))
+        num_columns = len(variables)
+    finally:
+        master.model.dispose()
+
+    load = np.zeros(len(keys))
+    used_paths = []
+    for (k, path, _), fraction in zip(master.columns, fractions):
+        if fraction > tol:
+            source, _, demand = commodities[k]
+            load[path] += demand * fraction
+            used_paths.append({
+                'commodity': routed[k],
+                'nodes': [source] + heads[path].tolist(),
+                'flow': demand * fraction,
+                'latency': float(latency[path].sum()),
+                'hops': len(path)
+            })
+    cost = float(unit @ load)
+
+    volumes = np.array([d for _, _, d in commodities])
+    feasible = bool(np.all(volumes * unserved <= tol * np.maximum(volumes, 1.0)))
+    if not feasible:
+        status = 'infeasible'
+        message = "Aucun routage ne respecte le SLA et les capacités."
+    else:
+        status = 'optimal' if converged else 'suboptimal'
+        message = None
+    results = RoutingResult(
+        status, time.time() - start_time, tails, heads, arrays['capacity'],
+        arrays['cost'], latency, load if feasible else None, links=arrays['link'],
+        source=optimizer.source, destination=optimizer.destination,
+        demand=optimizer.demand, objective=cost if feasible else None, message=message
+    )
+    results['method'] = 'column_generation'
+    results['lower_bound'] = lower_bound
+    results['gap'] = (max(0.0, (cost - lower_bound) / max(abs(cost), 1e-9))
+                      if feasible else None)
+    results['num_columns'] = num_columns
+    results['iterations'] = iterations
+    unserved_volume = np.zeros(len(all_commodities))
+    unserved_volume[routed] = volumes * unserved
+    results['unserved'] = unserved_volume.tolist()
+    if feasible:
+        results['paths'] = used_paths
+        results['max_path_latency'] = max((p['latency'] for p in used_paths), default=0.0)
+        results['max_path_hops'] = max((p['hops'] for p in used_paths), default=0)
+        results['main_paths'] = [
+            f"Chemin: {' → '.join(str(n) for n in p['nodes'])} | Flux: {p['flow']:.2f}"
+            f" | Latence: {p['latency']:.1f} | Sauts: {p['hops']}"
+            for p in sorted(used_paths, key=lambda p: -p['flow'])
+        ]
+    return results
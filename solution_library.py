@@ -0,0 +1,423 @@
+"""
+Bibliothèque de solutions: démarrage à chaud depuis des instances voisines
+
+Les réseaux évoluent lentement (quelques liens ajoutés, des capacités
+ajustées). Chaque solution optimale est conservée dans une base SQLite
+locale (tableaux NumPy stockés en blobs), indexée par:
+  - une signature exacte de la topologie et des options de modélisation
+  - une empreinte MinHash de l'ensemble des arêtes, qui estime la
+    similarité de Jaccard entre deux topologies sans relire les arêtes
+
+Pour une nouvelle instance on retient la solution la plus proche, on la
+projette sur le nouvel ensemble d'arêtes (arêtes disparues ignorées,
+nouvelles arêtes à zéro, flux remis à l'échelle de la demande) et on la
+donne au solveur:
+  - PL (link_used relâché): base du simplexe projetée arête par arête
+    (variables et contraintes de chaque arête, contraintes de chaque
+    nœud); les arêtes nouvelles entrent hors base, leurs contraintes
+    avec un écart basique. Gurobi répare une base incomplète. Les
+    éléments d'un lien (link_used et contraintes de capacité, partagés
+    par les deux arcs d'un lien bidirectionnel) sont rangés une seule
+    fois, dans la colonne du premier arc du lien.
+  - PLNE: solution de départ (Start) avec les flux projetés
+
+Le temps de recherche et le gain de temps sont enregistrés dans la base.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_LIBRARY_PATH = os.path.join(os.path.expanduser('~'), '.cache',
+                                    'ro_transport_reseau', 'solutions.sqlite')
+
+# Empreinte MinHash: nombre de fonctions de hachage
+SKETCH_SIZE = 64
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240611)
+_HASH_A = _rng.integers(1, _PRIME, SKETCH_SIZE, dtype=np.uint64)
+_HASH_B = _rng.integers(0, _PRIME, SKETCH_SIZE, dtype=np.uint64)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instances (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    signature TEXT NOT NULL,
+    options TEXT NOT NULL,
+    num_nodes INTEGER NOT NULL,
+    num_edges INTEGER NOT NULL,
+    demand REAL NOT NULL,
+    is_mip INTEGER NOT NULL,
+    objective REAL,
+    solve_time REAL,
+    created REAL NOT NULL,
+    sketch BLOB NOT NULL,
+    edge_codes BLOB NOT NULL,
+    flow BLOB NOT NULL,
+    edge_basis BLOB,
+    node_basis BLOB
+);
+CREATE INDEX IF NOT EXISTS instances_signature ON instances (signature);
+CREATE TABLE IF NOT EXISTS warm_starts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    instance_id INTEGER,
+    source_id INTEGER,
+    kind TEXT NOT NULL,
+    similarity REAL,
+    retrieval_time REAL NOT NULL,
+    solve_time REAL,
+    reference_time REAL,
+    created REAL NOT NULL
+);
+"""
+
+
+def edge_codes(tails, heads):
+    """Code entier unique de chaque arête orientée (i, j)"""
+    return (np.asarray(tails, dtype=np.int64) << 32) | np.asarray(heads, dtype=np.int64)
+
+
+def minhash(codes):
+    """Empreinte MinHash (SKETCH_SIZE entiers) d'un ensemble d'arêtes"""
+    if len(codes) == 0:
+        return np.full(SKETCH_SIZE, _PRIME, dtype=np.uint64)
+    base = (np.asarray(codes, dtype=np.uint64) * np.uint64(0x9E3779B1)) % np.uint64(_PRIME)
+    hashed = (_HASH_A[:, None] * base[None, :] + _HASH_B[:, None]) % np.uint64(_PRIME)
+    return hashed.min(axis=1)
+
+
+def jaccard(codes_a, codes_b):
+    """Similarité de Jaccard exacte de deux ensembles d'arêtes"""
+    common = len(np.intersect1d(codes_a, codes_b, assume_unique=True))
+    union = len(codes_a) + len(codes_b) - common
+    return common / union if union else 1.0
+
+
+def project(source_codes, source_values, target_codes, fill=0.0):
+    """
+    Reporter des valeurs par arête sur un autre ensemble d'arêtes
+
+    Returns:
+        tuple: (valeurs alignées sur target_codes, masque des arêtes trouvées)
+    """
+    values = np.full(len(target_codes), fill, dtype=float)
+    found = np.zeros(len(target_codes), dtype=bool)
+    if len(source_codes):
+        order = np.argsort(source_codes)
+        sorted_codes = source_codes[order]
+        pos = np.minimum(np.searchsorted(sorted_codes, target_codes), len(sorted_codes) - 1)
+        found = sorted_codes[pos] == target_codes
+        values[found] = np.asarray(source_values, dtype=float)[order][pos[found]]
+    return values, found
+
+
+# Colonnes relues pour un démarrage à chaud
+_MATCH_COLUMNS = "id, num_nodes, demand, solve_time, edge_codes, flow, edge_basis, node_basis"
+
+# Lignes de la base par arête: (handles de l'optimiseur, valeur par défaut);
+# toutes sauf flow_vars sont des éléments de lien (voir _link_columns)
+_EDGE_BASIS = (
+    ('flow_vars', 'VBasis', -1),
+    ('link_used', 'VBasis', -1),
+    ('capacity_constrs', 'CBasis', 0),
+    ('activation_constrs', 'CBasis', 0),
+    ('reliability_constrs', 'CBasis', 0),
+    ('balance_cap_constrs', 'CBasis', 0),
+)
+
+
+def _link_columns(optimizer):
+    """Colonne (premier arc) et handle de chaque lien, dans l'ordre de link_arcs"""
+    _, first = np.unique(optimizer.edge_arrays()['link'], return_index=True)
+    return first, [arcs[0] for arcs in optimizer.link_arcs]
+
+
+def _options(optimizer):
+    return (f"obj={optimizer.objective_type};rel={int(optimizer.use_reliability)};"
+            f"bal={int(optimizer.use_balance)};alpha={optimizer.alpha};"
+            f"scale={optimizer.latency_scale}")
+
+
+def _blob(array):
+    return None if array is None else np.ascontiguousarray(array).tobytes()
+
+
+class SolutionLibrary:
+    """Base locale de solutions passées, interrogée avant chaque résolution"""
+
+    def __init__(self, path=None, min_similarity=0.5, max_candidates=8):
+        """
+        Args:
+            path: Fichier SQLite (défaut: $RO_SOLUTION_LIBRARY ou DEFAULT_LIBRARY_PATH;
+                  ':memory:' pour une base temporaire)
+            min_similarity: Similarité de Jaccard minimale pour réutiliser
+            max_candidates: Candidats relus après le filtrage MinHash
+        """
+        self.path = path or os.environ.get('RO_SOLUTION_LIBRARY', DEFAULT_LIBRARY_PATH)
+        self.min_similarity = min_similarity
+        self.max_candidates = max_candidates
+        if self.path != ':memory:':
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def signature(codes, options):
+        """Signature exacte: ensemble d'arêtes (dans l'ordre) et options"""
+        digest = hashlib.sha1(np.ascontiguousarray(codes).tobytes())
+        digest.update(options.encode())
+        return digest.hexdigest()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM instances").fetchone()[0]
+
+    # ---- Recherche ----
+
+    def find(self, optimizer):
+        """
+        Solution stockée la plus proche de l'instance de l'optimiseur
+
+        Returns:
+            dict: id, similarity, exact (même signature), flow projeté sur
+                  les arêtes de l'optimiseur, basis (projetée), solve_time,
+                  retrieval_time; ou None si rien d'assez proche
+        """
+        start = time.perf_counter()
+        arrays = optimizer.edge_arrays()
+        codes = edge_codes(arrays['tails'], arrays['heads'])
+        options = _options(optimizer)
+        signature = self.signature(codes, options)
+
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_MATCH_COLUMNS} FROM instances "
+                "WHERE signature = ? ORDER BY created DESC LIMIT 1",
+                (signature,)).fetchone()
+            if row is not None:
+                candidates = [(1.0, row)]
+            else:
+                candidates = self._similar(codes)
+
+        if not candidates:
+            return None
+        similarity, (row_id, num_nodes, demand, solve_time, codes_blob, flow_blob,
+                     edge_basis, node_basis) = candidates[0]
+        stored_codes = np.frombuffer(codes_blob, dtype=np.int64)
+        flow, found = project(stored_codes, np.frombuffer(flow_blob, dtype=float), codes)
+        if demand and optimizer.demand != demand:
+            flow = flow * (optimizer.demand / demand)
+
+        basis = None
+        if edge_basis is not None:
+            rows = np.frombuffer(edge_basis, dtype=np.int8).reshape(len(_EDGE_BASIS), -1)
+            basis = {
+                'edges': [project(stored_codes, row, codes, fill=default)[0].astype(int)
+                          for row, (_, _, default) in zip(rows, _EDGE_BASIS)],
+                'nodes': np.frombuffer(node_basis, dtype=np.int8).astype(int),
+            }
+
+        return {
+            'id': row_id,
+            'similarity': similarity,
+            'exact': row is not None,
+            'flow': flow,
+            'matched_edges': int(found.sum()),
+            'basis': basis,
+            'solve_time': solve_time,
+            'retrieval_time': time.perf_counter() - start
+        }
+
+    def _similar(self, codes):
+        """Candidats triés par similarité de Jaccard (filtrés par MinHash)"""
+        rows = self._db.execute("SELECT id, sketch FROM instances").fetchall()
+        if not rows:
+            return []
+        sketch = minhash(codes)
+        ids = np.array([r[0] for r in rows])
+        sketches = np.stack([np.frombuffer(r[1], dtype=np.uint64) for r in rows])
+        estimate = (sketches == sketch).mean(axis=1)
+        keep = np.argsort(-estimate, kind='stable')[:self.max_candidates]
+
+        candidates = []
+        for k in keep:
+            if estimate[k] < 0.5 * self.min_similarity:
+                break
+            row = self._db.execute(
+                f"SELECT {_MATCH_COLUMNS} FROM instances WHERE id = ?",
+                (int(ids[k]),)).fetchone()
+            similarity = jaccard(np.frombuffer(row[4], dtype=np.int64), codes)
+            if similarity >= self.min_similarity:
+                candidates.append((similarity, row))
+        candidates.sort(key=lambda c: -c[0])
+        return candidates
+
+    # ---- Démarrage à chaud ----
+
+    def warm_start(self, optimizer):
+        """
+        Chercher une solution voisine et la donner au modèle de l'optimiseur
+
+        Returns:
+            dict: kind ('basis', 'start' ou 'none'), source_id,
+                  similarity, retrieval_time, reference_time
+        """
+        match = self.find(optimizer)
+        if match is None:
+            return {'kind': 'none', 'source_id': None, 'similarity': 0.0,
+                    'retrieval_time': 0.0, 'reference_time': None}
+
+        model = optimizer.model
+        model.update()
+        if not model.IsMIP and match['basis'] is not None:
+            self._set_basis(optimizer, match['basis'])
+            kind = 'basis'
+        else:
+            upper = np.array([optimizer.flow_upper_bound(*e) for e in optimizer.flow_vars])
+            flow = np.minimum(match['flow'], upper)
+            model.setAttr('Start', list(optimizer.flow_vars.values()), flow.tolist())
+            # link_used = 1 partout: toujours compatible avec les flux
+            model.setAttr('Start', list(optimizer.link_used.values()),
+                          [1.0] * len(optimizer.link_used))
+            kind = 'start'
+
+        return {'kind': kind, 'source_id': match['id'],
+                'similarity': match['similarity'],
+                'retrieval_time': match['retrieval_time'],
+                'reference_time': match['solve_time']}
+
+    @staticmethod
+    def _set_basis(optimizer, basis):
+        """
+        Installer une base projetée
+
+        Une base doit compter autant d'éléments basiques que de contraintes,
+        sinon Gurobi l'ignore. Les arêtes disparues emportent leurs éléments
+        basiques: on rétablit le compte avec des écarts de contraintes
+        (manque) ou en sortant de la base des variables (excès).
+        """
+        model = optimizer.model
+        keys = list(optimizer.flow_vars)
+        first, link_keys = _link_columns(optimizer)
+        entries = []
+        for (name, attr, _), values in zip(_EDGE_BASIS, basis['edges']):
+            handles = getattr(optimizer, name)
+            if not handles:
+                continue
+            if name == 'flow_vars':
+                entries.append((attr, [handles[e] for e in keys], values.copy()))
+            else:
+                entries.append((attr, [handles[e] for e in link_keys], values[first]))
+        nodes = np.zeros(optimizer.num_nodes, dtype=int)
+        common = min(len(nodes), len(basis['nodes']))
+        nodes[:common] = basis['nodes'][:common]
+        entries.append(('CBasis', [optimizer.balance_constrs[i]
+                                   for i in range(optimizer.num_nodes)], nodes))
+
+        missing = model.NumConstrs - sum(int((v == 0).sum()) for _, _, v in entries)
+        for attr, _, values in reversed(entries):
+            if missing == 0:
+                break
+            if missing > 0 and attr == 'CBasis':
+                candidates = np.flatnonzero(values != 0)[:missing]
+                values[candidates] = 0
+                missing -= len(candidates)
+            elif missing < 0 and attr == 'VBasis':
+                candidates = np.flatnonzero(values == 0)[:-missing]
+                values[candidates] = -1
+                missing += len(candidates)
+
+        for attr, handles, values in entries:
+            model.setAttr(attr, handles, values.tolist())
+
+    # ---- Enregistrement ----
+
+    def store(self, optimizer, flow, solve_time, objective=None, warm_start=None):
+        """
+        Enregistrer la solution optimale courante de l'optimiseur
+
+        Args:
+            optimizer: NetworkOptimizer venant d'être résolu
+            flow: Flux par arête (ordre de flow_vars)
+            solve_time: Temps de résolution (s)
+            objective: Valeur de l'objectif
+            warm_start: Dict renvoyé par warm_start() (journalisé)
+
+        Returns:
+            int: Identifiant de l'instance enregistrée
+        """
+        model = optimizer.model
+        arrays = optimizer.edge_arrays()
+        codes = edge_codes(arrays['tails'], arrays['heads'])
+        options = _options(optimizer)
+
+        edge_basis = node_basis = None
+        if not model.IsMIP:
+            keys = list(optimizer.flow_vars)
+            first, link_keys = _link_columns(optimizer)
+            edge_basis = np.zeros((len(_EDGE_BASIS), len(keys)), dtype=np.int8)
+            for row, (name, attr, default) in enumerate(_EDGE_BASIS):
+                handles = getattr(optimizer, name)
+                edge_basis[row] = default
+                if handles and name == 'flow_vars':
+                    edge_basis[row] = model.getAttr(attr, [handles[e] for e in keys])
+                elif handles:
+                    edge_basis[row, first] = model.getAttr(attr, [handles[e] for e in link_keys])
+            node_basis = np.array(model.getAttr(
+                'CBasis', [optimizer.balance_constrs[i] for i in range(optimizer.num_nodes)]
+            ), dtype=np.int8)
+
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO instances (signature, options, num_nodes, num_edges, demand, "
+                "is_mip, objective, solve_time, created, sketch, edge_codes, flow, "
+                "edge_basis, node_basis) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.signature(codes, options), options, optimizer.num_nodes,
+                 len(codes), float(optimizer.demand), int(model.IsMIP), objective,
+                 solve_time, now, _blob(minhash(codes)), _blob(codes),
+                 _blob(np.asarray(flow, dtype=float)), _blob(edge_basis), _blob(node_basis)))
+            instance_id = cursor.lastrowid
+            if warm_start is not None:
+                self._db.execute(
+                    "INSERT INTO warm_starts (instance_id, source_id, kind, similarity, "
+                    "retrieval_time, solve_time, reference_time, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (instance_id, warm_start['source_id'], warm_start['kind'],
+                     warm_start['similarity'], warm_start['retrieval_time'],
+                     solve_time, warm_start['reference_time'], now))
+            self._db.commit()
+        return instance_id
+
+    def stats(self):
+        """
+        Bilan des démarrages à chaud journalisés
+
+        Returns:
+            dict: instances, warm_starts, hits, avg_retrieval_time,
+                  avg_speedup (temps de la solution source / temps obtenu)
+        """
+        with self._lock:
+            instances = self._db.execute("SELECT COUNT(*) FROM instances").fetchone()[0]
+            rows = self._db.execute(
+                "SELECT kind, retrieval_time, solve_time, reference_time FROM warm_starts"
+            ).fetchall()
+        hits = [r for r in rows if r[0] != 'none']
+        speedups = [r[3] / r[2] for r in hits if r[2] and r[3]]
+        return {
+            'instances': instances,
+            'warm_starts': len(rows),
+            'hits': len(hits),
+            'avg_retrieval_time': float(np.mean([r[1] for r in rows])) if rows else 0.0,
+            'avg_speedup': float(np.mean(speedups)) if speedups else None
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
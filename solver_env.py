@@ -0,0 +1,175 @@
+"""
+Environnements Gurobi partagés et cache de modèles
+
+Créer un environnement Gurobi coûte cher (démarrage, et réservation d'un
+jeton de licence avec un serveur de jetons). Ce module fournit:
+  - un environnement principal partagé par les optimiseurs du processus
+  - un pool d'environnements pour les threads de calcul (un environnement
+    Gurobi ne doit être utilisé que par un seul thread à la fois)
+  - un cache de modèles « gabarits » par topologie: une nouvelle résolution
+    sur le même graphe copie le modèle au lieu de le reconstruire
+"""
+
+import os
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import gurobipy as gp
+
+DEFAULT_PARAMS = {'OutputFlag': 0}
+
+_lock = threading.Lock()
+_shared_env = None
+_env_pool = None
+_template_cache = None
+
+
+class EnvPool:
+    """Pool d'environnements Gurobi réutilisables entre threads"""
+
+    def __init__(self, size=None, params=None):
+        """
+        Args:
+            size: Nombre maximal d'environnements (défaut: nombre de cœurs)
+            params: Paramètres appliqués à chaque environnement
+        """
+        self.size = size or os.cpu_count() or 1
+        self.params = dict(DEFAULT_PARAMS, **(params or {}))
+        self._free = queue.LifoQueue()
+        self._envs = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Obtenir un environnement libre (créé à la demande, sinon attente)"""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._envs) < self.size:
+                env = gp.Env(params=self.params)
+                self._envs.append(env)
+                return env
+        return self._free.get()
+
+    def release(self, env):
+        """Rendre un environnement au pool"""
+        self._free.put(env)
+
+    @contextmanager
+    def acquire(self):
+        """Emprunter un environnement le temps d'un bloc with"""
+        env = self.get()
+        try:
+            yield env
+        finally:
+            self.release(env)
+
+    def close(self):
+        """Libérer tous les environnements (et leurs jetons de licence)"""
+        with self._lock:
+            for env in self._envs:
+                env.dispose()
+            self._envs = []
+            self._free = queue.LifoQueue()
+
+
+class ModelTemplateCache:
+    """
+    Cache LRU de modèles construits, indexé par topologie et options
+
+    La demande n'entre pas dans la clé: elle ne modifie que des seconds
+    membres, mis à jour après copie du gabarit.
+    """
+
+    def __init__(self, max_size=32):
+        self.max_size = max_size
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(optimizer):
+        """Signature de la topologie et des options de modélisation"""
+        return (
+            optimizer.num_nodes,
+            tuple(tuple(edge) for edge in optimizer.edges),
+            optimizer.objective_type,
+            optimizer.use_reliability,
+            optimizer.use_balance,
+            optimizer.alpha,
+            optimizer.latency_scale
+        )
+
+    def get(self, key, env=None):
+        """
+        Copier le gabarit associé à key
+
+        Returns:
+            tuple: (modèle copié dans env, demande du gabarit) ou None
+        """
+        with self._lock:
+            entry = self._templates.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._templates.move_to_end(key)
+            self.hits += 1
+            # La copie lit le gabarit: sérialisée sous le verrou
+            template, demand = entry
+            return template.copy(env=env or shared_env()), demand
+
+    def put(self, key, model, demand):
+        """Enregistrer une copie du modèle comme gabarit"""
+        with self._lock:
+            if key in self._templates:
+                return
+            self._templates[key] = (model.copy(env=shared_env()), demand)
+            while len(self._templates) > self.max_size:
+                _, (old, _) = self._templates.popitem(last=False)
+                old.dispose()
+
+    def clear(self):
+        with self._lock:
+            for template, _ in self._templates.values():
+                template.dispose()
+            self._templates.clear()
+
+    def __len__(self):
+        return len(self._templates)
+
+
+def thread_budget(parallel_jobs=1):
+    """Threads par résolution quand parallel_jobs résolutions tournent en même temps"""
+    return max(1, (os.cpu_count() or 1) // max(1, parallel_jobs))
+
+
+def shared_env():
+    """Environnement principal du processus (créé une seule fois)"""
+    global _shared_env
+    with _lock:
+        if _shared_env is None:
+            _shared_env = gp.Env(params=DEFAULT_PARAMS)
+        return _shared_env
+
+
+def env_pool():
+    """Pool d'environnements partagé par les threads de calcul"""
+    global _env_pool
+    with _lock:
+        if _env_pool is None:
+            _env_pool = EnvPool()
+        return _env_pool
+
+
+def template_cache():
+    """Cache de gabarits partagé (interface graphique, résolutions répétées)"""
+    global _template_cache
+    with _lock:
+        if _template_cache is None:
+            _template_cache = ModelTemplateCache()
+        return _template_cache
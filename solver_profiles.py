@@ -0,0 +1,283 @@
+"""
+Profils de paramètres Gurobi par classe d'instance
+
+Une instance est classée selon son type (PL ou PLNE), sa taille (nombre
+d'arêtes) et la densité du graphe. Chaque classe reçoit un profil:
+  - des paramètres par défaut raisonnables (DEFAULT_PROFILES): simplexe
+    dual / réseau pour les PL moyens, barrière pour les grands PL,
+    tolérance d'écart relâchée pour les grands PLNE
+  - complétés, s'ils existent, par des paramètres issus d'un réglage hors
+    ligne (outil de réglage de Gurobi) mis en cache dans un fichier JSON
+    et réutilisés automatiquement pour toute instance de la même classe
+
+Le nombre de threads est toujours borné par thread_budget(): des
+résolutions lancées en parallèle se partagent les cœurs au lieu de les
+surcharger.
+
+Réglage hors ligne:
+    python solver_profiles.py tune reseau.txt --time-limit 60
+    python solver_profiles.py show
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+
+from solver_env import thread_budget
+
+# Bornes supérieures (nombre d'arêtes) des classes de taille
+SIZE_CLASSES = ((1000, 'small'), (50000, 'medium'), (500000, 'large'))
+
+# Densité E / (n (n - 1)) au-delà de laquelle le graphe est dit dense
+DENSE_THRESHOLD = 0.1
+
+DEFAULT_PROFILES = {
+    ('lp', 'small'): {'Threads': 1},
+    ('lp', 'medium'): {'Method': 1, 'NetworkAlg': 1},  # NetworkAlg: Gurobi >= 12
+    ('lp', 'large'): {'Method': 2},
+    ('lp', 'huge'): {'Method': 2, 'Presolve': 1},
+    ('mip', 'small'): {'Threads': 1},
+    ('mip', 'medium'): {'MIPGap': 1e-4},
+    ('mip', 'large'): {'MIPGap': 1e-3, 'MIPFocus': 1},
+    ('mip', 'huge'): {'MIPGap': 1e-2, 'MIPFocus': 1, 'Method': 2},
+}
+
+# Paramètres relevés après un réglage (ceux qui diffèrent des défauts Gurobi)
+TUNABLE_PARAMS = (
+    'Method', 'NetworkAlg', 'Presolve', 'PreDual', 'Aggregate', 'ScaleFlag',
+    'SimplexPricing', 'NormAdjust', 'Crossover', 'BarOrder', 'MIPFocus',
+    'Cuts', 'Heuristics', 'Symmetry', 'VarBranch', 'NodeMethod', 'Threads'
+)
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser('~'), '.cache',
+                                  'ro_transport_reseau', 'solver_profiles.json')
+
+_lock = threading.Lock()
+_profile_store = None
+
+
+def size_class(num_edges):
+    """Classe de taille d'une instance selon son nombre d'arêtes"""
+    for limit, name in SIZE_CLASSES:
+        if num_edges < limit:
+            return name
+    return 'huge'
+
+
+def classify(optimizer):
+    """
+    Classe d'instance d'un optimiseur dont le modèle est construit
+
+    Returns:
+        tuple: (type 'lp' ou 'mip', taille, densité 'sparse' ou 'dense')
+    """
+    model = optimizer.model
+    model.update()
+    kind = 'mip' if model.IsMIP else 'lp'
+
+    num_edges = len(optimizer.edge_dict)
+    n = optimizer.num_nodes
+    density = num_edges / (n * (n - 1)) if n > 1 else 0.0
+    return kind, size_class(num_edges), 'dense' if density > DENSE_THRESHOLD else 'sparse'
+
+
+def class_name(instance_class):
+    """Nom lisible d'une classe, utilisé comme clé du cache: 'lp-small-sparse'"""
+    return '-'.join(instance_class)
+
+
+class ProfileStore:
+    """Cache JSON des paramètres réglés, une entrée par classe d'instance"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Fichier JSON (défaut: $RO_SOLVER_PROFILES ou DEFAULT_STORE_PATH)
+        """
+        self.path = path or os.environ.get('RO_SOLVER_PROFILES', DEFAULT_STORE_PATH)
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, instance_class):
+        """Paramètres réglés d'une classe (dict vide si aucun réglage)"""
+        with self._lock:
+            entry = self._load().get(class_name(instance_class))
+        return dict(entry['params']) if entry else {}
+
+    def entries(self):
+        """Toutes les entrées du cache: {classe: {'params', 'source', ...}}"""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._load().items()}
+
+    def put(self, instance_class, params, **info):
+        """Enregistrer les paramètres d'une classe et réécrire le fichier"""
+        with self._lock:
+            entries = self._load()
+            entries[class_name(instance_class)] = dict(info, params=params,
+                                                       timestamp=time.time())
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+
+def profile_store():
+    """Cache de profils partagé par le processus"""
+    global _profile_store
+    with _lock:
+        if _profile_store is None:
+            _profile_store = ProfileStore()
+        return _profile_store
+
+
+def resolve_params(instance_class, parallel_jobs=1, store=None):
+    """
+    Paramètres d'une classe: défauts, puis réglage en cache, threads bornés
+
+    Args:
+        instance_class: Tuple renvoyé par classify()
+        parallel_jobs: Nombre de résolutions lancées en même temps
+        store: ProfileStore (défaut: cache partagé)
+    """
+    kind, size, _ = instance_class
+    params = dict(DEFAULT_PROFILES.get((kind, size), {}))
+    params.update((store or profile_store()).get(instance_class))
+
+    budget = thread_budget(parallel_jobs)
+    threads = params.get('Threads', 0)
+    params['Threads'] = budget if threads <= 0 else min(threads, budget)
+    return params
+
+
+def apply_params(model, params):
+    """
+    Appliquer un dict de paramètres à un modèle Gurobi
+
+    Les paramètres inconnus de la version installée (ex: NetworkAlg avant
+    Gurobi 12) sont ignorés.
+    """
+    for name, value in params.items():
+        try:
+            model.setParam(name, value)
+        except gp.GurobiError as e:
+            if not _unknown_param(e):
+                raise
+
+
+def _unknown_param(error):
+    """Erreur « paramètre inconnu » (gurobipy ne renseigne pas toujours errno)"""
+    return (error.errno == GRB.Error.UNKNOWN_PARAMETER
+            or str(error).startswith('Unknown parameter'))
+
+
+def _changed_params(model):
+    """Paramètres réglables dont la valeur diffère du défaut Gurobi"""
+    changed = {}
+    for name in TUNABLE_PARAMS:
+        try:
+            _, _, current, _, _, default = model.getParamInfo(name)
+        except gp.GurobiError as e:
+            if not _unknown_param(e):
+                raise
+            continue
+        if current != default:
+            changed[name] = current
+    return changed
+
+
+def tune_instance(optimizer, time_limit=60.0, store=None, source=None):
+    """
+    Régler les paramètres sur une instance et les mettre en cache pour sa classe
+
+    Le réglage utilise l'outil de Gurobi (Model.tune) sur une copie du
+    modèle; le meilleur jeu de paramètres trouvé est enregistré pour la
+    classe de l'instance et sera appliqué aux prochaines résolutions.
+
+    Args:
+        optimizer: NetworkOptimizer (le modèle est construit si besoin)
+        time_limit: Durée maximale du réglage (s)
+        store: ProfileStore (défaut: cache partagé)
+        source: Description de l'instance de réglage (enregistrée)
+
+    Returns:
+        tuple: (classe d'instance, paramètres enregistrés)
+    """
+    if not optimizer.flow_vars:
+        optimizer.build_model()
+    instance_class = classify(optimizer)
+
+    model = optimizer.model.copy()
+    try:
+        model.setParam('TuneTimeLimit', time_limit)
+        model.setParam('TuneResults', 1)
+        model.setParam('TuneOutput', 0)
+        model.tune()
+        params = {}
+        if model.TuneResultCount > 0:
+            model.getTuneResult(0)
+            params = _changed_params(model)
+    finally:
+        model.dispose()
+
+    (store or profile_store()).put(instance_class, params, source=source,
+                                   tune_time_limit=time_limit)
+    return instance_class, params
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Réglage hors ligne des paramètres Gurobi par classe d'instance")
+    parser.add_argument('--store', help="Fichier de cache des profils")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    tune = commands.add_parser('tune', help="Régler sur un ou plusieurs réseaux")
+    tune.add_argument('networks', nargs='+', help="Fichiers réseau (format de Network.save)")
+    tune.add_argument('--time-limit', type=float, default=60.0)
+    tune.add_argument('--relaxed', action='store_true',
+                      help="Régler le PL obtenu en relâchant link_used")
+    commands.add_parser('show', help="Afficher les profils en cache")
+
+    args = parser.parse_args(argv)
+    store = ProfileStore(args.store)
+
+    if args.command == 'show':
+        for name, entry in sorted(store.entries().items()):
+            print(f"{name:<22} {entry['params']}  ({entry.get('source') or '-'})")
+        return 0
+
+    from network_model import Network
+
+    for filename in args.networks:
+        optimizer = Network.load(filename).optimizer()
+        optimizer.build_model()
+        if args.relaxed:
+            optimizer.relax_link_usage()
+        instance_class, params = tune_instance(optimizer, args.time_limit, store,
+                                               source=os.path.basename(filename))
+        print(f"{class_name(instance_class):<22} {params or 'paramètres par défaut'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,432 @@
+"""
+Réservation de capacité sous incertitude de la demande (deux étapes)
+
+Les prévisions arrivent sous forme de scénarios (demande, coûts unitaires,
+probabilité). Première étape: capacité r_e réservée sur chaque lien, au
+coût rho_e par unité (les deux arcs d'un lien bidirectionnel se partagent
+sa réservation). Deuxième étape, scénario par scénario: la demande
+est routée dans la capacité réservée (et les bornes effectives de
+NetworkOptimizer); la demande non servie est fortement pénalisée.
+
+    min  rho . r + R(Q_1(r), ..., Q_N(r))
+    Q_s(r) = min { c_s . x + M u : conservation (demande d_s - u),
+                                    x <= r, x <= borne_s }
+
+avec R l'espérance (risk='expected') ou le pire cas (risk='worst_case',
+routage robuste).
+
+Méthodes:
+  - 'l_shaped': décomposition de Benders multi-coupes. Le maître (PL)
+    ne contient que r et une variable theta_s par scénario; chaque
+    sous-problème, résolu dans un processus de calcul qui garde son
+    modèle (seules les bornes x <= r changent: démarrage à chaud du
+    simplexe dual), renvoie la coupe theta_s >= Q_s(r^) + pi_s . (r - r^)
+  - 'extensive': forme étendue complète (petits N, vérification)
+"""
+
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from network_model import RoutingResult
+from worker_pool import start_workers, stop_workers
+
+RISK_MEASURES = ('expected', 'worst_case')
+
+
+def _scenario_data(optimizer, scenarios):
+    """
+    Demande, coûts unitaires, bornes et probabilité de chaque scénario
+
+    Returns:
+        tuple: (liens, désignés par leur premier arc; capacité par lien;
+                données des scénarios, par arc)
+    """
+    keys = list(optimizer.edge_dict.keys())
+    links = optimizer.edge_arrays()['link']
+    capacity = np.array([optimizer.edge_dict[arcs[0]]['capacity']
+                         for arcs in optimizer.link_arcs], dtype=float)
+    latency = np.array([optimizer.edge_dict[e]['latency'] for e in keys], dtype=float)
+    nominal_cost = np.array([optimizer.edge_dict[e]['cost'] for e in keys], dtype=float)
+    if optimizer.use_balance:
+        capacity = 0.7 * capacity
+
+    scenarios = [s if isinstance(s, dict) else {'demand': s} for s in scenarios]
+    if not scenarios:
+        raise ValueError("Au moins un scénario est nécessaire")
+    weights = np.array([s.get('probability', 1.0) for s in scenarios], dtype=float)
+    if np.any(weights < 0) or weights.sum() <= 0:
+        raise ValueError("Les probabilités des scénarios doivent être positives")
+    weights = weights / weights.sum()
+
+    data = []
+    for index, (scenario, probability) in enumerate(zip(scenarios, weights.tolist())):
+        cost = scenario.get('cost')
+        if cost is None:
+            cost = nominal_cost
+        elif isinstance(cost, dict):
+            cost = np.array([cost.get(e, optimizer.edge_dict[e]['cost']) for e in keys],
+                            dtype=float)
+        else:
+            cost = np.asarray(cost, dtype=float)
+        demand = float(scenario['demand'])
+        upper = capacity[links]
+        if optimizer.use_reliability:
+            upper = np.minimum(upper, 0.8 * demand)
+        data.append({
+            'scenario': index,
+            'demand': demand,
+            'probability': probability,
+            'unit': np.array([optimizer.objective_coefficient(c, l)
+                              for c, l in zip(cost, latency)]),
+            'upper': upper
+        })
+    # Pénalité supérieure au coût de tout chemin, dans tous les scénarios
+    penalty = 1.0 + 2.0 * max(float(np.abs(d['unit']).sum()) for d in data)
+    for d in data:
+        d['penalty'] = penalty
+    return [arcs[0] for arcs in optimizer.link_arcs], capacity, data
+
+
+def _reservation_cost(reservation_cost, keys, optimizer):
+    """Coût de réservation par lien: fraction du coût unitaire, dict ou tableau"""
+    unit = np.array([optimizer.objective_coefficient(optimizer.edge_dict[e]['cost'],
+                                                     optimizer.edge_dict[e]['latency'])
+                     for e in keys])
+    if isinstance(reservation_cost, dict):
+        return np.array([reservation_cost.get(e, 0.0) for e in keys], dtype=float)
+    if np.isscalar(reservation_cost):
+        return float(reservation_cost) * unit
+    cost = np.asarray(reservation_cost, dtype=float)
+    if cost.shape != (len(keys),):
+        raise ValueError(f"{len(cost)} coûts de réservation pour {len(keys)} liens")
+    return cost
+
+
+def _link_groups(links):
+    """Arcs de chaque lien (indices), dans l'ordre des liens"""
+    groups = [[] for _ in range(int(links.max(initial=-1)) + 1)]
+    for k, link in enumerate(links.tolist()):
+        groups[link].append(k)
+    return groups
+
+
+def _add_second_stage(model, network, data, weight=1.0):
+    """
+    Variables et conservation du flux d'un scénario dans model
+
+    Returns:
+        tuple: (variables de flux, variable de demande non servie)
+    """
+    num_nodes, tails, heads, source, destination, _ = network
+    x = list(model.addVars(len(tails), lb=0.0, ub=data['upper'].tolist(),
+                           obj=(weight * data['unit']).tolist()).values())
+    unserved = model.addVar(obj=weight * data['penalty'])
+
+    # Sortant - entrant = offre; la demande non servie réduit l'offre
+    outgoing = [[] for _ in range(num_nodes)]
+    incoming = [[] for _ in range(num_nodes)]
+    for k, (i, j) in enumerate(zip(tails.tolist(), heads.tolist())):
+        outgoing[i].append(x[k])
+        incoming[j].append(x[k])
+    for node in range(num_nodes):
+        expr = gp.LinExpr([1.0] * len(outgoing[node]) + [-1.0] * len(incoming[node]),
+                          outgoing[node] + incoming[node])
+        rhs = 0.0
+        if node == source:
+            expr.add(unserved)
+            rhs = data['demand']
+        elif node == destination:
+            expr.add(unserved, -1.0)
+            rhs = -data['demand']
+        model.addLConstr(expr, GRB.EQUAL, rhs)
+    return x, unserved
+
+
+class _ScenarioSolver:
+    """PL de deuxième étape d'un scénario, modifié en place à chaque itération"""
+
+    def __init__(self, env, network, data):
+        self.scenario = data['scenario']
+        model = gp.Model(f"scenario_{self.scenario}", env=env)
+        self.x, self.unserved = _add_second_stage(model, network, data)
+
+        # Capacité réservée par lien (seconds membres modifiés à chaque itération)
+        self.reserved = [model.addLConstr(gp.LinExpr([1.0] * len(group),
+                                                     [self.x[k] for k in group]),
+                                          GRB.LESS_EQUAL, 0.0)
+                         for group in _link_groups(network[5])]
+        self.model = model
+
+    def _optimize(self, reservation):
+        self.model.setAttr('RHS', self.reserved, reservation.tolist())
+        self.model.optimize()
+        if self.model.Status != GRB.OPTIMAL:
+            raise RuntimeError(f"Scénario {self.scenario}: statut {self.model.Status}")
+
+    def solve(self, reservation):
+        """
+        Résoudre à réservation fixée
+
+        Returns:
+            dict: valeur Q_s(r), sous-gradient (duaux de x <= r, négatifs),
+                  demande non servie, temps
+        """
+        start = time.perf_counter()
+        self._optimize(reservation)
+        return {
+            'scenario': self.scenario,
+            'value': self.model.ObjVal,
+            'gradient': np.array(self.model.getAttr('Pi', self.reserved)),
+            'unserved': self.unserved.X,
+            'time': time.perf_counter() - start
+        }
+
+    def flows(self, reservation):
+        """Flux du scénario à réservation fixée"""
+        self._optimize(reservation)
+        return self.scenario, np.array(self.model.getAttr('X', self.x))
+
+
+def _aggregate(values, probabilities, risk):
+    """Espérance ou pire cas des coûts de deuxième étape"""
+    values = np.asarray(values, dtype=float)
+    return float(probabilities @ values) if risk == 'expected' else float(values.max())
+
+
+def _stochastic_results(optimizer, keys, status, start_time, reservation, flows, data,
+                        rho, risk, method, values, unserved, objective):
+    """
+    RoutingResult du flux moyen, complété par la réservation et les scénarios
+
+    La demande du résultat est le volume moyen livré (demande espérée moins
+    demande non servie espérée), cohérent avec le flux moyen; la demande
+    espérée est rapportée dans expected_demand.
+    """
+    arrays = optimizer.edge_arrays()
+    probabilities = np.array([d['probability'] for d in data])
+    feasible = reservation is not None
+    mean_flow = probabilities @ flows if feasible else None
+    expected_demand = float(probabilities @ np.array([d['demand'] for d in data]))
+    delivered = (expected_demand - float(probabilities @ np.asarray(unserved))
+                 if feasible else expected_demand)
+    results = RoutingResult(
+        status, time.time() - start_time, arrays['tails'], arrays['heads'],
+        arrays['capacity'], arrays['cost'], arrays['latency'], mean_flow,
+        links=arrays['link'], source=optimizer.source, destination=optimizer.destination,
+        demand=delivered, objective=objective if feasible else None,
+        message=None if feasible else "Aucune réservation trouvée."
+    )
+    results['method'] = method
+    results['risk'] = risk
+    results['expected_demand'] = expected_demand
+    if feasible:
+        results['reservation'] = {e: float(v) for e, v in zip(keys, reservation)
+                                  if v > 1e-9}
+        results['reservation_array'] = reservation
+        results['reservation_cost'] = float(rho @ reservation)
+        results['scenario_costs'] = [float(v) for v in values]
+        results['scenario_flows'] = flows
+        results['unserved'] = [float(u) for u in unserved]
+        results['expected_cost'] = float(probabilities @ np.asarray(values))
+        results['worst_case_cost'] = float(np.max(values))
+    return results
+
+
+def solve_extensive(optimizer, scenarios, reservation_cost=0.5, risk='expected',
+                    time_limit=None):
+    """
+    Forme étendue: réservation et flux de tous les scénarios dans un seul PL
+
+    Mêmes arguments et résultats que solve_stochastic (petits N seulement).
+    """
+    if risk not in RISK_MEASURES:
+        raise ValueError(f"Mesure de risque inconnue: {risk}")
+    start_time = time.time()
+    keys, capacity, data = _scenario_data(optimizer, scenarios)
+    rho = _reservation_cost(reservation_cost, keys, optimizer)
+    arrays = optimizer.edge_arrays()
+    network = (optimizer.num_nodes, arrays['tails'], arrays['heads'],
+               optimizer.source, optimizer.destination, arrays['link'])
+    groups = _link_groups(arrays['link'])
+
+    model = gp.Model("stochastic_extensive", env=optimizer.env)
+    model.setParam('OutputFlag', 0)
+    if time_limit is not None:
+        model.setParam('TimeLimit', time_limit)
+    try:
+        r = list(model.addVars(len(keys), ub=capacity.tolist(), obj=rho.tolist()).values())
+        eta = model.addVar(obj=1.0) if risk == 'worst_case' else None
+        blocks = []
+        for d in data:
+            weight = d['probability'] if risk == 'expected' else 0.0
+            x, unserved = _add_second_stage(model, network, d, weight)
+            for l, group in enumerate(groups):
+                model.addLConstr(gp.LinExpr([1.0] * len(group) + [-1.0],
+                                            [x[k] for k in group] + [r[l]]),
+                                 GRB.LESS_EQUAL, 0.0)
+            if eta is not None:
+                cost = gp.LinExpr(d['unit'].tolist(), x)
+                cost.add(unserved, d['penalty'])
+                model.addLConstr(cost, GRB.LESS_EQUAL, eta)
+            blocks.append((x, unserved, d))
+        model.optimize()
+
+        status = optimizer.get_status_string(model)
+        reservation = flows = None
+        values, unserved_values = [], []
+        if model.SolCount > 0:
+            reservation = np.array(model.getAttr('X', r))
+            flows = np.array([model.getAttr('X', x) for x, _, _ in blocks])
+            for x_val, (_, unserved, d) in zip(flows, blocks):
+                values.append(float(d['unit'] @ x_val) + d['penalty'] * unserved.X)
+                unserved_values.append(unserved.X)
+        objective = (float(rho @ reservation) + _aggregate(
+            values, np.array([d['probability'] for d in data]), risk)
+            if reservation is not None else None)
+    finally:
+        model.dispose()
+    return _stochastic_results(optimizer, keys, status, start_time, reservation, flows,
+                               data, rho, risk, 'extensive', values, unserved_values,
+                               objective)
+
+
+def solve_stochastic(optimizer, scenarios, reservation_cost=0.5, risk='expected',
+                     workers=None, tol=1e-4, max_iter=200, time_limit=None, progress=None):
+    """
+    Réservation de capacité sur N scénarios par décomposition L-shaped
+
+    Args:
+        optimizer: NetworkOptimizer (seules ses données sont utilisées)
+        scenarios: Liste de dicts {'demand', 'probability' (défaut:
+                   uniforme), 'cost' (dict {(i, j): coût} ou tableau,
+                   défaut: coûts nominaux)}, ou simplement de demandes
+        reservation_cost: Coût unitaire de réservation: fraction du coût
+                          unitaire de chaque lien (scalaire), dict
+                          {(i, j) du lien: coût} ou tableau par lien
+        risk: 'expected' (espérance) ou 'worst_case' (robuste)
+        workers: Processus de calcul (défaut: min(scénarios, cœurs);
+                 0 = tout dans le processus courant)
+        tol: Écart relatif visé entre bornes
+        max_iter: Itérations maître / scénarios
+        time_limit: Limite de temps (s)
+        progress: Fonction appelée à chaque itération (bornes, écart)
+
+    Returns:
+        RoutingResult du flux moyen (demande: volume moyen livré),
+        complété par expected_demand, reservation, reservation_cost,
+        scenario_costs, scenario_flows, unserved, expected_cost, worst_case_cost, lower_bound,
+        upper_bound, gap, iterations, history, scenario_times
+    """
+    if risk not in RISK_MEASURES:
+        raise ValueError(f"Mesure de risque inconnue: {risk}")
+    start_time = time.time()
+    keys, capacity, data = _scenario_data(optimizer, scenarios)
+    rho = _reservation_cost(reservation_cost, keys, optimizer)
+    probabilities = np.array([d['probability'] for d in data])
+    num_scenarios = len(data)
+    arrays = optimizer.edge_arrays()
+    network = (optimizer.num_nodes, arrays['tails'], arrays['heads'],
+               optimizer.source, optimizer.destination, arrays['link'])
+
+    # Répartition des scénarios entre processus (tourniquet)
+    handles, processes = start_workers(optimizer.env, _ScenarioSolver, data, workers,
+                                       args=(network,))
+
+    # Maître: réservation, une estimation theta_s par scénario (coûts >= 0)
+    master = gp.Model("stochastic_master", env=optimizer.env)
+    r = list(master.addVars(len(keys), ub=capacity.tolist(), obj=rho.tolist()).values())
+    if risk == 'expected':
+        theta = list(master.addVars(num_scenarios, obj=probabilities.tolist()).values())
+    else:
+        theta = list(master.addVars(num_scenarios).values())
+        eta = master.addVar(obj=1.0)
+        for t in theta:
+            master.addLConstr(gp.LinExpr([1.0, -1.0], [eta, t]), GRB.GREATER_EQUAL, 0.0)
+
+    history = []
+    scenario_times = np.zeros(num_scenarios)
+    lower_bound, upper_bound = -np.inf, np.inf
+    best = None
+    gap, status = np.inf, 'iteration_limit'
+    iteration = 0
+
+    try:
+        for iteration in range(1, max_iter + 1):
+            master.optimize()
+            if master.Status != GRB.OPTIMAL:
+                status = 'infeasible'
+                break
+            lower_bound = max(lower_bound, master.ObjVal)
+            r_val = np.array(master.getAttr('X', r))
+            theta_val = master.getAttr('X', theta)
+
+            for handle in handles:
+                handle.send(('solve', r_val))
+            answers = [answer for handle in handles for answer in handle.recv()]
+
+            values = np.zeros(num_scenarios)
+            unserved = np.zeros(num_scenarios)
+            for answer in answers:
+                s = answer['scenario']
+                scenario_times[s] += answer['time']
+                values[s] = answer['value']
+                unserved[s] = answer['unserved']
+                # Coupe theta_s >= Q_s(r^) + pi_s . (r - r^)
+                if answer['value'] > theta_val[s] + 1e-9 * max(1.0, abs(answer['value'])):
+                    gradient = answer['gradient']
+                    active = np.flatnonzero(gradient)
+                    expr = gp.LinExpr((-gradient[active]).tolist(), [r[k] for k in active])
+                    expr.add(theta[s])
+                    master.addLConstr(expr, GRB.GREATER_EQUAL,
+                                      answer['value'] - float(gradient @ r_val))
+
+            value = float(rho @ r_val) + _aggregate(values, probabilities, risk)
+            if value < upper_bound:
+                upper_bound = value
+                best = (r_val.copy(), values.copy(), unserved.copy())
+            gap = (upper_bound - lower_bound) / max(abs(upper_bound), 1e-9)
+            entry = {
+                'iteration': iteration,
+                'lower_bound': lower_bound,
+                'upper_bound': upper_bound,
+                'gap': gap,
+                'time': time.time() - start_time
+            }
+            history.append(entry)
+            if progress is not None:
+                progress(entry)
+
+            if gap <= tol:
+                status = 'optimal'
+                break
+            if time_limit is not None and time.time() - start_time > time_limit:
+                status = 'time_limit'
+                break
+
+        reservation = flows = None
+        values = unserved = []
+        if best is not None:
+            reservation, values, unserved = best
+            flows = np.zeros((num_scenarios, len(arrays['tails'])))
+            for handle in handles:
+                handle.send(('flows', reservation))
+            for handle in handles:
+                for s, x in handle.recv():
+                    flows[s] = x
+    finally:
+        stop_workers(handles, processes)
+        master.dispose()
+
+    results = _stochastic_results(optimizer, keys, status, start_time, reservation, flows,
+                                  data, rho, risk, 'l_shaped', values, unserved,
+                                  upper_bound if reservation is not None else None)
+    results['lower_bound'] = lower_bound
+    results['upper_bound'] = upper_bound
+    results['gap'] = gap
+    results['iterations'] = iteration
+    results['history'] = history
+    results['scenario_times'] = scenario_times
+    return results
@@ -0,0 +1,349 @@
+"""
+Ingestion de télémétrie en continu et ré-optimisation incrémentale
+
+Les latences, capacités et coûts des liens arrivent d'un flux de
+télémétrie (fichier suivi en continu, socket Unix ou file en mémoire).
+Les rafales de mises à jour sont regroupées sur une fenêtre d'anti-rebond,
+appliquées en place sur le modèle, et une nouvelle résolution n'est lancée
+que si le changement peut modifier le routage optimal.
+
+Format d'une mise à jour (une ligne JSON):
+    {"edge": [i, j], "latency": 12.5, "capacity": 180, "cost": 1.2, "ts": 1700000000.0}
+Seul "edge" est obligatoire; "ts" (horodatage epoch de la mesure) sert au
+calcul de la latence de bout en bout.
+"""
+
+import json
+import os
+import queue
+import socket
+import threading
+import time
+
+from gurobipy import GRB
+
+FIELDS = ('capacity', 'cost', 'latency')
+
+
+def parse_update(raw):
+    """
+    Décoder une mise à jour de télémétrie
+
+    Args:
+        raw: Ligne JSON (str / bytes) ou dict déjà décodé
+
+    Returns:
+        dict: {'edge': (i, j), champs présents, 'ts': horodatage} ou None
+    """
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode('utf-8')
+    if isinstance(raw, str):
+        raw = raw.strip()
+        if not raw:
+            return None
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return None
+
+    try:
+        i, j = raw['edge']
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    update = {'edge': (int(i), int(j)), 'ts': float(raw.get('ts', time.time()))}
+    for field in FIELDS:
+        if field in raw:
+            update[field] = float(raw[field])
+    return update
+
+
+class QueueSource:
+    """Source en mémoire (tests locaux, producteur dans le même processus)"""
+
+    def __init__(self, q=None):
+        self.queue = q if q is not None else queue.Queue()
+
+    def put(self, update):
+        self.queue.put(update)
+
+    def read(self, timeout):
+        """Attendre au plus timeout secondes, puis vider la file"""
+        items = []
+        try:
+            items.append(self.queue.get(timeout=timeout))
+            while True:
+                items.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return [u for u in map(parse_update, items) if u is not None]
+
+    def close(self):
+        pass
+
+
+class FileTailSource:
+    """Suivi d'un fichier de télémétrie en lignes JSON (équivalent de tail -f)"""
+
+    def __init__(self, path, from_start=False, poll_interval=0.01):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.file = open(path, 'r', encoding='utf-8')
+        if not from_start:
+            self.file.seek(0, os.SEEK_END)
+        self._partial = ''
+
+    def read(self, timeout):
+        deadline = time.time() + timeout
+        updates = []
+        while True:
+            chunk = self.file.read()
+            if chunk:
+                lines = (self._partial + chunk).split('\n')
+                self._partial = lines.pop()
+                updates.extend(u for u in map(parse_update, lines) if u is not None)
+            if updates or time.time() >= deadline:
+                return updates
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        self.file.close()
+
+
+class UnixSocketSource:
+    """Réception de datagrammes JSON sur un socket Unix"""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(path)
+
+    def read(self, timeout):
+        updates = []
+        self.sock.settimeout(timeout)
+        try:
+            data = self.sock.recv(65536)
+            self.sock.setblocking(False)
+            while True:
+                updates.extend(data.splitlines())
+                data = self.sock.recv(65536)
+        except (socket.timeout, BlockingIOError):
+            pass
+        return [u for u in map(parse_update, updates) if u is not None]
+
+    def close(self):
+        self.sock.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class TelemetryPipeline:
+    """
+    Boucle d'ingestion: regroupement, application en place, ré-optimisation
+
+    Chaque routage publié est un dict:
+        {'status', 'flows', 'objective', 'num_updates',
+         'update_latency', 'solve_time', 'timestamp'}
+    """
+
+    def __init__(self, optimizer, source, debounce=0.05, threshold=0.05,
+                 on_routing=None):
+        """
+        Args:
+            optimizer: NetworkOptimizer (le modèle est construit ici)
+            source: Source de télémétrie (read(timeout) -> liste de mises à jour)
+            debounce: Fenêtre de regroupement des rafales (s)
+            threshold: Variation relative minimale jugée significative
+            on_routing: Callback appelé à chaque routage publié
+        """
+        self.optimizer = optimizer
+        self.source = source
+        self.debounce = debounce
+        self.threshold = threshold
+        self.on_routing = on_routing
+
+        if not optimizer.flow_vars:
+            optimizer.build_model()
+        optimizer.relax_link_usage()
+
+        self.edges = list(optimizer.edge_dict.keys())
+        self._vars = [optimizer.flow_vars[e] for e in self.edges]
+        self.flows = None
+        self.last_routing = None
+        # Attributs des arêtes lors de la dernière résolution: les petites
+        # dérives s'accumulent jusqu'à devenir significatives
+        self._baseline = {}
+        self.stats = {'updates': 0, 'batches': 0, 'solves': 0, 'skipped': 0}
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ============================================
+    # DÉCISION DE RÉ-OPTIMISATION
+    # ============================================
+
+    def _relative(self, old, new):
+        return abs(new - old) / max(abs(old), 1e-9)
+
+    def is_material(self, edge, old, new):
+        """
+        Le changement d'une arête peut-il modifier le routage optimal ?
+
+        Pour un PL, relâcher une borne inactive ou augmenter le coût d'une
+        arête sans flux laisse la solution courante optimale. La capacité
+        est celle du lien: elle est comparée à la charge de tous ses arcs.
+        """
+        if self.flows is None:
+            return True
+
+        flow = self.flows.get(edge, 0.0)
+        opt = self.optimizer
+
+        if new['capacity'] != old['capacity']:
+            load = sum(self.flows.get(arc, 0.0)
+                       for arc in opt.link_arcs[opt._arc_link[edge]])
+            new_bound = opt.flow_upper_bound(*edge, capacity=new['capacity'])
+            if load > new_bound + 1e-6:
+                return True  # La solution courante devient irréalisable
+            old_bound = opt.flow_upper_bound(*edge, capacity=old['capacity'])
+            saturated = load >= old_bound - 1e-6
+            if (saturated and new_bound > old_bound
+                    and self._relative(old_bound, new_bound) > self.threshold):
+                return True
+
+        old_coeff = opt.objective_coefficient(old['cost'], old['latency'])
+        new_coeff = opt.objective_coefficient(new['cost'], new['latency'])
+        if new_coeff != old_coeff and self._relative(old_coeff, new_coeff) > self.threshold:
+            if flow > 1e-6 or new_coeff < old_coeff:
+                return True
+
+        return False
+
+    # ============================================
+    # TRAITEMENT D'UN LOT
+    # ============================================
+
+    def coalesce(self, updates):
+        """Ne garder que la dernière valeur de chaque champ par arête"""
+        merged = {}
+        for update in updates:
+            edge = update['edge']
+            if edge not in self.optimizer.edge_dict:
+                continue
+            entry = merged.setdefault(edge, {'ts': update['ts']})
+            entry['ts'] = min(entry['ts'], update['ts'])
+            for field in FIELDS:
+                if field in update:
+                    entry[field] = update[field]
+        return merged
+
+    def process_batch(self, updates):
+        """
+        Appliquer un lot de mises à jour et ré-optimiser si nécessaire
+
+        Returns:
+            dict: Routage publié, ou None si le lot est sans effet
+        """
+        self.stats['updates'] += len(updates)
+        self.stats['batches'] += 1
+        merged = self.coalesce(updates)
+        if not merged and self.flows is not None:
+            return None
+
+        material = self.flows is None
+        changes = {field: {} for field in FIELDS}
+        for edge, entry in merged.items():
+            old = self._baseline.get(edge, self.optimizer.edge_dict[edge])
+            current = dict(self.optimizer.edge_dict[edge])
+            current.update(entry)
+            if self.is_material(edge, old, current):
+                material = True
+            for field in FIELDS:
+                if field in entry:
+                    changes[field][edge] = entry[field]
+
+        # Les changements sont toujours appliqués: le modèle reste à jour
+        self.optimizer.update_edges(capacities=changes['capacity'],
+                                    costs=changes['cost'],
+                                    latencies=changes['latency'])
+
+        if not material:
+            self.stats['skipped'] += 1
+            return None
+
+        start = time.time()
+        self.optimizer.model.optimize()
+        solve_time = time.time() - start
+        self.stats['solves'] += 1
+        self._baseline = {e: dict(v) for e, v in self.optimizer.edge_dict.items()}
+
+        routing = {
+            'status': self.optimizer.get_status_string(),
+            'num_updates': len(updates),
+            'solve_time': solve_time
+        }
+        if self.optimizer.model.Status == GRB.OPTIMAL:
+            x = self.optimizer.model.getAttr('X', self._vars)
+            self.flows = dict(zip(self.edges, x))
+            routing['flows'] = self.flows
+            routing['objective'] = self.optimizer.model.ObjVal
+        else:
+            self.flows = None
+
+        now = time.time()
+        oldest = min((entry['ts'] for entry in merged.values()), default=now)
+        routing['update_latency'] = now - oldest
+        routing['timestamp'] = now
+
+        self.last_routing = routing
+        if self.on_routing:
+            self.on_routing(routing)
+        return routing
+
+    # ============================================
+    # BOUCLE D'INGESTION
+    # ============================================
+
+    def run(self, max_batches=None, idle_timeout=0.1):
+        """
+        Consommer la source jusqu'à stop() (ou max_batches lots traités)
+
+        Une rafale est regroupée à partir de sa première mise à jour
+        jusqu'à la fin de la fenêtre d'anti-rebond.
+        """
+        if self.flows is None:
+            self.process_batch([])
+
+        batches = 0
+        while not self._stop.is_set():
+            updates = self.source.read(idle_timeout)
+            if not updates:
+                continue
+
+            window_end = time.time() + self.debounce
+            while True:
+                remaining = window_end - time.time()
+                if remaining <= 0:
+                    break
+                updates.extend(self.source.read(remaining))
+
+            self.process_batch(updates)
+            batches += 1
+            if max_batches is not None and batches >= max_batches:
+                break
+
+    def start(self):
+        """Lancer la boucle d'ingestion dans un thread d'arrière-plan"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrêter la boucle et fermer la source"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.source.close()
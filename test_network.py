@@ -5,9 +5,38 @@ sans interface graphique
 
 import sys
 from network_optimizer import NetworkOptimizer
+from metrics import format_report
 import time
 import json
 
+def _grid_edges(rows, cols, seed=None, capacity=(20, 60)):
+    """
+    Grille rows x cols, liens dans les deux sens (un arc par sens)
+    
+    Avec seed (graine ou générateur NumPy): capacités tirées dans
+    l'intervalle capacity, coûts et latences aléatoires. Sans seed:
+    capacité fixe capacity, coûts et latences périodiques.
+    
+    Returns:
+        tuple: (nombre de nœuds, tails, heads, edges)
+    """
+    import numpy as np
+    
+    num_nodes = rows * cols
+    grid = np.arange(num_nodes).reshape(rows, cols)
+    tails = np.concatenate([grid[:, :-1].ravel(), grid[:-1, :].ravel()])
+    heads = np.concatenate([grid[:, 1:].ravel(), grid[1:, :].ravel()])
+    tails, heads = np.concatenate([tails, heads]), np.concatenate([heads, tails])
+    if seed is None:
+        edges = [(int(i), int(j), capacity, 1.0 + k % 7, 2.0 + k % 5)
+                 for k, (i, j) in enumerate(zip(tails, heads))]
+    else:
+        rng = np.random.default_rng(seed)
+        low, high = capacity
+        edges = [(int(i), int(j), float(rng.integers(low, high)), float(rng.integers(1, 10)),
+                  float(rng.integers(1, 20))) for i, j in zip(tails, heads)]
+    return num_nodes, tails, heads, edges
+
 def test_simple_network():
     """Test 1: Réseau simple avec 5 nœuds"""
     print("="*70)
@@ -226,40 +255,1422 @@ def test_scalability():
     
     print()
 
+def test_pareto_frontier():
+    """Test 5: Frontière de Pareto coût / latence"""
+    print("="*70)
+    print("TEST 5: Frontière de Pareto coût / latence")
+    print("="*70)
+    
+    num_nodes = 4
+    edges = [
+        (0, 1, 100, 1.0, 30),  # Chemin lent et bon marché
+        (1, 3, 100, 1.0, 30),
+        (0, 2, 60, 3.0, 5),    # Chemin rapide et coûteux
+        (2, 3, 60, 3.0, 5),
+        (0, 3, 50, 2.5, 20)    # Lien direct
+    ]
+    demand = 150
+    
+    optimizer = NetworkOptimizer(num_nodes, edges, demand, 
+                                use_reliability=False)
+    
+    frontier = optimizer.solve_pareto(method='parametric')
+    print(f"Paramétrique: {len(frontier)} points extrêmes "
+          f"en {frontier.solve_time:.3f} s")
+    for point in frontier:
+        print(f"  Coût: {point['cost']:.2f} €  Latence: {point['latency']:.2f}")
+    
+    sweep = optimizer.solve_pareto(method='epsilon', num_points=9, workers=2)
+    print(f"Epsilon-contrainte: {len(sweep)} points en {sweep.solve_time:.3f} s")
+    
+    # Les deux méthodes partagent les mêmes extrémités
+    assert abs(frontier[0]['cost'] - sweep[0]['cost']) < 1e-4
+    assert abs(frontier[-1]['latency'] - sweep[-1]['latency']) < 1e-4
+    
+    # Choisir un compromis sans nouvelle résolution
+    target = (frontier[0]['latency'] + frontier[-1]['latency']) / 2
+    chosen = frontier.select(max_latency=target)
+    print(f"Compromis (latence <= {target:.0f}): coût {chosen['cost']:.2f} €")
+    assert chosen['latency'] <= target + 1e-6
+    assert frontier[0]['cost'] <= chosen['cost'] <= frontier[-1]['cost']
+    print()
+
+def test_time_slots():
+    """Test 6: Routage par créneaux horaires avec démarrage à chaud"""
+    print("="*70)
+    print("TEST 6: Routage par créneaux horaires")
+    print("="*70)
+    
+    import numpy as np
+    from time_slots import solve_time_slots
+    
+    num_nodes = 6
+    edges = [
+        (0, 1, 120, 2.0, 20),
+        (0, 2, 100, 1.5, 10),
+        (1, 3, 110, 1.8, 15),
+        (2, 3, 90, 1.2, 8),
+        (2, 4, 130, 2.5, 25),
+        (3, 4, 100, 1.0, 5),
+        (3, 5, 120, 1.5, 12),
+        (4, 5, 140, 1.3, 10)
+    ]
+    
+    # Profil journalier: demande en cloche, coûts perturbés
+    num_slots = 12
+    demands = 150 * (0.5 + 0.5 * np.sin(np.linspace(0, np.pi, num_slots)))
+    base_costs = np.array([e[3] for e in edges])
+    rng = np.random.default_rng(0)
+    costs = base_costs * (1 + 0.3 * rng.random((num_slots, len(edges))))
+    
+    series = solve_time_slots(num_nodes, edges, demands, costs=costs,
+                              use_reliability=False)
+    print(f"{len(series)} créneaux résolus en {series.total_time:.3f} s "
+          f"(flux: tableau {series.flows.shape})")
+    
+    # Chaque créneau doit égaler une résolution à froid
+    for t in [0, num_slots // 2, num_slots - 1]:
+        slot_edges = [(i, j, cap, costs[t, k], lat)
+                      for k, (i, j, cap, _, lat) in enumerate(edges)]
+        cold = NetworkOptimizer(num_nodes, slot_edges, demands[t],
+                                use_reliability=False).solve()
+        print(f"  Créneau {t}: {series.objective[t]:.2f} € "
+              f"(à froid: {cold['total_cost']:.2f} €)")
+        assert abs(series.objective[t] - cold['total_cost']) < 1e-6 * cold['total_cost']
+    
+    # Limite de variation entre créneaux
+    smooth = solve_time_slots(num_nodes, edges, demands, costs=costs,
+                              use_reliability=False, max_change=30)
+    steps = np.abs(np.diff(smooth.flows, axis=0))
+    print(f"Variation max avec limite: {steps[~smooth.ramp_relaxed[1:]].max():.2f}")
+    assert steps[~smooth.ramp_relaxed[1:]].max() <= 30 + 1e-6
+    
+    # Créneaux indépendants en parallèle
+    parallel = solve_time_slots(num_nodes, edges, demands, costs=costs,
+                                use_reliability=False, parallel=True, workers=3)
+    assert np.allclose(parallel.objective, series.objective)
+    print()
+
+def test_telemetry_pipeline():
+    """Test 7: Ingestion de télémétrie et ré-optimisation incrémentale"""
+    print("="*70)
+    print("TEST 7: Télémétrie en continu")
+    print("="*70)
+    
+    from telemetry import TelemetryPipeline, QueueSource
+    
+    num_nodes = 4
+    edges = [
+        (0, 1, 100, 1.0, 30),
+        (1, 3, 100, 1.0, 30),
+        (0, 2, 60, 3.0, 5),
+        (2, 3, 60, 3.0, 5),
+        (0, 3, 50, 2.5, 20)
+    ]
+    optimizer = NetworkOptimizer(num_nodes, edges, 80, use_reliability=False)
+    
+    published = []
+    source = QueueSource()
+    pipeline = TelemetryPipeline(optimizer, source, debounce=0.01,
+                                 on_routing=published.append)
+    
+    initial = pipeline.process_batch([])
+    print(f"Routage initial: {initial['objective']:.2f} €")
+    
+    # Rafale sans effet: hausse de coût d'un lien inutilisé
+    burst = [{'edge': (0, 2), 'cost': 3.0 + k, 'ts': 0} for k in range(5)]
+    assert pipeline.process_batch(burst) is None
+    print(f"Rafale ignorée (lien inutilisé): {pipeline.stats}")
+    
+    # Panne partielle du lien principal: ré-optimisation
+    source.put('{"edge": [0, 1], "capacity": 20}')
+    pipeline.run(max_batches=1)
+    routing = published[-1]
+    print(f"Après dégradation: {routing['objective']:.2f} € "
+          f"(latence de mise à jour: {routing['update_latency']*1000:.1f} ms)")
+    
+    degraded = [(0, 1, 20, 1.0, 30)] + edges[1:2] + [(0, 2, 60, 7.0, 5)] + edges[3:]
+    cold = NetworkOptimizer(num_nodes, degraded, 80, use_reliability=False).solve()
+    assert abs(routing['objective'] - cold['total_cost']) < 1e-6
+    assert pipeline.stats['solves'] == 2
+    
+    # Lien bidirectionnel: la capacité réduite par l'arc inverse lie la charge
+    links = [(0, 1, 100, 1.0, 10, True), (1, 2, 100, 1.0, 10), (0, 2, 100, 5.0, 10)]
+    optimizer = NetworkOptimizer(3, links, 60, use_reliability=False)
+    pipeline = TelemetryPipeline(optimizer, QueueSource())
+    pipeline.process_batch([])
+    assert abs(pipeline.flows[(0, 1)] - 60) < 1e-6
+    routing = pipeline.process_batch([{'edge': (1, 0), 'capacity': 30, 'ts': 0}])
+    assert routing is not None
+    assert abs(routing['flows'][(0, 1)] - 30) < 1e-6
+    print("✓ Capacité du lien bidirectionnel comparée à sa charge")
+    print()
+
+def test_model_template_cache():
+    """Test 8: Pool d'environnements et cache de modèles"""
+    print("="*70)
+    print("TEST 8: Réutilisation des environnements et des modèles")
+    print("="*70)
+    
+    from solver_env import ModelTemplateCache, env_pool
+    
+    num_nodes = 6
+    edges = [
+        (0, 1, 120, 2.0, 20),
+        (0, 2, 100, 1.5, 10),
+        (1, 3, 110, 1.8, 15),
+        (2, 3, 90, 1.2, 8),
+        (2, 4, 130, 2.5, 25),
+        (3, 4, 100, 1.0, 5),
+        (3, 5, 120, 1.5, 12),
+        (4, 5, 140, 1.3, 10)
+    ]
+    cache = ModelTemplateCache()
+    
+    print(f"{'Demande':<10} {'Coût (€)':<12} {'Référence':<12} {'Construction (ms)':<18}")
+    print("-"*70)
+    for demand in [100, 100, 80, 120]:
+        start = time.time()
+        optimizer = NetworkOptimizer(num_nodes, edges, demand,
+                                    use_reliability=True, use_balance=True,
+                                    template_cache=cache)
+        optimizer.build_model()
+        build_ms = (time.time() - start) * 1000
+        results = optimizer.solve()
+        
+        reference = NetworkOptimizer(num_nodes, edges, demand,
+                                    use_reliability=True, use_balance=True).solve()
+        print(f"{demand:<10} {results.get('total_cost', float('nan')):<12.2f} "
+              f"{reference.get('total_cost', float('nan')):<12.2f} {build_ms:<18.2f}")
+        assert results['status'] == reference['status']
+        if reference['status'] == 'optimal':
+            assert abs(results['total_cost'] - reference['total_cost']) < 1e-6
+    
+    print(f"Cache: {cache.hits} réutilisations, {cache.misses} construction(s)")
+    assert cache.hits == 3 and cache.misses == 1
+    
+    # Un environnement du pool par thread de calcul
+    with env_pool().acquire() as env:
+        optimizer = NetworkOptimizer(num_nodes, edges, 150, env=env,
+                                    template_cache=cache)
+        assert optimizer.solve()['status'] == 'optimal'
+        optimizer.model.dispose()
+    print()
+
+def test_core_import():
+    """Test 9: Cœur léger (sans solveur) et budget d'import"""
+    print("="*70)
+    print("TEST 9: Cœur léger et budget d'import")
+    print("="*70)
+    
+    import os
+    import tempfile
+    from benchmark import check_core_import, CORE_IMPORT_BUDGET
+    from network_model import Network
+    
+    ok, result = check_core_import()
+    print(f"Import de network_model: {result.get('time', float('nan')):.3f} s "
+          f"(budget {CORE_IMPORT_BUDGET:.2f} s), modules lourds: {result.get('heavy')}")
+    assert ok, result
+    
+    # Aller-retour fichier et résolution via le moteur chargé à la demande
+    network = Network.from_example('campus')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'campus.txt')
+        network.save(path)
+        loaded = Network.load(path)
+    
+    assert loaded.num_nodes == network.num_nodes
+    assert loaded.demand == network.demand
+    assert loaded.edges == [tuple(float(v) if k > 1 else v for k, v in enumerate(e))
+                            for e in network.edges]
+    
+    results = loaded.optimizer('gurobi', use_reliability=False).solve()
+    print(f"Réseau relu: {len(loaded.edges)} arêtes, coût {results['total_cost']:.2f} €")
+    assert results['status'] == 'optimal'
+    print()
+
+def test_network_design():
+    """Test 10: Conception de réseau à coûts fixes (Benders vs monolithique)"""
+    print("="*70)
+    print("TEST 10: Conception de réseau à coûts fixes")
+    print("="*70)
+    
+    import numpy as np
+    
+    num_nodes = 8
+    edges = [
+        (0, 1, 150, 1.2, 10),
+        (0, 2, 120, 1.8, 12),
+        (1, 2, 100, 1.0, 8),
+        (1, 3, 140, 1.5, 11),
+        (2, 3, 110, 1.3, 9),
+        (2, 4, 130, 2.0, 15),
+        (3, 4, 120, 1.1, 8),
+        (3, 5, 150, 1.7, 13),
+        (4, 5, 140, 1.4, 10),
+        (4, 6, 130, 2.2, 18),
+        (5, 6, 150, 1.2, 9),
+        (5, 7, 160, 1.6, 12),
+        (6, 7, 170, 1.0, 7)
+    ]
+    demand = 200
+    fixed_costs = np.linspace(1, 10, len(edges))
+    routing = NetworkOptimizer(num_nodes, edges, demand, use_reliability=False,
+                               fast_path=False).solve()
+    
+    print(f"{'Méthode':<12} {'Limite':<8} {'Objectif':<12} {'Liens ouverts':<15} {'Temps (s)':<10}")
+    print("-"*70)
+    for limit in [None, 8]:
+        reference = None
+        for method in ['monolithic', 'benders']:
+            optimizer = NetworkOptimizer(num_nodes, edges, demand,
+                                        use_reliability=False)
+            res = optimizer.solve_design(fixed_costs, max_active_links=limit,
+                                         method=method)
+            print(f"{method:<12} {str(limit):<8} {res['objective']:<12.2f} "
+                  f"{len(res['open_links']):<15} {res['solve_time']:<10.3f}")
+            
+            assert res['status'] == 'optimal'
+            assert abs(res['objective'] - res['total_cost'] - res['fixed_cost']) < 1e-6
+            if limit is not None:
+                assert len(res['open_links']) <= limit
+            if reference is None:
+                reference = res['objective']
+            else:
+                assert abs(res['objective'] - reference) < 1e-4 * reference
+            
+            # Le modèle de l'optimiseur n'est pas modifié par la conception
+            after = optimizer.solve()
+            assert abs(after.objective - routing.objective) < 1e-6 * routing.objective
+        print(f"  Coupes Benders: {res['optimality_cuts']} d'optimalité, "
+              f"{res['feasibility_cuts']} de faisabilité")
+    print()
+
+def test_congestion_routing():
+    """Test 11: Routage à délai convexe (Frank-Wolfe vs linéarisation Gurobi)"""
+    print("="*70)
+    print("TEST 11: Routage sensible à la congestion")
+    print("="*70)
+    
+    import numpy as np
+    from network_model import Network
+    from congestion import frank_wolfe
+    
+    num_nodes = 8
+    edges = [
+        (0, 1, 150, 1.2, 10),
+        (0, 2, 120, 1.8, 12),
+        (1, 2, 100, 1.0, 8),
+        (1, 3, 140, 1.5, 11),
+        (2, 3, 110, 1.3, 9),
+        (2, 4, 130, 2.0, 15),
+        (3, 4, 120, 1.1, 8),
+        (3, 5, 150, 1.7, 13),
+        (4, 5, 140, 1.4, 10),
+        (4, 6, 130, 2.2, 18),
+        (5, 6, 150, 1.2, 9),
+        (5, 7, 160, 1.6, 12),
+        (6, 7, 170, 1.0, 7)
+    ]
+    demand = 200
+    network = Network(num_nodes, edges, demand)
+    arrays = network.arrays
+    
+    print(f"{'Délai':<10} {'Moteur':<24} {'Délai total':<14} {'Écart':<10} "
+          f"{'Itér.':<7} {'ms/itér.':<10}")
+    print("-"*70)
+    for delay in ['bpr', 'kleinrock']:
+        options = {'service_scale': 500.0} if delay == 'kleinrock' else {}
+        runs = [frank_wolfe(network, delay, conjugate=conjugate, max_iter=5000,
+                            tol=1e-5, **options)
+                for conjugate in [False, True]]
+        optimizer = NetworkOptimizer(num_nodes, edges, demand, use_reliability=False)
+        runs.append(optimizer.solve_congestion(delay, engine='pwl', tol=1e-5, **options))
+        
+        for res in runs:
+            print(f"{delay:<10} {res['method']:<24} {res['total_delay']:<14.2f} "
+                  f"{res['relative_gap']:<10.1e} {res['iterations']:<7} "
+                  f"{1000 * res['iteration_times'].mean():<10.3f}")
+            
+            # Conservation du flot: la demande quitte la source et arrive au puits
+            x = res['x']
+            net_out = (np.bincount(arrays['tails'], x, num_nodes)
+                       - np.bincount(arrays['heads'], x, num_nodes))
+            assert abs(net_out[0] - demand) < 1e-6
+            assert abs(net_out[-1] + demand) < 1e-6
+            assert np.all(np.abs(net_out[1:-1]) < 1e-6)
+            assert res['lower_bound'] <= res['total_delay'] + 1e-6
+        
+        # Capacités non saturées: les moteurs doivent s'accorder
+        if runs[-1]['max_utilization'] < 0.99:
+            reference = min(res['total_delay'] for res in runs)
+            for res in runs:
+                assert res['total_delay'] - reference <= 1e-3 * reference
+        # Le Frank-Wolfe conjugué ne doit pas être plus lent que le classique
+        assert runs[1]['iterations'] <= runs[0]['iterations']
+    print()
+
+def test_routing_result():
+    """Test 12: Résultat typé (tableaux NumPy, export pandas / Arrow)"""
+    print("="*70)
+    print("TEST 12: Résultat de routage typé")
+    print("="*70)
+    
+    import numpy as np
+    from network_model import RoutingResult, flow_metrics
+    
+    edges = [
+        (0, 1, 100, 1.5, 10),
+        (0, 2, 80, 2.0, 15),
+        (1, 2, 60, 1.0, 8),
+        (1, 3, 100, 1.8, 12),
+        (2, 3, 70, 1.2, 10),
+        (2, 4, 90, 2.5, 20),
+        (3, 4, 120, 1.0, 8)
+    ]
+    optimizer = NetworkOptimizer(5, edges, 100, use_reliability=False)
+    results = optimizer.solve()
+    
+    assert isinstance(results, RoutingResult)
+    assert results['status'] == 'optimal'
+    print(results)
+    
+    # Les métriques vectorisées reproduisent flow_metrics
+    reference = flow_metrics(optimizer.edge_dict, results['flows'])
+    for key, value in reference.items():
+        if isinstance(value, (int, float)):
+            assert abs(results[key] - value) < 1e-9, key
+        else:
+            assert results[key] == value, key
+    assert np.allclose(results.flow, [results['flows'][e] for e in results.edge_keys])
+    
+    # Export pandas sans copie
+    df = results.to_pandas()
+    assert list(df.columns) == list(RoutingResult.COLUMNS)
+    assert np.shares_memory(df['flow'].to_numpy(), results.flow)
+    print(df.sort_values('flow', ascending=False).head().to_string(index=False))
+    
+    try:
+        table = results.to_arrow()
+        assert table.num_rows == len(results.flow)
+        print(f"✓ Table Arrow: {table.num_rows} lignes")
+    except ImportError as e:
+        print(f"  Export Arrow ignoré: {e}")
+    print()
+
+def test_solver_profiles():
+    """Test 13: Profils de paramètres du solveur par classe d'instance"""
+    print("="*70)
+    print("TEST 13: Profils de paramètres du solveur")
+    print("="*70)
+    
+    import os
+    import tempfile
+    from solver_env import thread_budget
+    from solver_profiles import ProfileStore, class_name, tune_instance
+    
+    edges = [
+        (0, 1, 100, 1.5, 10),
+        (0, 2, 80, 2.0, 15),
+        (1, 2, 60, 1.0, 8),
+        (1, 3, 100, 1.8, 12),
+        (2, 3, 70, 1.2, 10),
+        (2, 4, 90, 2.5, 20),
+        (3, 4, 120, 1.0, 8)
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProfileStore(os.path.join(tmp, 'profiles.json'))
+        
+        optimizer = NetworkOptimizer(5, edges, 100, use_reliability=False, profile=store)
+        reference = optimizer.solve()
+        print(f"Classe: {class_name(optimizer.instance_class)} -> {optimizer.solver_params}")
+        assert optimizer.instance_class == ('mip', 'small', 'dense')
+        assert optimizer.solver_params['Threads'] == 1
+        
+        # Le PL relâché change de classe et de profil
+        optimizer.relax_link_usage()
+        optimizer.apply_solver_profile()
+        assert optimizer.instance_class[0] == 'lp'
+        
+        # Réglage hors ligne, puis réutilisation automatique par la classe
+        instance_class, params = tune_instance(
+            NetworkOptimizer(5, edges, 100, use_reliability=False, profile=None),
+            time_limit=1, store=store, source='test')
+        print(f"Réglage: {class_name(instance_class)} -> {params or 'défauts'}")
+        store.put(instance_class, dict(params, Presolve=2), source='test')
+        
+        tuned = NetworkOptimizer(5, edges, 100, use_reliability=False,
+                                 profile=ProfileStore(store.path))
+        results = tuned.solve()
+        assert tuned.solver_params['Presolve'] == 2
+        assert tuned.model.Params.Presolve == 2
+        assert abs(results['total_cost'] - reference['total_cost']) < 1e-6
+        
+        # Pas de surcharge des cœurs en parallèle
+        jobs = 2 * (os.cpu_count() or 1)
+        batch = NetworkOptimizer(5, edges, 100, use_reliability=False,
+                                 profile=store, parallel_jobs=jobs)
+        batch.solve()
+        assert batch.model.Params.Threads == thread_budget(jobs) == 1
+        print(f"✓ Profil réglé réutilisé, {thread_budget(1)} thread(s) disponibles")
+    
+    # Paramètre absent de la version de Gurobi installée: ignoré
+    optimizer = NetworkOptimizer(5, edges, 100, use_reliability=False,
+                                 profile={'Method': 1, 'UnknownParam': 1})
+    assert optimizer.solve()['status'] == 'optimal'
+    assert optimizer.model.Params.Method == 1
+    print()
+
+def test_decomposition():
+    """Test 14: Décomposition par régions (coordination par les frontières)"""
+    print("="*70)
+    print("TEST 14: Décomposition par régions")
+    print("="*70)
+    
+    import numpy as np
+    from graph_partition import cut_mask, partition_graph
+    
+    # Grille 12 x 15, liens dans les deux sens
+    num_nodes, tails, heads, edges = _grid_edges(12, 15, 3)
+    demand = 40
+    
+    parts = partition_graph(num_nodes, tails, heads, 4)
+    sizes = np.bincount(parts)
+    print(f"Partition: régions de {sizes.min()} à {sizes.max()} nœuds, "
+          f"{cut_mask(parts, tails, heads).sum()} arêtes coupées sur {len(edges)}")
+    assert sizes.max() <= np.ceil(1.05 * num_nodes / 4)
+    
+    reference = NetworkOptimizer(num_nodes, edges, demand, use_reliability=False)
+    reference.build_model()
+    reference.relax_link_usage()
+    expected = reference.solve()['total_cost']
+    
+    for workers in [0, 2]:
+        history = []
+        optimizer = NetworkOptimizer(num_nodes, edges, demand, use_reliability=False)
+        res = optimizer.solve_decomposed(num_regions=4, workers=workers, tol=1e-6,
+                                         progress=history.append)
+        print(f"  {workers} processus: {res['iterations']} itérations, "
+              f"bornes [{res['lower_bound']:.2f}, {res['upper_bound']:.2f}], "
+              f"{res['solve_time']:.2f} s, régions: "
+              + ", ".join(f"{t * 1000:.0f} ms" for t in res['region_times']))
+        
+        assert res['status'] == 'optimal'
+        assert len(history) == res['iterations']
+        assert res['lower_bound'] <= res['upper_bound'] + 1e-6
+        assert abs(res['total_cost'] - expected) < 1e-4 * expected
+        
+        # Conservation du flot recomposé
+        net_out = (np.bincount(tails, res.flow, num_nodes)
+                   - np.bincount(heads, res.flow, num_nodes))
+        assert abs(net_out[0] - demand) < 1e-6 and abs(net_out[-1] + demand) < 1e-6
+        assert np.all(np.abs(net_out[1:-1]) < 1e-6)
+        assert np.all(res.flow <= res.capacity + 1e-6)
+    print(f"✓ Coût identique au modèle complet: {expected:.2f}")
+    print()
+
+def test_solution_library():
+    """Test 15: Bibliothèque de solutions et démarrage à chaud"""
+    print("="*70)
+    print("TEST 15: Bibliothèque de solutions")
+    print("="*70)
+    
+    import os
+    import tempfile
+    import numpy as np
+    from solution_library import SolutionLibrary
+    
+    rng = np.random.default_rng(3)
+    num_nodes, tails, heads, edges = _grid_edges(12, 12, rng)
+    
+    def solve(edge_list, demand, library):
+        optimizer = NetworkOptimizer(num_nodes, edge_list, demand, use_reliability=False,
+                                     solution_library=library)
+        optimizer.build_model()
+        optimizer.relax_link_usage()
+        results = optimizer.solve()
+        assert results['status'] == 'optimal'
+        return results, optimizer.model.IterCount
+    
+    # Capacités ajustées, puis quelques liens retirés / ajoutés et demande modifiée
+    nudged = [(i, j, cap * rng.uniform(0.95, 1.05), cost, lat)
+              for i, j, cap, cost, lat in edges]
+    changed = nudged[:-6] + [(0, num_nodes - 1, 5.0, 50.0, 50.0)]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'solutions.sqlite')
+        library = SolutionLibrary(path)
+        solve(edges, 50, library)
+        
+        print(f"{'Instance':<12} {'Départ':<8} {'Similarité':<12} {'Itér. chaud':<12} "
+              f"{'Itér. froid':<12} {'Recherche (ms)':<14}")
+        print("-"*70)
+        for name, edge_list, demand in [('ajustée', nudged, 50), ('modifiée', changed, 55)]:
+            warm, warm_iters = solve(edge_list, demand, library)
+            cold, cold_iters = solve(edge_list, demand, None)
+            info = warm['warm_start']
+            print(f"{name:<12} {info['kind']:<8} {info['similarity']:<12.3f} "
+                  f"{warm_iters:<12.0f} {cold_iters:<12.0f} "
+                  f"{1000 * info['retrieval_time']:<14.2f}")
+            
+            assert info['kind'] == 'basis'
+            assert abs(warm['total_cost'] - cold['total_cost']) < 1e-6 * cold['total_cost']
+            assert warm_iters < cold_iters
+        library.close()
+        
+        # La bibliothèque persiste sur disque
+        reopened = SolutionLibrary(path)
+        stats = reopened.stats()
+        print(f"✓ {stats['instances']} instances, {stats['hits']} démarrages à chaud, "
+              f"recherche moyenne {1000 * stats['avg_retrieval_time']:.2f} ms")
+        assert stats['instances'] == 3 and stats['hits'] == 2
+        reopened.close()
+        
+        # Liens bidirectionnels: éléments de base partagés comptés une fois
+        links = [edge + (True,) for edge in edges[:len(edges) // 2]]
+        nudged_links = [edge + (True,) for edge in nudged[:len(nudged) // 2]]
+        library = SolutionLibrary(os.path.join(tmp, 'links.sqlite'))
+        solve(links, 50, library)
+        warm, warm_iters = solve(nudged_links, 50, library)
+        cold, cold_iters = solve(nudged_links, 50, None)
+        print(f"Liens bidirectionnels: {warm_iters:.0f} itérations à chaud, "
+              f"{cold_iters:.0f} à froid")
+        assert warm['warm_start']['kind'] == 'basis'
+        assert abs(warm['total_cost'] - cold['total_cost']) < 1e-6 * cold['total_cost']
+        assert warm_iters < cold_iters
+        library.close()
+    print()
+
+def test_metrics_engine():
+    """Test 16: Moteur de métriques vectorisé"""
+    print("="*70)
+    print("TEST 16: Moteur de métriques")
+    print("="*70)
+    
+    import numpy as np
+    from metrics import compute_metrics
+    from network_model import flow_metrics
+    
+    # Deux liens: l'un saturé, l'autre vide
+    edge_dict = {(0, 1): {'capacity': 10, 'cost': 2.0, 'latency': 5.0},
+                 (1, 2): {'capacity': 1000, 'cost': 1.0, 'latency': 50.0}}
+    flows = {(0, 1): 10.0, (1, 2): 0.0}
+    metrics = flow_metrics(edge_dict, flows)
+    print(f"Utilisation moyenne: {metrics['avg_utilization']:.1%} "
+          f"(ancien calcul flux / capacité: {10 / 1010:.1%})")
+    assert abs(metrics['avg_utilization'] - 0.5) < 1e-12
+    assert metrics['bottlenecks'] == [((0, 1), 1.0)]
+    assert metrics['utilization_histogram']['counts'] == [1, 0, 0, 0, 1]
+    
+    # Percentiles pondérés: 90 % du flux voit une latence de 1
+    weighted = compute_metrics([90.0, 10.0], [100.0, 100.0], [1.0, 1.0], [1.0, 100.0])
+    print(f"Percentiles de latence: {weighted['latency_percentiles']}")
+    assert weighted['latency_percentiles'][50] == 1.0
+    assert weighted['latency_percentiles'][99] == 100.0
+    
+    # Lien bidirectionnel (arcs 0 et 1, capacité partagée 100): agrégé par lien
+    shared = compute_metrics([60.0, 40.0, 5.0], [100.0, 100.0, 50.0], [1.0] * 3,
+                             [1.0] * 3, tails=[0, 1, 1], heads=[1, 0, 2], links=[0, 0, 1])
+    assert shared['bottlenecks'] == [((0, 1), 1.0)]
+    assert shared['active_links'] == 2 and shared['total_capacity'] == 150.0
+    assert abs(shared['avg_utilization'] - 0.55) < 1e-12
+    # Identifiants de liens quelconques (non contigus): mêmes métriques
+    sparse = compute_metrics([60.0, 40.0, 5.0], [100.0, 100.0, 50.0], [1.0] * 3,
+                             [1.0] * 3, tails=[0, 1, 1], heads=[1, 0, 2], links=[3, 3, 7])
+    assert sparse == shared
+    
+    # Résultat de solve(): mêmes métriques par les tableaux et par le dict
+    num_nodes = 5
+    edges = [(0, 1, 100, 1.5, 10), (0, 2, 80, 2.0, 15), (1, 2, 60, 1.0, 8),
+             (1, 3, 100, 1.8, 12), (2, 3, 70, 1.2, 10), (2, 4, 90, 2.5, 20),
+             (3, 4, 120, 1.0, 8)]
+    optimizer = NetworkOptimizer(num_nodes, edges, 150)
+    results = optimizer.solve()
+    from_dict = flow_metrics(optimizer.edge_dict, results['flows'])
+    for key in ('total_cost', 'avg_latency', 'avg_utilization', 'max_utilization'):
+        assert abs(results[key] - from_dict[key]) < 1e-9
+    expected = np.mean([results['flows'][(i, j)] / cap for i, j, cap, _, _ in edges])
+    assert abs(results['avg_utilization'] - expected) < 1e-12
+    print(format_report(results, max_links=3))
+    print()
+
+def test_async_solve():
+    """Test 17: API asyncio (concurrence bornée, annulation)"""
+    print("="*70)
+    print("TEST 17: Résolutions asynchrones")
+    print("="*70)
+    
+    import asyncio
+    from network_model import RoutingResult
+    from async_solve import solve_many_async
+    from solver_env import shared_env
+    
+    num_nodes = 5
+    edges = [(0, 1, 100, 1.5, 10), (0, 2, 80, 2.0, 15), (1, 2, 60, 1.0, 8),
+             (1, 3, 100, 1.8, 12), (2, 3, 70, 1.2, 10), (2, 4, 90, 2.5, 20),
+             (3, 4, 120, 1.0, 8)]
+    problems = [{'num_nodes': num_nodes, 'edges': edges, 'demand': demand,
+                 'use_reliability': False} for demand in (40, 80, 120, 160)]
+    
+    async def scenario():
+        # Une résolution simple
+        optimizer = NetworkOptimizer(num_nodes, edges, 100)
+        results = await optimizer.solve_async()
+        print(f"solve_async: {results['status']}, coût {results['total_cost']:.2f}")
+        assert isinstance(results, RoutingResult) and results['status'] == 'optimal'
+        
+        # Annulation: CancelledError, puis l'optimiseur reste utilisable
+        task = asyncio.ensure_future(optimizer.solve_async())
+        await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+            raise AssertionError("la tâche annulée aurait dû lever CancelledError")
+        except asyncio.CancelledError:
+            print("✓ Annulation propagée")
+        assert (await optimizer.solve_async())['status'] == 'optimal'
+        
+        # Jamais l'environnement partagé dans un thread du pool: le modèle y
+        # est ramené après la résolution
+        envs = []
+        solve = optimizer.solve
+        optimizer.solve = lambda: (envs.append(optimizer.env), solve())[1]
+        assert (await optimizer.solve_async())['status'] == 'optimal'
+        del optimizer.solve
+        assert envs[0] is not shared_env() and optimizer.env is shared_env()
+        assert optimizer.solve()['status'] == 'optimal'
+        assert optimizer.model.Params.Threads == optimizer.solver_params['Threads']
+        
+        # Annulation arrivée après le test d'annulation, avant optimize()
+        phase = optimizer._phase
+        
+        def late_cancel(monitor, name):
+            if name == 'solve':
+                optimizer.cancel()
+            return phase(monitor, name)
+        
+        optimizer._phase = late_cancel
+        assert optimizer.solve()['status'] == 'interrupted'
+        del optimizer._phase
+        optimizer.clear_cancel()
+        print("✓ Environnement du pool, annulation tardive prise en compte")
+        
+        # Lot: résultats au fil de l'eau, au plus deux résolutions à la fois
+        costs = {}
+        async for index, batch_results in solve_many_async(problems, max_concurrency=2):
+            costs[index] = batch_results['total_cost']
+        print(f"solve_many_async: {dict(sorted(costs.items()))}")
+        assert sorted(costs) == [0, 1, 2, 3]
+        assert costs[0] < costs[1] < costs[2] < costs[3]
+        
+        # Sortie anticipée: les résolutions restantes sont abandonnées
+        received = 0
+        stream = solve_many_async(problems, max_concurrency=1)
+        async for _ in stream:
+            received += 1
+            break
+        await stream.aclose()
+        assert received == 1
+        print("✓ Lot interrompu après le premier résultat")
+    
+    asyncio.run(scenario())
+    print()
+
+def test_unsplittable_routing():
+    """Test 18: Routage insécable (heuristique puis PLNE sur les chemins)"""
+    print("="*70)
+    print("TEST 18: Routage insécable")
+    print("="*70)
+    
+    import numpy as np
+    
+    num_nodes, tails, heads, edges = _grid_edges(8, 8, 1)
+    optimizer = NetworkOptimizer(num_nodes, edges, 15, use_reliability=False)
+    
+    # Une seule demande: le plus court chemin admissible est optimal
+    single = optimizer.solve_unsplittable()
+    print(f"Demande unique: {single['status']}, coût {single['total_cost']:.2f}")
+    print(f"  {single['main_paths'][0]}")
+    assert single['status'] == 'optimal' and len(single['paths']) == 1
+    
+    rng = np.random.default_rng(7)
+    ends = rng.integers(0, num_nodes, (8, 2))
+    commodities = [(int(s), int(t), float(d))
+                   for (s, t), d in zip(ends, rng.integers(10, 25, 8)) if s != t]
+    
+    heuristic = optimizer.solve_unsplittable(commodities, exact=False)
+    exact = optimizer.solve_unsplittable(commodities, time_limit=20)
+    print(f"{'Méthode':<12} {'Statut':<12} {'Coût':<10} {'Borne':<10} {'Écart':<8} {'Temps (ms)':<10}")
+    print("-"*70)
+    print(f"{'heuristique':<12} {heuristic['status']:<12} {heuristic['total_cost']:<10.1f} "
+          f"{'-':<10} {'-':<8} {1000 * heuristic['heuristic_time']:<10.2f}")
+    print(f"{'PLNE':<12} {exact['status']:<12} {exact['total_cost']:<10.1f} "
+          f"{exact['lower_bound']:<10.1f} {exact['gap']:<8.2%} {1000 * exact.solve_time:<10.2f}")
+    
+    # Un seul chemin par demande, capacités respectées
+    for nodes, (s, t, _) in zip(exact['paths'], commodities):
+        assert nodes[0] == s and nodes[-1] == t and len(set(nodes)) == len(nodes)
+    assert np.all(exact.flow <= exact.capacity + 1e-9)
+    assert exact['total_cost'] <= heuristic['total_cost'] + 1e-9
+    assert exact['lower_bound'] <= exact['total_cost'] + 1e-6
+    
+    # Demande de volume nul: chemin vide, les autres demandes inchangées
+    for exact_mode in (True, False):
+        mixed = optimizer.solve_unsplittable(commodities=commodities + [(0, 5, 0)],
+                                             exact=exact_mode)
+        assert mixed['paths'][-1] == [0]
+        assert mixed['status'] != 'infeasible'
+    print()
+
+def test_reliability_simulation():
+    """Test 19: Fiabilité sous pannes aléatoires (Monte-Carlo)"""
+    print("="*70)
+    print("TEST 19: Fiabilité sous pannes de liens")
+    print("="*70)
+    
+    import itertools
+    import numpy as np
+    from flow_algorithms import max_flow
+    
+    num_nodes = 5
+    edges = [(0, 1, 100, 1.5, 10), (0, 2, 80, 2.0, 15), (1, 2, 60, 1.0, 8),
+             (1, 3, 100, 1.8, 12), (2, 3, 70, 1.2, 10), (2, 4, 90, 2.5, 20),
+             (3, 4, 120, 1.0, 8)]
+    demand = 100
+    failure_prob = 0.05
+    optimizer = NetworkOptimizer(num_nodes, edges, demand, use_reliability=False)
+    
+    # Valeurs exactes par énumération des 2^7 scénarios
+    tails = [e[0] for e in edges]
+    heads = [e[1] for e in edges]
+    capacity = np.array([e[2] for e in edges], dtype=float)
+    availability, unserved = 0.0, 0.0
+    for pattern in itertools.product([False, True], repeat=len(edges)):
+        failed = np.array(pattern)
+        weight = np.prod(np.where(failed, failure_prob, 1 - failure_prob))
+        value = max_flow(num_nodes, tails, heads, capacity * ~failed, 0, num_nodes - 1)[0]
+        availability += weight * (value >= demand - 1e-9)
+        unserved += weight * max(0.0, demand - value)
+    
+    estimate = optimizer.simulate_reliability(failure_prob, seed=3, tol=0.005)
+    low, high = estimate['availability_ci']
+    print(f"Disponibilité exacte: {availability:.4f} | estimée: {estimate['availability']:.4f} "
+          f"[{low:.4f}, {high:.4f}] ({estimate['samples']} scénarios, "
+          f"{estimate['time']:.2f} s)")
+    print(f"Demande non servie exacte: {unserved:.3f} | estimée: "
+          f"{estimate['expected_unserved']:.3f}")
+    print("Liens critiques: " + ", ".join(
+        f"{link['edge'][0]} → {link['edge'][1]} (+{link['importance']:.1f})"
+        for link in estimate['critical_links']))
+    assert estimate['converged']
+    assert low - 0.01 <= availability <= high + 0.01
+    assert abs(estimate['expected_unserved'] - unserved) < 0.1 * demand * failure_prob
+    
+    # Solution fixée: sans reroutage, la perte d'un chemin n'est pas compensée
+    fixed = optimizer.simulate_reliability(failure_prob, mode='fixed', reroute=False,
+                                           seed=3, tol=0.005)
+    print(f"Solution fixée sans reroutage: disponibilité {fixed['availability']:.4f}")
+    assert fixed['availability'] <= estimate['availability'] + 0.01
+    
+    # Lien bidirectionnel 1-2 (capacité partagée 40): une panne par lien,
+    # reroutage borné par la capacité laissée par le chemin survivant
+    edges = [(0, 1, 30, 1, 1), (1, 2, 40, 1, 1, True), (2, 4, 30, 1, 1), (0, 2, 30, 1, 1),
+             (2, 3, 30, 1, 1), (3, 4, 30, 1, 1), (1, 4, 30, 1, 1)]
+    optimizer = NetworkOptimizer(5, edges, 60, use_reliability=False)
+    paths = {(0, 1): 30, (1, 2): 30, (2, 4): 30, (0, 2): 30, (2, 3): 30, (3, 4): 30}
+    flow = np.array([paths.get(arc, 0.0) for arc in optimizer.edge_dict])
+    options = {'mode': 'fixed', 'results': flow, 'max_samples': 64, 'min_samples': 64}
+    rerouted = optimizer.simulate_reliability({(2, 3): 1.0}, **options)
+    assert abs(rerouted['expected_unserved'] - 20) < 1e-6  # 10 rerouté sur 2 → 1
+    reverse = optimizer.simulate_reliability({(2, 1): 1.0}, reroute=False, **options)
+    assert abs(reverse['expected_unserved'] - 30) < 1e-6
+    assert reverse['critical_links'][0]['edge'] == (1, 2)
+    try:
+        optimizer.simulate_reliability(failure_prob, max_samples=0)
+        raise AssertionError("max_samples=0 aurait dû lever ValueError")
+    except ValueError:
+        pass
+    
+    # Solution fixée d'une instance irréalisable: rien à évaluer
+    try:
+        NetworkOptimizer(5, edges, 500, use_reliability=False).simulate_reliability(
+            failure_prob, mode='fixed')
+        raise AssertionError("une instance irréalisable aurait dû lever ValueError")
+    except ValueError as e:
+        assert "Aucune solution" in str(e)
+    print("✓ Pannes par lien, capacité partagée au reroutage")
+    print()
+
 def print_results(results):
     """Afficher les résultats de manière formatée"""
-    if results['status'] != 'optimal':
-        print(f"⚠️  Statut: {results['status']}")
-        print(f"   Message: {results.get('message', 'Aucune solution trouvée')}")
-        return
+    print(format_report(results))
+    print()
+
+def test_sla_routing():
+    """Test 20: Contraintes de latence par chemin (génération de colonnes)"""
+    print("="*70)
+    print("TEST 20: SLA par chemin")
+    print("="*70)
+    
+    import numpy as np
+    import gurobipy as gp
+    from flow_algorithms import ForwardStar
+    
+    num_nodes, tails, heads, edges = _grid_edges(5, 5, 3, capacity=(10, 30))
+    optimizer = NetworkOptimizer(num_nodes, edges, 30)
+    
+    # Sans SLA: même optimum que le modèle sur les arêtes
+    reference = optimizer.solve()
+    free = optimizer.solve_sla()
+    print(f"Sans SLA: {free['total_cost']:.2f} (solve: {reference['total_cost']:.2f}), "
+          f"latence max d'un chemin {free['max_path_latency']:.1f}")
+    assert free['status'] == 'optimal'
+    assert abs(free['total_cost'] - reference['total_cost']) < 1e-6
     
-    print(f"✓ Statut: {results['status'].upper()}")
-    print(f"  Temps de calcul: {results['solve_time']:.3f} secondes")
+    # SLA plus serré que le chemin le plus lent de la solution libre
+    limit = 65.0
+    sla = optimizer.solve_sla(max_latency=limit, max_hops=10)
+    print(f"SLA latence <= {limit:.1f}, sauts <= 10: {sla['status']}, "
+          f"coût {sla['total_cost']:.2f}, {sla['num_columns']} colonnes, "
+          f"{sla['iterations']} tours")
+    for line in sla['main_paths'][:3]:
+        print(f"  {line}")
+    assert sla['status'] == 'optimal' and sla['total_cost'] > free['total_cost']
+    assert all(p['latency'] <= limit + 1e-9 and p['hops'] <= 10 for p in sla['paths'])
+    assert np.all(sla.flow <= sla.capacity + 1e-9)
+    
+    # Référence: PL sur tous les chemins admissibles énumérés
+    graph = ForwardStar(num_nodes, tails, heads)
+    latency = np.array([e[4] for e in edges])
+    paths = [p for p in graph.simple_paths(latency, 0, num_nodes - 1, limit)
+             if len(p) <= 10]
+    cost = np.array([e[3] for e in edges])
+    bound = np.array([optimizer.flow_upper_bound(e[0], e[1]) for e in edges])
+    with gp.Model(env=optimizer.env) as model:
+        model.setParam('OutputFlag', 0)
+        x = model.addVars(len(paths), obj=[float(cost[p].sum()) for p in paths])
+        model.addConstr(x.sum() == 30)
+        for e in range(len(edges)):
+            model.addConstr(gp.quicksum(x[k] for k, p in enumerate(paths) if e in p)
+                            <= bound[e])
+        model.optimize()
+        print(f"Énumération de {len(paths)} chemins: {model.ObjVal:.2f}")
+        assert abs(model.ObjVal - sla['total_cost']) < 1e-6
+    
+    # SLA impossible à respecter
+    impossible = optimizer.solve_sla(max_hops=2)
+    print(f"Sauts <= 2: {impossible['status']}")
+    assert impossible['status'] == 'infeasible'
+    
+    # Demande de volume nul: routage vide, les autres demandes inchangées
+    mixed = optimizer.solve_sla(max_latency=limit, max_hops=10,
+                                commodities=[(0, num_nodes - 1, 30), (0, num_nodes - 1, 0)])
+    assert mixed['status'] == 'optimal' and mixed['unserved'] == [0.0, 0.0]
+    assert abs(mixed['total_cost'] - sla['total_cost']) < 1e-6
     print()
-    print(f"Résultats:")
-    print(f"  Coût total: {results['total_cost']:.2f} €")
-    print(f"  Latence moyenne: {results['avg_latency']:.2f} ms")
-    print(f"  Liens actifs: {results['active_links']}")
-    print(f"  Utilisation moyenne: {results['avg_utilization']:.1%}")
+
+def test_headless_rendering():
+    """Test 21: Rendu des schémas sans interface (Agg, en lot)"""
+    print("="*70)
+    print("TEST 21: Rendu sans interface")
+    print("="*70)
+    
+    import os
+    import subprocess
+    import tempfile
+    from network_model import Network
+    from rendering import network_layout, render_batch
+    
+    # Aucun module Qt ni pyplot chargé par le moteur de rendu
+    check = subprocess.run(
+        [sys.executable, '-c',
+         "import sys, rendering; print(any(m.startswith(('PyQt5', 'matplotlib.pyplot')) "
+         "for m in sys.modules))"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert check.stdout.strip() == 'False', check.stderr
+    
+    campus = Network.from_example('campus')
+    results = campus.optimizer().solve()
+    enterprise = Network.from_example('enterprise')
+    jobs = [
+        {'name': 'campus', 'num_nodes': campus.num_nodes, 'edges': campus.edges,
+         'flows': results},
+        {'name': 'campus_topologie', 'num_nodes': campus.num_nodes, 'edges': campus.edges},
+        {'name': 'entreprise', 'num_nodes': enterprise.num_nodes, 'edges': enterprise.edges,
+         'flows': enterprise.optimizer().solve()}
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.time()
+        pngs = render_batch(jobs, tmp, fmt='png', workers=0)
+        svgs = render_batch(jobs, tmp, fmt='svg', workers=0)
+        elapsed = time.time() - start
+        print(f"{len(pngs) + len(svgs)} schémas en {elapsed:.2f} s")
+        assert [os.path.basename(f) for f in pngs] == ['campus.png', 'campus_topologie.png',
+                                                       'entreprise.png']
+        for filename in pngs:
+            with open(filename, 'rb') as f:
+                assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+        for filename in svgs:
+            with open(filename, encoding='utf-8') as f:
+                assert '<svg' in f.read()
+    
+    # Positions calculées une fois par topologie
+    assert network_layout(campus.num_nodes, campus.edges) is \
+        network_layout(campus.num_nodes, list(reversed(campus.edges)))
+    print()
+
+def test_memory_budget():
+    """Test 22: Mesure de la mémoire et stratégie sous budget"""
+    print("="*70)
+    print("TEST 22: Mémoire par phase et budget")
+    print("="*70)
+    
+    import numpy as np
+    from memory import STRATEGIES, estimate_memory, format_size
+    
+    num_nodes, tails, heads, edges = _grid_edges(12, 12, capacity=50.0)
+    
+    estimates = {s: estimate_memory(num_nodes, len(edges), s, False, False)['total']
+                 for s in STRATEGIES}
+    print(f"{'Stratégie':<10} {'Estimation':<12} {'Coût':<10} {'Pic Python (build)':<20}")
+    print("-"*70)
+    costs = {}
+    for strategy in STRATEGIES:
+        # Budget juste au-dessus de l'estimation de la stratégie visée
+        budget = estimates[strategy] + 1
+        optimizer = NetworkOptimizer(num_nodes, edges, 60, use_reliability=False,
+                                     memory_budget=budget)
+        results = optimizer.solve()
+        memory = results['memory']
+        costs[strategy] = results['total_cost']
+        print(f"{strategy:<10} {format_size(estimates[strategy]):<12} "
+              f"{results['total_cost']:<10.2f} "
+              f"{format_size(memory['phases']['build']['python_peak']):<20}")
+        assert memory['strategy'] == strategy
+        assert set(memory['phases']) >= {'build', 'solve'}
+    assert max(costs.values()) - min(costs.values()) < 1e-6
+    
+    # Fonctions qui réutilisent le modèle: variables sans nom, sans link_used ('lp')
+    reference = NetworkOptimizer(num_nodes, edges, 60, use_reliability=False)
+    frontier = reference.solve_pareto()
+    design = reference.solve_design(np.ones(len(edges)), method='monolithic')
+    for strategy in ('chunked', 'lp'):
+        optimizer = NetworkOptimizer(num_nodes, edges, 60, use_reliability=False)
+        optimizer.strategy = strategy
+        for method in ('parametric', 'epsilon'):
+            points = optimizer.solve_pareto(method=method, num_points=3).points
+            assert abs(points[0]['cost'] - frontier.points[0]['cost']) < 1e-6
+        if strategy == 'chunked':
+            result = optimizer.solve_design(np.ones(len(edges)), method='monolithic')
+            assert abs(result['objective'] - design['objective']) < 1e-4 * design['objective']
+        else:
+            try:
+                optimizer.solve_design(np.ones(len(edges)))
+                assert False, "ValueError attendue"
+            except ValueError as e:
+                print(f"Conception sous 'lp': {e}")
+    
+    # Rien ne tient: échec immédiat, avant toute construction
+    optimizer = NetworkOptimizer(num_nodes, edges, 60, memory_budget='10k')
+    try:
+        optimizer.solve()
+        assert False, "MemoryError attendue"
+    except MemoryError as e:
+        print(f"Budget de 10 Ko: {e}")
+    assert optimizer.model.NumVars == 0
+    print()
+
+def test_stochastic_reservation():
+    """Test 23: Réservation de capacité sur scénarios (L-shaped)"""
+    print("="*70)
+    print("TEST 23: Scénarios de demande (L-shaped)")
+    print("="*70)
+    
+    import numpy as np
+    from network_model import Network
+    
+    network = Network.from_example('metropolitan')
+    optimizer = network.optimizer(use_reliability=False)
+    rng = np.random.default_rng(0)
+    base = np.array([edge[3] for edge in network.edges])
+    scenarios = [{'demand': float(network.demand * f),
+                  'cost': base * rng.uniform(0.7, 1.5, len(base))}
+                 for f in rng.uniform(0.5, 1.3, 6)]
+    
+    print(f"{'Risque':<12} {'Méthode':<12} {'Objectif':<12} {'Itérations':<12} {'Temps (ms)':<10}")
+    print("-"*70)
+    objectives = {}
+    for risk in ('expected', 'worst_case'):
+        extensive = optimizer.solve_stochastic(scenarios, risk=risk, method='extensive')
+        decomposed = optimizer.solve_stochastic(scenarios, risk=risk, workers=0)
+        for name, results in (('extensive', extensive), ('l_shaped', decomposed)):
+            print(f"{risk:<12} {name:<12} {results.objective:<12.2f} "
+                  f"{results.get('iterations', '-'):<12} {1000 * results.solve_time:<10.1f}")
+        assert decomposed['status'] == 'optimal'
+        assert abs(decomposed.objective - extensive.objective) <= 1e-4 * extensive.objective
+        # Chaque scénario reste dans la capacité réservée
+        reserved = decomposed['reservation_array']
+        assert np.all(decomposed['scenario_flows'] <= reserved + 1e-6)
+        # Demande rapportée = volume moyen livré par le flux moyen
+        delivered = decomposed.flow[decomposed.tails == optimizer.source].sum()
+        assert abs(decomposed.demand - delivered) < 1e-6
+        assert decomposed.demand <= decomposed['expected_demand'] + 1e-9
+        objectives[risk] = decomposed
+    assert objectives['worst_case']['worst_case_cost'] <= \
+        objectives['expected']['worst_case_cost'] + 1e-6
+    
+    # Scénarios répartis sur deux processus
+    parallel = optimizer.solve_stochastic(scenarios, workers=2)
+    print(f"2 processus: {parallel.objective:.2f} en {parallel['iterations']} itérations")
+    assert abs(parallel.objective - objectives['expected'].objective) <= \
+        1e-4 * parallel.objective
     print()
+
+def test_fast_path():
+    """Test 24: Chemin rapide quand les capacités ne lient pas"""
+    print("="*70)
+    print("TEST 24: Chemin rapide (plus court chemin)")
+    print("="*70)
+    
+    import numpy as np
+    
+    num_nodes, tails, heads, edges = _grid_edges(8, 8, capacity=100.0)
+    
+    # Demande 40: le plus court chemin suffit; 150: la capacité lie
+    for demand, expected in ((40, 'shortest_path'), (150, None)):
+        results = NetworkOptimizer(num_nodes, edges, demand, use_reliability=False).solve()
+        reference = NetworkOptimizer(num_nodes, edges, demand, use_reliability=False,
+                                     fast_path=False).solve()
+        print(f"Demande {demand}: méthode {results.get('method', 'gurobi')}, "
+              f"objectif {results.objective:.2f} (Gurobi {reference.objective:.2f}), "
+              f"{1000 * results.solve_time:.2f} ms")
+        assert results.get('method') == expected
+        assert abs(results.objective - reference.objective) <= 1e-6 * reference.objective
+    
+    # Le chemin rapide ne construit pas le modèle
+    fast = NetworkOptimizer(num_nodes, edges, 40, use_reliability=False)
+    fast.solve()
+    assert not fast.flow_vars and fast.get_model_statistics()['num_variables'] > 0
+    print()
+
+def test_deadline_solve():
+    """Test 25: Résolution à échéance (meilleure solution, borne, écart)"""
+    print("="*70)
+    print("TEST 25: Résolution à échéance")
+    print("="*70)
     
-    # Afficher les flux principaux
-    if results.get('main_paths'):
-        print("Chemins principaux:")
-        for i, path in enumerate(results['main_paths'][:3], 1):
-            print(f"  {i}. {path}")
+    import numpy as np
+    from network_model import Network
+    
+    network = Network.from_example('metropolitan')
+    optimum = network.optimizer().solve().objective
+    
+    print(f"{'Échéance (s)':<14} {'Statut':<12} {'Source':<11} {'Objectif':<10} "
+          f"{'Borne':<10} {'Écart':<8} {'Temps (ms)':<10}")
+    print("-"*70)
+    responses = {}
+    for deadline in (0.0, 30.0):
+        optimizer = network.optimizer()
+        results = responses[deadline] = optimizer.solve(deadline=deadline)
+        bound = results['best_bound']
+        gap = results['gap']
+        print(f"{deadline:<14} {results.status:<12} {results['incumbent']:<11} "
+              f"{results.objective:<10.2f} {bound if bound is not None else '-':<10} "
+              f"{gap if gap is not None else '-':<8} {1000 * results['elapsed']:<10.2f}")
+        
+        # Toujours une solution réalisable: conservation et capacités
+        assert results.has_solution and results.objective >= optimum - 1e-6
+        net = np.zeros(network.num_nodes)
+        np.add.at(net, results.tails, results.flow)
+        np.add.at(net, results.heads, -results.flow)
+        assert abs(net[0] - network.demand) < 1e-6 and abs(net[-1] + network.demand) < 1e-6
+        assert np.all(np.abs(net[1:-1]) < 1e-6)
+        assert np.all(results.flow <= results.capacity + 1e-6)
+    
+    # Échéance passée: l'heuristique répond; sinon l'optimum est prouvé
+    assert responses[0.0].status == 'time_limit'
+    assert responses[0.0]['incumbent'] == 'heuristic'
+    assert responses[30.0].status == 'optimal' and responses[30.0]['gap'] == 0.0
+    
+    # Sans échéance, la limite de temps est levée
+    optimizer.solve()
+    assert optimizer.model.Params.TimeLimit == float('inf')
+     
+    # Liens bidirectionnels: départ à chaud réalisable (un binaire par lien)
+    line = NetworkOptimizer(3, [(0, 1, 10, 1.0, 1.0, True), (1, 2, 10, 1.0, 1.0, True),
+                                (0, 2, 10, 5.0, 1.0)], 5)
+    assert line.solve(deadline=30.0).status == 'optimal'
+    heuristic, _ = line._heuristic_flow()
+    starts = line.model.getAttr('Start', [line.link_used[arcs[0]] for arcs in line.link_arcs])
+    for arcs, start in zip(line.link_arcs, starts):
+        used = any(heuristic[list(line.edge_dict).index(arc)] > 0 for arc in arcs)
+        assert start == float(used)
+    
+    # Chemin rapide (demande légère, sans fiabilité): mêmes clés, optimum prouvé
+    light = Network(network.num_nodes, network.edges, 10)
+    for options in ({'deadline': 0.0}, {'mip_gap': 0.01}):
+        results = light.optimizer(use_reliability=False).solve(**options)
+        assert results['method'] == 'shortest_path'
+        assert results['incumbent'] == 'shortest_path' and results['gap'] == 0.0
+        assert results['best_bound'] == results.objective and results['elapsed'] >= 0
+    print()
+
+def test_solution_certificate():
+    """Test 26: Certificat de validité d'une solution"""
+    print("="*70)
+    print("TEST 26: Certificat de solution")
+    print("="*70)
     
-    # Afficher les flux sur chaque lien
-    print("\nFlux sur les liens:")
-    active_flows = [(edge, flow) for edge, flow in results['flows'].items() 
-                   if flow > 0.01]
-    active_flows.sort(key=lambda x: x[1], reverse=True)
+    import numpy as np
+    from certificate import check_flow, check_solution
+    from network_model import Network
+    
+    network = Network.from_example('metropolitan')
+    optimizer = network.optimizer()
+    results = optimizer.solve()
+    certificate = optimizer.check_solution(results)
+    print(f"Solution optimale: {certificate!r} en {1000 * certificate.check_time:.3f} ms")
+    assert certificate and certificate.objective == results.objective
+    assert check_solution(network, results)
+    
+    # Réponse heuristique à échéance: vérifiée de la même façon
+    heuristic = network.optimizer().solve(deadline=0.0)
+    assert optimizer.check_solution(heuristic)
+    
+    # Flux perturbé: conservation, capacité et objectif annoncé
+    flow = results.flow.copy()
+    k = int(np.argmax(flow))
+    flow[k] += results.capacity[k]
+    certificate = optimizer.check_solution(flow, objective=results.objective)
+    print(certificate.summary())
+    checks = {v['check'] for v in certificate.violations}
+    assert not certificate and {'conservation', 'capacity'} <= checks
+    assert certificate.violations[0]['amount'] == max(v['amount'] for v in certificate.violations)
+    assert certificate.max_violation['objective'] > 0
+    
+    # Grand réseau aléatoire: flux nul sans demande, vérifié en quelques ms
+    rng = np.random.default_rng(0)
+    num_nodes, num_edges = 100000, 500000
+    tails = rng.integers(0, num_nodes, num_edges)
+    heads = rng.integers(0, num_nodes, num_edges)
+    certificate = check_flow(num_nodes, tails, heads, np.ones(num_edges),
+                             np.zeros(num_edges), 0.0, unit_cost=np.ones(num_edges),
+                             objective=0.0)
+    print(f"{num_edges} arêtes: {1000 * certificate.check_time:.1f} ms")
+    assert certificate
+    print()
+
+def test_bidirectional_links():
+    """Test 27: Liens bidirectionnels à capacité partagée"""
+    print("="*70)
+    print("TEST 27: Liens bidirectionnels")
+    print("="*70)
+    
+    import os
+    import tempfile
+    import numpy as np
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+    from network_model import Network
+    from rendering import draw_network
+    from solver_env import ModelTemplateCache
+    
+    # Grille 4x4: un enregistrement par lien, ou deux arcs indépendants
+    rows, cols = 4, 4
+    grid = np.arange(rows * cols).reshape(rows, cols)
+    pairs = list(zip(grid[:, :-1].ravel().tolist(), grid[:, 1:].ravel().tolist())) + \
+        list(zip(grid[:-1, :].ravel().tolist(), grid[1:, :].ravel().tolist()))
+    links = [(i, j, 40.0, 1.0 + k % 3, 5.0 + k % 4, True) for k, (i, j) in enumerate(pairs)]
+    arcs = [edge for i, j, c, w, l, _ in links for edge in ((i, j, c, w, l), (j, i, c, w, l))]
+    bidirectional = Network(rows * cols, links, 60)
+    directed = Network(rows * cols, arcs, 60)
+    
+    print(f"{'Modèle':<14} {'Variables':<10} {'Binaires':<10} {'Contraintes':<12} {'Objectif':<10}")
+    print("-"*70)
+    objectives = {}
+    for name, network in (('bidirectionnel', bidirectional), ('deux arcs', directed)):
+        optimizer = network.optimizer(use_reliability=False, fast_path=False)
+        results = optimizer.solve()
+        stats = optimizer.get_model_statistics()
+        print(f"{name:<14} {stats['num_variables']:<10} {stats['num_binary_vars']:<10} "
+              f"{stats['num_constraints']:<12} {results.objective:<10.2f}")
+        objectives[name] = results.objective
+        if name == 'bidirectionnel':
+            # Variables et contraintes proportionnelles aux liens physiques
+            assert stats['num_binary_vars'] == len(links)
+            assert stats['num_variables'] == 3 * len(links)
+            assert stats['num_constraints'] == rows * cols + 2 * len(links)
+            assert optimizer.check_solution(results)
+    # À coûts positifs, un flux unique n'emprunte jamais un lien dans les deux sens
+    assert abs(objectives['bidirectionnel'] - objectives['deux arcs']) < 1e-6
+    
+    # Mêmes optimums avec toutes les stratégies et le chemin rapide
+    for strategy in ('chunked', 'lp', 'native'):
+        optimizer = bidirectional.optimizer(use_reliability=False, fast_path=False)
+        optimizer.strategy = strategy
+        assert abs(optimizer.solve().objective - objectives['bidirectionnel']) < 1e-6
+    light = Network(rows * cols, links, 10)
+    fast = light.optimizer(use_reliability=False).solve()
+    exact = light.optimizer(use_reliability=False, fast_path=False).solve()
+    assert fast.get('method') == 'shortest_path'
+    assert abs(fast.objective - exact.objective) < 1e-6
+    
+    # Gabarit en cache: variables et contraintes retrouvées par lien
+    cache = ModelTemplateCache()
+    for demand in (60, 50):
+        optimizer = bidirectional.optimizer(use_reliability=False, template_cache=cache)
+        optimizer.demand = demand
+        results = optimizer.solve()
+        reference = Network(rows * cols, links, demand).optimizer(
+            use_reliability=False, fast_path=False).solve()
+        assert abs(results.objective - reference.objective) < 1e-6
+    assert cache.hits == 1
+    
+    # Capacité partagée: 40 dans chaque sens d'un lien inutilisé dépasse
+    # sa capacité de 40 (valide avec deux arcs indépendants)
+    optimizer = bidirectional.optimizer(use_reliability=False)
+    results = optimizer.solve()
+    keys = list(optimizer.edge_dict)
+    idle = next(k for k in range(0, len(keys), 2) if results.flow[k:k + 2].max() < 1e-9)
+    loop = np.zeros(len(keys))
+    loop[idle:idle + 2] = 40.0
+    certificate = optimizer.check_solution(results.flow + loop)
+    assert not certificate and certificate.violations[0]['check'] == 'capacity'
+    assert directed.optimizer(use_reliability=False).check_solution(
+        dict(zip(keys, (results.flow + loop).tolist())))
+    print(certificate.summary())
+    
+    # Lecture / écriture et rendu: un enregistrement, un trait par lien
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'grille.txt')
+        bidirectional.save(filename)
+        loaded = Network.load(filename)
+    assert loaded.edges == bidirectional.edges
+    ax = Figure().add_subplot(111)
+    draw_network(ax, rows * cols, links, results, edge_labels=False)
+    segments = sum(len(c.get_segments()) for c in ax.collections
+                   if isinstance(c, LineCollection))
+    assert segments == len(links)
+    
+    # Demandes opposées sur une ligne 0-1-2: la capacité du lien est
+    # partagée par les deux sens (2 x 50 > 60, 2 x 30 <= 60)
+    line = NetworkOptimizer(3, [(0, 1, 60, 1, 1, True), (1, 2, 60, 1, 1, True)], 50,
+                            use_reliability=False)
+    line_arrays = line.edge_arrays()
+    for volume, feasible in ((50, False), (30, True)):
+        commodities = [(0, 2, volume), (2, 0, volume)]
+        outcomes = [line.solve_unsplittable(commodities, exact=exact) for exact in (True, False)]
+        outcomes.append(line.solve_sla(max_hops=5, commodities=commodities))
+        for outcome in outcomes:
+            assert (outcome.status != 'infeasible') == feasible
+            if outcome.flow is not None:
+                load = np.bincount(line_arrays['link'], outcome.flow)
+                assert np.all(load <= 60 + 1e-6)
+    
+    # Moteurs par décomposition: capacité partagée dans les régions et le maître
+    reference = bidirectional.optimizer(use_reliability=False, fast_path=False).solve()
+    decomposed = bidirectional.optimizer(use_reliability=False).solve_decomposed(
+        num_regions=4, workers=0)
+    assert abs(decomposed.objective - reference.objective) < 1e-4 * reference.objective
+    shared = NetworkOptimizer(3, [(0, 1, 60, 1, 1, True), (1, 2, 60, 1, 1, True),
+                                  (0, 2, 100, 5, 1)], 50, use_reliability=False)
+    reservation = shared.solve_stochastic([40, 80], workers=0)
+    assert reservation['reservation'][(0, 1)] <= 60 + 1e-6
+    print()
+
+def test_capacity_planning():
+    """Test 28: Débit maximal et flot concurrent maximal"""
+    print("="*70)
+    print("TEST 28: Planification de capacité")
+    print("="*70)
+    
+    import numpy as np
+    from certificate import check_flow
+    from network_model import Network
+    from network_optimizer import NetworkOptimizer
+    
+    network = Network.from_example('metropolitan')
+    optimizer = network.optimizer(use_reliability=False)
+    
+    # Débit maximal = capacité de la coupe saturée
+    throughput = optimizer.max_throughput()
+    print(f"Débit maximal: {throughput['throughput']:.1f} "
+          f"(+{throughput['additional_demand']:.1f}), coupe {throughput['cut']}")
+    assert abs(throughput['throughput'] - throughput['cut_capacity']) < 1e-6
+    arrays = optimizer.edge_arrays()
+    assert check_flow(network.num_nodes, arrays['tails'], arrays['heads'], arrays['capacity'],
+                      throughput.flow, throughput['throughput'], links=arrays['link'])
+    assert all(throughput['headroom'][e] >= -1e-9 for e in throughput['headroom'])
+    
+    # Le débit maximal passe, un peu plus ne passe pas
+    for demand, expected in ((throughput['throughput'], 'optimal'),
+                             (throughput['throughput'] + 1, 'infeasible')):
+        check = NetworkOptimizer(network.num_nodes, network.edges, demand,
+                                 use_reliability=False, fast_path=False)
+        assert check.solve().status == expected
+    
+    # Une seule demande: λ = débit maximal / demande
+    concurrent = optimizer.max_concurrent_flow()
+    print(f"λ = {concurrent['lambda']:.3f}, liens limitants {concurrent['cut']}")
+    assert abs(concurrent['lambda'] * network.demand - throughput['throughput']) < 1e-6
+    
+    # Matrice de trafic: charges dans les capacités, limite atteinte
+    last = network.num_nodes - 1
+    commodities = [(0, last, 100), (1, last, 50), (0, 3, 30)]
+    concurrent = optimizer.max_concurrent_flow(commodities)
+    assert np.all(concurrent.flow <= arrays['capacity'] + 1e-6)
+    assert concurrent['cut'] and set(concurrent['cut']) <= set(concurrent['saturated'])
+    print(f"Matrice: λ = {concurrent['lambda']:.3f}, "
+          f"acheminé {[round(v, 1) for v in concurrent['routed']]}")
+    print()
+
+def test_multilevel_solve():
+    """Test 29: Résolution multiniveau (contraction, raffinement)"""
+    print("="*70)
+    print("TEST 29: Résolution multiniveau")
+    print("="*70)
+    
+    import numpy as np
+    from network_model import Network
+    
+    # Même optimum que le modèle complet sur un exemple (fiabilité active)
+    network = Network.from_example('metropolitan')
+    reference = network.optimizer(fast_path=False).solve()
+    results = network.optimizer().solve_multilevel(coarse_nodes=4)
+    assert results['certified'] and results.status == 'optimal'
+    assert abs(results.objective - reference.objective) < 1e-6 * reference.objective
+    
+    # Grille 24x24: 2208 arcs, le PL restreint n'en garde qu'une partie
+    num_nodes, tails, heads, edges = _grid_edges(24, 24, 11)
+    
+    optimizer = NetworkOptimizer(num_nodes, edges, 40, use_reliability=False)
+    results = optimizer.solve_multilevel()
+    native = NetworkOptimizer(num_nodes, edges, 40, use_reliability=False, fast_path=False)
+    native.strategy = 'native'
+    expected = native.solve().objective
+    
+    print(f"{'Niveau':<8} {'Nœuds':<8} {'Arcs':<8} {'Candidats':<10} {'Tours':<6} {'Objectif':<10}")
+    print("-"*70)
+    for level in results['levels']:
+        print(f"{level['level']:<8} {level['nodes']:<8} {level['arcs']:<8} "
+              f"{level['candidates']:<10} {level['rounds']:<6} {level['objective']:<10.1f}")
+    print(f"Première solution: {results['first_objective']:.1f} en "
+          f"{1000 * results['time_to_first']:.1f} ms; optimum {results.objective:.1f} en "
+          f"{1000 * results['time_to_optimal']:.1f} ms (flot de coût minimal: {expected:.1f})")
     
-    for (source, dest), flow in active_flows[:5]:
-        print(f"  {source} → {dest}: {flow:.2f} unités")
+    assert results.status == 'optimal' and results['certified']
+    assert abs(results.objective - expected) < 1e-6 * expected
+    assert results['candidate_arcs'] < len(edges)
+    assert results['time_to_first'] <= results['time_to_optimal']
+    assert results['first_objective'] >= results.objective - 1e-6
+    assert optimizer.check_solution(results.flow, results.objective)
     
-    if len(active_flows) > 5:
-        print(f"  ... et {len(active_flows) - 5} autres liens")
+    # Demande nulle: flux nul, optimal comme solve()
+    empty = NetworkOptimizer(num_nodes, edges, 0, use_reliability=False).solve_multilevel()
+    assert empty.status == 'optimal' and empty.objective == 0.0 and not empty.flow.any()
     print()
 
 def run_all_tests():
@@ -274,7 +1685,32 @@ def run_all_tests():
         ("Test 1: Réseau simple", test_simple_network),
         ("Test 2: Réseau moyen", test_medium_network),
         ("Test 3: Comparaison objectifs", test_all_objectives),
-        ("Test 4: Scalabilité", test_scalability)
+        ("Test 4: Scalabilité", test_scalability),
+        ("Test 5: Frontière de Pareto", test_pareto_frontier),
+        ("Test 6: Créneaux horaires", test_time_slots),
+        ("Test 7: Télémétrie", test_telemetry_pipeline),
+        ("Test 8: Cache de modèles", test_model_template_cache),
+        ("Test 9: Cœur léger", test_core_import),
+        ("Test 10: Conception de réseau", test_network_design),
+        ("Test 11: Congestion", test_congestion_routing),
+        ("Test 12: Résultat typé", test_routing_result),
+        ("Test 13: Profils solveur", test_solver_profiles),
+        ("Test 14: Décomposition", test_decomposition),
+        ("Test 15: Bibliothèque de solutions", test_solution_library),
+        ("Test 16: Métriques", test_metrics_engine),
+        ("Test 17: Asynchrone", test_async_solve),
+        ("Test 18: Routage insécable", test_unsplittable_routing),
+        ("Test 19: Fiabilité", test_reliability_simulation),
+        ("Test 20: SLA par chemin", test_sla_routing),
+        ("Test 21: Rendu sans interface", test_headless_rendering),
+        ("Test 22: Mémoire", test_memory_budget),
+        ("Test 23: Scénarios", test_stochastic_reservation),
+        ("Test 24: Chemin rapide", test_fast_path),
+        ("Test 25: Échéance", test_deadline_solve),
+        ("Test 26: Certificat", test_solution_certificate),
+        ("Test 27: Liens bidirectionnels", test_bidirectional_links),
+        ("Test 28: Planification de capacité", test_capacity_planning),
+        ("Test 29: Multiniveau", test_multilevel_solve)
     ]
     
     start_time = time.time()
@@ -0,0 +1,204 @@
+"""
+Routage par créneaux horaires (horizon glissant)
+
+La demande et les coûts / capacités des liens évoluent au cours de la
+journée. Plutôt que de reconstruire un NetworkOptimizer par créneau, on
+construit le modèle une seule fois puis on le modifie en place d'un
+créneau à l'autre: le simplexe repart de la base du créneau précédent.
+Une limite de variation du flux par lien entre deux créneaux évite les
+oscillations de routes (route flapping).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gurobipy import GRB
+import numpy as np
+
+from network_model import is_bidirectional
+from network_optimizer import NetworkOptimizer
+from solver_env import env_pool
+
+
+class TimeSlotResult:
+    """Résultats d'une série de créneaux, stockés en tableaux créneaux × arêtes"""
+
+    def __init__(self, edges, num_slots):
+        """
+        Args:
+            edges: Liste ordonnée des arêtes (i, j), alignée sur les colonnes
+            num_slots: Nombre de créneaux
+        """
+        self.edges = edges
+        self.flows = np.zeros((num_slots, len(edges)))
+        self.objective = np.full(num_slots, np.nan)
+        self.solve_times = np.zeros(num_slots)
+        self.status = [None] * num_slots
+        self.ramp_relaxed = np.zeros(num_slots, dtype=bool)
+        self.total_time = 0.0
+
+    def __len__(self):
+        return len(self.status)
+
+    def slot_flows(self, t):
+        """Flux du créneau t sous forme de dict {(i, j): flux}"""
+        return dict(zip(self.edges, self.flows[t].tolist()))
+
+
+def _profile(values, num_slots, num_edges, name):
+    """Normaliser un profil (None, vecteur par arête ou tableau créneaux × arêtes)"""
+    if values is None:
+        return None
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = np.broadcast_to(values, (num_slots, num_edges))
+    if values.shape != (num_slots, num_edges):
+        raise ValueError(f"Profil '{name}' de forme {values.shape}, "
+                         f"attendu ({num_slots}, {num_edges})")
+    return values
+
+
+def _changed(edges, previous, current):
+    """Dict des seules arêtes dont la valeur a changé"""
+    if current is None:
+        return None
+    idx = np.flatnonzero(previous != current)
+    return {edges[k]: float(current[k]) for k in idx}
+
+
+def _run_slots(slots, num_nodes, base_edges, keys, demands, capacities, costs,
+               latencies, options, max_change, result, env=None):
+    """Résoudre séquentiellement une suite de créneaux sur un même modèle"""
+    optimizer = None
+    flow_vars = None
+    previous = None
+    prev_caps = prev_costs = prev_lats = None
+
+    for t in slots:
+        start = time.time()
+        caps = capacities[t] if capacities is not None else None
+        cst = costs[t] if costs is not None else None
+        lat = latencies[t] if latencies is not None else None
+
+        if optimizer is None:
+            edges = [
+                (i, j,
+                 caps[k] if caps is not None else cap,
+                 cst[k] if cst is not None else cost,
+                 lat[k] if lat is not None else latency)
+                for k, (i, j, cap, cost, latency) in enumerate(base_edges)
+            ]
+            optimizer = NetworkOptimizer(num_nodes, edges, demands[t], env=env, **options)
+            optimizer.build_model()
+            optimizer.relax_link_usage()
+            optimizer.apply_solver_profile()
+            flow_vars = [optimizer.flow_vars[e] for e in keys]
+        else:
+            if demands[t] != optimizer.demand:
+                optimizer.update_demand(demands[t])
+            optimizer.update_edges(
+                capacities=_changed(keys, prev_caps, caps),
+                costs=_changed(keys, prev_costs, cst),
+                latencies=_changed(keys, prev_lats, lat)
+            )
+        prev_caps, prev_costs, prev_lats = caps, cst, lat
+
+        upper = np.array([optimizer.edge_dict[e]['capacity'] for e in keys], dtype=float)
+        ramped = max_change is not None and previous is not None
+        if ramped:
+            optimizer.model.setAttr('LB', flow_vars, np.maximum(previous - max_change, 0.0).tolist())
+            optimizer.model.setAttr('UB', flow_vars, np.minimum(previous + max_change, upper).tolist())
+        elif max_change is not None:
+            # Pas de créneau précédent exploitable: bornes d'origine
+            optimizer.model.setAttr('LB', flow_vars, [0.0] * len(flow_vars))
+            optimizer.model.setAttr('UB', flow_vars, upper.tolist())
+
+        optimizer.model.optimize()
+
+        if ramped and optimizer.model.Status != GRB.OPTIMAL:
+            # Limite de variation incompatible avec le créneau: on la relâche
+            optimizer.model.setAttr('LB', flow_vars, [0.0] * len(flow_vars))
+            optimizer.model.setAttr('UB', flow_vars, upper.tolist())
+            optimizer.model.optimize()
+            result.ramp_relaxed[t] = True
+
+        result.status[t] = optimizer.get_status_string()
+        if optimizer.model.Status == GRB.OPTIMAL:
+            x = np.array(optimizer.model.getAttr('X', flow_vars))
+            result.flows[t] = x
+            result.objective[t] = optimizer.model.ObjVal
+            previous = x
+        else:
+            previous = None
+
+        result.solve_times[t] = time.time() - start
+
+    if optimizer is not None and env is not None:
+        optimizer.model.dispose()
+
+
+def _run_block(slots, *args):
+    """Bloc parallèle: environnement emprunté au pool partagé"""
+    with env_pool().acquire() as env:
+        _run_slots(slots, *args, env=env)
+
+
+def solve_time_slots(num_nodes, edges, demands, capacities=None, costs=None,
+                     latencies=None, objective_type=0, use_reliability=True,
+                     use_balance=False, max_change=None, parallel=False,
+                     workers=2):
+    """
+    Résoudre une série de créneaux horaires
+
+    Args:
+        num_nodes: Nombre de nœuds
+        edges: Liste de tuples (source, dest, capacity, cost, latency)
+        demands: Demande par créneau (liste ou tableau de longueur T)
+        capacities: Profil de capacités (T × E) ou None
+        costs: Profil de coûts (T × E) ou None
+        latencies: Profil de latences (T × E) ou None
+        objective_type, use_reliability, use_balance: voir NetworkOptimizer
+        max_change: Variation maximale du flux d'un lien entre deux créneaux
+        parallel: Résoudre des blocs de créneaux indépendants en parallèle
+        workers: Nombre de blocs parallèles
+
+    Returns:
+        TimeSlotResult
+    """
+    if any(is_bidirectional(e) for e in edges):
+        raise ValueError("Les créneaux horaires attendent des arêtes orientées "
+                         "(profils alignés sur les arcs)")
+    start_time = time.time()
+    demands = np.atleast_1d(np.asarray(demands, dtype=float))
+    num_slots = len(demands)
+    keys = [(e[0], e[1]) for e in edges]
+
+    capacities = _profile(capacities, num_slots, len(keys), 'capacities')
+    costs = _profile(costs, num_slots, len(keys), 'costs')
+    latencies = _profile(latencies, num_slots, len(keys), 'latencies')
+
+    options = {
+        'objective_type': objective_type,
+        'use_reliability': use_reliability,
+        'use_balance': use_balance
+    }
+    result = TimeSlotResult(keys, num_slots)
+    args = (num_nodes, edges, keys, demands, capacities, costs, latencies,
+            options, max_change, result)
+
+    if parallel and workers > 1 and num_slots > 1:
+        if max_change is not None:
+            raise ValueError("max_change couple les créneaux: mode parallèle impossible")
+
+        # Blocs contigus: chaque bloc garde le démarrage à chaud interne
+        blocks = [b for b in np.array_split(np.arange(num_slots), workers) if len(b)]
+        options['parallel_jobs'] = len(blocks)
+        with ThreadPoolExecutor(max_workers=len(blocks)) as pool:
+            futures = [pool.submit(_run_block, block, *args) for block in blocks]
+            for future in futures:
+                future.result()
+    else:
+        _run_slots(range(num_slots), *args)
+
+    result.total_time = time.time() - start_time
+    return result
@@ -0,0 +1,422 @@
+"""
+Routage insécable: chaque demande emprunte un seul chemin
+
+Les demandes (source, destination, volume) ne peuvent pas être réparties
+sur plusieurs chemins. Deux étapes:
+  - heuristique constructive (quelques millisecondes): placement glouton
+    des demandes par volume décroissant sur le plus court chemin au coût
+    marginal (coût unitaire + pénalité de dépassement de capacité), puis
+    recherche locale « rip-up and reroute »: chaque demande est retirée et
+    replacée tant que cela fait baisser le coût
+  - PLNE sur les chemins, amorcée par l'heuristique: génération de
+    colonnes sur la relaxation linéaire (chemins de coût réduit négatif
+    trouvés par Dijkstra), puis résolution entière sur les chemins générés
+    avec limite de temps. La borne inférieure est celle de la relaxation
+    sur tous les chemins (borne lagrangienne si la génération est arrêtée
+    avant convergence): l'écart rapporté est un écart global
+
+La règle de fiabilité de NetworkOptimizer (au plus 80 % de la demande par
+lien) impose de répartir le flux: elle est ignorée ici. L'équilibrage
+(70 % de la capacité) est conservé. Capacités et dépassements portent sur
+la charge de chaque lien: les deux arcs d'un lien bidirectionnel partagent
+sa capacité.
+"""
+
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+
+from flow_algorithms import ForwardStar
+from network_model import RoutingResult
+
+# Resserrements successifs de l'énumération quand une demande dépasse son quota
+MAX_TIGHTENINGS = 12
+
+
+def _instance(optimizer, commodities):
+    """
+    Tableaux des arêtes, lien de chaque arc, capacité par lien et demandes
+
+    Les demandes de volume nul (ou de source = destination) ont un routage
+    vide: seules les autres sont renvoyées, avec leurs indices (routed).
+    """
+    keys = list(optimizer.edge_dict.keys())
+    tails = np.array([i for i, _ in keys], dtype=np.int64)
+    heads = np.array([j for _, j in keys], dtype=np.int64)
+    unit = np.array([optimizer.objective_coefficient(optimizer.edge_dict[e]['cost'],
+                                                     optimizer.edge_dict[e]['latency'])
+                     for e in keys])
+    links = optimizer.edge_arrays()['link']
+    bounds = np.array([optimizer.edge_dict[arcs[0]]['capacity']
+                       for arcs in optimizer.link_arcs], dtype=float)
+    if optimizer.use_balance:
+        bounds = 0.7 * bounds
+
+    if commodities is None:
+        commodities = [(optimizer.source, optimizer.destination, optimizer.demand)]
+    commodities = [(int(s), int(t), float(d)) for s, t, d in commodities]
+    routed = [k for k, (s, t, d) in enumerate(commodities) if d > 0 and s != t]
+    return keys, tails, heads, unit, links, bounds, commodities, routed
+
+
+def _overflow(load, bounds):
+    return np.maximum(load - bounds, 0.0)
+
+
+class _Routing:
+    """
+    État de l'heuristique: un chemin (indices d'arêtes) par demande, charge
+    par arc et par lien
+    """
+
+    def __init__(self, graph, unit, bounds, commodities, penalty, links):
+        self.graph = graph
+        self.unit = unit
+        self.bounds = bounds
+        self.links = links
+        self.commodities = commodities
+        self.penalty = penalty
+        self.paths = [None] * len(commodities)
+        self.arc_load = np.zeros(len(unit))
+        self.load = np.zeros(len(bounds))
+
+    def marginal_weights(self, demand):
+        """Coût par unité de demande d'emprunter chaque arête, charge actuelle donnée"""
+        extra = (_overflow(self.load + demand, self.bounds)
+                 - _overflow(self.load, self.bounds))
+        return self.unit + self.penalty * extra[self.links] / demand
+
+    def route(self, k):
+        """Placer la demande k sur son meilleur chemin (demande retirée de la charge)"""
+        source, destination, demand = self.commodities[k]
+        weights = self.marginal_weights(demand)
+        length, path = self.graph.shortest_path(weights, source, destination)
+        if path is None:
+            raise ValueError(f"Aucun chemin de {source} à {destination}")
+        return demand * length, path
+
+    def place(self, k, path):
+        self.paths[k] = path
+        self.arc_load[path] += self.commodities[k][2]
+        np.add.at(self.load, self.links[path], self.commodities[k][2])
+
+    def remove(self, k):
+        self.arc_load[self.paths[k]] -= self.commodities[k][2]
+        np.add.at(self.load, self.links[self.paths[k]], -self.commodities[k][2])
+
+    def cost(self):
+        """(coût de routage, dépassement total de capacité)"""
+        return (float(self.unit @ self.arc_load),
+                float(_overflow(self.load, self.bounds).sum()))
+
+
+def _penalty(unit):
+    """Pénalité par unité de dépassement, supérieure au coût de tout chemin"""
+    return 1.0 + 2.0 * float(np.abs(unit).sum())
+
+
+def greedy_routing(graph, unit, bounds, commodities, max_passes=20, tol=1e-9,
+                   links=None):
+    """
+    Heuristique gloutonne puis « rip-up and reroute »
+
+    Args:
+        graph: ForwardStar du réseau
+        unit: Coût unitaire par arête
+        bounds: Capacité utilisable par lien (par arête sans links)
+        commodities: Liste de (source, destination, volume)
+        max_passes: Passes de recherche locale
+        tol: Amélioration minimale pour accepter un déplacement
+        links: Lien de chaque arête (défaut: un lien par arête)
+
+    Returns:
+        tuple: (chemins, charge par arête, coût, dépassement, passes effectuées)
+    """
+    links = np.arange(len(unit)) if links is None else links
+    state = _Routing(graph, unit, bounds, commodities, _penalty(unit), links)
+
+    order = sorted(range(len(commodities)), key=lambda k: -commodities[k][2])
+    for k in order:
+        _, path = state.route(k)
+        state.place(k, path)
+
+    passes = 0
+    for passes in range(1, max_passes + 1):
+        improved = False
+        # Demandes passant par un lien saturé d'abord, puis les plus coûteuses
+        over = (_overflow(state.load, bounds) > tol)[links]
+        order = sorted(range(len(commodities)), key=lambda k: (
+            not over[state.paths[k]].any(),
+            -commodities[k][2] * float(unit[state.paths[k]].sum())))
+        for k in order:
+            demand = commodities[k][2]
+            state.remove(k)
+            current = demand * float(state.marginal_weights(demand)[state.paths[k]].sum())
+            value, path = state.route(k)
+            if value < current - tol * max(1.0, abs(current)):
+                state.place(k, path)
+                improved = True
+            else:
+                state.place(k, state.paths[k])
+        if not improved:
+            break
+
+    cost, overflow = state.cost()
+    return state.paths, state.arc_load, cost, overflow, passes
+
+
+class _PathMaster:
+    """
+    PLNE sur les chemins
+
+        min  sum_k sum_p d_k c_p lambda_kp + M sum_e s_e
+        s.c. sum_p lambda_kp = 1                         (sigma_k)
+             sum_k d_k sum_{p ∋ l} lambda_kp - s_l <= u_l  (pi_l <= 0)
+             lambda binaires (relâchées pendant la génération de colonnes)
+
+    Une ligne de capacité par lien l (les deux arcs d'un lien
+    bidirectionnel y contribuent). Les écarts s_l rendent le maître
+    toujours réalisable, au prix M.
+    """
+
+    def __init__(self, env, unit, bounds, commodities, penalty, links):
+        self.unit = unit
+        self.links = links
+        self.commodities = commodities
+        self.model = gp.Model("unsplittable_paths", env=env)
+        self.model.setParam('OutputFlag', 0)
+        num_links = len(bounds)
+        self.slack = list(self.model.addVars(num_links, obj=penalty).values())
+        self.capacity = [self.model.addLConstr(gp.LinExpr(-1.0, self.slack[l]),
+                                               GRB.LESS_EQUAL, float(bounds[l]))
+                         for l in range(num_links)]
+        self.convexity = [self.model.addLConstr(gp.LinExpr(), GRB.EQUAL, 1.0)
+                          for _ in commodities]
+        self.columns = []  # (demande k, indices des arêtes, variable)
+        self.known = [set() for _ in commodities]
+
+    def find(self, k, path):
+        """Variable du chemin path de la demande k"""
+        signature = tuple(path.tolist())
+        for j, known, var in self.columns:
+            if j == k and tuple(known.tolist()) == signature:
+                return var
+        return None
+
+    def add_path(self, k, path):
+        """Ajouter le chemin d'arêtes path pour la demande k (ignoré s'il existe)"""
+        signature = tuple(path.tolist())
+        if signature in self.known[k]:
+            return None
+        self.known[k].add(signature)
+        demand = self.commodities[k][2]
+        column = gp.Column([demand] * len(path) + [1.0],
+                           [self.capacity[l] for l in self.links[path].tolist()]
+                           + [self.convexity[k]])
+        var = self.model.addVar(obj=demand * float(self.unit[path].sum()), column=column)
+        self.columns.append((k, path, var))
+        return var
+
+    def duals(self):
+        """Duaux par arête (celui de son lien) et par demande"""
+        pi = np.array(self.model.getAttr('Pi', self.capacity))[self.links]
+        sigma = np.array(self.model.getAttr('Pi', self.convexity))
+        return pi, sigma
+
+
+def solve_unsplittable(optimizer, commodities=None, exact=True, time_limit=10.0,
+                       mip_gap=1e-4, max_rounds=100, max_passes=20, max_columns=1500):
+    """
+    Routage insécable: heuristique, puis PLNE sur les chemins
+
+    La PLNE est exacte lorsque tous les chemins dont le coût réduit est
+    inférieur à l'écart entre l'heuristique et la relaxation ont pu être
+    énumérés (au plus max_columns): aucun autre chemin ne peut figurer
+    dans une solution meilleure que celle de l'heuristique. Sinon elle
+    porte sur les chemins générés et l'écart reste mesuré par rapport à
+    la borne de la relaxation.
+
+    Args:
+        optimizer: NetworkOptimizer (seules ses données sont utilisées)
+        commodities: Liste de (source, destination, volume); par défaut la
+                     demande de l'optimiseur, sur un seul chemin
+        exact: Lancer la PLNE après l'heuristique
+        time_limit: Limite de temps totale (s)
+        mip_gap: Écart relatif visé
+        max_rounds: Tours de génération de colonnes
+        max_passes: Passes de recherche locale de l'heuristique
+        max_columns: Nombre maximal de chemins dans la PLNE
+
+    Returns:
+        RoutingResult (flux agrégés), complété par paths, heuristic_cost,
+        heuristic_time, lower_bound, gap, num_columns, method
+    """
+    start_time = time.time()
+    keys, tails, heads, unit, links, bounds, requested, routed = _instance(optimizer,
+                                                                         commodities)
+    commodities = [requested[k] for k in routed]
+    graph = ForwardStar(optimizer.num_nodes, tails, heads)
+    tol = 1e-6 * max(1.0, max((d for _, _, d in commodities), default=0.0))
+    penalty = _penalty(unit)
+
+    paths, load, cost, overflow, passes = greedy_routing(graph, unit, bounds, commodities,
+                                                        max_passes, links=links)
+    heuristic_time = time.time() - start_time
+    heuristic_cost = cost if overflow <= tol else None
+
+    info = {
+        'method': 'heuristic',
+        'heuristic_cost': heuristic_cost,
+        'heuristic_time': heuristic_time,
+        'local_search_passes': passes,
+        'lower_bound': None,
+        'gap': None,
+        'num_columns': 0
+    }
+    status = 'suboptimal' if heuristic_cost is not None else 'infeasible'
+
+    if exact:
+        master = _PathMaster(optimizer.env, unit, bounds, commodities, penalty, links)
+        try:
+            # L'énumération n'est possible qu'à partir d'un routage réalisable
+            lower_bound, complete = _price_and_enumerate(
+                master, graph, unit, commodities, paths,
+                heuristic_cost, start_time, time_limit, max_rounds, max_columns, tol)
+            start_vars = [master.find(k, path) for k, path in enumerate(paths)]
+
+            # Phase entière: chemins binaires, dépassements interdits
+            variables = [var for _, _, var in master.columns]
+            master.model.setAttr('VType', variables, [GRB.BINARY] * len(variables))
+            master.model.setAttr('UB', master.slack, [0.0] * len(master.slack))
+            if heuristic_cost is not None:
+                master.model.setAttr('Start', variables, [0.0] * len(variables))
+                master.model.setAttr('Start', start_vars, [1.0] * len(start_vars))
+            master.model.setParam('TimeLimit', max(0.0, time_limit - (time.time() - start_time)))
+            master.model.setParam('MIPGap', mip_gap)
+            master.model.optimize()
+
+            # Pool complet: toute solution hors du pool coûte au moins
+            # autant que l'heuristique
+            if complete and master.model.SolCount > 0:
+                lower_bound = max(lower_bound, min(master.model.ObjBound, heuristic_cost))
+            info.update(method='paths_mip', num_columns=len(variables),
+                        complete_pool=complete, lower_bound=lower_bound)
+
+            if master.model.SolCount > 0:
+                chosen = np.array(master.model.getAttr('X', variables)) > 0.5
+                for (k, path, _), used in zip(master.columns, chosen):
+                    if used:
+                        paths[k] = path
+                load = np.zeros(len(unit))
+                for k, path in enumerate(paths):
+                    load[path] += commodities[k][2]
+                cost, overflow = float(unit @ load), 0.0
+
+            if overflow <= tol:
+                gap = max(0.0, (cost - lower_bound) / max(abs(cost), 1e-9))
+                info['gap'] = gap
+                if gap <= mip_gap:
+                    status = 'optimal'
+                elif master.model.Status == GRB.TIME_LIMIT:
+                    status = 'time_limit'
+                else:
+                    status = 'suboptimal'
+            elif master.model.Status == GRB.TIME_LIMIT:
+                status = 'time_limit'
+        finally:
+            master.model.dispose()
+
+    arrays = optimizer.edge_arrays()
+    feasible = overflow <= tol
+    results = RoutingResult(
+        status, time.time() - start_time, tails, heads, arrays['capacity'],
+        arrays['cost'], arrays['latency'], load if feasible else None,
+        links=arrays['link'], source=optimizer.source, destination=optimizer.destination,
+        demand=optimizer.demand,
+        objective=cost if feasible else None,
+        message=None if feasible else "Aucun routage sur un seul chemin ne respecte les capacités."
+    )
+    for key, value in info.items():
+        results[key] = value
+    if feasible:
+        # Une entrée par demande reçue (routage vide pour les volumes nuls)
+        node_paths = [[s] for s, _, _ in requested]
+        for k, path in zip(routed, paths):
+            if len(path):
+                node_paths[k] = [int(tails[path[0]])] + heads[path].tolist()
+        results['paths'] = node_paths
+        results['main_paths'] = [
+            f"Chemin: {' → '.join(str(n) for n in nodes)} | Flux: {d:.2f}"
+            for nodes, (_, _, d) in zip(node_paths, requested)
+        ]
+    return results
+
+
+def _price_and_enumerate(master, graph, unit, commodities, paths, upper_bound,
+                         start_time, time_limit, max_rounds, max_columns, tol):
+    """
+    Génération de colonnes sur la relaxation, puis énumération des chemins
+    de coût réduit assez faible pour améliorer upper_bound
+
+    Pour des duales (pi, sigma) du maître restreint de valeur D, toute
+    solution entière coûte au moins D + sum_k rc_k(p_k), où
+    rc_k(p) = d_k * sum_{e in p} (c_e - pi_e) - sigma_k et rc_k(p) >= rc_k^min.
+    Un chemin p de la demande k ne peut donc améliorer upper_bound que si
+    rc_k(p) <= upper_bound - D - sum_{j != k} min(0, rc_j^min).
+
+    Returns:
+        tuple: (borne inférieure lagrangienne, vrai si l'énumération est complète)
+
+    max_columns borne le nombre total de chemins du maître (un quota par demande).
+    """
+    for k, path in enumerate(paths):
+        master.add_path(k, path)
+
+    reverse = ForwardStar(graph.num_nodes, graph.heads, graph.tails)
+    lower_bound = -np.inf
+    for _ in range(max_rounds):
+        master.model.optimize()
+        pi, sigma = master.duals()
+        value = master.model.ObjVal
+        # pi <= 0: les poids unit - pi restent positifs (Dijkstra)
+        weights = unit - pi
+        reduced = np.zeros(len(commodities))
+        candidates = []
+        for k, (source, destination, demand) in enumerate(commodities):
+            length, path = graph.shortest_path(weights, source, destination)
+            reduced[k] = demand * length - sigma[k]
+            if reduced[k] < -tol:
+                candidates.append((k, path))
+        lower_bound = max(lower_bound, value + float(np.minimum(reduced, 0.0).sum()))
+        if not candidates or time.time() - start_time > time_limit:
+            break
+        for k, path in candidates:
+            master.add_path(k, path)
+
+    if upper_bound is None:
+        return lower_bound, False
+
+    # Énumération des chemins utiles (duales du dernier maître résolu).
+    # Au-delà du quota d'une demande, l'énumération est resserrée autour
+    # de son plus court chemin: le pool n'est plus complet
+    complete = True
+    negative = np.minimum(reduced, 0.0)
+    for k, (source, destination, demand) in enumerate(commodities):
+        budget = upper_bound - value - (negative.sum() - negative[k]) + tol
+        quota = max(1, (max_columns - len(master.columns)) // (len(commodities) - k))
+        to_target, _ = reverse.shortest_path_tree(weights, destination)
+        shortest = to_target[source]
+        max_length = (budget + sigma[k]) / demand
+        found = None
+        for _ in range(MAX_TIGHTENINGS):
+            found = graph.simple_paths(weights, source, destination, max_length,
+                                       to_target=to_target, limit=quota)
+            if found is not None:
+                break
+            complete = False
+            max_length = shortest + 0.5 * (max_length - shortest)
+        for path in found or []:
+            master.add_path(k, path)
+    return lower_bound, complete
@@ -0,0 +1,113 @@
+"""
+Processus de calcul des moteurs de décomposition (régions, scénarios)
+
+Chaque processus garde ses sous-problèmes en mémoire d'une itération à
+l'autre et répond par un tube aux commandes du maître:
+  - ('solve', valeur): résultat de solve(valeur) pour chaque sous-problème
+  - ('flows', valeur): résultat de flows(valeur) pour chaque sous-problème
+  - ('stop', None): libère les modèles et termine le processus
+
+Un sous-problème est construit par solver(env, *args, données) et expose
+solve, flows et son modèle Gurobi (model).
+"""
+
+import multiprocessing
+
+import gurobipy as gp
+
+
+def _serve(connection, solver, args, items, threads):
+    """Boucle d'un processus de calcul: garde ses sous-problèmes en mémoire"""
+    env = gp.Env(params={'OutputFlag': 0, 'Threads': threads})
+    solvers = [solver(env, *args, data) for data in items]
+    try:
+        while True:
+            command, value = connection.recv()
+            if command == 'solve':
+                connection.send([s.solve(value) for s in solvers])
+            elif command == 'flows':
+                connection.send([s.flows(value) for s in solvers])
+            else:
+                break
+    finally:
+        for s in solvers:
+            s.model.dispose()
+        env.dispose()
+        connection.close()
+
+
+class _LocalWorker:
+    """Même interface qu'un processus de calcul, mais dans le processus courant"""
+
+    def __init__(self, env, solver, args, items):
+        self.solvers = [solver(env, *args, data) for data in items]
+        self._reply = None
+
+    def send(self, message):
+        command, value = message
+        if command == 'solve':
+            self._reply = [s.solve(value) for s in self.solvers]
+        elif command == 'flows':
+            self._reply = [s.flows(value) for s in self.solvers]
+        else:
+            for s in self.solvers:
+                s.model.dispose()
+
+    def recv(self):
+        return self._reply
+
+
+def start_workers(env, solver, items, workers=None, args=()):
+    """
+    Répartit les sous-problèmes entre processus de calcul (tourniquet)
+
+    Args:
+        env: environnement Gurobi du processus courant (workers=0)
+        solver: classe des sous-problèmes, appelée solver(env, *args, données)
+        items: données de chaque sous-problème
+        workers: nombre de processus (None = un par cœur, au plus un par
+                 sous-problème, 0 = tout dans le processus courant)
+        args: arguments communs passés avant les données
+
+    Returns:
+        (handles, processes): extrémités des tubes et processus lancés
+    """
+    if workers is None:
+        workers = min(len(items), multiprocessing.cpu_count())
+    handles, processes = [], []
+    if workers == 0:
+        handles.append(_LocalWorker(env, solver, args, items))
+        return handles, processes
+
+    workers = min(workers, len(items))
+    context = multiprocessing.get_context('spawn')
+    threads = max(1, multiprocessing.cpu_count() // workers)
+    try:
+        for w in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve,
+                                      args=(child, solver, args, items[w::workers],
+                                            threads),
+                                      daemon=True)
+            process.start()
+            child.close()
+            handles.append(parent)
+            processes.append(process)
+    except BaseException:
+        stop_workers(handles, processes)
+        raise
+    return handles, processes
+
+
+def stop_workers(handles, processes, timeout=5):
+    """Arrête les processus de calcul; termine ceux qui ne répondent plus"""
+    for handle in handles:
+        try:
+            handle.send(('stop', None))
+        except OSError:
+            pass  # Processus déjà terminé
+    for process in processes:
+        process.join(timeout=timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()